@@ -2,15 +2,52 @@
 This is test code and may not work for long (if at all) as Google constantly changes their interface without an API
 """
 import datetime
-import urllib.request
+import http.client
+import json
+import math
+import urllib.parse
+import random
 import re
+import socket
+import ssl
 import time
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
 import tqdm
 
 
 TEST = """<!doctype html><html><head><title>View article</title><meta http-equiv="Content-Type" content="text/html;charset=ISO-8859-1"><meta http-equiv="X-UA-Compatible" content="IE=Edge"><meta name="referrer" content="always"><meta name="viewport" content="width=device-width,initial-scale=1,minimum-scale=1,maximum-scale=2"><meta name="format-detection" content="telephone=no"><link rel="shortcut icon" href="/favicon.ico"><meta name="description" content="MS Rosenberg, CD Anderson, Methods in Ecology and Evolution, 2011 - Cited by 957"><meta property="og:description" content="MS Rosenberg, CD Anderson, Methods in Ecology and Evolution, 2011 - Cited by 957"><meta property="og:title" content="PASSaGE: Pattern analysis, spatial statistics and geographic exegesis. Version 2"><meta property="og:image" content=""><meta property="og:type" content="website"><meta name="twitter:card" content="summary"><style>html,body,form,table,div,h1,h2,h3,h4,h5,h6,img,ol,ul,li,button{margin:0;padding:0;border:0;}table{border-collapse:collapse;border-width:0;empty-cells:show;}html,body{height:100%}#gs_top{position:relative;box-sizing:border-box;min-height:100%;min-width:964px;-webkit-tap-highlight-color:rgba(0,0,0,0);}#gs_top>*:not(#x){-webkit-tap-highlight-color:rgba(204,204,204,.5);}.gs_el_ph #gs_top,.gs_el_ta #gs_top{min-width:320px;}#gs_top.gs_nscl{position:fixed;width:100%;}body,td,input,button{font-size:13px;font-family:Arial,sans-serif;line-height:1.24;}body{background:#fff;color:#222;-webkit-text-size-adjust:100%;-moz-text-size-adjust:none;}.gs_gray{color:#777777}.gs_red{color:#dd4b39}.gs_grn{color:#006621}.gs_lil{font-size:11px}.gs_med{font-size:16px}.gs_hlt{font-weight:bold;}a:link{color:#1a0dab;text-decoration:none}a:visited{color:#660099;text-decoration:none}a:hover,a:hover .gs_lbl{text-decoration:underline}a:active,a:active .gs_lbl,a .gs_lbl:active{color:#d14836}.gs_el_tc a:hover,.gs_el_tc a:hover .gs_lbl{text-decoration:none}.gs_pfcs a:focus,.gs_pfcs button:focus,.gs_pfcs input:focus,.gs_pfcs label:focus{outline:none}.gs_a,.gs_a a:link,.gs_a a:visited{color:#006621}.gs_a a:active{color:#d14836}a.gs_fl:link,.gs_fl a:link{color:#1a0dab}a.gs_fl:visited,.gs_fl a:visited{color:#660099}a.gs_fl:active,.gs_fl a:active{color:#d14836}.gs_fl{color:#777777}.gs_ctc,.gs_ctu{vertical-align:middle;font-size:11px;font-weight:bold}.gs_ctc{color:#1a0dab}.gs_ctg,.gs_ctg2{font-size:13px;font-weight:bold}.gs_ctg{color:#1a0dab}a.gs_pda,.gs_pda a{padding:7px 0 5px 0}.gs_alrt{background:#f9edbe;border:1px solid #f0c36d;padding:0 16px;text-align:center;box-shadow:0 2px 4px rgba(0,0,0,.2);border-radius:2px;}.gs_alrt:empty{display:none;}.gs_spc{display:inline-block;width:12px}.gs_br{width:0;font-size:0}.gs_ibl{display:inline-block;}.gs_scl:after{content:"";display:table;clear:both;}.gs_ind{padding-left:8px;text-indent:-8px}.gs_ico,.gs_icm{display:inline-block;background:no-repeat url(/intl/en/scholar/images/1x/sprite_20161020.png);background-position:-23px -161px;background-size:169px;width:21px;height:21px;}@media(-webkit-min-device-pixel-ratio:1.5),(min-resolution:144dpi){.gs_ico,.gs_icm{background-image:url(/intl/en/scholar/images/2x/sprite_20161020.png);}}.gs_el_ta .gs_nta,.gs_ota,.gs_el_ph .gs_nph,.gs_oph{display:none}.gs_el_ta .gs_ota,.gs_el_ph .gs_oph{display:inline}.gs_el_ta div.gs_ota,.gs_el_ph div.gs_oph{display:block}.gs_sth_g{visibility:hidden;max-height:0;}.gs_sth_vis .gs_sth_g{max-height:1000px;}.gs_sth_vis .gs_sth_b{position:fixed;top:0;}.gs_sth_trk .gs_sth_b{position:absolute;top:auto;}@keyframes gs_anm_spin{0%{transform:rotate(0deg);}100%{transform:rotate(360deg);}}.gs_invis{visibility:hidden;}.gs_rimg{display:block;background-color:#e5e5e5;border-radius:50%;overflow:hidden;position:relative;z-index:1;}.gs_rimg>img{position:absolute;margin:auto;left:0;top:0;bottom:0;right:0;}.gs_in_txtw{display:inline-block;vertical-align:middle;}.gs_in_txtb{display:block;}.gs_in_txt{color:#000;background-color:#fff;font-size:16px;box-sizing:border-box;height:29px;line-height:23px;border:1px solid #d9d9d9;border-top-color:#c0c0c0;padding:3px 6px 1px 8px;border-radius:1px;outline:none;-webkit-appearance:none;-moz-appearance:none;}.gs_el_tc .gs_in_txt{font-size:18px;}.gs_in_txtb .gs_in_txt{width:100%;}.gs_in_rnd .gs_in_txt{border-radius:14.5px;padding:3px 12px 1px 12px;}.gs_in_txt:hover{border-color:#b9b9b9;border-top-color:#a0a0a0;box-shadow:inset 0 1px 2px rgba(0,0,0,.1);}.gs_in_txte .gs_in_txt{border-color:#dd4b39;}.gs_in_txt:focus{border-color:#4d90fe;box-shadow:inset 0 1px 2px rgba(0,0,0,.3);}.gs_in_txt:disabled{color:#b8b8b8;border-color:#f1f1f1;box-shadow:none;}.gs_in_txtm .gs_in_txt{font-size:13px;height:24px;line-height:16px;padding:3px 6px;}.gs_in_txtm.gs_in_rnd .gs_in_txt{border-radius:12px;}.gs_el_tc .gs_in_txtm .gs_in_txt{height:29px;line-height:21px;}.gs_el_tc .gs_in_txtm.gs_in_rnd .gs_in_txt{border-radius:14.5px;}.gs_in_txtl .gs_in_txt{height:41px;padding:9px 43px;}.gs_in_txtl.gs_in_rnd .gs_in_txt{border-radius:20.5px;}.gs_in_txts{font-size:13px;line-height:18px;color:#666;}.gs_in_txts:not(:empty){margin-top:2px;}.gs_in_txte .gs_in_txts{color:#dd4b39;}button{position:relative;z-index:1;box-sizing:border-box;font-size:13px;cursor:pointer;height:29px;line-height:normal;min-width:72px;padding:0 8px;color:#444;border:1px solid rgba(0,0,0,.1);border-radius:3px;text-align:center;background-color:#f5f5f5;user-select:none;}button.gs_btn_rnd{border-radius:14px;padding:0 12px;}button.gs_btn_rnd.gs_btn_rndci{padding-left:4px;}button.gs_btn_lrge{height:41px;min-width:82px;padding:0 9px;}button.gs_btn_lrge.gs_btn_lrge_asym{padding-left:5px;padding-right:8px;}button.gs_btn_lrge.gs_btn_rnd{border-radius:20px;padding:0 16px;}button.gs_btn_lrge.gs_btn_rnd.gs_btn_rndci{padding-left:10px;}button.gs_btn_cir{border-radius:14.5px;min-width:29px;}button.gs_btn_lrge.gs_btn_cir{border-radius:20.5px;min-width:41px;}button.gs_btn_mini{padding:0;border:0;}.gs_el_ph button.gs_btn_mph,.gs_el_ta button.gs_btn_mta{height:41px;}button .gs_wr{position:relative;display:inline-block;width:100%;height:100%;}button .gs_wr:before{content:"";width:0;height:100%;}button .gs_wr:before,button .gs_ico,button .gs_rdt,button .gs_lbl,button .gs_icm{display:inline-block;vertical-align:middle;}button .gs_wr{font-size:13px;text-transform:none;}.gs_btn_lrge .gs_wr{font-size:15px;}.gs_btn_lsb .gs_wr{font-size:11px;font-weight:bold;}.gs_btn_lsu .gs_wr{font-size:11px;text-transform:uppercase;}.gs_btn_lrge.gs_btn_lsb .gs_wr,.gs_btn_lrge.gs_btn_lsu .gs_wr,.gs_btn_lrge.gs_btn_lrge_asym .gs_wr{font-size:13px;}.gs_btn_half,.gs_el_ta .gs_btn_hta,.gs_el_ph .gs_btn_hph{min-width:36px;}.gs_btn_lrge.gs_btn_half,.gs_el_ta .gs_btn_lrge.gs_btn_hta,.gs_el_ph .gs_btn_lrge.gs_btn_hph,.gs_el_ta .gs_btn_mta,.gs_el_ph .gs_btn_mph{min-width:41px;}.gs_btn_slt{border-radius:3px 0 0 3px;}.gs_btn_srt{margin-left:-1px;border-radius:0 3px 3px 0;}.gs_btn_smd{margin-left:-1px;border-radius:0;}button:hover{z-index:2;color:#222;border-color:rgba(0,0,0,.2);background-color:#f8f8f8;}button.gs_sel{background-color:#dcdcdc;}button:active{z-index:2;background-color:#f1f1f1;}button:focus{z-index:2;}button::-moz-focus-inner{padding:0;border:0}button:-moz-focusring{outline:1px dotted ButtonText}.gs_pfcs button:-moz-focusring{outline:none}a.gs_in_ib{position:relative;display:inline-block;line-height:16px;padding:6px 0 7px 0;user-select:none;}a.gs_btn_lrge{height:40px;padding:0;}a.gs_in_bgcw{min-width:41px;}a.gs_btn_lrge.gs_in_bgcw:before{position:absolute;content:"";height:29px;width:29px;top:6px;left:6px;background-color:#fff;box-shadow:0 1px 3px rgb(0,0,0,.4);border-radius:50%;}a.gs_in_bgcw:hover:before{background-color:#f5f5f5;}a.gs_in_bgcw:active:before{background-color:#e5e5e5;}a.gs_in_bgcw.gs_dis:before{background-color:#fff;}a.gs_in_ib .gs_lbl{display:inline-block;padding-left:21px;color:#222;}a.gs_in_ib.gs_in_gray .gs_lbl{color:#444;}a.gs_in_ib .gs_lbl:not(:empty){padding-left:29px;}button.gs_in_ib .gs_lbl:not(:empty){padding-left:4px;}a.gs_in_ib:active .gs_lbl,a.gs_in_ib .gs_lbl:active,a.gs_in_ib :active~.gs_lbl{color:#d14836;}.gs_el_ta .gs_btn_hta .gs_lbl,.gs_el_ph .gs_btn_hph .gs_lbl,.gs_el_ta .gs_btn_mta .gs_lbl,.gs_el_ph .gs_btn_mph .gs_lbl,.gs_el_ta .gs_btn_cta .gs_lbl,.gs_el_ph .gs_btn_cph .gs_lbl{display:none;}a.gs_in_ib .gs_ico{position:absolute;top:3px;left:0;}.gs_in_ib.gs_md_li .gs_ico{left:14px;}.gs_el_tc .gs_in_ib.gs_md_li .gs_ico{top:11px;}.gs_in_ib.gs_md_li.gs_md_lix .gs_ico{top:10px;left:16px;}a.gs_btn_lrge .gs_ico{top:50%;left:50%;margin:-10.5px 0 0 -10.5px;}.gs_in_ib .gs_ico{opacity:.55;}.gs_in_ib:hover .gs_ico{opacity:.72;}.gs_in_ib:active .gs_ico,.gs_in_ib .gs_ico:active,.gs_in_ib :active~.gs_ico{opacity:1;}.gs_in_ib:disabled .gs_ico,.gs_in_ib.gs_dis .gs_ico{opacity:.28;}.gs_in_ib.gs_btn_act .gs_ico,.gs_in_ib.gs_btn_cre .gs_ico{opacity:1;}.gs_btn_act:disabled .gs_ico,.gs_btn_cre:disabled .gs_ico{opacity:.72;}.gs_rdt{position:relative;width:0;height:21px;}a.gs_in_ib .gs_rdt{left:21px;}.gs_rdt:before{content:"";position:absolute;top:1px;right:0;width:5px;height:5px;border:1px solid #fff;border-radius:50%;background-color:#dd4b39;}.gs_notf{display:inline-block;vertical-align:top;margin-left:8px;width:16px;line-height:16px;background-color:#d14836;border-radius:50%;color:#fff;text-align:center;font-size:9px;font-weight:bold;}.gs_notf:empty{display:none;}.gs_ind .gs_notf{text-indent:0;}button.gs_btn_flat{border-color:transparent;background-color:transparent;}button.gs_btn_olact{color:#4d90fe;background-color:transparent;}button.gs_btn_flat:hover,button.gs_btn_olact:hover{background-color:rgba(0,0,0,.05);}button.gs_btn_flat:active,button.gs_btn_olact:active{background-color:rgba(0,0,0,.1);}button.gs_btn_flat.gs_btn_flact{color:#1a0dab;}button.gs_btn_act{color:#fff;background-color:#4d90fe;}button.gs_btn_act:hover{color:#fff;background-color:#3983fe;}button.gs_btn_act.gs_sel{background-color:#2f6bcc;}button.gs_btn_act:active{background-color:#357ae8;}button.gs_btn_cre{color:#fff;background-color:#d14836;}button.gs_btn_cre:hover{color:#fff;background-color:#c53727;}button.gs_btn_cre.gs_sel{background-color:#992b1e;}button.gs_btn_cre:active{background-color:#b0281a;}button.gs_btn_hov_nobg:hover,button.gs_btn_hov_nobg:active{border:none;background:transparent;}button:disabled,button:disabled:hover,button:disabled:active{cursor:default;color:#b8b8b8;border-color:rgba(0,0,0,.05);background-color:transparent;z-index:0;}button.gs_btn_flat:disabled{color:#b8b8b8;border-color:transparent;}button.gs_btn_act:disabled{color:#fff;background-color:#a6c8ff;}button.gs_btn_cre:disabled{color:#fff;background-color:#e8a49b;}a.gs_in_ib.gs_dis{cursor:default;pointer-events:none}a.gs_in_ib.gs_dis .gs_lbl{color:#b8b8b8;text-decoration:none}.gs_ttp{position:absolute;top:100%;right:50%;z-index:10;pointer-events:none;visibility:hidden;opacity:0;transition:visibility 0s .13s,opacity .13s ease-out;}button:hover .gs_ttp,button:focus .gs_ttp,a:hover .gs_ttp,a:focus .gs_ttp{transition:visibility 0s .3s,opacity .13s ease-in .3s;visibility:visible;opacity:1;}.gs_md_tb.gs_sel .gs_ttp{transition:none;visibility:hidden;}button.gs_btn_lrge.gs_btn_cir .gs_ttp{top:75%;}.gs_ttp .gs_aro,.gs_ttp .gs_aru{position:absolute;top:-2px;right:-5px;width:0;height:0;line-height:0;font-size:0;border:5px solid transparent;border-top:none;border-bottom-color:#595959;z-index:1;}.gs_ttp .gs_aro{top:-3px;right:-6px;border-width:6px;border-top:none;border-bottom-color:white;}.gs_ttp .gs_txt{display:block;position:relative;top:2px;right:-50%;padding:4px 6px;background:#595959;color:white;font-size:11px;font-weight:bold;line-height:normal;white-space:nowrap;border:1px solid white;border-radius:3px;box-shadow:inset 0 1px 4px rgba(0,0,0,.2);}.gs_press,.gs_in_se,.gs_tan{touch-action:none;}.gs_in_se .gs_lbl:not(:empty){padding-right:14px;}.gs_in_se .gs_icm{position:absolute;top:50%;margin-top:-5.5px;right:0;width:7px;height:11px;background-position:-21px -88px;opacity:.55;}.gs_in_se:hover .gs_icm{opacity:.72;}.gs_in_se:active .gs_icm{opacity:1;}.gs_in_se:disabled .gs_icm{opacity:.28;}.gs_el_ta .gs_btn_hta .gs_icm,.gs_el_ph .gs_btn_hph .gs_icm,.gs_el_ta .gs_btn_mta .gs_icm,.gs_el_ph .gs_btn_mph .gs_icm,.gs_el_ta .gs_btn_cta .gs_icm,.gs_el_ph .gs_btn_cph .gs_icm{display:none;}.gs_btn_mnu .gs_icm{margin-top:-3.5px;height:7px;background-position:0 -110px;}.gs_in_se.gs_btn_act .gs_icm,.gs_in_se.gs_btn_cre .gs_icm{margin-top:-3.5px;height:7px;background-position:-42px -44px;opacity:1;}.gs_btn_act:disabled .gs_icm,.gs_btn_cre:disabled .gs_icm{opacity:.72;}button.gs_btnG .gs_ico{width:21px;height:21px;background-position:-92px -253px;}button .gs_bs{position:absolute;top:50%;left:50%;margin-top:-10px;margin-left:-10px;box-sizing:border-box;width:20px;height:20px;border-radius:50%;border:2px solid #eee;border-top-color:#4d90fe;visibility:hidden;animation:gs_anm_spin .8s linear infinite;}button.gs_bsp .gs_bs{visibility:visible;transition:visibility 0s .4s;}.gs_md_d{text-transform:none;white-space:nowrap;position:absolute;top:0;left:0;border:1px solid #ccc;border-color:rgba(0,0,0,.2);background:#fff;box-shadow:0 2px 4px rgba(0,0,0,.2);z-index:1100;text-align:left;visibility:hidden;max-height:0;margin-top:-1000px;opacity:0;transition:opacity .13s,visibility 0s .13s,max-height 0s .13s,margin-top 0s .13s;}.gs_md_d.gs_vis{visibility:visible;max-height:10000px;margin-top:0;opacity:1;transition:all 0s;}.gs_el_tc .gs_md_d{transform-origin:100% 0;transform:scale(1,0);transition:opacity .218s ease-out,transform 0s .218s,visibility 0s .218s,max-height 0s .218s,margin-top 0s .218s;}.gs_el_tc .gs_md_d.gs_ttzi{transform-origin:50% 50%;transform:scale(0,0);}.gs_el_tc .gs_md_d.gs_ttzr{transform:scale(0,0);}.gs_el_tc .gs_md_d.gs_vis{transform:scale(1,1);transition:transform .218s ease-out;}.gs_md_r{position:relative;display:inline-block;}.gs_md_rmb>.gs_md_d{top:29px}.gs_md_rmbl>.gs_md_d{top:41px}.gs_md_ul{list-style-type:none;word-wrap:break-word;display:inline-block;vertical-align:top;}.gs_md_ul.gs_md_ul_tb{display:block;}.gs_md_li,.gs_in_cb.gs_md_li,.gs_md_li:link,.gs_md_li:visited{display:block;padding:6px 44px 6px 16px;font-size:13px;line-height:16px;color:#222;cursor:pointer;text-decoration:none;position:relative;z-index:0;}a.gs_md_li:hover .gs_lbl,a.gs_md_li:active .gs_lbl{text-decoration:none}.gs_el_tc .gs_md_li{padding-top:14px;padding-bottom:10px;}.gs_md_li.gs_md_lix{font-size:16px;line-height:20px;padding:12px 16px 8px 16px;}.gs_md_li:before{content:"";background-color:#f1f1f1;position:absolute;left:0;right:0;top:0;bottom:0;opacity:0;transition:opacity .13s;z-index:-1;}.gs_md_li:hover:before,.gs_md_li:focus:before{opacity:1;transition:all 0s;}a.gs_in_ib.gs_md_li .gs_lbl{color:#222}a.gs_in_ib.gs_md_li.gs_in_gray .gs_lbl{color:#444}.gs_md_li:active:before{background-color:#ddd}.gs_md_li.gs_sel,a.gs_in_ib.gs_md_li.gs_sel .gs_lbl{color:#d14836}.gs_md_d:focus,.gs_md_li:focus{outline:none}a.gs_md_lix .gs_lbl,a.gs_md_lix .gs_lbl:not(:empty){padding:0 0 0 40px;}a.gs_in_cb:link,a.gs_in_cb:visited,a.gs_in_cb:active,a.gs_in_cb:hover{cursor:pointer;color:#222;text-decoration:none;}.gs_in_cb,.gs_in_ra{position:relative;line-height:16px;display:inline-block;user-select:none;}.gs_in_cb.gs_md_li{padding:6px 44px 6px 16px;}.gs_in_cb input,.gs_in_ra input{position:absolute;top:1px;left:1px;width:15px;height:15px;margin:0;padding:0;opacity:0;z-index:2;}.gs_in_ra input{top:0;left:0}.gs_el_tc .gs_in_cb input{top:9px}.gs_el_tc .gs_in_ra input{top:8px}.gs_in_cb.gs_in_cbj input{top:15px;left:15px}.gs_in_cb label,.gs_in_cb .gs_lbl,.gs_in_ra label{display:inline-block;padding-left:21px;min-height:16px;}.gs_in_ra_lrge{font-size:15px;}.gs_in_cb label:empty:before,.gs_in_cb .gs_lbl:empty:before,.gs_in_ra label:empty:before{content:"\\200b";}.gs_el_tc .gs_in_cb label,.gs_el_tc .gs_in_cb .gs_lbl,.gs_el_tc .gs_in_ra label{padding-top:8px;padding-bottom:5px;}.gs_in_cb.gs_in_cbj label,.gs_in_cb.gs_in_cbj .gs_lbl{padding:13px 0 12px 41px;}.gs_in_cbb,.gs_in_cbb label,.gs_in_cbb .gs_lbl{display:block;}.gs_in_cb .gs_cbx,.gs_in_ra .gs_cbx{position:absolute}.gs_in_cb .gs_cbx{top:2px;left:2px;width:11px;height:11px;border:1px solid #c6c6c6;border-radius:1px;}.gs_md_li .gs_cbx{top:8px;left:18px}.gs_el_tc .gs_in_cb .gs_cbx{top:10px}.gs_el_tc .gs_md_li .gs_cbx{top:16px}.gs_in_cb.gs_in_cbj .gs_cbx{top:15px;left:15px}.gs_el_tc .gs_in_ra .gs_cbx{top:8px}.gs_in_ra .gs_cbx{top:0;left:0;border:1px solid #c6c6c6;width:13px;height:13px;border-radius:7px;}.gs_in_cb:hover .gs_cbx,.gs_in_ra:hover .gs_cbx{border-color:#666;box-shadow:inset 0 1px 1px rgba(0,0,0,.1);}button.gs_in_cb:hover .gs_cbx{border-color:#c6c6c6;}.gs_in_cb :focus~label,.gs_in_ra :focus~label{outline:1px dotted #222;}.gs_pfcs .gs_in_cb :focus~label,.gs_pfcs .gs_in_ra :focus~label{outline:none;}.gs_in_cb:active .gs_cbx,.gs_in_ra:active .gs_cbx,.gs_in_cb .gs_cbx:active,.gs_in_ra .gs_cbx:active,.gs_in_cb :active~.gs_cbx,.gs_in_ra :active~.gs_cbx{border-color:#666;background-color:#ebebeb;}button.gs_in_cb:active .gs_cbx{border-color:#a6a6a6;}.gs_in_cb :disabled~.gs_cbx,.gs_in_ra :disabled~.gs_cbx,button.gs_in_cb:disabled .gs_cbx{border-color:#f1f1f1;box-shadow:none;}.gs_in_cb :disabled~label,.gs_in_ra :disabled~label{color:#b8b8b8;}.gs_in_cb.gs_err .gs_cbx{border-color:#eda29b;}.gs_in_cb .gs_chk,.gs_in_ra .gs_chk{position:absolute;z-index:1;top:-3px;left:-2px;width:21px;height:21px;}.gs_md_li .gs_chk{top:3px;left:14px}.gs_el_tc .gs_in_cb .gs_chk{top:5px}.gs_el_tc .gs_md_li .gs_chk{top:11px}.gs_in_cb.gs_in_cbj .gs_chk{top:10px;left:11px}.gs_in_ra .gs_chk{top:4px;left:4px;width:7px;height:7px;border-radius:4px;}.gs_el_tc .gs_in_ra .gs_chk{top:12px}.gs_in_cb input:checked~.gs_chk,.gs_in_cb.gs_sel .gs_chk{background:no-repeat url(/intl/en/scholar/images/1x/sprite_20161020.png) -69px -67px;opacity:.62;}.gs_in_ra input:checked~.gs_chk{background-color:#666}.gs_in_cb.gs_par .gs_chk{background:no-repeat url(/intl/en/scholar/images/1x/sprite_20161020.png) -21px -44px;opacity:.55;}@media(-webkit-min-device-pixel-ratio:1.5),(min-resolution:144dpi){.gs_in_cb input:checked~.gs_chk,.gs_in_cb.gs_sel .gs_chk,.gs_in_cb.gs_par .gs_chk{background-image:url(/intl/en/scholar/images/2x/sprite_20161020.png);background-size:169px;}}.gs_in_cb input:checked:disabled~.gs_chk{opacity:.22}.gs_in_ra input:checked:disabled~.gs_chk{background-color:#f1f1f1}.gs_in_cb.gs_bsp .gs_cbx{top:6px;left:16px;border-radius:6px;border-width:3px;animation:gs_cbx_spn .5s infinite linear;}.gs_el_tc .gs_in_cb.gs_md_li.gs_bsp .gs_cbx{top:14px}.gs_in_cb .gs_csp{background:url(\'/intl/en/scholar/images/spinner.gif\') no-repeat;position:absolute;height:25px;width:25px;top:2px;left:12px;display:none;animation:gs_cbx_ah 9s infinite;}.gs_in_cb.gs_bsp .gs_csp{display:block}.gs_el_tc .gs_md_li .gs_csp{top:10px}@keyframes gs_cbx_spn{0%,100%{border-color:#4d90fe #c6c6c6 #c6c6c6 #c6c6c6}40%{border-color:#c6c6c6 #4d90fe #c6c6c6 #c6c6c6}50%{border-color:#c6c6c6 #c6c6c6 #4d90fe #c6c6c6}60%{border-color:#c6c6c6 #c6c6c6 #c6c6c6 #4d90fe}}@keyframes gs_cbx_ah{0%,100%{visibility:hidden}}.gs_ico_x{background-position:-113px -22px;opacity:.55;}.gs_ico_x:hover{opacity:.72;}.gs_ico_x:active{opacity:1;}.gs_ico_X{background-position:-71px 0;opacity:.55;}.gs_ico_X:hover{opacity:.72;}.gs_ico_X:active{opacity:1;}.gs_btnX .gs_ico{background-position:-71px 0;}.gs_el_tc .gs_ico_Xt{background-origin:content-box;background-clip:content-box;padding:10px 6px 10px 14px;}.gs_ico_P{background-position:0 0;opacity:.55;}.gs_ico_P:hover{opacity:.72;}.gs_ico_P:active{opacity:1;}.gs_btnP .gs_ico{background-position:-21px 0;}.gs_btnC .gs_ico{background-position:0 -66px;}.gs_btnL .gs_ico{background-position:-92px -44px;}.gs_ico_LB{background-position:-50px -44px;height:16px;}.gs_btnJ .gs_ico{background-position:-92px -22px;}.gs_btnM .gs_ico{background-position:-92px 0;}.gs_btnMW .gs_ico{background-position:-21px -22px;}.gs_btnSB .gs_ico{background-position:0 -44px;}.gs_btnTSB .gs_ico{background-position:-115px -253px;}.gs_btnPL .gs_ico{background-position:-148px -66px;}.gs_btnPR .gs_ico{background-position:-21px -66px;}.gs_btnPLW .gs_ico{background-position:-0 -230px;}.gs_btnPRW .gs_ico{background-position:-23px -230px;}.gs_btnZI .gs_ico{background-position:-148px -22px;}.gs_btnZO .gs_ico{background-position:-127px -44px;}.gs_btnDE .gs_ico{background-position:-134px 0;}.gs_btnFI .gs_ico{background-position:-50px -66px;}.gs_btnAD .gs_ico{background-position:-141px -88px;opacity:.55;}.gs_btnAD:hover .gs_ico{opacity:.72;}.gs_btnAD:active .gs_ico,.gs_btnAD .gs_ico:active,.gs_btnAD :active~.gs_ico{opacity:1;}.gs_btnBA .gs_ico{background-position:-50px -22px;}.gs_btnADD .gs_ico{background-position:-92px -66px;}.gs_btnMRG .gs_ico{background-position:-113px 0;}.gs_btnLBL .gs_ico{background-position:0 -161px;}.gs_btnCNCL .gs_ico{background-position:-71px 0;}.gs_btnDWL .gs_ico{background-position:-28px -88px;}.gs_btnMNU .gs_ico{background-position:0 -88px;}.gs_btnMNT .gs_ico{background-position:-46px -161px;}.gs_btnALT .gs_ico{background-position:-92px -161px;}.gs_btnART .gs_ico{background-position:-115px -161px;}.gs_btnGSL .gs_ico{background-position:-69px -161px;}.gs_btnCLS .gs_ico{background-position:-138px -161px;}.gs_btnXBLU .gs_ico{background-position:-138px -253px;}.gs_btnSSB .gs_ico{background-position:0 -276px;}.gs_btnSSW .gs_ico{background-position:-23px -276px;}.gs_btnFLT .gs_ico{background-position:0 -184px;}.gs_btnXT .gs_ico{background-position:-46px -184px;}.gs_btnPD .gs_ico{background-position:-69px -184px;}.gs_btnPU .gs_ico {background-position:-92px -276px;}.gs_btnCP .gs_ico{background-position:-92px -184px;}.gs_btnTP .gs_ico{background-position:-138px -184px;}.gs_btnML .gs_ico{background-position:-115px -276px;}.gs_btnCHK .gs_ico{background-position:-71px -66px;}.gs_btnDNB .gs_ico{background-position:-115px -230px;}.gs_btnDNW .gs_ico{background-position:0 -207px;}.gs_btnACA .gs_ico{background-position:-23px -207px;}.gs_btnAPT .gs_ico{background-position:-46px -207px;}.gs_btnAPTW .gs_ico{background-position:-92px -230px;}.gs_btnAFL .gs_ico{background-position:-69px -207px;}.gs_btnAN .gs_ico{background-position:-46px -276px;}.gs_btnAI .gs_ico{background-position:-69px -276px;}.gs_btnPBL .gs_ico{background-position:-92px -207px;}.gs_btnUCT .gs_ico{background-position:-115px -207px;}.gs_btnVRF .gs_ico{background-position:-138px -207px;}.gs_btnLSI .gs_ico{background-position:-46px -230px;}.gs_btnLSG .gs_ico{background-position:-69px -230px;}.gs_btnMOR .gs_ico{background-position:-23px -253px;}.gs_btnADV .gs_ico{background-position:-46px -253px;}.gs_btnPRO .gs_ico{background-position:-69px -253px;}.gs_ico_star{background-position:-71px -44px;width:13px;height:13px;}.gs_btnPLSW .gs_ico{background-position:-138px -230px;}.gs_btnPDF .gs_ico{background-position:0 -253px;}.gs_btnS .gs_ico{background-position:-138px -276px;}.gs_btnUNS .gs_ico{background-position:0 -299px;}.gs_btnMORR .gs_ico{background-position:-23px -299px;}.gs_btnTW .gs_ico{background-position:-46px -299px;}.gs_btnIN .gs_ico{background-position:-69px -299px;}.gs_btnFB .gs_ico{background-position:-92px -299px;}.gs_btnET .gs_ico{background-position:-115px -299px;}.gs_btnARC .gs_ico{background-position:-138px -299px;}.gs_btnOL .gs_ico{background-position:0px -322px;}.gs_btnFA .gs_ico{background-position:-23px -322px;}.gs_btnFAD .gs_ico{background-position:-46px -322px;}.gs_btnHP .gs_ico{background-position:-69px -322px;}.gs_btnPLM .gs_ico{background-position:-92px -322px;}.gs_btnPRM .gs_ico{background-position:-115px -322px;}.gs_btnRN .gs_ico{background-position:-138px -322px;}.gs_btnVF .gs_ico{background-position:0px -345px;}.gs_btnVP .gs_ico{background-position:-23px -345px;}.gs_btnSRT .gs_ico{background-position:-46px -345px;}#gs_md_s.gs_hdr_drs{transition:opacity .15s,visibility 0s .15s;}#gs_md_s.gs_hdr_drs.gs_vis{transition:opacity .15s,visibility 0s;}.gs_el_tc #gs_md_s.gs_hdr_drs{transition:opacity .218s,visibility 0s .218s;}.gs_el_tc #gs_md_s.gs_hdr_drs.gs_vis{transition:opacity .218s,visibility 0s;}#gs_hdr_drw{position:fixed;top:0;left:0;height:100%;z-index:1200;visibility:hidden;overflow:auto;width:228px;background-color:#fff;box-shadow:2px 2px 4px rgba(0,0,0,.15);outline:none;transform:translate(-100%,0);transition:transform .15s ease-in-out,visibility 0s .15s;}#gs_hdr_drw.gs_vis{visibility:visible;transform:translate(0,0);transition:transform .15s ease-in-out,visibility 0s;}.gs_el_tc #gs_hdr_drw{transition:transform .3s cubic-bezier(.4,0,.6,1),visibility 0s .3s;}.gs_el_tc #gs_hdr_drw.gs_vis{transition:transform .225s cubic-bezier(0,0,.2,1),visibility 0s;}#gs_top #gs_hdr_drw.gs_abt,#gs_top #gs_md_s.gs_abt{transition:none;}#gs_hdr_drw_in{position:relative;box-sizing:border-box;min-height:100%;padding:0 0 8px 0;}.gs_el_ta #gs_hdr_drw_in,.gs_el_ph #gs_hdr_drw_in{padding:0 0 65px 0;}#gs_hdr_drw_top{position:relative;height:63px;border-bottom:1px solid #e5e5e5;margin-bottom:8px;}.gs_el_ta #gs_hdr_drw_top,.gs_el_ph #gs_hdr_drw_top{height:57px;}#gs_hdr_drw_mnu,#gs_hdr_drw_lgo{position:absolute;top:0;height:100%;}#gs_hdr_drw_mnu{left:0;width:55px;}#gs_hdr_drw_lgo{left:56px;}.gs_hdr_drw_sec:before{display:block;content:" ";height:0;border-bottom:1px solid #e5e5e5;margin:8px 0;}.gs_hdr_drw_sec:first-child:before{display:none;}#gs_hdr_drw_bot{display:none;}.gs_el_ta #gs_hdr_drw_bot,.gs_el_ph #gs_hdr_drw_bot{display:block;position:absolute;left:0;bottom:0;width:100%;height:65px;}#gs_hdr_drw_bot .gs_md_li:before{opacity:0;}#gs_hdr_drw_bot .gs_hdr_pp{display:block;position:absolute;bottom:14px;left:15px;pointer-events:none;}#gs_hdr_drw_bot .gs_lbl{display:block;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}#gs_hdr{position:relative;height:63px;background-color:#f5f5f5;border-bottom:1px solid #e5e5e5;display:flex;}.gs_el_ta #gs_hdr,.gs_el_ph #gs_hdr{height:57px;}#gs_hdr_mnu,#gs_hdr_bck,#gs_hdr_lgo,#gs_hdr_lgt,#gs_hdr_md,#gs_hdr_sre,#gs_hdr_act{display:inline-block;vertical-align:top;position:relative;height:100%;flex:0 0 auto;}#gs_hdr_md{flex:1 1 auto;}#gs_hdr .gs_hdr_mbo,#gs_hdr .gs_hdr_mbo,.gs_el_ta #gs_hdr .gs_hdr_dso,.gs_el_ph #gs_hdr .gs_hdr_dso{display:none;}.gs_el_ta #gs_hdr .gs_hdr_mbo,.gs_el_ph #gs_hdr .gs_hdr_mbo{display:inline-block;}#gs_hdr_mnu,#gs_hdr_bck,#gs_hdr_sre{width:55px;margin-right:1px;}#gs_hdr_lgo,#gs_hdr_drw_lgo{width:149px;background:no-repeat url(\'/intl/en/scholar/images/1x/scholar_logo_24dp.png\') 0% 50%;background-size:149px;}@media(-webkit-min-device-pixel-ratio:1.5),(min-resolution:144dpi){#gs_hdr_lgo,#gs_hdr_drw_lgo{background-image:url(\'/intl/en/scholar/images/2x/scholar_logo_24dp.png\');}}#gs_hdr_lgo{margin-right:31px;}.gs_el_ph #gs_hdr_lgo{margin-right:0;}#gs_hdr_lgt{min-width:164px;margin-right:16px;}#gs_hdr_md{margin-right:16px;min-width:1px;}#gs_hdr_lgt,#gs_hdr_md h1{padding:19px 0 0 0;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;font-size:20px;line-height:25px;font-weight:normal;color:#666;max-width:100%;text-align:left;}.gs_el_ta #gs_hdr_md h1,.gs_el_ph #gs_hdr_md h1{padding:16px 0 0 0;}#gs_hdr_srch{padding:14px 0 0 0;max-width:600px;}.gs_el_ta #gs_hdr_srch,.gs_el_ph #gs_hdr_srch{padding:10px 0 0 0;max-width:none;}#gs_hdr_frm{position:relative;padding-right:39px;}#gs_hdr_tsi{height:38px;border-radius:2px 0 0 2px;}#gs_hdr_tsi::-ms-clear{display:none;}#gs_hdr_tsc{display:none;position:absolute;top:3px;right:41px;width:21px;height:21px;padding:6px 10px 7px 10px;}.gs_in_acw[dir="rtl"]~#gs_hdr_tsc{right:auto;left:1px;}#gs_hdr_tsb{position:absolute;top:0;right:0;width:40px;height:38px;border-radius:0 2px 2px 0;}#gs_hdr_frm_ac{top:37px;right:40px;}.gs_el_ph #gs_hdr_frm_ac{right:0;}.gs_el_ph .gs_hdr_ifc #gs_hdr_mnu,.gs_el_ph .gs_hdr_ifc #gs_hdr_bck,.gs_hdr_src #gs_hdr_srch,.gs_hdr_src #gs_hdr_lgt,.gs_hdr_srx #gs_hdr_sre,.gs_hdr_srx #gs_hdr_md h1,.gs_hdr_srx #gs_hdr_md h1.gs_hdr_mbo,.gs_hdr_srx #gs_hdr_md h1.gs_hdr_dso,.gs_el_ta .gs_hdr_srx #gs_hdr_lgo,.gs_el_ph .gs_hdr_srx #gs_hdr_lgo,.gs_el_ph .gs_hdr_srx #gs_hdr_mnu,.gs_el_ph .gs_hdr_srx #gs_hdr_bck{display:none;}.gs_el_ph .gs_hdr_ifc #gs_hdr_md,.gs_el_ph .gs_hdr_srx #gs_hdr_md{margin-left:16px;}.gs_el_tc .gs_hdr_tsc #gs_hdr_tsi[dir="ltr"]{padding-right:41px;}.gs_el_tc .gs_hdr_tsc #gs_hdr_tsi[dir="rtl"]{padding-left:41px;}.gs_el_tc .gs_hdr_tsc .gs_in_acw~#gs_hdr_tsc{display:block;}#gs_hdr_act{min-width:64px;max-width:200px;text-align:right;float:right;}.gs_el_ta #gs_hdr_act,.gs_el_ph #gs_hdr_act{display:none;}#gs_hdr_act_i,#gs_hdr_act_s{display:inline-block;padding:23px 24px 23px 16px;max-width:100%;box-sizing:border-box;font-size:13px;line-height:17px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;color:#444;}#gs_hdr_act_s{text-transform:uppercase;}.gs_el_sm #gs_hdr_act_i,.gs_el_sm #gs_hdr_act_s{padding:23px 16px;}.gs_el_ta #gs_hdr_act_i,.gs_el_ta #gs_hdr_act_s,.gs_el_ph #gs_hdr_act_i,.gs_el_ph #gs_hdr_act_s{padding:20px 16px;}#gs_hdr_act_i:active,#gs_hdr_act_s:active{color:#d14836;}#gs_hdr_act_i,.gs_el_sm #gs_hdr_act_i{padding-top:15px;padding-bottom:16px;}.gs_el_ta #gs_hdr_act_i,.gs_el_ph #gs_hdr_act_i{padding-top:12px;padding-bottom:13px;}#gs_hdr_act_i .gs_hdr_pp{vertical-align:top;}#gs_hdr_act_d{top:63px;left:auto;right:24px;min-width:288px;max-width:400px;}.gs_el_sm #gs_hdr_act_d{right:16px;}.gs_el_ta #gs_hdr_act_d{top:57px;}.gs_el_ph #gs_hdr_act_d{top:57px;min-width:280px;max-width:280px;max-width:90vw;}/* Account dialog body. */#gs_hdr_act_aw,#gs_hdr_act_ap,.gs_hdr_act_am,#gs_hdr_act_ab{display:block;padding:10px 20px;word-wrap:break-word;white-space:normal;}#gs_hdr_act_aw{background-color:#fef9db;font-size:11px;}#gs_hdr_act_ap,.gs_hdr_act_am{border-bottom:1px solid #ccc;}#gs_hdr_act_ap{padding:20px;}.gs_el_ph #gs_hdr_act_ap{padding:10px;}#gs_hdr_act_apb{margin-top:12px;}#gs_hdr_act_aa:link,#gs_hdr_act_aa:visited{float:right;margin-left:8px;color:#1a0dab;}#gs_hdr_act_aa:active{color:#d14836}.gs_hdr_act_am:link,.gs_hdr_act_am:visited{color:#222;text-decoration:none;background:#fbfbfb;}.gs_hdr_act_am:hover,.gs_hdr_act_am:focus{background:#f1f1f1;}.gs_hdr_act_am:active{background:#eee;}#gs_hdr_act_ab{background:#fbfbfb;padding:10px 0;display:table;width:100%;white-space:nowrap;}#gs_hdr_act_aba,#gs_hdr_act_abs{display:table-cell;padding:0 20px;}#gs_hdr_act_abs{text-align:right;}.gs_el_ph #gs_hdr_act_aba,.gs_el_ph #gs_hdr_act_abs{display:block;padding:10px;text-align:center;}.gs_el_ph #gs_hdr_act_aba button,.gs_el_ph #gs_hdr_act_abs button{width:100%;}#gs_hdr_act_a1,#gs_hdr_act_a2{position:absolute;top:-9px;right:7.5px;width:0;height:0;z-index:1;border:8.5px solid transparent;border-top:none;border-bottom-color:#333;border-bottom-color:rgba(0,0,0,.2);}#gs_hdr_act_a2{top:-8px;border-bottom-color:#fff;}.gs_hdr_act_mw #gs_hdr_act_a2{border-bottom-color:#fef9db;}.gs_hdr_pp{border-radius:50%;overflow:hidden;}#gs_hdr_act_ap .gs_hdr_pp,.gs_hdr_act_am .gs_hdr_pp{float:left;}#gs_hdr_act_ap .gs_hdr_pm{margin-left:116px;}.gs_hdr_act_am .gs_hdr_pm{margin:6px 0 0 58px;}#gs_ab{position:relative;height:41px;border-bottom:1px solid #e5e5e5;display:flex;white-space:nowrap;background-color:#fff;z-index:1000;}.gs_el_ta #gs_ab.gs_nta,.gs_el_ph #gs_ab.gs_nph{display:none;}.gs_sth_vis #gs_ab{position:fixed;}#gs_ab_ico,#gs_ab_ttl,#gs_ab_md,#gs_ab_btns{display:inline-block;vertical-align:top;position:relative;height:100%;flex:0 0 auto;}.gs_el_ph #gs_ab_md{display:block;}#gs_ab_ico{width:55px;margin-right:1px;}#gs_ab_ico .gs_ico{position:absolute;top:50%;left:50%;margin:-10.5px 0 0 -10.5px;}#gs_ab_ttl{min-width:172px;padding-right:8px;}.gs_el_sm #gs_ab_ttl{min-width:68px;}.gs_el_ta #gs_ab_ttl,.gs_el_ph #gs_ab_ttl{min-width:0;}#gs_ab_ttl,#gs_ab_ttll{font-size:18px;color:#666;text-transform:none;}.gs_el_sm #gs_ab_ttl,.gs_el_sm #gs_ab_ttll{font-size:16px;}#gs_ab_ttll{overflow:hidden;text-overflow:ellipsis;max-width:200px;}#gs_ab_md{flex:1 0 auto;}.gs_ab_st #gs_ab_md{flex:1 1 auto;font-size:13px;line-height:17px;padding:0 8px;color:#999;overflow:hidden;text-overflow:ellipsis;}.gs_el_ph .gs_ab_st #gs_ab_md{visibility:hidden;padding:0;}#gs_ab_btns{margin-right:8px;}.gs_el_sm #gs_ab_btns{margin-right:0;}.gs_el_ta #gs_ab_btns,.gs_el_ph #gs_ab_btns{margin-right:4px;}#gs_ab_ttl:before,#gs_ab_md:before,#gs_ab_btns:before{content:"";display:inline-block;width:0;height:100%;vertical-align:middle;}#gs_ab_md>button,#gs_ab_btns>button,#gs_ab_md>.gs_in_ib,#gs_ab_btns>.gs_in_ib,#gs_ab_md>.gs_md_r,#gs_ab_btns>.gs_md_r,#gs_ab .gs_ab_mdw,#gs_ab .gs_ab_btw{margin:0 8px;vertical-align:middle;}#gs_ab .gs_ab_mdw,.gs_ab_btw{display:inline-block;margin:0;}#gs_ab_btns>.gs_in_ib{margin:0 16px 0 8px;}#gs_ab .gs_ab_btw{margin:0 12px 0 16px;}.gs_el_ta .gs_ab_sel #gs_ab_ico,.gs_el_ph .gs_ab_sel #gs_ab_ico,.gs_el_ta .gs_ab_sel #gs_ab_ttl,.gs_el_ph .gs_ab_sel #gs_ab_ttl,.gs_el_ta .gs_ab_sel #gs_ab_btns,.gs_el_ph .gs_ab_sel #gs_ab_btns{display:none;}#gs_bdy{display:table;table-layout:fixed;width:100%;}#gs_bdy_sb{vertical-align:top;width:228px;word-wrap:break-word;display:table-cell;}.gs_el_sm #gs_bdy_sb{}.gs_el_ta #gs_bdy_sb,.gs_el_ph #gs_bdy_sb{display:none;}.gs_bdy_sb_sec{margin:0 40px 0 56px;}.gs_bdy_sb_sec:before{display:block;content:" ";height:0;margin:13px 0;border-top:1px solid #eee;}.gs_bdy_sb_sec:first-child:before{margin:21px 0 0 0;border:none;}#gs_bdy_sb ul{list-style-type:none;}.gs_bdy_sb_sec a:link,.gs_bdy_sb_sec a:visited{color:#222;}.gs_bdy_sb_sec a:active{color:#d14836;}.gs_bdy_sb_sel a:link,.gs_bdy_sb_sel a:visited{color:#d14836;text-decoration:none;}.gs_el_tc .gs_bdy_sb_sec li.gs_ind,.gs_el_tc .gs_bdy_sb_sec li.gs_ind a{padding-top:8px;padding-bottom:5px;}.gs_el_tc .gs_bdy_sb_sec:first-child li.gs_ind:first-child{margin-top:-8px;}#gs_bdy_sb .gs_ind,#gs_bdy_sb .gs_inw{margin-bottom:6px;}.gs_el_tc #gs_bdy_sb .gs_ind,.gs_el_tc #gs_bdy_sb .gs_inw{margin-bottom:0;}#gs_bdy_ccl{display:table-cell;vertical-align:top;padding:0 24px 0 16px;}.gs_el_sm #gs_bdy_ccl{padding:0 16px;}.gs_el_ta #gs_bdy_ccl,.gs_el_ph #gs_bdy_ccl{padding:0 16px 0 56px;}.gs_el_ph #gs_bdy_ccl{padding:0 16px;padding:0;}#gs_ftr_sp{height:62px;}.gs_el_sm #gs_ftr_sp{height:57px;}#gs_ftr{position:absolute;bottom:0;left:0;width:100%;white-space:nowrap;border-top:1px solid #e4e4e4;background-color:#f2f2f2;display:flex;}#gs_ftr.gs_pfix{position:fixed;}#gs_ftr_rt{box-sizing:border-box;max-width:100%;overflow-x:auto;margin-left:auto;padding:0 12px;}.gs_el_sm #gs_ftr_rt{padding:0 8px;}.gs_el_ph #gs_ftr_rt:after{content:" ";position:absolute;top:0;right:0;width:16px;height:100%;background-image:linear-gradient(to right,rgba(242,242,242,0),rgba(242,242,242,1) 80%);}#gs_ftr_rt>a{display:inline-block;line-height:16px;padding:12px;white-space:nowrap;}.gs_el_sm #gs_ftr_rt>a{padding:12px 8px;}#gs_ftr_rt>a:link,#gs_ftr_rt>a:visited{color:#666}#gs_ftr_rt>a:active{color:#d14836}#gs_ftr_mnu{top:auto;bottom:48px;left:auto;right:24px;padding:8px 0;}.gs_el_sm #gs_ftr_mnu{right:16px;}#gsc_sb_ui{text-align:center;margin-bottom:16px;}#gsc_sb_ui img{max-width:120px;height:auto;}.gs_el_sm #gsc_sb_ui img{max-width:100px;}.gsc_sb_addl{text-align:right;padding:0 8px;color:#777777;min-width:60px;}#gsc_ccl{max-width:862px;margin:21px 0 0 0;}.gs_el_sm #gsc_ccl{margin:16px 0 0 0;}.gsc_art_mm{font-size:24px;line-height:16px;display:inline-block;margin:-10px 0 0 4px;position:relative;top:8px;}.gs_pp_tn,.gs_el_ta .gs_pp_mo_tn,.gs_el_ph .gs_pp_mo_tn{width:32px;height:32px;}.gs_pp_sm,.gs_el_ta .gs_pp_mo_sm,.gs_el_ph .gs_pp_mo_sm{width:56px;height:56px;}.gs_pp_nm,.gs_el_ta .gs_pp_mo_nm,.gs_el_ph .gs_pp_mo_nm{width:128px;height:128px;}#gsc_vcpb{max-width:870px;padding-top:21px;}.gs_el_ph #gsc_vcpb{padding:16px 8px;}#gsc_vcpb_btns{padding-bottom:16px;}#gsc_vcpb_btns:empty{display:none;}#gsc_vcpb_btns>button{margin-right:16px;}.gs_el_ph #gsc_vcpb_btns>button{margin-right:8px;}#gsc_oci_title_wrapper{font-size:16px;margin:0 0 16px 0;}#gsc_oci_title{font-size:20px;}.gs_el_sm #gsc_oci_title{font-size:18px;}#gsc_oci_title_gg{float:right;padding:0 0 8px 16px;}.gs_el_ph #gsc_oci_title_gg{float:none;text-align:right;padding:0;margin:-4px 0 8px 0;}.gsc_oci_title_ggt{font-size:13px;font-weight:bold;}.gsc_oci_title_ggut{font-size:13px;color:#777;padding-bottom:8px;}.gsc_oci_field{float:left;width:100px;text-align:right;color:#777;}.gs_el_ph .gsc_oci_field{float:none;width:auto;text-align:left;margin-bottom:4px;font-size:16px;color:black;}.gsc_oci_value{margin-left:116px;max-width:512px;margin-bottom:16px;}.gs_el_ph .gsc_oci_value{margin-left:0;}.gsc_oci_merged_snippet{margin-bottom:1em;}#gsc_oci_graph_wrapper{height:100px;overflow-x:auto;overflow-y:hidden;direction:rtl;}#gsc_oci_graph{position:relative;min-width:100%;}#gsc_oci_graph_x{position:absolute;top:57px;left:0;width:100%;height:13px;border-top:1px solid #777;}.gsc_oci_g_t{position:absolute;top:60px;color:#777;font-size:11px;}#gsc_oci_graph_bars{position:absolute;top:0;right:0;width:100%;height:100px;}.gsc_oci_g_a{position:absolute;bottom:13px;width:15px;background:#777;}.gsc_oci_g_a:hover{background:#1a0dab;text-decoration:none;}.gsc_oci_g_a:active{background:#d14836;}.gsc_oci_g_al{position:absolute;bottom:15px;left:7px;color:#222;background:white;text-align:center;font-size:11px;min-width:11px;padding:1px;border:1px solid #777;border-radius:1px;visibility:hidden;opacity:0;}.gsc_oci_g_a:hover .gsc_oci_g_al{visibility:visible;opacity:1;}.gsc_oci_g_a{transition:all .218s;}.gsc_oci_g_al{transition:opacity .218s,visibility 0s .218s;}.gsc_oci_g_a:hover,.gsc_oci_g_a:hover .gsc_oci_g_al{transition:all 0s;}a.gsc_oci_lbx:link,a.gsc_oci_lbx:visited{white-space:nowrap;display:inline-block;vertical-align:middle;font-size:11px;background-color:#e5e5e5;color:#777;padding:2px 6px;text-decoration:none;}a.gsc_oci_lbx:hover{color:#e5e5e5;background-color:#777;}a.gsc_oci_lbx:active{color:#d14836;}.gsc_oms_mm{font-size:24px;line-height:16px;display:inline-block;margin:-10px 0 0 4px;position:relative;top:8px;}.gsc_oms_link{white-space:nowrap;margin-right:12px;}.gsc_oms_link:last-child{margin-right:0;}.gs_fsvg line{stroke:#222222}a:link .gs_fsvg{fill:#1a0dab;}a:link .gs_fsvg line{stroke:#1a0dab;}a:visited .gs_fsvg{fill:#660099;}a:visited .gs_fsvg line{stroke:#660099;}a:active .gs_fsvg{fill:#d14836;}a:active .gs_fsvg line{stroke:#d14836;}a .gs_fsvg{border-bottom:1px solid transparent;}a:hover .gs_fsvg,a:focus .gs_fsvg{border-bottom-color:inherit;}.gs_fsml{font-size:13px}.gs_fscp{font-variant:small-caps}.gsh_clim{display:table-row}.gsh_clil,.gsh_clic{display:table-cell;padding-bottom:8px}.gsh_clil{padding-right:8px;}.gsh_lla{list-style-type:lower-alpha}.gsh_lua{list-style-type:upper-alpha}.gsh_llr{list-style-type:lower-roman}.gsh_lur{list-style-type:upper-roman}.gsh_l>li{margin-left:32px;}.gs_fma .gsh_l>li{margin-left:16px;}.gsh_h3{font-size:inherit;font-weight:normal}.gsh_h3,.gsh_csp{margin:16px 0}.gsh_h3+.gsh_csp{margin-top:-8px}.gs_fma .gsh_h3{margin:12px 0 0 0;font-size:15px;font-weight:bold;}.gs_fma_abs .gsh_csp{margin:0 0 12px 0;}.gs_fma b,.gs_fma .gsh_h3{color:#444;}.gs_fma .gsh_h3+.gsh_csp{margin:4px 0 0 0;}.gs_fma .gsh_csp:last-child,.gs_fma .gsh_h3.gsh_flh{margin:0;}.gs_fma ul .gsh_clim:last-child .gsh_clic{padding-bottom:0;}.gs_fma ul,.gs_fma ol{margin:12px 0;}.gsh_ovln{text-decoration:overline}.gsh_small .gsh_l .gsh_csp{margin:8px 0}.gsh_small .gsh_csp:first-child,.gsh_small .gsh_h3.gsh_flh{margin-top:0}.gsh_small .gsh_csp:last-child{margin-bottom:0}.gsh_dspfr{text-align:center}.gsh_dspfr svg{margin:8px 0}</style><script>!function(GSP){var aa=function(a){var b=0;return function(){return b<a.length?{done:!1,value:a[b++]}:{done:!0}}},ba=typeof Object.defineProperties=="function"?Object.defineProperty:function(a,b,c){if(a==Array.prototype||a==Object.prototype)return a;a[b]=c.value;return a},ca=function(a){a=["object"==typeof globalThis&&globalThis,a,"object"==typeof window&&window,"object"==typeof self&&self,"object"==typeof global&&global];for(var b=0;b<a.length;++b){var c=a[b];if(c&&c.Math==Math)return c}throw Error("Cannot find global object");\n},da=ca(this),h=function(a,b){if(b)a:{var c=da;a=a.split(".");for(var d=0;d<a.length-1;d++){var e=a[d];if(!(e in c))break a;c=c[e]}a=a[a.length-1];d=c[a];b=b(d);b!=d&&b!=null&&ba(c,a,{configurable:!0,writable:!0,value:b})}};\nh("Symbol",function(a){if(a)return a;var b=function(f,g){this.ba=f;ba(this,"description",{configurable:!0,writable:!0,value:g})};b.prototype.toString=function(){return this.ba};var c="jscomp_symbol_"+(Math.random()*1E9>>>0)+"_",d=0,e=function(f){if(this instanceof e)throw new TypeError("Symbol is not a constructor");return new b(c+(f||"")+"_"+d++,f)};return e});var ea=typeof Object.create=="function"?Object.create:function(a){var b=function(){};b.prototype=a;return new b},fa;\nif(typeof Object.setPrototypeOf=="function")fa=Object.setPrototypeOf;else{var ha;a:{var ia={a:!0},ka={};try{ka.__proto__=ia;ha=ka.a;break a}catch(a){}ha=!1}fa=ha?function(a,b){a.__proto__=b;if(a.__proto__!==b)throw new TypeError(a+" is not extensible");return a}:null}\nvar la=fa,ma=function(a,b){a.prototype=ea(b.prototype);a.prototype.constructor=a;if(la)la(a,b);else for(var c in b)if(c!="prototype")if(Object.defineProperties){var d=Object.getOwnPropertyDescriptor(b,c);d&&Object.defineProperty(a,c,d)}else a[c]=b[c];a.qa=b.prototype};h("Symbol.dispose",function(a){return a?a:Symbol("Symbol.dispose")});\nh("Math.trunc",function(a){return a?a:function(b){b=Number(b);if(isNaN(b)||b===Infinity||b===-Infinity||b===0)return b;var c=Math.floor(Math.abs(b));return b<0?-c:c}});var na=function(a){a=Math.trunc(a)||0;a<0&&(a+=this.length);if(!(a<0||a>=this.length))return this[a]};h("Array.prototype.at",function(a){return a?a:na});var n=function(a){return a?a:na};h("Int8Array.prototype.at",n);h("Uint8Array.prototype.at",n);h("Uint8ClampedArray.prototype.at",n);h("Int16Array.prototype.at",n);\nh("Uint16Array.prototype.at",n);h("Int32Array.prototype.at",n);h("Uint32Array.prototype.at",n);h("Float32Array.prototype.at",n);h("Float64Array.prototype.at",n);h("String.prototype.at",function(a){return a?a:na});/*\n\n Copyright The Closure Library Authors.\n SPDX-License-Identifier: Apache-2.0\n*/\nvar oa=function(a,b){var c=Array.prototype.slice.call(arguments,1);return function(){var d=c.slice();d.push.apply(d,arguments);return a.apply(this,d)}};var t=function(){this.C=this.C;this.H=this.H};t.prototype.C=!1;t.prototype.isDisposed=function(){return this.C};t.prototype.dispose=function(){this.C||(this.C=!0,this.K())};t.prototype[Symbol.dispose]=function(){this.dispose()};t.prototype.K=function(){if(this.H)for(;this.H.length;)this.H.shift()()};var pa=function(){};function u(a,b){a.classList.add(b)}function v(a,b){a.classList.remove(b)}function w(a,b){return a.classList?a.classList.contains(b):!1}function x(a,b,c){c=c!==void 0?c:!w(a,b);(c?u:v)(a,b)};function z(a){return(navigator.userAgent||"").indexOf(a)>=0}var qa=z("iPhone")||z("iPad")||z("iPod"),ra=z("iPhone")||z("Android")&&z("Mobile");function sa(){if(b===void 0){var a=window.screen;a={width:window.innerWidth,height:window.innerHeight,pa:a.width,oa:a.height}}else a=b;var b=a;a=b.width;var c=b.height,d=b.pa;b=b.oa;var e=4;if(a<600||d*b<48E4||ra)e=1;else if(a<982)e=2;else if(a<1136||c<590)e=3;return e}var ta,ua=/[?&]tc=([01])/.exec(location.search||"");\nta=ua?+ua[1]>0:z("Android")?!0:window.matchMedia&&window.matchMedia("(pointer)").matches?window.matchMedia("(pointer:coarse)").matches:!z("Firefox")||z("Mobile")||z("Tablet")?qa||"ontouchstart"in window||(navigator.msMaxTouchPoints||0)>0:!1;function va(){if(wa==void 0){wa=!1;try{var a=Object.defineProperty({},"passive",{get:function(){wa=!0}});window.addEventListener("testPassive",pa,a);window.removeEventListener("testPassive",pa,a)}catch(b){}}return wa}var wa;var xa=new function(){this.aa="INPUT"};function D(a){return document.getElementById(a)}function E(a){return a.id||(a.id="gs_id"+ya++)}function za(a){a=(a===void 0?null:a)||document.body;return(a?window.getComputedStyle(a,null):null).direction=="rtl"}function Aa(a){var b=[];a=a.elements;for(var c=a.length,d=0;d<c;d++){var e=a[d],f=encodeURIComponent(e.name||""),g=e.type;!f||e.disabled||!(g!="checkbox"&&g!="radio"||e.checked)||b.push(f+"="+encodeURIComponent(e.value||""))}return b.join("&")}\nfunction Ba(a,b){var c=a.elements[b];c||(c=document.createElement(xa.aa),c.type="hidden",c.name=b,a.appendChild(c));return c}var ya=100,Ca=/\\S+/g,Da=/^(?:https?:|[^:/?#]*(?:[/?#]|$))/i,Ea=/^(?:#|\\/[a-z0-9_-]*(?:[?].*)?$)/i;function F(a){return a.hasOwnProperty("gs_uid")?a.gs_uid:a.gs_uid=++Ga}var Ga=0;var G=function(){this.o=[];this.F={};this.S=this.I=0};G.prototype.add=function(a){var b=F(a);this.F[b]||(this.o.push(a),this.F[b]=this.o.length,++this.I)};G.prototype.remove=function(a){a=F(a);var b=this.F[a];b&&(this.o[b-1]=null,delete this.F[a],--this.I*2<this.o.length&&!this.S&&Ha(this))};G.prototype.notify=function(a){var b=this.o;try{++this.S;for(var c=0;c<b.length;c++){var d=b[c];d&&d.apply(null,arguments)}}finally{!--this.S&&this.I*2<b.length&&Ha(this)}};G.prototype.getSize=function(){return this.I};\nvar Ha=function(a){var b=a.o,c=b.length;a=a.F;for(var d=0,e=0;e<c;e++){var f=b[e];f&&(b[d]=f,a[F(f)]=++d)}b.length=d};function H(a,b,c,d,e){Ia(a,b,c,d===void 0?!1:d,e===void 0?!1:e,Ja)}function I(a,b,c,d){Ia(a,b,c,d===void 0?!1:d,!1,Ka)}function La(a,b,c,d){function e(g){I(f,a,e,c);b(g)}var f=document;c=c===void 0?!1:c;H(f,a,e,c,d===void 0?!1:d)}function Ma(a){Na?Na.add(a):a()}var Oa=window.requestAnimationFrame?function(a){window.requestAnimationFrame(a)}:function(a){setTimeout(function(){return a(window.performance&&performance.now?performance.now():Date.now())},33)};\nfunction Pa(a){a.stopPropagation();a.preventDefault()}function Qa(a){return(a.ctrlKey?1:0)|(a.altKey?2:0)|(a.metaKey?4:0)|(a.shiftKey?8:0)}function Ja(a,b,c,d,e){var f=a.addEventListener;e=e&&va();f.call(a,b,c,e?{passive:e,capture:d}:d)}function Ka(a,b,c,d){a.removeEventListener(b,c,d)}function Ia(a,b,c,d,e,f){if(typeof b==="string")f(a,b,c,d,e);else for(var g=b.length,m=0;m<g;m++)f(a,b[m],c,d,e)}function Ra(){Na.notify();Na=null}\nfunction Sa(){document.readyState=="complete"&&(I(document,"readystatechange",Sa),Ra())}var Na,Ta=!!document.attachEvent,Ua=document.readyState;if(Ta?Ua!="complete":Ua=="loading")Na=new G,Ta?H(document,"readystatechange",Sa):La("DOMContentLoaded",Ra);function Va(){La(["mousedown","touchstart"],function(){x(document.documentElement,"gs_pfcs",!0);H(document,"keydown",Wa,!0)},!0,!0)}function Wa(a){a.keyCode==9&&(x(document.documentElement,"gs_pfcs",!1),I(document,"keydown",Wa,!0),Va())}Va();function Xa(a,b,c,d,e){var f=D(a);Ya(f,function(){u(f,"gs_vis");b&&b()},function(){v(f,"gs_vis");c&&c()},d,e)}function Za(a){a=J[a]||[0];return a[a.length-1]}\nfunction Ya(a,b,c,d,e,f){f=f===void 0?"":f;var g=E(a),m=Za(g);if(!m||m<Za(f)){var k=document.activeElement;f=D(f);$a(ab(f||a),!0);b&&b();K.push(function(l){J[g].pop();J[g].length||delete J[g];if(!l){(l=e)||k==document.body||(l=k);var p=document.activeElement;if(l)try{l.focus()}catch(A){}else p&&a.contains(p)&&p.blur()}c&&c()});J[g]||(J[g]=[]);J[g].push(K.length);k&&a.contains(k)||setTimeout(function(){var l=d,p=l&&l.type=="text";if(!l||p&&ta)l=a;try{l.focus(),p&&(l.value=l.value)}catch(A){}},0)}}\nfunction L(a){$a((Za(a)||1E6)-1,!1)}function bb(a){a=a===void 0?!1:a;K.pop()(a)}function $a(a,b){for(b=b===void 0?!1:b;K.length>a;)bb(b||K.length>a+1)}function ab(a){for(var b=0;a&&!(b=Za(a.id));)a=a.parentNode;return b}var K=[],J={};H(document,"click",function(a){var b=K.length;b&&!Qa(a)&&b>ab(a.target)&&bb(!0)});H(document,"keydown",function(a){a.keyCode==27&&!Qa(a)&&K.length&&bb()});\nH(document,"focus",function(a){var b=K.length;if(b)for(var c=ab(a.target);c<b;){var d="",e;for(e in J)if(Za(e)==b){d=e;break}a:{d=(D(d).getAttribute("data-wfc")||"").match(Ca)||[];for(var f=0;f<d.length;f++){var g=D(d[f]);if(g&&g.offsetWidth){d=g;break a}}d=void 0}if(d){Pa(a);d.focus();break}else bb(!0),--b}},!0);var cb={},db={},eb;try{eb=window.sessionStorage}catch(a){};function M(a){return typeof a=="object"?a:null}function fb(){var a=gb(),b=hb();b=ib(b);a=jb(a);a=kb(a)||"#";N=M(b);lb?window.history.replaceState(b,"",a):window.location.replace(a)}function kb(a){var b=[],c;for(c in a)b.push(encodeURIComponent(c)+"="+encodeURIComponent(a[c]));return(a=b.sort().join("&"))?"#"+a:""}\nfunction mb(a){var b={};a=a.split("&");for(var c=0;c<a.length;c++){var d=a[c],e=d.indexOf("=");if(e+1){var f=d.substr(0,e);d=d.substr(e+1)}else f=d,d="";f&&(b[decodeURIComponent(f)]=decodeURIComponent(d))}return b}function nb(){var a=window.location.hash,b=a.indexOf("#")+1;return mb(b?a.substr(b):"")}function ob(a,b){for(var c in b){var d=b[c];d!==void 0?a[c]=d:delete a[c]}}function jb(a){var b=nb();ob(b,a);return b}\nfunction ib(a){var b=N||M(window.history.state),c={},d;for(d in b)c[d]=b[d];ob(c,a);return c}function pb(){setTimeout(function(){if(!qb){var a=window.history.state;qb=!0;N=M(a);rb.notify()}sb=!1},0)}var rb=new G,N,qb=!1,sb=!0,lb="pushState"in window.history,tb;\nif(typeof GSP=="undefined")tb=!1;else{var ub=.001*Date.now(),vb=GSP.eventId,wb=!1,O,xb=eb;if(!("nh"in cb)){var yb=xb&&xb.getItem("nh"),zb;if(yb)try{zb=JSON.parse(yb)}catch(a){}db.nh=zb}O=db.nh;O instanceof Array||(O=[]);for(var Ab=O.length,Bb=0,Cb=0;Cb<Ab;Cb++){var Db=O[Cb];if(Db instanceof Array&&Db.length==2){var Eb=Db[1]==vb;wb=wb||Eb;Ab-Cb<=10&&+Db[0]>ub-86400&&!Eb&&(O[Bb++]=Db)}}O.length=Bb;O.push([ub,vb]);var Fb=O,Gb=eb;db.nh=Fb;try{Gb&&Gb.setItem("nh",JSON.stringify(Fb))}catch(a){}tb=wb}\nvar Hb=tb;"onpageshow"in window?H(window,"pageshow",pb):Ma(pb);H(window,lb?"popstate":"hashchange",function(a){document.readyState!="loading"&&(a=a.state,qb=!0,N=M(a),rb.notify())});function Ib(){Jb&&(I(D("gs_alrt_l"),"click",Jb),Jb=void 0)}function Kb(){var a=Lb();u(a,"gs_anm");u(a,"gs_vis");H(document,"click",Mb);clearTimeout(Nb);Nb=setTimeout(Mb,4E3);++Ob;setTimeout(Pb,0)}function Mb(){Ob||(I(document,"click",Mb),clearTimeout(Nb),Nb=void 0,Ib(),v(Lb(),"gs_vis"))}function Lb(){return D("gs_alrt")}function Pb(){Ob=0}var Nb,Ob=0,Jb;Ma(function(){var a=D("gs_alrt_m");a&&(a.innerHTML&&!Hb&&Kb(),H(window,"pagehide",function(){Ob=0;Mb();v(Lb(),"gs_anm")}))});function Qb(a,b,c){var d=new XMLHttpRequest;d.onreadystatechange=function(){if(d.readyState==4){var e=d.status,f=d.responseText,g=d.getResponseHeader("Content-Type"),m=d.responseURL,k=window.location,l=k.protocol;k="//"+k.host+"/";m&&m.indexOf(l+k)&&m.indexOf("https:"+k)&&(e=0,g=f="");c(e,f,g||"")}};d.open(b?"POST":"GET",a,!0);d.setRequestHeader("X-Requested-With","XHR");b&&d.setRequestHeader("Content-Type","application/x-www-form-urlencoded");b?d.send(b):d.send();return d}\nfunction Rb(a){a&&(a.onreadystatechange=function(){},a.abort())};var Sb=function(a,b,c){this.type=a;this.currentTarget=this.target=b;this.i=c===void 0?null:c;this.U=!1};Sb.prototype.stopPropagation=function(){this.i&&this.i.stopPropagation();this.U=!0};var P=function(a){a.i&&Pa(a.i);a.U=!0};var Q=function(a,b){this.V=a;this.na=b},Tb=function(a,b,c){this.V=a;this.types=b;this.listener=c};function Ub(a,b){var c=b.length;if(c){var d=F(a),e=Vb[d];if(!e){e=Vb[d]=[];d=Wb(b[0].V);for(var f in d){var g=Xb[f];g||(g=Xb[f]=Object.create(null));for(var m in d[f]){var k=g[m];k||(k=g[m]=[]);k.push(a)}}Yb(a,e,b[0],Zb);for(f=1;f<c;f++)Yb(a,e,b[f],$b)}}}function S(a,b,c){ac(new Sb(a,b,c===void 0?null:c))}\nfunction T(a,b,c){var d=bc;typeof b==="string"&&(cc[0]=b,b=cc);var e=b.length;a=Wb(a);for(var f in a)for(var g in a[f])for(var m=0;m<e;m++)d(f,g,b[m],c)}function Wb(a){typeof a==="string"&&(dc[0]=a,a=dc);for(var b=a.length,c=Object.create(null),d=0;d<b;d++){var e=a[d],f=e.charAt(0),g=e.substr(1);if(f!="#"&&f!="."||!g)throw Error("bad selector: "+e);(e=c[f])||(e=c[f]=Object.create(null));e[g]=!0}return c}\nfunction bc(a,b,c,d){var e=ec[c];e||(c!="touchstart"&&c!="mouseover"&&c!="mouseout"&&H(document,c,fc,c=="focus"||c=="blur"),e=ec[c]=Object.create(null));(c=e[a])||(c=e[a]=Object.create(null));(a=c[b])||(a=c[b]=new G);a.add(d)}function fc(a){var b=a.target;b&&b.nodeType==3&&(b=b.parentNode);ac(new Sb(a.type,b,a))}\nfunction ac(a){for(var b=a.target;b&&b!=document&&!b.disabled&&!w(b,"gs_dis");){a.currentTarget=b;var c=b.id;if(c&&!gc("#",c,a))break;c=b.classList||[];for(var d=c.length,e=0;e<d;e++)if(!gc(".",c[e],a))return;b=b.parentNode}}function gc(a,b,c){var d=ec[c.type];(b=(a=d&&d[a])&&a[b])&&b.notify(c);return!c.U}function Yb(a,b,c,d){var e=c.V;c=c.na;for(var f in c){var g=oa(d,a,c[f]);T(e,f,g);b.push(new Tb(e,f,g))}}function Zb(a,b,c){var d=c.currentTarget;a=hc(a,d)||a;a=ic(a,d);b.call(a,c)}\nfunction $b(a,b,c){a:{for(var d=c.currentTarget;d&&d!=document;){var e=hc(a,d);if(e){a=ic(e,d);break a}d=d.parentNode}a=void 0}a&&b.call(a,c)}function ic(a,b){var c=jc(b),d=kc[c];d||(d=kc[c]=[]);for(var e=d.length,f=0;f<e;f++){var g=d[f];if(g instanceof a)return g}b=new a(b);d.push(b);a=F(a);(d=lc[a])||(d=lc[a]=[]);d.push(c);return b}function hc(a,b){var c,d=b.id;d&&(c=mc(a,c,"#",d));b=b.classList||[];d=b.length;for(var e=0;e<d;e++)c=mc(a,c,".",b[e]);return c}\nfunction mc(a,b,c,d){c=(d=(c=Xb[c])&&c[d])?d.length:0;for(var e=0;e<c;e++){var f=d[e];!(f===a||f.prototype instanceof a)||b&&!(f===b||f.prototype instanceof b)||(b=f)}return b}function jc(a){var b=a.getAttribute("data-duid");b||a.setAttribute("data-duid",b=""+nc++);return b}var ec=Object.create(null),dc=[""],cc=[""],Xb=Object.create(null),Vb=Object.create(null),lc=Object.create(null),kc=Object.create(null),nc=100;window.gs_evt_dsp=fc;function oc(){var a=".gs_md_li";if(typeof a==="string"){var b=a.charAt(0),c=a.slice(1);if(b=="#")a=function(d){return d.id==c&&d.offsetWidth>0};else if(b==".")a=function(d){return w(d,c)&&d.offsetWidth>0};else throw Error("bad selector: "+a);}return a}function pc(a,b){return a&&((b===void 0?0:b)?a.lastElementChild:a.firstElementChild)}function qc(a,b){return a&&((b===void 0?0:b)?a.previousElementSibling:a.nextElementSibling)}function rc(a,b,c){c=c===void 0?!1:c;return sc(a,b,oc(),c,!1)}\nfunction sc(a,b,c,d,e){for(var f;b&&a;){if(c(b)){if(e)return b}else for(f=pc(b,d);f;f=qc(f,d))if(e=sc(f,f,c,d,!0))return e;for(e=!0;;){if(b==a)return null;f=b.parentNode;if(b=qc(b,d))break;b=f}}return null};var tc=["false","true","mixed"];var U=function(){this.D=Object.create(null)};U.prototype.clear=function(){this.D=Object.create(null)};U.prototype.has=function(a){return a in this.D};U.prototype.get=function(a){return this.D[a]};U.prototype.set=function(a,b){this.has(a);this.D[a]=b};U.prototype.delete=function(a){this.has(a)&&delete this.D[a]};var uc=function(a){var b=window,c=this;this.o=new G;this.Y=0;this.W=[b,a,function(){c.Y++||Oa(d)},!1];var d=function(){c.Y=0;c.o.notify()}};uc.prototype.addListener=function(a){this.o.getSize()||H.apply(null,this.W);this.o.add(a)};uc.prototype.removeListener=function(a){this.o.remove(a);this.o.getSize()||I.apply(null,this.W)};var vc=new uc("scroll"),wc=new uc("resize");var xc=new G;function yc(){var a=document.documentElement,b=sa();b={gs_el_ph:b==1,gs_el_ta:b==2,gs_el_sm:b!=4,gs_el_tc:ta||b==1};var c;for(c in b){var d=b[c];if(w(a,c)!=d){var e=!0;x(a,c,d)}}e&&xc.notify()}x(document.documentElement,"gs_el_ios",qa);yc();wc.addListener(yc);H(window,["pageshow","load"],yc);var zc=function(a,b,c,d,e,f){this.g=a;this.B=b;this.v=c;this.A=d;this.T=e;this.s=f;this.m=null},Ac=function(a,b){a.m=b},Bc=function(){this.l=[];this.j=-1};Bc.prototype.push=function(a){++this.j;this.j==this.l.length?this.l.push(a):(this.l[this.j]=a,this.l.splice(this.j+1,this.l.length-this.j))};Bc.prototype.pop=function(){--this.j};var Ec=function(a){for(var b=W;b.j>a;)L(b.top().g)},Fc=function(a,b){for(var c=0;c<a.l.length&&!(a.l[c].s>=b);++c);return c};Bc.prototype.top=function(){return this.at(this.j)};\nBc.prototype.at=function(a){return this.l[a]||null};function Gc(a,b){var c=a==W.j;W.j=a;b&&!N&&!M(window.history.state)&&fb();c||Hc()}function Ic(a,b){b=b===void 0?"":b;var c=c===void 0?"":c;var d=d===void 0?"":d;var e=W.top();e&&a==e.g&&b==e.B&&c==e.v||(W.push(new zc(a,b,c,d,e&&e.g==a?e.T+1:1,Date.now())),b=gb(),a=hb(),a=ib(a),b=jb(b),b=kb(b)||"#",N=M(a),lb?window.history.pushState(a,"",b):window.location.assign(b),Hc())}\nfunction Jc(a){a=Kc(D(a));return!!a&&w(a,"gs_md_wmw")&&w(document.documentElement,"gs_el_ph")}function Lc(){var a=D("gs_top"),b=document.documentElement;a=a.scrollHeight>b.clientHeight;for(var c=!1,d=0;d<=W.j&&!c;++d)c=!Jc(W.at(d).g);x(D("gs_md_s"),"gs_vis",c);c=W.j;c>=1&&(c=W.at(c-1).g,d=Jc(c),x(D(c),"gs_md_ins_vis",!d));b.style.overflowY=a&&!Jc(W.top().g)?"scroll":""}\nfunction Hc(){function a(){var y=c.clientHeight,q=+B.getAttribute("data-h");q||(g.style.maxHeight="none",q=f.offsetHeight);var r=f.querySelector(".gs_md_ftr");q=Math.max((y-q)/2,10);y=Math.max(y-48-(r?r.offsetHeight:0)-2*q,10);r=Jc(e);f.style.top=r?"auto":q+"px";g.style.maxHeight=r?"none":y+"px";Mc(g)}var b=W.top(),c=document.documentElement,d=D("gs_top"),e=b.g,f=D(e),g=D(e+"-bdy"),m=1200+W.j,k=D(f.getAttribute("data-cid")||f.id+"-bdy")||f,l=b.A,p=b.v,A=b.B,C=D("gs_md_s"),V=D(e).getAttribute("data-shd")||\n"",B=Kc(f),R=window.pageYOffset,Cc=A&&A[0]!="#"&&!l,Dc=W.j>0?W.at(W.j-1).g:"",ja=!!J[e];Cc?(ja?x(k,"gs_md_ldg",!0):Nc(f,k,\'<div class="gs_md_prg">\'+D("gs_md_ldg").innerHTML+"</div>",b),S("gs-md-ldin",k)):(l&&Nc(f,k,l,b),S("gs-md-lded",k));ja&&e==Dc||Ya(f,function(){(B||f).style.zIndex=m;Oc(V);if(!ja){B&&u(B,"gs_vis");u(f,"gs_vis");x(f,"gs_abt",sb);x(C,"gs_abt",sb);Pc(e);if(W.j==0){var y=Lc;xc.add(y);y()}else Lc();B&&g&&(a(),wc.addListener(a))}W.j==0&&(u(d,"gs_nscl"),d.style.top=-R+"px")},function(){ja||\n(wc.removeListener(a),B&&v(B,"gs_vis"),v(f,"gs_vis"),v(f,"gs_abt"));for(var y=W.top()?W.top().T:0;W.top()&&W.top().g==e;){var q=W.top();Rb(q.m);q.m=null;W.pop()}if(W.top()){if(q=W.top().g,Oc(D(q).getAttribute("data-shd")||""),v(D(q),"gs_md_ins_vis"),ja){a:{q=W;for(var r=q.j;r>=0;r--)if(q.l[r].g==e){q=r;break a}q=-1}r=W.at(q);(B||f).style.zIndex=1200+q;Nc(f,k,r.A,r)}}else v(C,"gs_vis"),v(C,"gs_abt");W.j==-1?(xc.remove(Lc),c.style.overflowY="",v(d,"gs_nscl"),d.style.top="auto",window.scrollTo(0,R)):\nLc();Qc||(y>0?window.history.go(-y):fb())},Rc(f),Sc(f),Dc);Cc&&(Rb(b.m),b.m=null,Ac(b,Qb(A,p,function(y,q,r){b.m=null;r=(y=y==200&&r.match(/^text\\/html(;.*)?$/i))?q:Tc();Nc(f,k,r,b);if(y)for(y=e,r=0;r<W.l.length;++r){var Fa=W.at(r);y==Fa.g&&A==Fa.B&&p==Fa.v&&(Fa.A=q,r==W.j&&fb())}S("gs-md-lded",k)})))}function Kc(a){a=a.parentNode;return w(a,"gs_md_wnw")?a:null}function Rc(a){return(a=a.getAttribute("data-ifc"))?D(a):null}function Sc(a){return(a=a.getAttribute("data-cfc"))?D(a):null}\nfunction Nc(a,b,c,d){x(b,"gs_md_ldg",!1);for(var e=b.querySelectorAll("[data-duid]"),f=e.length,g={},m=0;m<f;m++){for(var k=jc(e[m]),l=kc[k],p=l?l.length:0,A=0;A<p;A++){var C=l[A],V=F(C.constructor),B=g[V];B||(B=g[V]={});B[k]=!0;C&&typeof C.dispose=="function"&&C.dispose()}delete kc[k]}for(var R in g){R=+R;e=g[R];m=(f=lc[R])?f.length:0;for(l=k=0;l<m;l++)p=f[l],p in e||(f[k++]=p);k?f.length=k:delete lc[R]}b.innerHTML=c;d.A=c;Pc(a.id);Rb(d.m);d.m=null}\nfunction Pc(a){if(a=document.querySelector("#"+a+">.gs_md_bdy"))a.scrollTop=a.scrollLeft=0,Mc(a)}function Mc(a){var b=a.style,c="padding"+(za(a)?"Left":"Right");b[c]="";var d=a.offsetWidth-a.clientWidth;d>2&&(a=parseInt(window.getComputedStyle(a,null)[c],10)||0,b[c]=Math.max(a-d,0)+"px")}function Tc(){return\'<div class="gs_md_prg"><div class="gs_alrt">\'+D("gs_md_err").innerHTML+"</div></div>"}\nfunction gb(){var a=W.top();return{d:a&&a.g||void 0,u:a&&a.B||void 0,p:a&&a.v?"1":void 0,t:a&&a.s||void 0}}function hb(){var a=W.top();return{n:a&&a.T||0,p:a&&a.v||"",h:a&&a.A||""}}function Oc(a){if(Uc!=a){var b=D("gs_md_s");Uc&&v(b,Uc);(Uc=a)&&u(b,a)}}var Qc=0,Uc="",W=new Bc;\nrb.add(function(){var a=nb(),b=a.d||"",c=b?D(b):null;++Qc;if(c){var d=a.u||"";c=+a.p>0;var e=+a.t||0,f=N||M(window.history.state)||{};a=+f.n||0;var g=""+(f.p||"");f=""+(f.h||"");d.match(Ea)||(d="");for(var m=Fc(W,e),k=m;k<W.l.length;++k){var l=W.at(k);if(e<l.s&&l.g!=b)break}for(l=m-1;l>=0;--l){var p=W.at(l);if(e>p.s&&p.g!=b)break}Ec(k-1);for(k=0;k<=l;++k)p=W.at(k).g,J[p]||Gc(l,!1);if(l=m<W.l.length)l=W.at(m),l=b==l.g&&d==l.B&&c==!!l.v&&e==l.s;l?Gc(m,!0):(a==0&&(Ec(-1),W=new Bc,e=Date.now()),c!=!!g&&\n(d=g="",f=Tc()),b=new zc(b,d,g,f,a,e),c=W,e=b.s,a=Fc(c,e),e=a<c.l.length&&e==c.at(a).s,c.l.splice(a,e?1:0,b),W.j=a,fb(),Hc())}else Ec(-1);--Qc});var Vc=function(a){t.call(this);this.G=a;this.R=Object.create(null);this.m=null;a=a.querySelectorAll(".gs_in_txtw>input[type=text]");for(var b=a.length;b--;){var c=a[b],d=c.parentNode.querySelector(".gs_in_txts");c=c.name;d&&c&&(this.R[c]=d.innerHTML)}};ma(Vc,t);Vc.prototype.K=function(){Rb(this.m);this.G=this.m=null;t.prototype.K.call(this)};\nVc.prototype.ja=function(a){var b=this;P(a);if((a=this.G)&&!this.m){var c="json=&"+Aa(a);Wc(this,!0);this.m=Qb(a.action,c,function(d,e){b.m=null;Wc(b,!1);var f=b.G,g=f.getAttribute("data-alrt");if(g=g?D(g):null)g.innerHTML="";try{var m=d==200&&JSON.parse(e)}catch(B){}d=!1;m&&typeof m=="object"||(Xc(g,D("gs_md_err").innerHTML),m={},d=!0);f.setAttribute("data-p",""+(m.P||""));S("gs-ajax-form-done",f);if(e=m.L){var k=""+e;k.match(Da)&&(window.location.href=k)}else{if(e=m.M)Xc(g,e),d=!0;e=1E6;g&&g.innerHTML&&\n(k=g,e=g.getBoundingClientRect().top);g=f.elements;m=m.E;typeof m=="object"||(m=Object.create(null));for(var l in b.R){var p=g[l],A=void 0,C=""+(m[l]||""),V=p.parentNode.querySelector(".gs_in_txts");x(p.parentNode,"gs_in_txte",!!C);V&&(V.innerHTML=C||b.R[l]||"");C&&(A=p.getBoundingClientRect().top)<e&&(k=p,e=A);d=d||!!C}(f=f.getAttribute("data-d"))&&!d&&L(f);k&&k.scrollIntoView&&(e<0||e+20>window.innerHeight)&&k.scrollIntoView()}})}};\nvar Wc=function(a,b){a=a.G;var c=a.getAttribute("data-bsel");a=c?document.querySelectorAll(c):a.querySelectorAll("button");for(c=a.length;c--;){var d=a[c];d.disabled=b;x(d,"gs_bsp",b)}},Xc=function(a,b){if(a)a.innerHTML=b;else{var c=c===void 0?"":c;var d=d===void 0?"":d;var e=e===void 0?[]:e;D("gs_alrt_m").innerHTML=b;Lb().action=d.match(Da)?d:"";a=D("gs_alrt_l");a.textContent=c;c=D("gs_alrt_h");c.innerHTML="";for(var f in e)b=document.createElement(xa.aa),b.type="hidden",b.name=f,b.value=e[f],c.appendChild(b);\nIb();x(a,"gs_fm_s",!0);Kb()}};Ub(Vc,[new Q(".gs_ajax_frm",{submit:Vc.prototype.ja})]);var Yc=[[1,0,1],[2,0,1]];T(".gs_cb_gen","click",function(a){var b=a.currentTarget,c=(w(b,"gs_sel")?1:0)+2*(w(b,"gs_par")?1:0),d=+b.getAttribute("data-s")==2;c=Yc[+d][c];d=!0;d=d===void 0?!1:d;x(b,"gs_sel",c==1);x(b,"gs_par",c==2);b.setAttribute("aria-checked",tc[c]);d||b.setAttribute("data-s",""+c);S("gs-change",b,a.i)});T(".gs_cb_gen",["keydown","keyup"],function(a){var b=a.currentTarget,c=a.i.keyCode;b.tagName!="BUTTON"||c!=13&&c!=32||(P(a),a.type=="keydown"&&b.click())});T([".gs_cb_gen",".gs_md_li"],"keydown",function(a){var b=a.currentTarget,c=b.tagName,d=a.i.keyCode;c!="BUTTON"&&(d==32||d==13&&c!="A")&&(P(a),b.click())});var Zc=["click","contextmenu","mouseup"].concat(navigator.sendBeacon?[]:["mousedown","touchstart"]),$c="",ad=null;function bd(){ad=null}function cd(a){navigator.sendBeacon?navigator.sendBeacon(a):ad&&a==ad.src||((ad=new Image).src=a,setTimeout(bd,1E3))}\nfunction dd(){var a=document.location.href,b=a.indexOf("?")+1;a=b?a.substr(b):"";b=a.indexOf("#");a=mb(b+1?a.substr(0,b):a).hl||"";a="/scholar_bfnav?url="+encodeURIComponent(document.location.href)+"&hl="+encodeURIComponent(a)+"&ei="+GSP.eventId;cd(a)}Ma(function(){$c=Hb?"&bn=1":"";Hb&&dd()});H(window,"pageshow",function(a){a.persisted&&($c="&bn=1",dd())});\nH(document,Zc,function(a){if(!(a.type=="click"&&a.button||a.type=="mouseup"&&a.button!=1)){var b,c;a:{for(a=a.target;a;){var d=a.nodeName;if(d=="A")break a;if(d=="SPAN"||d=="B"||d=="I"||d=="EM"||d=="IMG")a=a.parentNode;else break}a=null}a&&(b=a.getAttribute("href"))&&(c=a.getAttribute("data-clk"))&&(b="/scholar_url?url="+encodeURIComponent(b)+"&"+c+"&ws="+window.innerWidth+"x"+window.innerHeight+"&at=",c=encodeURIComponent,a=(a=a.getAttribute("data-clk-atid"))?D(a):null,b=b+c(a&&a.innerText||"")+\n$c,cd(b))}},!1,!0);T(".gs_fm_s","click",function(a){a=a.currentTarget.getAttribute("data-fm")||"";(a=D(a))&&a.submit()});var X=function(a){this.g=E(a.querySelector(".gs_md_d"));this.J=E(a.querySelector(".gs_md_tb"))};X.prototype.N=function(a){var b=D(this.g);return a!==void 0?rc(b,b,a):null};X.prototype.open=function(a){a=this.N(a);if(w(D(this.J),"gs_sel"))try{a&&a.focus()}catch(c){}else{var b=D(this.J);Xa(this.g,function(){u(b,"gs_sel")},function(){v(b,"gs_sel")},a,b)}};X.prototype.close=function(){L(this.g)};X.prototype.ca=function(a){P(a);w(D(this.J),"gs_sel")?this.close():this.open(a.i.type=="keydown"?!1:void 0)};\nX.prototype.X=function(a){var b=a.i.keyCode;if(b==38||b==40)P(a),this.open(b==38)};X.prototype.ea=function(a){a.target.id==this.g&&this.X(a)};Ub(X,[new Q(".gs_md_rmb",{}),new Q(".gs_md_tb",{"gs-press":X.prototype.ca,keydown:X.prototype.X}),new Q(".gs_md_d",{keydown:X.prototype.ea})]);var Y=function(a){X.call(this,a);this.la=E(a.querySelector(".gs_md_in"));this.ma=E(a.querySelector(".gs_md_tb .gs_lbl"))};ma(Y,X);Y.prototype.N=function(){return D(this.g).querySelector(".gs_md_li[aria-selected]")};Y.prototype.fa=function(a){ed(this,a)};Y.prototype.O=function(a){var b=a.i.keyCode;b!=13&&b!=32||ed(this,a)};\nvar ed=function(a,b){var c=b.currentTarget,d=D(a.la),e=a.N();c!=e&&(d.value=c.getAttribute("data-v"),D(a.ma).innerHTML=c.innerHTML,e&&fd(e,!1),fd(c,!0));P(b);a.close();S("gs-change",d,b.i)},fd=function(a,b){x(a,"gs_sel",b);b?a.setAttribute("aria-selected","true"):a.removeAttribute("aria-selected")};Ub(Y,[new Q(".gs_md_ris",{}),new Q(".gs_md_li",{click:Y.prototype.fa,keydown:Y.prototype.O})]);T("#gs_lp","click",function(a){P(a);Ic("gs_lp_d")});T("#gs_lp_cur","click",function(a){P(a);L("gs_lp_d")});var gd=function(a){this.Z=E(a)};gd.prototype.O=function(a){var b=a.currentTarget,c=a.i.keyCode;if(c==38||c==40){var d=D(this.Z);d=rc(d,b,c==38)||rc(d,d,c==38)}else if(c==37||c==39)a:{c=c==37!=za(b.parentNode);d=b.parentNode;var e=d.children,f=e.length;if(d.id!=this.Z){for(;e[--f]!=b;);d=qc(d,c)||pc(d.parentNode,c);e=d.children;if(f=Math.min(f+1,e.length))if(d=e[f-1],w(d,"gs_md_li")&&d.offsetLeft!=b.offsetLeft)break a}d=void 0}d&&(P(a),d.focus())};Ub(gd,[new Q(".gs_md_ulr",{}),new Q(".gs_md_li",{keydown:gd.prototype.O})]);T("#gs_hdr_mnu","click",function(a){P(a);Ic("gs_hdr_drw")});T("#gs_hdr_drw_mnu","click",function(a){P(a);L("gs_hdr_drw")});T("#gs_hdr_act_i","click",function(a){P(a);sa()==1?(a=document.querySelector("#gs_hdr_drw_bot>a").href,a.match(Da)&&(window.location.href=a)):Xa("gs_hdr_act_d")});T("#gs_hdr_drw","keydown",function(a){var b=a.i.keyCode;if(b==38||b==40){var c=a.currentTarget;if(b=rc(c,c,b==38))P(a),b.focus()}});\nT("#gs_hdr_tsi",["focus","blur"],function(a){function b(){var g=d.getBoundingClientRect().top-10;Math.abs(g)>10&&window.scrollBy(0,g);clearTimeout(e);c()}function c(){I(window,f,b)}var d=a.target;a=a.type=="focus";x(D("gs_hdr"),"gs_hdr_ifc",a);if(a&&ta&&!(window.innerHeight>749)){var e=setTimeout(c,1E3),f=["scroll","resize"];H(window,f,b)}});T("#gs_hdr_tsi",["input","gs-change"],function(a){x(D("gs_hdr_frm"),"gs_hdr_tsc",!!a.currentTarget.value)});\nT("#gs_hdr_tsc","mousedown",function(a){P(a);var b=D("gs_hdr_tsi");b.value="";b.focus();S("input",b,a.i)});T("#gs_hdr_sre","click",function(a){P(a);var b=D("gs_hdr");Xa("gs_hdr_frm",function(){v(b,"gs_hdr_src");u(b,"gs_hdr_srx")},function(){u(b,"gs_hdr_src");v(b,"gs_hdr_srx")},D("gs_hdr_tsi"))});T(".gs_md_x","click",function(a){(a=a.currentTarget.getAttribute("data-mdx"))&&L(a)});var Z=function(){},hd,id;Z.prototype.da=function(a){a.i.button||(P(a),jd(a))};Z.prototype.ga=function(a){kd(a)&&(P(a),jd(a))};Z.prototype.ha=function(a){kd(a)&&P(a)};Z.prototype.ia=function(a){if(!a.i.button){P(a);var b=a.i;b&&(ld=b.clientX||0,md=b.clientY||0,H(document,nd,od,!0),clearTimeout(hd),hd=setTimeout(pd,2E3));jd(a)}};\nZ.prototype.ka=function(a){P(a);if(qd){var b=a.i;b=b&&b.touches||[];if(b=b.length==1?b[0]:null)rd=b.clientX,sd=b.clientY,H(document,td,ud,!0),clearTimeout(id),id=setTimeout(vd,2E3)}jd(a)};\nvar kd=function(a){a=a.i.keyCode;return a==32||a==13},jd=function(a){S("gs-press",a.currentTarget,a.i)},pd=function(){I(document,nd,od,!0);clearTimeout(hd);hd=void 0},od=function(a){a.type!="mousedown"&&Math.abs(a.clientX-ld)<10&&Math.abs(a.clientY-md)<10?(Pa(a),a.type=="click"&&pd()):pd()},vd=function(){I(document,td,ud,!0);clearTimeout(id);id=void 0},ud=function(a){a.type!="touchstart"&&Math.abs(a.clientX-rd)<10&&Math.abs(a.clientY-sd)<10?(Pa(a),a.type=="click"&&vd()):vd()},ld=0,md=0,nd=["mousedown",\n"mouseup","click"],qd=z("Android")&&!z("Chrome"),rd=0,sd=0,td=["touchstart","mousedown","mouseup","click"];Ub(Z,[new Q(".gs_press",{click:Z.prototype.da,keydown:Z.prototype.ga,keyup:Z.prototype.ha,mousedown:Z.prototype.ia,touchstart:Z.prototype.ka})]);function wd(a){xd.style.left=yd&&zd===Ad?a.left+"px":"auto";xd.style.width=yd?a.width+"px":"auto";S("gs-sth-change",D("gs_sth"))}function Bd(){var a=Cd.getBoundingClientRect(),b=a.top,c=xd.offsetHeight,d=b<0,e;if(e=d&&qa)e=document.activeElement,e=!!e&&e.tagName=="INPUT"&&e.type=="text";b=e?-b-a.height:Ad;var f=yd!=d||zd!==Ad!=e;b!==zd&&(zd=b,xd.style.transform=b===Ad?"none":"translate3d(0,"+b+"px,0)");f&&(yd=d,x(Dd,"gs_sth_vis",d),x(Dd,"gs_sth_trk",e),wd(a),Cd.style.height=yd?c+"px":"auto")}\nfunction Ed(){yd&&wd(Cd.getBoundingClientRect())}var Ad,Dd,Cd,xd,yd=!1,zd;Ma(function(){if(Dd=D("gs_sth"))Cd=Dd.querySelector(".gs_sth_g"),xd=Dd.querySelector(".gs_sth_b"),vc.addListener(Bd),wc.addListener(Ed),Bd()});(function(a){Ma(function(){return setTimeout(a,0)})})(function(){var a=document.querySelectorAll(".gs_invis");var b=typeof Symbol!="undefined"&&Symbol.iterator&&a[Symbol.iterator];if(b)a=b.call(a);else if(typeof a.length=="number")a={next:aa(a)};else throw Error(String(a)+" is not an iterable or ArrayLike");for(b=a.next();!b.done;b=a.next())v(b.value,"gs_invis")});new U;new U;var Fd=(new Date).getTimezoneOffset();T("#gs_vcpb_cita_edit","click",function(a){a.i&&Pa(a.i);a=D("gsc_vcpb").getAttribute("data-edit-link")+"&tzom="+Fd;Ic("gs_md_cita-d",a)});T("#gs_md_cita-b-save","click",function(){var a=D("gsc_ecd_form");Ba(a,"continue").value=window.location.pathname+window.location.search;S("submit",a)});\nT(".gsc_ecd_form_tsel","click",function(a){var b=D("gsc_ecd_form"),c=D("gsc_ecd_table");b=Ba(b,"articletype");a=a.currentTarget;b.value=a.getAttribute("data-type")||"";c.className=a.getAttribute("data-class")||"";c=document.querySelectorAll("#gsc_ecd_citation_type button");for(b=c.length;b--;)x(c[b],"gs_sel",c[b]==a)});\n}({"customAC":0,"eventId":"id_EZtCIIo3Yy9YP98XLwQk"});</script></head><body><div id="gs_top" onclick=""><style>#gs_md_s,.gs_md_wnw{z-index:1200;position:fixed;top:0;left:0;width:100%;height:100%;visibility:hidden;}.gs_md_ds:before{content:\'\';position:absolute;background-color:#fff;z-index:100;opacity:0;visibility:hidden;top:0;bottom:0;right:0;left:0;}.gs_md_ds.gs_md_d:not(.gs_el_ph .gs_md_wmw):before{top:-1px;bottom:-1px;right:-1px;left:-1px;}#gs_md_s{background-color:#fff;opacity:0;}.gs_el_ta #gs_md_s,.gs_el_ph #gs_md_s,.gs_el_ta .gs_md_ds:before,.gs_el_ph .gs_md_ds:before{background-color:#666;}#gs_md_s.gs_vis,.gs_md_ds.gs_md_ins_vis:before{opacity:.5;visibility:visible;}.gs_md_wnw{transition:all 0s .218s;}.gs_md_wnw.gs_vis{visibility:visible;transition:all 0s;}.gs_el_tc .gs_md_ds:before{transition:opacity .15s,visibility 0s .15s;}.gs_el_tc .gs_md_ds.gs_md_ins_vis:before{transition:opacity .218s,visibility 0s;}.gs_md_wnw>.gs_md_d{position:relative;margin:0 auto;width:464px;box-shadow:2px 2px 8px rgba(0,0,0,.2);white-space:normal;}.gs_el_ta .gs_md_wnw>.gs_md_d,.gs_el_ph .gs_md_wnw>.gs_md_d{box-shadow:2px 2px 8px rgba(0,0,0,.65);}.gs_el_ph .gs_md_wnw>.gs_md_d{width:80%;max-width:440px;}.gs_el_ph .gs_md_wmw>.gs_md_d{display:flex;flex-direction:column;width:100%;height:100%;max-width:none;border:none;box-shadow:none;transform:translate(0,100%);transform:translate(0,100vh);transition:transform .27s cubic-bezier(.4,0,.6,1),opacity 0s .27s,visibility 0s .27s,max-height 0s .27s;}.gs_el_ph .gs_md_wmw>.gs_md_d.gs_vis{transform:translate(0,0);transition:transform .3s cubic-bezier(0,0,.2,1);}.gs_md_wmw>.gs_md_d.gs_abt,.gs_el_ph .gs_md_wmw>.gs_md_d.gs_abt{transition:none;}.gs_md_hdr{display:flex;align-items:center;height:47px;border-bottom:1px solid #e0e0e0;border-bottom-color:rgba(0,0,0,.12);background-color:#f5f5f5;}.gs_md_hdr>a,.gs_md_hdr>a.gs_btn_lrge{flex:0 0 auto;width:41px;height:47px;}.gs_el_ph .gs_md_hdr>a{margin:0 2px 0 0;}.gs_el_ph a.gs_md_hdr_c{margin:0 0 0 2px;}.gs_md_hdr_b{margin:0 41px 0 16px;}.gs_el_ph .gs_md_hdr_b{margin:0 16px;}.gs_md_hdr_t:empty~.gs_md_hdr_b{margin-left:0;}.gs_md_hdr_b:empty{width:41px;margin:0;}.gs_el_ph .gs_md_hdr_b:empty{margin-right:2px;}.gs_md_hdr_b:empty:not(:last-child){display:none;}.gs_md_hdr_b>button{min-width:51px;height:33px;}.gs_md_hdr_t{flex:1 1 auto;font-size:18px;font-weight:normal;color:#666;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;text-align:center;}.gs_md_bdy{position:relative;overflow-y:auto;box-sizing:border-box;padding:24px 41px 0 41px;}.gs_md_bdy:after{display:block;content:"";clear:both;padding-bottom:24px;}.gs_el_ph .gs_md_bdy{padding:16px 16px 0 16px;}.gs_el_ph .gs_md_bdy:after{padding-bottom:16px;}.gs_el_ph .gs_md_wmw .gs_md_bdy{flex:1;}.gs_md_ftr{border-top:1px solid #e0e0e0;}.gs_md_lbl{display:block;font-size:16px;margin:0 0 16px 0;word-wrap:break-word;}.gs_md_btns{margin:24px 0 0 0;white-space:nowrap;}.gs_el_ph .gs_md_btns{margin:16px 0 0 0;}.gs_md_btns button{margin-right:16px;}.gs_md_btns button:last-child{margin-right:0;}.gs_md_prg{margin:24px 0;text-align:center;}.gs_md_prg .gs_alrt{padding:4px 16px;}.gs_md_ldg:before{content:"";position:absolute;top:0;left:0;bottom:0;right:0;background-color:#fff;opacity:.5;z-index:100;}</style><div id="gs_md_ldg" style="display:none">Loading...</div><div id="gs_md_err" style="display:none">The system can&#39;t perform the operation now. Try again later.</div><div id="gs_md_s"></div><div data-h="800" class="gs_md_wnw gs_md_ds gs_md_wmw"><div id="gs_md_cita-d" class="gs_md_d gs_md_ds gs_ttzi" role="dialog" tabindex="-1" aria-labelledby="gs_md_cita-d-t" data-cid="gs_md_cita-l" data-wfc="gs_md_cita-d-x"><div class="gs_md_hdr"><a href="javascript:void(0)" id="gs_md_cita-d-x" role="button" aria-label="Cancel" data-mdx="gs_md_cita-d" class="gs_btnCLS gs_md_x gs_md_hdr_c gs_in_ib gs_btn_lrge"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl"></span></a><h2 id="gs_md_cita-d-t" class="gs_md_hdr_t"></h2><div class="gs_md_hdr_b"><button type="button" id="gs_md_cita-b-save" aria-label="Save" class="gs_btnDNW gs_in_ib gs_btn_act gs_btn_half gs_btn_lsb"><span class="gs_wr"><span class="gs_ico"></span><span class="gs_lbl"></span></span></button></div></div><div id="gs_md_cita-d-bdy" class="gs_md_bdy"><style>#gs_md_cita-d{width:90%;max-width:1000px;}.gs_el_ph #gs_md_cita-d{width:100%;max-width:none;}#gs_md_cita-d .gs_md_prg{min-height:600px;}</style><div id="gs_md_cita-l" aria-live="assertive"></div></div></div></div><!--[if lte IE 9]><div class="gs_alrt" style="padding:16px"><div>Sorry, some features may not work in this version of Internet Explorer.</div><div>Please use <a href="//www.google.com/chrome/">Google Chrome</a> or <a href="//www.mozilla.com/firefox/">Mozilla Firefox</a> for the best experience.</div></div><![endif]--><div id="gs_hdr_drw" class="gs_md_ulr gs_md_ds" role="dialog" tabindex="-1" data-shd="gs_hdr_drs" data-wfc="gs_hdr_drw_mnu" data-cfc="gs_hdr_mnu"><div id="gs_hdr_drw_in"><div id="gs_hdr_drw_top"><a href="javascript:void(0)" id="gs_hdr_drw_mnu" role="button" aria-controls="gs_hdr_drw" aria-label="Options" class="gs_btnMNT gs_in_ib gs_btn_lrge"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl"></span></a><a id="gs_hdr_drw_lgo" href="/schhp?hl=en&amp;oe=ASCII" aria-label="Homepage"></a></div><div><div class="gs_hdr_drw_sec"><a href="/citations?hl=en&amp;oe=ASCII" role="menuitem" class="gs_btnPRO gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">My profile</span></a><a href="/scholar?scilib=1&amp;hl=en&amp;oe=ASCII" role="menuitem" class="gs_btnL gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">My library</span></a><a href="/citations?view_op=metrics_intro&amp;hl=en&amp;oe=ASCII" role="menuitem" class="gs_btnJ gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">Metrics</span></a><a href="/scholar_alerts?view_op=list_alerts&amp;hl=en&amp;oe=ASCII" role="menuitem" class="gs_btnM gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">Alerts</span></a></div><div class="gs_hdr_drw_sec"><a href="/scholar_settings?hl=en&amp;oe=ASCII" role="menuitem" class="gs_btnP gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">Settings</span></a></div></div><div id="gs_hdr_drw_bot" class="gs_hdr_drw_sec"><a href="https://accounts.google.com/Login?hl=en&amp;continue=https://scholar.google.com/schhp%3Fhl%3Den%26oe%3DASCII" class=" gs_in_ib gs_md_li gs_md_lix gs_in_gray"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl">Sign in</span></a></div></div></div><div id="gs_hdr" role="banner"><a href="/citations?view_op=list_works&amp;hl=en&amp;oe=ASCII&amp;hl=en&amp;oe=ASCII&amp;user=exyen9EAAAAJ" id="gs_hdr_bck" role="button" class="gs_btnALT gs_in_ib gs_btn_lrge"><span class="gs_ico"></span><span class="gs_ia_notf"></span><span class="gs_lbl"></span></a><div id="gs_hdr_md"><h1 dir="ltr">View article</h1></div><div id="gs_hdr_act"><a id="gs_hdr_act_s" href="https://accounts.google.com/Login?hl=en&amp;continue=https://scholar.google.com/schhp%3Fhl%3Den%26oe%3DASCII">Sign in</a></div></div><style>#gs_alrt{position:fixed;bottom:48px;left:16px;max-width:384px;z-index:1250;display:flex;justify-content:space-between;align-items:center;font-size:13px;line-height:16px;color:#e2e2e2;background:#333;text-align:left;border-radius:3px;box-shadow:0 3px 5px -1px rgba(0,0,0,.2),0 6px 10px 0 rgba(0,0,0,.14),0 1px 18px 0 rgba(0,0,0,.12);visibility:hidden;transform-origin:center;transform:scale(0.8,0.8) translate(0,100%);}.gs_el_ph #gs_alrt{bottom:0;left:0;width:100%;max-width:none;border-radius:0;box-shadow:none;transform:scale(1,1) translate(0,100%);}#gs_alrt.gs_vis{visibility:visible;transform:scale(1,1) translate(0,0);}#gs_alrt.gs_anm{transition:transform .067s cubic-bezier(.4,0,1,1),visibility 0s .067s;}#gs_alrt.gs_vis.gs_anm{transition:transform .067s cubic-bezier(0,0,.2,1);}.gs_el_ph #gs_alrt.gs_anm{transition:transform .084s cubic-bezier(.4,0,1,1),visibility 0s .084s;}.gs_el_ph #gs_alrt.gs_vis.gs_anm{transition:transform .1s cubic-bezier(0,0,.2,1);}#gs_alrt_m{display:block;padding:16px;}#gs_alrt_l{display:block;padding:8px;margin:0 8px 0 -8px;border-radius:3px;color:#fcc934;text-transform:uppercase;text-decoration:none;}#gs_alrt_l:hover{background-color:rgba(255,255,255,.05)}#gs_alrt_l:active{background-color:rgba(255,255,255,.1)}#gs_alrt_l:empty{display:none}#gs_alrt_m a{padding:8px 0;color:#e2e2e2;text-decoration:underline;}#gs_alrt_m a:active{color:#f6aea9}</style><form action="" method="post" id="gs_alrt"><span id="gs_alrt_m"></span><span id="gs_alrt_h"></span><a id="gs_alrt_l" href="javascript:void(0)" class="gs_fm_s" data-fm="gs_alrt"></a></form><div id="gs_bdy"><div id="gs_bdy_sb" role="navigation"><div id="gs_bdy_sb_in"><div id="gsc_sb_ui" class="gs_bdy_sb_sec"><a href="/citations?user=exyen9EAAAAJ&amp;hl=en&amp;oe=ASCII" class="gs_ibl"><span  class="gs_rimg gs_pp_sm"><img alt="Michael S. Rosenberg" sizes="56px" src="https://scholar.googleusercontent.com/citations?view_op=small_photo&amp;user=exyen9EAAAAJ&amp;citpid=4" srcset="https://scholar.googleusercontent.com/citations?view_op=small_photo&amp;user=exyen9EAAAAJ&amp;citpid=4 56w,https://scholar.googleusercontent.com/citations?view_op=view_photo&amp;user=exyen9EAAAAJ&amp;citpid=4 128w" width="56" height="56"></span></a><div><a href="/citations?user=exyen9EAAAAJ&amp;hl=en&amp;oe=ASCII">Michael S. Rosenberg</a></div></div></div></div><div id="gs_bdy_ccl" role="main"><div id="gsc_vcpb" data-edit-link="/citations?view_op=edit_citation&amp;hl=en&amp;oe=ASCII&amp;user=exyen9EAAAAJ&amp;citation_for_view=exyen9EAAAAJ:YsMSGLbcyi4C&amp;citation_for_view=exyen9EAAAAJ:YsMSGLbcyi4C&amp;back_view_op=view_citation"><form method="post" id="gsc_vcpb_btns" action="/citations?view_op=view_citation&amp;hl=en&amp;oe=ASCII"><input type="hidden" name="xsrf" value="ANI4uE0AAAAAZsYxCSGBSH6u5mibRQ7kIII9JSA"><input type="hidden" name="s" value="exyen9EAAAAJ:YsMSGLbcyi4C"><input type="hidden" name="continue" value="/citations?view_op=list_works&amp;hl=en&amp;oe=ASCII&amp;hl=en&amp;oe=ASCII&amp;user=exyen9EAAAAJ"></form><div id="gsc_oci_title_wrapper"><div id="gsc_oci_title_gg"><div class="gsc_oci_title_ggi"><a href="https://besjournals.onlinelibrary.wiley.com/doi/pdfdirect/10.1111/j.2041-210X.2010.00081.x" data-clk="hl=en&amp;sa=T&amp;ei=id_EZtCIIo3Yy9YP98XLwQk"><span class=\'gsc_vcd_title_ggt\'>[PDF]</span> from wiley.com</a></div><div class="gsc_oci_title_ggi"><a href="https://besjournals.onlinelibrary.wiley.com/doi/full/10.1111/j.2041-210X.2010.00081.x" data-clk="hl=en&amp;sa=T&amp;ei=id_EZtCIIo3Yy9YP98XLwQk">Full View</a></div></div><div id="gsc_oci_title"><a class="gsc_oci_title_link" href="https://besjournals.onlinelibrary.wiley.com/doi/abs/10.1111/j.2041-210X.2010.00081.x" data-clk="hl=en&amp;sa=T&amp;ei=id_EZtCIIo3Yy9YP98XLwQk">PASSaGE: Pattern analysis, spatial statistics and geographic exegesis. Version 2</a></div></div><div id="gsc_oci_table"><div class="gs_scl"><div class="gsc_oci_field">Authors</div><div class="gsc_oci_value">Michael S Rosenberg, Corey Devin Anderson</div></div><div class="gs_scl"><div class="gsc_oci_field">Publication date</div><div class="gsc_oci_value">2011</div></div><div class="gs_scl"><div class="gsc_oci_field">Journal</div><div class="gsc_oci_value">Methods in Ecology and Evolution</div></div><div class="gs_scl"><div class="gsc_oci_field">Volume</div><div class="gsc_oci_value">2</div></div><div class="gs_scl"><div class="gsc_oci_field">Issue</div><div class="gsc_oci_value">3</div></div><div class="gs_scl"><div class="gsc_oci_field">Pages</div><div class="gsc_oci_value">229-232</div></div><div class="gs_scl"><div class="gsc_oci_field">Publisher</div><div class="gsc_oci_value">Blackwell Publishing Ltd</div></div><div class="gs_scl"><div class="gsc_oci_field">Description</div><div class="gsc_oci_value" id="gsc_oci_descr"><div class="gsh_small"> <div class="gsh_csp"> <b>1.</b>&#8194;Spatial analysis has become increasingly popular in the biological sciences, particularly in disciplines such as landscape ecology and landscape genetics. However, many statistical functions for performing spatial analysis are not readily available (except in the most limited manner) in common, easy&#8208;to&#8208;use statistical packages or geographic information systems <span class="gs_fscp">(</span>GIS<span class="gs_fscp">)</span> software.</div> <div class="gsh_csp"> <b>2.</b>&#8194;Over the last decade, the software package Pattern Analysis, Spatial Statistics and Geographic Exegesis (PASSaGE) has been popular tool for conducting spatial statistics. PASSaGE is completely free and has a user&#8208;friendly graphical user interface. A new version of PASSaGE<i>,</i> rewritten from the ground up, has now been released and is available for download.</div> <div class="gsh_csp"> <b>3.</b>&#8194;PASSaGE 2 is significantly more user friendly than the original release and provides an excellent platform for both scientific analysis and classroom training. PASSaGE 2\xa0&#8230;</div></div></div></div><div class="gs_scl"><div class="gsc_oci_field">Total citations</div><div class="gsc_oci_value"><div style="margin-bottom:1em"><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5">Cited by 957</a></div><div id="gsc_oci_graph_wrapper"><div id="gsc_oci_graph" style="width:757px;"><div id="gsc_oci_graph_x"></div><div id="gsc_oci_graph_bars"><span class="gsc_oci_g_t" style="left:0px">2002</span><span class="gsc_oci_g_t" style="left:33px">2003</span><span class="gsc_oci_g_t" style="left:66px">2004</span><span class="gsc_oci_g_t" style="left:99px">2005</span><span class="gsc_oci_g_t" style="left:132px">2006</span><span class="gsc_oci_g_t" style="left:165px">2007</span><span class="gsc_oci_g_t" style="left:198px">2008</span><span class="gsc_oci_g_t" style="left:231px">2009</span><span class="gsc_oci_g_t" style="left:264px">2010</span><span class="gsc_oci_g_t" style="left:297px">2011</span><span class="gsc_oci_g_t" style="left:330px">2012</span><span class="gsc_oci_g_t" style="left:363px">2013</span><span class="gsc_oci_g_t" style="left:396px">2014</span><span class="gsc_oci_g_t" style="left:429px">2015</span><span class="gsc_oci_g_t" style="left:462px">2016</span><span class="gsc_oci_g_t" style="left:495px">2017</span><span class="gsc_oci_g_t" style="left:528px">2018</span><span class="gsc_oci_g_t" style="left:561px">2019</span><span class="gsc_oci_g_t" style="left:594px">2020</span><span class="gsc_oci_g_t" style="left:627px">2021</span><span class="gsc_oci_g_t" style="left:660px">2022</span><span class="gsc_oci_g_t" style="left:693px">2023</span><span class="gsc_oci_g_t" style="left:726px">2024</span><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2002&amp;as_yhi=2002" class="gsc_oci_g_a" style="left:5px;height:2px;top:55px;z-index:23"><span class="gsc_oci_g_al">3</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2003&amp;as_yhi=2003" class="gsc_oci_g_a" style="left:38px;height:2px;top:55px;z-index:22"><span class="gsc_oci_g_al">4</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2004&amp;as_yhi=2004" class="gsc_oci_g_a" style="left:71px;height:4px;top:53px;z-index:21"><span class="gsc_oci_g_al">7</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2005&amp;as_yhi=2005" class="gsc_oci_g_a" style="left:104px;height:9px;top:48px;z-index:20"><span class="gsc_oci_g_al">14</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2006&amp;as_yhi=2006" class="gsc_oci_g_a" style="left:137px;height:13px;top:44px;z-index:19"><span class="gsc_oci_g_al">21</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2007&amp;as_yhi=2007" class="gsc_oci_g_a" style="left:170px;height:15px;top:42px;z-index:18"><span class="gsc_oci_g_al">24</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2008&amp;as_yhi=2008" class="gsc_oci_g_a" style="left:203px;height:14px;top:43px;z-index:17"><span class="gsc_oci_g_al">23</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2009&amp;as_yhi=2009" class="gsc_oci_g_a" style="left:236px;height:12px;top:45px;z-index:16"><span class="gsc_oci_g_al">19</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2010&amp;as_yhi=2010" class="gsc_oci_g_a" style="left:269px;height:17px;top:40px;z-index:15"><span class="gsc_oci_g_al">27</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2011&amp;as_yhi=2011" class="gsc_oci_g_a" style="left:302px;height:28px;top:29px;z-index:14"><span class="gsc_oci_g_al">46</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2012&amp;as_yhi=2012" class="gsc_oci_g_a" style="left:335px;height:53px;top:4px;z-index:13"><span class="gsc_oci_g_al">87</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2013&amp;as_yhi=2013" class="gsc_oci_g_a" style="left:368px;height:57px;top:0px;z-index:12"><span class="gsc_oci_g_al">93</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2014&amp;as_yhi=2014" class="gsc_oci_g_a" style="left:401px;height:48px;top:9px;z-index:11"><span class="gsc_oci_g_al">78</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2015&amp;as_yhi=2015" class="gsc_oci_g_a" style="left:434px;height:57px;top:0px;z-index:10"><span class="gsc_oci_g_al">93</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2016&amp;as_yhi=2016" class="gsc_oci_g_a" style="left:467px;height:56px;top:1px;z-index:9"><span class="gsc_oci_g_al">92</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2017&amp;as_yhi=2017" class="gsc_oci_g_a" style="left:500px;height:42px;top:15px;z-index:8"><span class="gsc_oci_g_al">68</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2018&amp;as_yhi=2018" class="gsc_oci_g_a" style="left:533px;height:43px;top:14px;z-index:7"><span class="gsc_oci_g_al">70</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2019&amp;as_yhi=2019" class="gsc_oci_g_a" style="left:566px;height:34px;top:23px;z-index:6"><span class="gsc_oci_g_al">56</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2020&amp;as_yhi=2020" class="gsc_oci_g_a" style="left:599px;height:26px;top:31px;z-index:5"><span class="gsc_oci_g_al">42</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2021&amp;as_yhi=2021" class="gsc_oci_g_a" style="left:632px;height:21px;top:36px;z-index:4"><span class="gsc_oci_g_al">34</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2022&amp;as_yhi=2022" class="gsc_oci_g_a" style="left:665px;height:9px;top:48px;z-index:3"><span class="gsc_oci_g_al">15</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2023&amp;as_yhi=2023" class="gsc_oci_g_a" style="left:698px;height:13px;top:44px;z-index:2"><span class="gsc_oci_g_al">21</span></a><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2024&amp;as_yhi=2024" class="gsc_oci_g_a" style="left:731px;height:10px;top:47px;z-index:1"><span class="gsc_oci_g_al">16</span></a></div></div></div></div></div><div class="gs_scl"><div class="gsc_oci_field">Scholar articles</div><div class="gsc_oci_value"><div class="gsc_oci_merged_snippet"><div><a href="/scholar?oi=bibs&amp;cluster=12480068626253116047&amp;btnI=1&amp;hl=en&amp;oe=ASCII">PASSaGE: pattern analysis, spatial statistics and geographic exegesis. Version 2</a></div><div>MS Rosenberg, CD Anderson\xa0- Methods in Ecology and Evolution, 2011</div><div><a class="gsc_oms_link" href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047&amp;as_sdt=5">Cited by 957</a> <a class="gsc_oms_link" href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;q=related:j3JQGEscMq0J:scholar.google.com/">Related articles</a> <a class="gsc_oms_link" href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cluster=12480068626253116047">All 12 versions</a> </div></div><div class="gsc_oci_merged_snippet"><div><a href="/scholar?oi=bibs&amp;cluster=8651933093376463528&amp;btnI=1&amp;hl=en&amp;oe=ASCII">PS 13-147: PASSaGE 2: Software for spatial analysis and landscape ecology</a><span class="gsc_oms_mm">*</span></div><div>MS Rosenberg, CD Anderson - 2007</div><div><a class="gsc_oms_link" href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;q=related:qJIm-07XEXgJ:scholar.google.com/">Related articles</a> </div></div></div></div></div></div></div></div><div id="gs_ftr_sp" role="presentation"></div><div id="gs_ftr" class="gs_md_rmb" role="contentinfo"><div id="gs_ftr_rt"><a href="//www.google.com/intl/en/policies/privacy/">Privacy</a><a href="//www.google.com/intl/en/policies/terms/">Terms</a><a href="javascript:void(0)" ontouchstart="gs_evt_dsp(event)" role="button" aria-controls="gs_ftr_mnu" aria-haspopup="true" class="gs_press gs_md_tb">Help</a></div><div id="gs_ftr_mnu" class="gs_md_d gs_md_ds gs_ttzi gs_md_ulr" role="menu" tabindex="-1"><a role="menuitem" href="/intl/en/scholar/about.html" tabindex="-1" class="gs_md_li">About Scholar</a><a role="menuitem" href="//support.google.com/websearch?p=scholar_dsa&amp;hl=en&amp;oe=ASCII" tabindex="-1" class="gs_md_li">Search help</a></div></div></div></body></html>"""
 START_YEAR = 1997
 CURRENT_YEAR = datetime.datetime.now().year
+SCHOLAR_USER = "exyen9EAAAAJ"
+PROFILE_PAGE_SIZE = 100  # the largest page size Google Scholar allows for a profile listing
+OUTPUT_FILE = "google_scholar_citation_data.txt"
+TOTALS_FILE = "google_scholar_totals.txt"  # citation totals seen on the last profile fetch
+TRACE_FILE = "fetch_trace.jsonl"  # one JSON record per request/publication from the last run
+HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_2) AppleWebKit/601.3.9 "
+                         "(KHTML, like Gecko) Version/9.0.2 Safari/601.3.9"}
+
+# network settings
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 30  # seconds
+MAX_RETRIES = 4  # attempts at a single request before it is treated as failed
+MAX_REQUEUES = 2  # number of times a failed publication is sent to the back of the queue
+BACKOFF_BASE = 2  # seconds, doubled on each retry
+BACKOFF_MAX = 120  # seconds
+
+# classification of a fetched page
+PAGE_OK = "ok"
+PAGE_BLOCKED = "blocked"
+PAGE_EMPTY = "empty"
+PAGE_MALFORMED = "malformed"
+
+BLOCKED_MARKERS = ("gs_captcha", "recaptcha", "unusual traffic", "/sorry/")
+CITATION_PAGE_MARKER = "gsc_oci_title"  # present on every view_citation page, in raw or view-source form
+PROFILE_PAGE_MARKER = 'id="gsc_a_b"'  # body of the publication table of a profile listing
+SCAN_CHUNK_SIZE = 16384  # bytes read at a time when scanning a saved page
+SCAN_TAIL_SIZE = 2048  # bytes carried between chunks; longer than any single histogram anchor
+
+CitationHistogram = Dict[int, int]  # year -> citations received that year
 
 
 class Publication:
@@ -22,16 +59,308 @@ class Publication:
         self.code = ""
 
 
-def get_webpage(url, encoding):
+class FetchError(Exception):
+    """
+    raised when a page could not be retrieved successfully after all retries
+    """
+    def __init__(self, url: str, classification: str):
+        super().__init__(f"{classification}: {url}")
+        self.url = url
+        self.classification = classification
+
+
+class RateLimiter:
+    """
+    enforces a minimum delay between requests. The delay is increased whenever a block is detected and relaxes
+    back toward its starting value after each successful request
+    """
+    def __init__(self, delay: float = 5, max_delay: float = 300, slow_factor: float = 2, relax_factor: float = 0.9):
+        self.base_delay = delay
+        self.delay = delay
+        self.max_delay = max_delay
+        self.slow_factor = slow_factor
+        self.relax_factor = relax_factor
+        self.last_request = None
+
+    def wait(self) -> float:
+        """
+        sleep until the next request is allowed, returning the time spent waiting
+        """
+        waited = 0
+        if self.last_request is not None:
+            remaining = self.last_request + self.delay - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+                waited = remaining
+        self.last_request = time.monotonic()
+        return waited
+
+    def slow_down(self) -> None:
+        self.delay = min(self.max_delay, self.delay * self.slow_factor)
+
+    def relax(self) -> None:
+        self.delay = max(self.base_delay, self.delay * self.relax_factor)
+
+
+def percentile(sorted_values: list, p: float) -> float:
     """
-    function to fetch the webpage specifed by url and return a list containing the contents of the page
+    nearest-rank percentile of an already sorted list
     """
-    webpage = urllib.request.urlopen(url)
-    page = webpage.read()
-    page = page.decode(encoding)
-    # lines = page.split("\n")
-    return page
-    # return TEST
+    if len(sorted_values) == 0:
+        return 0
+    i = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[i]
+
+
+class FetchTrace:
+    """
+    collects a structured record of every request attempt and every publication processed during a run, so fetch
+    time can be attributed to DNS, connection, transfer, parsing, rate limiting, and retries
+    """
+    TIMING_FIELDS = ("dns", "connect", "transfer", "parse", "limiter_wait", "backoff")
+
+    def __init__(self):
+        self.records = []
+        self.start = time.perf_counter()
+
+    def record(self, event: str, **fields) -> None:
+        fields["event"] = event
+        fields["time"] = round(time.perf_counter() - self.start, 6)
+        self.records.append(fields)
+
+    def write(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as outfile:
+            for r in self.records:
+                outfile.write(json.dumps(r) + "\n")
+
+    def summary(self) -> str:
+        requests = [r for r in self.records if r["event"] == "request"]
+        pubs = [r for r in self.records if r["event"] == "publication"]
+        elapsed = time.perf_counter() - self.start
+        total_bytes = sum(r.get("bytes", 0) for r in requests)
+        outlist = [f"Fetch summary: {len(requests)} requests, {len(pubs)} publications in {elapsed:.1f} s",
+                   f"  bytes: {total_bytes} ({total_bytes / max(elapsed, 1e-9) / 1024:.1f} KiB/s)",
+                   f"  cache: {sum(1 for r in pubs if r.get('cache') == 'hit')} hit, "
+                   f"{sum(1 for r in pubs if r.get('cache') == 'miss')} miss",
+                   f"  retries: {sum(1 for r in requests if r.get('attempt', 0) > 0)}"]
+        classifications = {}
+        for r in requests:
+            classifications[r["classification"]] = classifications.get(r["classification"], 0) + 1
+        outlist.append("  responses: " + ", ".join(f"{c} {classifications[c]}" for c in sorted(classifications)))
+        outlist.append(f"  {'seconds':<13}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'total':>10}")
+        for f in self.TIMING_FIELDS:
+            values = sorted(r[f] for r in self.records if f in r)
+            if len(values) > 0:
+                outlist.append(f"  {f:<13}{percentile(values, 50):9.3f}{percentile(values, 90):9.3f}"
+                               f"{percentile(values, 99):9.3f}{values[-1]:9.3f}{sum(values):10.2f}")
+        return "\n".join(outlist)
+
+
+def get_webpage(url: str, encoding: str, timing: Optional[dict] = None) -> Tuple[int, str]:
+    """
+    function to fetch the webpage specifed by url and return the HTTP status and the contents of the page
+
+    separate timeouts are applied to establishing the connection and to each read from it. If a timing dictionary
+    is provided, it is filled with the seconds spent on name lookup, connecting (including the TLS handshake), and
+    transferring the request and response, as well as the size of the response in bytes
+    """
+    if timing is None:
+        timing = {}
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path
+    if parts.query != "":
+        path += "?" + parts.query
+    host = parts.hostname
+    port = parts.port or 443
+    start = time.perf_counter()
+    address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4]
+    timing["dns"] = time.perf_counter() - start
+    connection = http.client.HTTPSConnection(parts.netloc, timeout=CONNECT_TIMEOUT)
+    try:
+        start = time.perf_counter()
+        sock = socket.create_connection(address[:2], timeout=CONNECT_TIMEOUT)
+        connection.sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        connection.sock.settimeout(READ_TIMEOUT)
+        timing["connect"] = time.perf_counter() - start
+        start = time.perf_counter()
+        connection.request("GET", path, headers=HEADERS)
+        response = connection.getresponse()
+        data = response.read()
+        timing["transfer"] = time.perf_counter() - start
+        timing["bytes"] = len(data)
+        return response.status, data.decode(encoding, "ignore")
+    finally:
+        connection.close()
+
+
+def classify_page(status: int, page: str, marker: str) -> str:
+    """
+    classify a response as ok, blocked (captcha or throttling), empty, or malformed (missing the marker expected on
+    every valid page of its type)
+    """
+    if status in (429, 503) or 300 <= status < 400:  # Scholar redirects blocked clients to a captcha page
+        return PAGE_BLOCKED
+    lower_page = page.lower()
+    for m in BLOCKED_MARKERS:
+        if m in lower_page:
+            return PAGE_BLOCKED
+    if page.strip() == "":
+        return PAGE_EMPTY
+    if (status != 200) or (marker not in page):
+        return PAGE_MALFORMED
+    return PAGE_OK
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    exponential backoff with full jitter
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def fetch_page(url: str, encoding: str, marker: str, limiter: RateLimiter,
+               trace: Optional[FetchTrace] = None) -> str:
+    """
+    fetch a page through the rate limiter, retrying with backoff until it is classified as ok
+    """
+    classification = PAGE_EMPTY
+    for attempt in range(MAX_RETRIES):
+        backoff = 0
+        if attempt > 0:
+            backoff = backoff_delay(attempt)
+            time.sleep(backoff)
+        timing = {"limiter_wait": limiter.wait()}
+        try:
+            status, page = get_webpage(url, encoding, timing)
+            classification = classify_page(status, page, marker)
+        except (OSError, http.client.HTTPException):  # includes timeouts and dropped connections
+            status = None
+            page = ""
+            classification = PAGE_EMPTY
+        if trace is not None:
+            trace.record("request", url=url, attempt=attempt, status=status, classification=classification,
+                         backoff=backoff, **timing)
+        if classification == PAGE_OK:
+            limiter.relax()
+            return page
+        elif classification == PAGE_BLOCKED:
+            limiter.slow_down()
+    raise FetchError(url, classification)
+
+
+class HistogramScanner:
+    """
+    incremental scanner for the citations-per-year histogram of a view_citation page
+
+    page bytes are fed in chunks and only the gsc_oci_g_a bar anchors are recognized, in either raw form or the
+    syntax-highlighted markup of a saved view-source page. Scanning stops at the first closing div after the bars,
+    so the rest of the page is never read. Whether the citation page marker and any blocked markers were seen is
+    tracked in the same pass so the page can be classified without holding it in memory
+    """
+    ANCHOR_REGEX = re.compile(rb"as_yhi=(?P<year>\d{4}).{0,300}?gsc_oci_g_a\b.{0,600}?gsc_oci_g_al.{0,200}?"
+                              rb"(?:>|&gt;)(?:</span>)?(?P<cnt>\d+)", re.DOTALL)
+    CLOSE_REGEX = re.compile(rb"(?:<|&lt;)/div")
+    NEXT_ANCHOR = b"as_yhi="
+
+    def __init__(self):
+        self.counts = {}
+        self.done = False
+        self.seen_marker = False
+        self.seen_blocked = False
+        self.seen_content = False
+        self.buffer = b""
+
+    def check_markers(self, data: bytes) -> None:
+        lower_data = data.lower()
+        if CITATION_PAGE_MARKER.encode() in data:
+            self.seen_marker = True
+        for m in BLOCKED_MARKERS:
+            if m.encode() in lower_data:
+                self.seen_blocked = True
+        if data.strip() != b"":
+            self.seen_content = True
+
+    def scan(self, final: bool) -> None:
+        pos = 0
+        found = False
+        for match in self.ANCHOR_REGEX.finditer(self.buffer):
+            if (not final) and (match.end() == len(self.buffer)):  # the count may continue into the next chunk
+                break
+            year = int(match.group("year"))
+            self.counts[year] = self.counts.get(year, 0) + int(match.group("cnt"))
+            pos = match.end()
+            found = True
+        if found or (len(self.counts) > 0):
+            close = self.CLOSE_REGEX.search(self.buffer, pos)
+            if close is not None:
+                next_anchor = self.buffer.find(self.NEXT_ANCHOR, pos)
+                if (next_anchor == -1) or (next_anchor > close.start()):
+                    self.done = True
+        self.buffer = self.buffer[max(pos, len(self.buffer) - SCAN_TAIL_SIZE):]
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        add the next chunk of the page, returning True once the end of the histogram has been reached
+        """
+        if not self.done:
+            self.check_markers(self.buffer[-SCAN_TAIL_SIZE:] + chunk)
+            self.buffer += chunk
+            self.scan(False)
+        return self.done
+
+    def close(self) -> CitationHistogram:
+        if not self.done:
+            self.scan(True)
+            self.done = True
+        self.buffer = b""
+        return self.counts
+
+    def classification(self) -> str:
+        """
+        classify the scanned page in the same way as classify_page() does for a page returned with status 200
+        """
+        if self.seen_blocked:
+            return PAGE_BLOCKED
+        if not self.seen_content:
+            return PAGE_EMPTY
+        if not self.seen_marker:
+            return PAGE_MALFORMED
+        return PAGE_OK
+
+
+def scan_citation_histogram(chunks: Iterable[bytes]) -> HistogramScanner:
+    """
+    run a histogram scanner over an iterable of page chunks, stopping early once the histogram has been read
+    """
+    scanner = HistogramScanner()
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    scanner.close()
+    return scanner
+
+
+def read_file_chunks(filename: str, chunk_size: int = SCAN_CHUNK_SIZE):
+    with open(filename, "rb") as infile:
+        chunk = infile.read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = infile.read(chunk_size)
+
+
+def histogram_to_citations(histogram: CitationHistogram, pub_year: int) -> dict:
+    """
+    expand a histogram to a count for every year of the output, with n/a for years before publication and any
+    citations dated before the publication year credited to the publication year
+    """
+    citations = {y: 0 for y in range(START_YEAR, CURRENT_YEAR + 1)}
+    for y in range(START_YEAR, pub_year):  # set count to n/a for any year prior to publication year
+        citations[y] = "n/a"
+    for y, cnt in histogram.items():
+        if y < pub_year:
+            y = pub_year
+        citations[y] += cnt
+    return citations
 
 
 def read_input_data(filename: str):
@@ -53,9 +382,11 @@ def read_input_data(filename: str):
     return data, pub_list
 
 
-def fetch_pub_data(pub: Publication):
+def fetch_pub_data(pub: Publication, limiter: RateLimiter, trace: Optional[FetchTrace] = None):
     code = pub.code
-    page = get_webpage(f"https://scholar.google.com/citations?view_op=view_citation&hl=en&user=exyen9EAAAAJ&citation_for_view=exyen9EAAAAJ:{code}", "ISO-8859-1")
+    page = fetch_page(f"https://scholar.google.com/citations?view_op=view_citation&hl=en&user={SCHOLAR_USER}&"
+                      f"citation_for_view={SCHOLAR_USER}:{code}", "ISO-8859-1", CITATION_PAGE_MARKER, limiter, trace)
+    start = time.perf_counter()
     # print(page)
     # print()
 
@@ -66,63 +397,131 @@ def fetch_pub_data(pub: Publication):
     # pub_year = int(match.group("year"))
     pub_year = int(pub.year)
 
-    citations = {y: 0 for y in range(START_YEAR, CURRENT_YEAR + 1)}
-    for y in range(START_YEAR, pub_year):  # set count to n/a for any year prior to publication year
-        citations[y] = "n/a"
     # <a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2002&amp;as_yhi=2002" class="gsc_oci_g_a" style="left:5px;height:2px;top:55px;z-index:23"><span class="gsc_oci_g_al">3</span></a>
     # <a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=12480068626253116047,8651933093376463528&amp;as_sdt=5&amp;as_ylo=2003&amp;as_yhi=2003" class="gsc_oci_g_a" style="left:38px;height:2px;top:55px;z-index:22"><span class="gsc_oci_g_al">4</span></a>
-    regex = r'<a href="https://scholar.google.com/scholar\?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=.+?&amp;as_sdt=5&amp;as_ylo=(?P<year>\d{4})&amp;as_yhi=(?P<year2>\d{4})" class="gsc_oci_g_a" style=".+?"><span class="gsc_oci_g_al">(?P<cnt>\d+?)</span></a>'
-    # i = 0
-    for match in re.finditer(regex, page):
-        # i+=1
-        # print("match", i)
-        y = int(match.group("year"))
-        if y < pub_year:
-            y = pub_year
-        citations[y] += int(match.group("cnt"))
+    histogram = scan_citation_histogram([page.encode("ISO-8859-1")]).counts
+    citations = histogram_to_citations(histogram, pub_year)
 
     # for y in range(START_YEAR, CURRENT_YEAR + 1):
     #     print(y, citations[y])
+    if trace is not None:
+        trace.record("publication", code=code, cache="miss", parse=time.perf_counter() - start)
     return citations
 
 
 def fetch_pub_data_offline(pub: Publication):
     code = pub.code
-    try:
-        filename = f"scholar files/view-source_https___scholar.google.com_citations_view_op=view_citation&hl=en&user=exyen9EAAAAJ&citation_for_view=exyen9EAAAAJ_{code}.html"
-        with open(filename, "r", encoding="ISO-8859-1") as infile:
-            page = infile.read()
-    except FileNotFoundError:
+    filenames = [f"scholar files/view-source_https___scholar.google.com_citations_view_op=view_citation&hl=en&user=exyen9EAAAAJ&citation_for_view=exyen9EAAAAJ_{code}.html",
+                 f"scholar files/view-source_https___scholar.google.com_citations_view_op=view_citation&hl=en&user=exyen9EAAAAJ&cstart=20&pagesize=80&citation_for_view=exyen9EAAAAJ_{code}.html"]
+    scanner = None
+    for filename in filenames:
         try:
-            filename = f"scholar files/view-source_https___scholar.google.com_citations_view_op=view_citation&hl=en&user=exyen9EAAAAJ&cstart=20&pagesize=80&citation_for_view=exyen9EAAAAJ_{code}.html"
-                                     # view-source_https___scholar.google.com_citations_view_op=view_citation&hl=en&user=exyen9EAAAAJ&cstart=20&pagesize=80&citation_for_view=exyen9EAAAAJ_8k81kl-MbHgC
-            with open(filename, "r", encoding="ISO-8859-1") as infile:
-                page = infile.read()
+            scanner = scan_citation_histogram(read_file_chunks(filename))
+            break
         except FileNotFoundError:
-            print(f"{code} missing")
-    # print(page)
-    # print()
+            pass
+    if scanner is None:
+        print(f"{code} missing")
+        return None
+    classification = scanner.classification()
+    if classification != PAGE_OK:  # a saved captcha or truncated page is not the same as zero citations
+        print(f"{code} {classification}")
+        return None
+    return histogram_to_citations(scanner.counts, int(pub.year))
 
-    pub_year = int(pub.year)
 
-    citations = {y: 0 for y in range(START_YEAR, CURRENT_YEAR + 1)}
-    for y in range(START_YEAR, pub_year):  # set count to n/a for any year prior to publication year
-        citations[y] = "n/a"
-    # regex = r'<a.+?href="https://scholar.google.com/scholar\?oi=bibs&amp;hl=en&amp;oe=ASCII&amp;cites=.+?&amp;&amp;as_sdt=5&amp;as_ylo=(?P<year>\d{4})&amp;as_yhi=(?P<year2>\d{4})" class="gsc_oci_g_a" style=".+?"><span class="gsc_oci_g_al">(?P<cnt>\d+?)</span></a>'
-    regex = r'as_yhi=(?P<year>\d{4})</a>" <span class="html-attribute-name">class</span>="<span class="html-attribute-value">gsc_oci_g_a</span>" <span class="html-attribute-name">style</span>="<span class="html-attribute-value">.+?</span>"&gt;</span><span class="html-tag">&lt;span <span class="html-attribute-name">class</span>="<span class="html-attribute-value">gsc_oci_g_al</span>"&gt;</span>(?P<cnt>\d+?)<span class="html-tag">'
+def extract_profile_totals(page: str) -> dict:
+    """
+    extract the total citation count for every publication listed on a single page of a profile listing
+    """
+    # <a href="/citations?view_op=view_citation&amp;hl=en&amp;user=exyen9EAAAAJ&amp;pagesize=100&amp;citation_for_view=exyen9EAAAAJ:ypzvKOdbExQC" class="gsc_a_at">...</a>...<a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;cites=..." class="gsc_a_ac gs_ibl">1930</a>
+    # uncited publications have an empty count: <a href="javascript:void(0)" class="gsc_a_ac gs_ibl gsc_a_acm"></a>
+    regex = r'citation_for_view=[\w-]+?:(?P<code>[\w-]+?)" class="gsc_a_at">.+?' \
+            r'class="gsc_a_ac gs_ibl[^"]*?">(?P<cnt>\d*)</a>'
+    totals = {}
+    for row in page.split('<tr class="gsc_a_tr">')[1:]:
+        match = re.search(regex, row)
+        if match is not None:
+            cnt = match.group("cnt")
+            if cnt == "":
+                totals[match.group("code")] = 0
+            else:
+                totals[match.group("code")] = int(cnt)
+    return totals
 
-    for match in re.finditer(regex, page):
-        y = int(match.group("year"))
-        if y < pub_year:
-            y = pub_year
-        citations[y] += int(match.group("cnt"))
 
-    return citations
+def fetch_profile_totals(limiter: RateLimiter, trace: Optional[FetchTrace] = None) -> dict:
+    """
+    phase one of an online fetch: walk the paginated profile listing, which reports the current total citation
+    count of up to PROFILE_PAGE_SIZE publications per request
+    """
+    totals = {}
+    cstart = 0
+    while True:
+        page = fetch_page(f"https://scholar.google.com/citations?user={SCHOLAR_USER}&hl=en&"
+                          f"cstart={cstart}&pagesize={PROFILE_PAGE_SIZE}", "ISO-8859-1", PROFILE_PAGE_MARKER, limiter,
+                          trace)
+        start = time.perf_counter()
+        page_totals = extract_profile_totals(page)
+        if trace is not None:
+            trace.record("profile page", cstart=cstart, n_pubs=len(page_totals), parse=time.perf_counter() - start)
+        totals.update(page_totals)
+        if len(page_totals) < PROFILE_PAGE_SIZE:  # a short page is the last page
+            return totals
+        cstart += PROFILE_PAGE_SIZE
+
+
+def read_cached_totals(filename: str) -> dict:
+    """
+    read the citation totals recorded at the end of the previous online fetch
+    """
+    totals = {}
+    try:
+        with open(filename, "r") as infile:
+            for line in infile:
+                if line.strip() != "":
+                    code, total = line.strip().split("\t")
+                    totals[code] = int(total)
+    except FileNotFoundError:
+        pass
+    return totals
+
+
+def write_cached_totals(filename: str, totals: dict) -> None:
+    with open(filename, "w") as outfile:
+        for code in totals:
+            outfile.write(f"{code}\t{totals[code]}\n")
+
+
+def read_cached_counts(filename: str) -> dict:
+    """
+    read the yearly citation counts of each publication (by Google Scholar code) from a previous output file.
+    years added since that file was written are filled in with zero counts
+    """
+    counts = {}
+    try:
+        with open(filename, "r") as infile:
+            for line in infile:
+                if line.strip() != "":
+                    dat = line.strip().split("\t")
+                    citations = {y: 0 for y in range(START_YEAR, CURRENT_YEAR + 1)}
+                    for i, c in enumerate(dat[5:]):
+                        if START_YEAR + i in citations:
+                            if c == "n/a":
+                                citations[START_YEAR + i] = c
+                            else:
+                                citations[START_YEAR + i] = int(c)
+                    counts[dat[4]] = citations
+    except FileNotFoundError:
+        pass
+    return counts
 
 
 def write_output(pub_list, pub_data, citation_cnts):
-    with open("google_scholar_citation_data.txt", "w") as outfile:
+    with open(OUTPUT_FILE, "w") as outfile:
         for pub in pub_list:
+            if pub not in citation_cnts:  # publications which could not be fetched are left out, not written as zero
+                continue
             data = pub_data[pub]
             output = [data.year, data.n_authors, data.author_order, data.label, data.code]
             for y in range(START_YEAR, CURRENT_YEAR + 1):
@@ -138,6 +537,53 @@ def write_output(pub_list, pub_data, citation_cnts):
         #     print("\t".join(data))
 
 
+def fetch_changed_counts(pub_data: dict, pub_list: list, totals: dict, cached_totals: dict, cached_counts: dict,
+                         fetch, trace: Optional[FetchTrace] = None) -> dict:
+    """
+    phase two of an online fetch: the yearly citation counts of every publication, fetched (by fetch(pub), which
+    raises FetchError on failure) only for those whose total has changed since the cached counts were written.
+    a publication which still fails after MAX_REQUEUES requeues keeps its cached counts, and its entry in totals is
+    put back to the cached total (or removed) so it is retried on the next run
+    """
+    citation_cnts = {}
+    refetch = []
+    for pub in pub_list:
+        code = pub_data[pub].code
+        if (code in cached_counts) and (code in totals) and (cached_totals.get(code) == totals[code]):
+            citation_cnts[pub] = cached_counts[code]
+            if trace is not None:
+                trace.record("publication", code=code, cache="hit")
+        else:
+            refetch.append(pub)
+    print(f"{len(pub_list) - len(refetch)} publications unchanged, {len(refetch)} to fetch")
+    # failed publications go to the back of the queue so a temporary block does not stall the rest of the run
+    queue = deque((pub, 0) for pub in refetch)
+    failed = []
+    with tqdm.tqdm(total=len(refetch)) as progress:
+        while len(queue) > 0:
+            pub, requeues = queue.popleft()
+            try:
+                citation_cnts[pub] = fetch(pub_data[pub])
+                progress.update()
+            except FetchError:
+                if requeues < MAX_REQUEUES:
+                    queue.append((pub, requeues + 1))
+                else:
+                    failed.append(pub)
+                    progress.update()
+    for pub in failed:
+        code = pub_data[pub].code
+        print(f"Failed to fetch {pub}")
+        # keep the previous data (and previous total, so it is retried next run) rather than writing zeros
+        if code in cached_counts:
+            citation_cnts[pub] = cached_counts[code]
+        if code in cached_totals:
+            totals[code] = cached_totals[code]
+        else:
+            totals.pop(code, None)
+    return citation_cnts
+
+
 def main_online():
     print("Get Data from Google Scholar")
     print()
@@ -147,25 +593,24 @@ def main_online():
         data_name = default
     pub_data, pub_list = read_input_data(data_name)
     print()
-    # testing = True
-    citation_cnts ={}
-    # cnt = 0
-    for pub in tqdm.tqdm(pub_list):
-
-        # cnt += 1
-        # if cnt == 11:  # switch server every 10 fetches
-        #     cnt = 1
-        #     input("Change server. Press enter to continue")
-
-        # print("Fetching data from", pub)
-        citation_cnts[pub] = fetch_pub_data(pub_data[pub])
-        time.sleep(5)
-        # if testing:
-        #     time.sleep(5)
-        #     testing = False
-        #     print("Fetching data from", pub)
-        #     citation_cnts[pub] = fetch_pub_data(pub_data[pub])
+    limiter = RateLimiter()
+    trace = FetchTrace()
+    # phase one: current totals for every publication from the profile listing
+    print("Fetching profile listing")
+    try:
+        totals = fetch_profile_totals(limiter, trace)
+    except FetchError as err:
+        print(f"Unable to fetch profile listing ({err.classification}). Try again later.")
+        trace.write(TRACE_FILE)
+        return
+    cached_totals = read_cached_totals(TOTALS_FILE)
+    cached_counts = read_cached_counts(OUTPUT_FILE)
+    citation_cnts = fetch_changed_counts(pub_data, pub_list, totals, cached_totals, cached_counts,
+                                         lambda pub: fetch_pub_data(pub, limiter, trace), trace)
     write_output(pub_list, pub_data, citation_cnts)
+    write_cached_totals(TOTALS_FILE, totals)
+    trace.write(TRACE_FILE)
+    print(trace.summary())
 
 
 def main_offline():
@@ -179,7 +624,9 @@ def main_offline():
     print()
     citation_cnts ={}
     for pub in tqdm.tqdm(pub_list):
-        citation_cnts[pub] = fetch_pub_data_offline(pub_data[pub])
+        citations = fetch_pub_data_offline(pub_data[pub])
+        if citations is not None:
+            citation_cnts[pub] = citations
     write_output(pub_list, pub_data, citation_cnts)
 
 
@@ -5,7 +5,11 @@ This is test code and may not work for long (if at all) as Google constantly cha
 # import urllib.request
 import datetime
 # import time
-import requests
+from collections import deque
+from typing import Optional
+import Fetch_Google_Scholar
+
+RESULTS_PAGE_MARKER = "gs_ab_md"  # header of every search results page, including those without any results
 
 
 class Publication:
@@ -34,20 +38,16 @@ def read_input_data(file_name: str) -> list:
     return input_data
 
 
-def get_webpage(url: str, encoding: str) -> str:
+def get_webpage(url: str, encoding: str, limiter: Fetch_Google_Scholar.RateLimiter,
+                trace: Optional[Fetch_Google_Scholar.FetchTrace] = None) -> str:
     """
     function to fetch the webpage specifed by url and
     return a single string containing the contents of the page
+
+    requests go through the fetch layer of Fetch_Google_Scholar: they are rate limited, and retried with backoff
+    until the page is classified as a valid results page. FetchError is raised if it never is
     """
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_2) AppleWebKit/601.3.9 '
-                             '(KHTML, like Gecko) Version/9.0.2 Safari/601.3.9'}
-    # webpage = urllib.request.urlopen(url, headers=headers)
-    webpage = requests.get(url, headers=headers)
-    # page = webpage.read()
-    # page = page.decode(encoding, "ignore")
-    # return page
-    # print(webpage.text)
-    return webpage.text
+    return Fetch_Google_Scholar.fetch_page(url, encoding, RESULTS_PAGE_MARKER, limiter, trace)
 
 
 def extract_cite_count(page: str) -> int:
@@ -74,9 +74,15 @@ def dump_page(text: str, pub: Publication, year: str) -> None:
         outfile.write(text)
 
 
-def fetch_pub_data(pub: Publication) -> None:
-    req_cnt = 0
-    min_req_cnt = 0
+def fetch_cite_count(url: str, pub: Publication, year: str, limiter: Fetch_Google_Scholar.RateLimiter,
+                     trace: Optional[Fetch_Google_Scholar.FetchTrace] = None) -> int:
+    page = get_webpage(url, "UTF-8", limiter, trace)
+    dump_page(page, pub, year)
+    return extract_cite_count(page)
+
+
+def fetch_pub_data(pub: Publication, limiter: Fetch_Google_Scholar.RateLimiter,
+                   trace: Optional[Fetch_Google_Scholar.FetchTrace] = None) -> None:
     current_year = datetime.datetime.now().year
     # reset citation data
     pub.cite_data["total"] = 0
@@ -88,61 +94,51 @@ def fetch_pub_data(pub: Publication) -> None:
         with open("scraper_api_key.txt", "r") as infile:
             apikey = infile.read().strip()
         # curl "http://api.scraperapi.com?api_key=23038b92027c20f7ed0ed02852911337&url=http://httpbin.org/ip"
-        scraper_url = "http://api.scraperapi.com?api_key=" + apikey + "&url="
+        scraper_url = "https://api.scraperapi.com?api_key=" + apikey + "&url="
 
         total_prefix = "https://scholar.google.com/scholar?oi=bibs&hl=en&cites="
         sub_prefix = "https://scholar.google.com/scholar?hl=en&as_sdt=0%2C47&sciodt=0%2C47&cites={}&scipsc="
-        try_again = True
-        try_cnt = 0
-        total_cites = -1
-        min_req_cnt += 1
-        while try_again and try_cnt < 5:
-            req_cnt += 1
-            total_page = get_webpage(scraper_url + total_prefix + pub.citation_nums, "UTF-8")
-            dump_page(total_page, pub, "total")
-            total_cites = extract_cite_count(total_page)
-            try_cnt += 1
-            if total_cites > -1:
-                try_again = False
+        total_cites = fetch_cite_count(scraper_url + total_prefix + pub.citation_nums, pub, "total", limiter, trace)
         print("  Total:", total_cites)
         pub.cite_data["total"] = total_cites
         if total_cites > 0:
             # everything up publication year
             start_year = int(pub.year)
             # start_year = 1997
-            # time.sleep(45)
-            try_again = True
-            try_cnt = 0
-            y_cites = -1
-            min_req_cnt += 1
-            while try_again and try_cnt < 5:
-                req_cnt += 1
-                year_page = get_webpage(scraper_url + sub_prefix.format(pub.citation_nums) + "&as_yhi={0}".format(start_year), "UTF-8")
-                dump_page(year_page, pub, str(start_year))
-                y_cites = extract_cite_count(year_page)
-                if y_cites > -1:
-                    try_again = False
+            y_cites = fetch_cite_count(scraper_url + sub_prefix.format(pub.citation_nums) +
+                                       "&as_yhi={0}".format(start_year), pub, str(start_year), limiter, trace)
             print("  -"+str(start_year), y_cites)
             pub.cite_data[start_year] = y_cites
             for y in range(start_year+1, current_year+1):  # one year at a time
-                # time.sleep(45)
-                try_again = True
-                try_cnt = 0
-                y_cites = -1
-                min_req_cnt += 1
-                while try_again and try_cnt < 5:
-                    req_cnt += 1
-                    year_page = get_webpage(scraper_url + sub_prefix.format(pub.citation_nums) + "&as_ylo={0}&as_yhi={0}".format(y), "UTF-8")
-                    dump_page(year_page, pub, str(y))
-                    y_cites = extract_cite_count(year_page)
-                    if y_cites > -1:
-                        try_again = False
+                y_cites = fetch_cite_count(scraper_url + sub_prefix.format(pub.citation_nums) +
+                                           "&as_ylo={0}&as_yhi={0}".format(y), pub, str(y), limiter, trace)
                 print(" ", y, y_cites)
                 pub.cite_data[y] = y_cites
         else:  # skip searching google scholar and add numbers for uncited pubs
             for y in range(1997, current_year+1):
                 pub.cite_data[y] = 0
-    print("# requests = {}, minimum possible requests = {}".format(req_cnt, min_req_cnt))
+
+
+def fetch_all_pub_data(pub_data: list, limiter: Fetch_Google_Scholar.RateLimiter,
+                       trace: Optional[Fetch_Google_Scholar.FetchTrace] = None) -> None:
+    """
+    fetch the data of every publication. a publication whose pages cannot be fetched is sent to the back of the
+    queue, up to MAX_REQUEUES times; if it still fails, all of its counts are set to -1 (unknown)
+    """
+    queue = deque((pub, 0) for pub in pub_data)
+    while len(queue) > 0:
+        pub, requeues = queue.popleft()
+        print("Fetching data from", pub.article_code)
+        try:
+            fetch_pub_data(pub, limiter, trace)
+        except Fetch_Google_Scholar.FetchError as error:
+            if requeues < Fetch_Google_Scholar.MAX_REQUEUES:
+                print("  Requeued after", error)
+                queue.append((pub, requeues + 1))
+            else:
+                print("  Failed:", error)
+                for key in pub.cite_data:
+                    pub.cite_data[key] = -1
 
 
 def write_output(pub_data: list) -> None:
@@ -182,9 +178,9 @@ def main():
         data_name = default
     pub_data = read_input_data(data_name)
     print()
-    for pub in pub_data:
-        print("Fetching data from", pub.article_code)
-        fetch_pub_data(pub)
+    trace = Fetch_Google_Scholar.FetchTrace()
+    fetch_all_pub_data(pub_data, Fetch_Google_Scholar.RateLimiter(), trace)
+    print(trace.summary())
     write_output(pub_data)
 
 
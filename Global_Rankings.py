@@ -0,0 +1,325 @@
+# Global rankings
+"""
+This module places a researcher within the science-wide author databases of standardized citation indicators
+(Ioannidis et al. 2019, and its yearly updates; see "Global Rankings/data and paper location.txt" for where the
+releases can be downloaded).
+
+Each release ranks several hundred thousand scientists by six indicators, with and without self-citations (the
+"(ns)" columns), and by the composite indicator c built from them:
+* nc: total citations
+* h: h-index
+* hm: Schreiber's hm-index
+* ncs: citations to single-authored papers
+* ncsf: citations to single and first-authored papers
+* ncsfl: citations to single, first, and last-authored papers
+* c: the sum of log(1 + x) / log(1 + max x) over the six indicators, where max x is the largest value of the
+  indicator in the database (the "maxlog" tables, e.g., Table-S10-maxlog-2019-career.csv)
+
+A release file (the career-long table, saved as csv) is read once and every indicator column is stored, sorted, in a
+compact binary cache next to it. From then on the cache is memory-mapped rather than read, and a researcher is
+placed in each column by binary search.
+
+    python Global_Rankings.py release.csv [release2.csv ...] --citations cites.txt [--self self.txt]
+                              [--coauthor coauth.txt]
+
+the indicators of the researcher are calculated for the last date of their citation data. without self-citation
+data, only the indicators which include self-citations are placed. the database counts citations from any coauthor
+as self-citations, so the coauthor-citation file should be given too for the "(ns)" indicators to match
+"""
+
+import argparse
+import array
+import bisect
+import csv
+import glob
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from typing import Optional
+
+import Impact_Cohort
+import Impact_Defs
+import Impact_Funcs
+import ImpactFactorCalculator
+
+INDICATORS = ("nc", "h", "hm", "ncs", "ncsf", "ncsfl")
+COMPOSITE = "c"
+NO_SELF = " (ns)"
+# the columns of every indicator; the year suffixes of nc, h, and hm change with each release
+INDICATOR_PATTERNS = {"nc": r"nc\d{4}", "h": r"h\d{2}", "hm": r"hm\d{2}", "ncs": r"ncs", "ncsf": r"ncsf",
+                      "ncsfl": r"ncsfl", "c": r"c"}
+CACHE_SUFFIX = ".ranks"
+CACHE_VERSION = 1
+
+
+def indicator_name(column: str) -> Optional[str]:
+    """
+    the indicator held by a column of a release or maxlog table (e.g., "h19 (ns)" -> "h (ns)"), or None for any
+    other column
+    """
+    column = column.strip()
+    no_self = column.endswith(NO_SELF)
+    if no_self:
+        column = column[:-len(NO_SELF)].strip()
+    for name, pattern in INDICATOR_PATTERNS.items():
+        if re.fullmatch(pattern, column):
+            return name + NO_SELF if no_self else name
+    return None
+
+
+def read_maxlog(filename: str) -> dict:
+    """
+    log(1 + largest value) of every indicator, from a maxlog table
+    """
+    with open(filename, "r", encoding="utf-8-sig", newline="") as infile:
+        reader = csv.reader(infile)
+        header = next(reader)
+        values = next(reader)
+    maxlog = {}
+    for column, value in zip(header, values):
+        name = indicator_name(column)
+        if name is not None:
+            maxlog[name] = float(value)
+    return maxlog
+
+
+def find_maxlog(release_name: str) -> Optional[str]:
+    """
+    the maxlog table in the same directory as a release, preferring the one for the same kind of table (career or
+    single year) when there are several
+    """
+    tables = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(release_name)), "*maxlog*.csv")))
+    if len(tables) == 0:
+        return None
+    for kind in ("career", "singlyr"):
+        if kind in os.path.basename(release_name):
+            for table in tables:
+                if kind in os.path.basename(table):
+                    return table
+    return tables[0]
+
+
+def composite_indicator(indicators: dict, maxlog: dict, no_self: bool = False) -> Optional[float]:
+    """
+    the composite indicator c of a set of indicators, or None if any indicator (or its maxlog) is missing
+    """
+    suffix = NO_SELF if no_self else ""
+    c = 0
+    for name in INDICATORS:
+        if (name + suffix not in indicators) or (name + suffix not in maxlog):
+            return None
+        c += math.log(1 + indicators[name + suffix]) / maxlog[name + suffix]
+    return c
+
+
+# --- binary cache of a release ---
+def source_stamp(filename: str) -> dict:
+    stat = os.stat(filename)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def read_release_columns(filename: str) -> dict:
+    """
+    stream a release table, keeping only the indicator columns, each as a compact array of doubles. rows without a
+    number in a column are left out of that column
+    """
+    with open(filename, "r", encoding="utf-8-sig", newline="") as infile:
+        reader = csv.reader(infile)
+        header = next(reader)
+        positions = {}
+        for i, column in enumerate(header):
+            name = indicator_name(column)
+            if (name is not None) and (name not in positions):
+                positions[name] = i
+        columns = {name: array.array("d") for name in positions}
+        for row in reader:
+            for name, i in positions.items():
+                if i < len(row):
+                    try:
+                        value = float(row[i])
+                    except ValueError:
+                        continue
+                    if math.isfinite(value):
+                        columns[name].append(value)
+    return columns
+
+
+def write_cache(cache_name: str, columns: dict, stamp: dict) -> None:
+    """
+    the cache holds an 8-byte header length, a json header (with the source file's size and time, so a changed
+    release is noticed, and the offset and length of every column), and then every sorted column as native doubles
+    """
+    offsets = {}
+    position = 0
+    for name, values in columns.items():
+        offsets[name] = [position, len(values)]
+        position += 8 * len(values)
+    header = {"version": CACHE_VERSION, "byteorder": sys.byteorder, "source": stamp, "columns": offsets}
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 8)  # keep the columns aligned
+    with open(cache_name, "wb") as outfile:
+        outfile.write(struct.pack("<Q", len(header_bytes)))
+        outfile.write(header_bytes)
+        for values in columns.values():
+            outfile.write(array.array("d", sorted(values)).tobytes())
+
+
+def read_cache_header(cache_name: str) -> Optional[dict]:
+    try:
+        with open(cache_name, "rb") as infile:
+            header_length = struct.unpack("<Q", infile.read(8))[0]
+            header = json.loads(infile.read(header_length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return None
+    header["data_start"] = 8 + header_length
+    return header
+
+
+class ReleaseRanking:
+    """
+    the sorted indicator columns of a release, memory-mapped from its cache
+    """
+    def __init__(self, release_name: str, cache_name: Optional[str] = None, rebuild: bool = False):
+        self.release_name = release_name
+        if cache_name is None:
+            cache_name = release_name + CACHE_SUFFIX
+        self.cache_name = cache_name
+        stamp = source_stamp(release_name)
+        header = None if rebuild else read_cache_header(cache_name)
+        if (header is None) or (header.get("version") != CACHE_VERSION) or \
+                (header.get("byteorder") != sys.byteorder) or (header.get("source") != stamp):
+            write_cache(cache_name, read_release_columns(release_name), stamp)
+            header = read_cache_header(cache_name)
+        self.infile = open(cache_name, "rb")
+        if os.fstat(self.infile.fileno()).st_size > header["data_start"]:
+            self.map = mmap.mmap(self.infile.fileno(), 0, access=mmap.ACCESS_READ)
+            data = memoryview(self.map)
+        else:  # an empty release; an empty file cannot be mapped
+            self.map = None
+            data = memoryview(b"")
+        self.columns = {}
+        for name, (offset, count) in header["columns"].items():
+            start = header["data_start"] + offset
+            self.columns[name] = data[start:start + 8 * count].cast("d")
+
+    def percentile(self, name: str, value: float) -> Optional[float]:
+        """
+        the percentile of a value within an indicator column (the percentage of scientists with a lower value,
+        counting half of those with an equal value), or None if the release does not include the indicator
+        """
+        column = self.columns.get(name)
+        if (column is None) or (len(column) == 0):
+            return None
+        below = bisect.bisect_left(column, value)
+        equal = bisect.bisect_right(column, value) - below
+        return Impact_Cohort.percentile_rank(below, equal, len(column))
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        if self.map is not None:
+            self.map.close()
+        self.infile.close()
+
+
+# --- indicators of a researcher ---
+def researcher_indicators(metric_set: Impact_Defs.MetricSet, inc_self: bool = True,
+                          maxlog: Optional[dict] = None) -> dict:
+    """
+    the six indicators (and, with the maxlog values, the composite) of the database for a researcher on the date of
+    a metric set, both with self-citations and, if self-citations are known, without them. as in the database,
+    citations from coauthors (if known) are removed along with the researcher's own self-citations
+    """
+    n_authors = metric_set.author_counts()
+    author_pos = metric_set.author_position()
+    versions = [("", metric_set.citations)]
+    if inc_self and (metric_set.self_citations is not None):
+        coauthor_citations = metric_set.coauthor_citations
+        if coauthor_citations is None:
+            coauthor_citations = [0 for _ in metric_set.citations]
+        versions.append((NO_SELF, [c - s - a for c, s, a in zip(metric_set.citations, metric_set.self_citations,
+                                                                  coauthor_citations)]))
+    indicators = {}
+    for suffix, citations in versions:
+        single = [c for i, c in enumerate(citations) if n_authors[i] == 1]
+        first = [c for i, c in enumerate(citations) if (n_authors[i] == 1) or (author_pos[i] == 1)]
+        last = [c for i, c in enumerate(citations) if (n_authors[i] == 1) or (author_pos[i] == 1) or
+                (author_pos[i] == n_authors[i])]
+        indicators["nc" + suffix] = sum(citations)
+        indicators["h" + suffix] = Impact_Funcs.get_rank_value(sorted(citations, reverse=True))
+        indicators["hm" + suffix] = Impact_Funcs.calculate_hm_index(citations, n_authors)
+        indicators["ncs" + suffix] = sum(single)
+        indicators["ncsf" + suffix] = sum(first)
+        indicators["ncsfl" + suffix] = sum(last)
+        if maxlog is not None:
+            c = composite_indicator(indicators, maxlog, suffix == NO_SELF)
+            if c is not None:
+                indicators[COMPOSITE + suffix] = c
+    return indicators
+
+
+def place_researcher(indicators: dict, rankings: list) -> dict:
+    """
+    the percentile of every indicator within every release, as {indicator: {release name: percentile}}
+    """
+    placement = {}
+    for name, value in indicators.items():
+        placement[name] = {}
+        for ranking in rankings:
+            percentile = ranking.percentile(name, value)
+            if percentile is not None:
+                placement[name][ranking.release_name] = percentile
+    return placement
+
+
+def main():
+    parser = argparse.ArgumentParser(description="place a researcher within global citation rankings")
+    parser.add_argument("releases", nargs="+", help="release tables (csv)")
+    parser.add_argument("--citations", required=True, help="citation file of the researcher")
+    parser.add_argument("--self", default="", help="self-citation file of the researcher")
+    parser.add_argument("--coauthor", default="", help="coauthor-citation file of the researcher")
+    parser.add_argument("--maxlog", help="maxlog table for the composite indicator (default: the one next to the "
+                                         "first release)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the cached columns of the releases")
+    args = parser.parse_args()
+
+    date_list, article_list = ImpactFactorCalculator.read_data_file(args.citations)
+    inc_self = args.self != ""
+    inc_coauth = inc_self and (args.coauthor != "")
+    if inc_self:
+        ImpactFactorCalculator.read_self_citation_files(article_list, args.self, args.coauthor)
+    metric_set = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, inc_self, inc_coauth)[-1]
+    maxlog_name = args.maxlog if args.maxlog is not None else find_maxlog(args.releases[0])
+    maxlog = read_maxlog(maxlog_name) if maxlog_name is not None else None
+    indicators = researcher_indicators(metric_set, inc_self, maxlog)
+
+    start = time.perf_counter()
+    rankings = [ReleaseRanking(name, rebuild=args.rebuild) for name in args.releases]
+    loaded = time.perf_counter()
+    placement = place_researcher(indicators, rankings)
+    placed = time.perf_counter()
+    n_lookups = sum(len(p) for p in placement.values())
+    for ranking in rankings:
+        ranking.close()
+
+    print(f"Indicators for {ImpactFactorCalculator.date_to_string(metric_set.date)}")
+    header = f"{'':<14}{'value':>12}" + "".join(f"{os.path.basename(r)[:22]:>24}" for r in args.releases)
+    print(header)
+    for name, value in indicators.items():
+        line = f"{name:<14}{value:>12.4g}"
+        for release in args.releases:
+            percentile = placement[name].get(release)
+            line += f"{'—' if percentile is None else format(percentile, '.2f'):>24}"
+        print(line)
+    print(f"Releases loaded in {(loaded - start) * 1000:.1f} ms; {n_lookups} lookups in "
+          f"{(placed - loaded) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
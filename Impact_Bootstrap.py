@@ -0,0 +1,296 @@
+# Bootstrap confidence intervals
+"""
+This module estimates how stable a researcher's metric values are: the publications active at a snapshot are
+resampled with replacement many times, every scalar metric is recalculated for each resample, and the spread of the
+resampled values gives a (percentile) bootstrap confidence interval for the metric.
+
+The resamples of a snapshot are drawn from a seeded random number generator, so results are reproducible, and the
+same resamples are used for every metric.
+
+The h-family (h, g, h(2), hg, a, R, e, i10, total and h-core cites) only depends on the sorted citation counts, so
+when numpy is available these are calculated for all resamples at once from a matrix of resampled citations (one
+row per resample). every other metric is calculated from a full metric set built for each resample, split among
+worker processes if requested. metrics which depend on the date or on earlier snapshots have the history of every
+resample built as well, so are much slower to resample
+
+    python Impact_Bootstrap.py cites.txt [self.txt coauth.txt] --metrics h-index g-index --resamples 1000
+    python Impact_Bootstrap.py cites.txt --all-dates --processes 8
+"""
+
+import argparse
+import math
+import multiprocessing
+import random
+from typing import Optional
+
+import Impact_Cohort
+import Impact_Defs
+import Impact_Funcs
+import ImpactFactorCalculator
+
+N_RESAMPLES = 1000
+CONFIDENCE = 0.95
+SEED = 1
+BATCHED_METRICS = ("total cites", "h-index", "g-index", "h(2)-index", "hg-index", "h-core cites", "a-index",
+                   "R-index", "e-index", "i10")
+
+
+class BootstrapInterval:
+    """
+    the observed value of a metric at a snapshot and its bootstrap confidence interval
+    """
+    def __init__(self, name: str, date, value, low: Optional[float], high: Optional[float], n_resamples: int):
+        self.name = name
+        self.date = date
+        self.value = value
+        self.low = low
+        self.high = high
+        self.n_resamples = n_resamples  # resamples for which the metric could be calculated
+
+
+def resample_indices(n_pubs: int, n_resamples: int, seed: int, snapshot: int) -> list:
+    """
+    the publications (by position) of every resample of a snapshot. each snapshot has its own generator, so the
+    resamples of a snapshot do not depend on which other snapshots are resampled
+    """
+    rng = random.Random(f"{seed}:{snapshot}")
+    pubs = range(n_pubs)
+    return [rng.choices(pubs, k=n_pubs) for _ in range(n_resamples)]
+
+
+def scalar_value(metric: Impact_Defs.Metric) -> Optional[float]:
+    """
+    the value of a metric, or None if it cannot be calculated or is not a number (e.g., "n/a")
+    """
+    try:
+        value = metric.value
+    except (ArithmeticError, ValueError, IndexError):
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    return None
+
+
+def scalar_metric_names(metric_set: Impact_Defs.MetricSet, metric_names: Optional[list], inc_self: bool,
+                        inc_coauth: bool) -> list:
+    """
+    the scalar metrics among those named (or all of them), leaving out self and coauthor citation metrics when
+    those citations are not included
+    """
+    names = []
+    for name in (metric_set.metric_names if metric_names is None else metric_names):
+        metric = metric_set.metrics[name]
+        if (metric.metric_type in Impact_Cohort.SCALAR_TYPES) and (inc_self or not metric.is_self) and \
+                (inc_coauth or not metric.is_coauthor):
+            names.append(name)
+    return names
+
+
+# --- batched kernels ---
+def first_failure(np, passed):
+    """
+    for every row of a boolean matrix, the position of its first False (or the row length if there are none)
+    """
+    return np.where(passed.all(axis=1), passed.shape[1], np.argmin(passed, axis=1))
+
+
+def batched_values(citations: list, indices: list, names: list) -> dict:
+    """
+    the values of h-family metrics for every resample, calculated together from the matrix of resampled citations
+    """
+    np = Impact_Funcs.load_numpy()
+    resampled = np.asarray(citations, dtype=np.int64)[np.asarray(indices, dtype=np.intp)]
+    return matrix_values(np, resampled, names)
+
+
+def matrix_values(np, citations, names: list) -> dict:
+    """
+    the values of h-family metrics for every row of a matrix of citation counts (one row per resample or
+    trajectory), calculated together from the rows sorted from highest to lowest. values which cannot be calculated
+    (e.g., the a-index when h is zero) are None
+    """
+    ordered = -np.sort(-citations, axis=1)
+    ranks = np.arange(1, ordered.shape[1] + 1)
+    cumulative = np.cumsum(ordered, axis=1)
+    h = first_failure(np, ordered >= ranks)
+    core = np.where(h > 0, cumulative[np.arange(len(h)), np.maximum(h - 1, 0)], 0)
+    g = first_failure(np, cumulative >= ranks ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kernels = {"total cites": lambda: cumulative[:, -1],
+                   "h-index": lambda: h,
+                   "g-index": lambda: g,
+                   "h(2)-index": lambda: first_failure(np, np.sqrt(ordered) >= ranks),
+                   "hg-index": lambda: np.sqrt(h * g),
+                   "h-core cites": lambda: core,
+                   "a-index": lambda: np.where(h > 0, core / np.maximum(h, 1), np.nan),
+                   "R-index": lambda: np.sqrt(core),
+                   "e-index": lambda: np.sqrt(core - h ** 2),
+                   "i10": lambda: (citations >= 10).sum(axis=1)}
+        values = {}
+        for name in names:
+            column = kernels[name]()
+            if column.dtype.kind == "f":
+                values[name] = [v if math.isfinite(v) else None for v in column.tolist()]
+            else:
+                values[name] = column.tolist()
+    return values
+
+
+# --- recalculation of resampled metric sets ---
+worker_data = None  # (date_list, article_list, inc_self, inc_coauth) of the researcher, set in every worker
+
+
+def set_worker_data(date_list: list, article_list: list, inc_self: bool, inc_coauth: bool) -> None:
+    global worker_data
+    worker_data = (date_list, article_list, inc_self, inc_coauth)
+
+
+def resampled_values(snapshot: int, indices: list, names: list, history: bool) -> dict:
+    """
+    the values of the metrics for every resample of a snapshot, each calculated from a metric set of the resampled
+    publications (and, if any metric needs it, the metric sets of the same publications at every earlier date)
+    """
+    date_list, article_list, inc_self, inc_coauth = worker_data
+    active = [a for a in article_list if a.citations[snapshot] is not None]
+    values = {name: [] for name in names}
+    for row in indices:
+        articles = [active[i] for i in row]
+        if history:
+            metric_set = ImpactFactorCalculator.calculate_all_metrics(date_list[:snapshot + 1], articles, inc_self,
+                                                                      inc_coauth)[-1]
+        else:
+            metric_set = ImpactFactorCalculator.calculate_metrics(snapshot, date_list, articles, inc_self, inc_coauth)
+        metric_set.metrics["h-index"].value  # make sure the core has been identified
+        for name in names:
+            values[name].append(scalar_value(metric_set.metrics[name]))
+    return values
+
+
+def start_workers(processes: int, date_list: list, article_list: list, inc_self: bool, inc_coauth: bool):
+    """
+    a pool of worker processes which each hold the researcher's data, or None (with the data kept by this process)
+    if there is only one process
+    """
+    if processes > 1:
+        return multiprocessing.Pool(processes, initializer=set_worker_data,
+                                    initargs=(date_list, article_list, inc_self, inc_coauth))
+    set_worker_data(date_list, article_list, inc_self, inc_coauth)
+    return None
+
+
+def stop_workers(pool) -> None:
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+
+def recalculated_values(pool, processes: int, snapshot: int, indices: list, names: list) -> dict:
+    """
+    the values of the metrics for every resample of a snapshot, with the resamples split into contiguous chunks
+    among the worker processes (if any), so the values are in the same order however many processes are used
+    """
+    history = any(n in Impact_Defs.date_dependent_metrics() for n in names)
+    if pool is None:
+        return resampled_values(snapshot, indices, names, history)
+    size = math.ceil(len(indices) / processes)
+    parts = pool.starmap(resampled_values, [(snapshot, indices[i:i + size], names, history)
+                                            for i in range(0, len(indices), size)])
+    return {name: [v for part in parts for v in part[name]] for name in names}
+
+
+def confidence_interval(values: list, confidence: float) -> tuple:
+    """
+    the percentile bootstrap interval of the resampled values which could be calculated, and their count
+    """
+    distribution = Impact_Cohort.ExactDistribution()
+    for v in values:
+        if v is not None:
+            distribution.add(v)
+    if distribution.count == 0:
+        return None, None, 0
+    alpha = (1 - confidence) / 2
+    return distribution.quantile(alpha), distribution.quantile(1 - alpha), distribution.count
+
+
+def bootstrap_intervals(date_list: list, article_list: list, inc_self: bool, inc_coauth: bool,
+                        metric_names: Optional[list] = None, snapshots: Optional[list] = None,
+                        n_resamples: int = N_RESAMPLES, confidence: float = CONFIDENCE, seed: int = SEED,
+                        processes: int = 1, batched: bool = True) -> list:
+    """
+    bootstrap confidence intervals of the scalar metrics (all of them, unless names are given) at the given
+    snapshots (by default, the last one).
+
+    metrics of the h-family are calculated by the batched kernels when numpy is available (and batched is True);
+    the rest are recalculated for every resample, with the resamples split among worker processes if more than one
+    """
+    metric_sets = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, inc_self, inc_coauth)
+    if snapshots is None:
+        snapshots = [len(date_list) - 1]
+    use_batched = batched and bool(Impact_Funcs.load_numpy())
+    pool = start_workers(processes, date_list, article_list, inc_self, inc_coauth)
+    intervals = []
+    try:
+        for snapshot in snapshots:
+            metric_set = metric_sets[snapshot]
+            names = scalar_metric_names(metric_set, metric_names, inc_self, inc_coauth)
+            n_pubs = len(metric_set.citations)
+            if (n_pubs == 0) or (len(names) == 0):
+                continue
+            indices = resample_indices(n_pubs, n_resamples, seed, snapshot)
+            fast_names = [n for n in names if use_batched and (n in BATCHED_METRICS)]
+            slow_names = [n for n in names if n not in fast_names]
+            values = batched_values(metric_set.citations, indices, fast_names) if len(fast_names) > 0 else {}
+            if len(slow_names) > 0:
+                values.update(recalculated_values(pool, processes, snapshot, indices, slow_names))
+            for name in names:
+                low, high, count = confidence_interval(values[name], confidence)
+                intervals.append(BootstrapInterval(name, metric_set.date, scalar_value(metric_set.metrics[name]),
+                                                   low, high, count))
+    finally:
+        stop_workers(pool)
+    return intervals
+
+
+def write_intervals(filename: str, intervals: list, confidence: float) -> None:
+    with open(filename, "w", encoding="utf-8") as outfile:
+        outfile.write(f"Date\tMetric\tValue\tLow ({confidence:.0%})\tHigh ({confidence:.0%})\tResamples\n")
+        for interval in intervals:
+            values = ["" if v is None else str(v) for v in (interval.value, interval.low, interval.high)]
+            outfile.write(f"{ImpactFactorCalculator.date_to_string(interval.date)}\t{interval.name}\t" +
+                          "\t".join(values) + f"\t{interval.n_resamples}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bootstrap confidence intervals of a researcher's metrics")
+    parser.add_argument("citations", help="citation file")
+    parser.add_argument("self", nargs="?", default="", help="self-citation file")
+    parser.add_argument("coauthor", nargs="?", default="", help="coauthor-citation file")
+    parser.add_argument("--metrics", nargs="+", help="names of the metrics (default: every scalar metric)")
+    parser.add_argument("--all-dates", action="store_true", help="resample every snapshot, not just the last")
+    parser.add_argument("--resamples", type=int, default=N_RESAMPLES, help="number of bootstrap resamples")
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE, help="confidence level of the intervals")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--output", default="bootstrap_intervals.txt", help="name of the output file")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache the results of the metric kernels, and report their hit rates (in this process)")
+    args = parser.parse_args()
+    if args.memoize:
+        Impact_Funcs.enable_memoization()
+
+    date_list, article_list = ImpactFactorCalculator.read_data_file(args.citations)
+    inc_self = args.self != ""
+    inc_coauth = args.coauthor != ""
+    if inc_self:
+        ImpactFactorCalculator.read_self_citation_files(article_list, args.self, args.coauthor)
+    snapshots = list(range(len(date_list))) if args.all_dates else None
+    intervals = bootstrap_intervals(date_list, article_list, inc_self, inc_coauth, args.metrics, snapshots,
+                                    args.resamples, args.confidence, args.seed, args.processes)
+    write_intervals(args.output, intervals, args.confidence)
+    print(f"{len(intervals)} confidence intervals written to {args.output}")
+    if args.memoize:
+        print(Impact_Funcs.memoization_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+# Cohort percentiles
+"""
+This module places researchers within a cohort: for every metric and year, the distribution of the values of all
+researchers in the cohort is collected, and each researcher's value is converted into a percentile rank.
+
+The cohort is processed in two passes over the researchers' metric streams (the value of every scalar metric at the
+last date of each year):
+1. every researcher's stream is added to a CohortPercentiles, which keeps one distribution per (metric, year)
+2. every researcher's stream is read again and each value is converted into its percentile in the cohort
+
+Small cohorts keep every value, so percentiles are exact. Once a distribution holds more than EXACT_LIMIT values it
+is converted into a quantile sketch of bounded size (a DDSketch, Masson et al. 2019), whose percentiles are accurate
+to within a small relative error of the values. Distributions (exact or sketched) can be merged, so parts of a
+cohort can be aggregated by separate worker processes and combined.
+
+    python Impact_Cohort.py cohort.txt              write the percentiles of everyone in the cohort
+    python Impact_Cohort.py cohort.txt --exact      keep every value, however large the cohort
+    python Impact_Cohort.py cohort.txt --processes 8
+
+each line of the cohort file contains the tab-delimited names of a researcher's citation file and (optionally) their
+self-citation and coauthor-citation files. researchers are labeled in the output by the path of their citation file
+"""
+
+import argparse
+import bisect
+import copy
+import math
+import multiprocessing
+import os
+import tempfile
+from typing import Optional
+
+import Impact_Defs
+import Impact_Funcs
+import ImpactFactorCalculator
+
+EXACT_LIMIT = 1000  # values kept exactly in a distribution before it is converted into a sketch
+RELATIVE_ACCURACY = 0.01
+MAX_BINS = 2048
+MIN_MAGNITUDE = 1e-9  # values closer to zero than this are counted as zero by a sketch
+SCALAR_TYPES = (Impact_Defs.INT, Impact_Defs.FLOAT, Impact_Defs.FLOAT_NA)
+
+
+def percentile_rank(below: float, equal: float, total: float) -> float:
+    """
+    percentage of the cohort with a lower value, counting half of those with an equal value
+    """
+    return 100 * (below + equal / 2) / total
+
+
+class ExactDistribution:
+    """
+    every value of a distribution, sorted when needed
+    """
+    def __init__(self):
+        self.values = []
+        self.is_sorted = True
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float) -> None:
+        self.values.append(value)
+        self.is_sorted = False
+
+    def merge(self, other: "ExactDistribution") -> None:
+        self.values.extend(other.values)
+        self.is_sorted = False
+
+    def sorted_values(self) -> list:
+        if not self.is_sorted:
+            self.values.sort()
+            self.is_sorted = True
+        return self.values
+
+    def percentile(self, value: float) -> float:
+        values = self.sorted_values()
+        below = bisect.bisect_left(values, value)
+        equal = bisect.bisect_right(values, value) - below
+        return percentile_rank(below, equal, len(values))
+
+    def quantile(self, q: float) -> float:
+        values = self.sorted_values()
+        return values[math.floor(q * (len(values) - 1))]
+
+
+class QuantileSketch:
+    """
+    a DDSketch: values are counted in logarithmically sized bins, so every quantile is found within the relative
+    accuracy of its true value, whatever the range of the values. positive and negative values are binned
+    separately. if the number of bins would grow beyond max_bins, the bins of the smallest magnitudes are collapsed
+    together, which only affects the accuracy of the values closest to zero
+    """
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_bins: int = MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}  # bin index -> count
+        self.negative = {}  # bin index (of the magnitude) -> count
+        self.zeros = 0
+        self.count = 0
+        self.ordered = None  # sorted bins and cumulative counts, built when first needed after a change
+
+    def bin_index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def bin_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value > MIN_MAGNITUDE:
+            bins = self.positive
+            index = self.bin_index(value)
+        elif value < -MIN_MAGNITUDE:
+            bins = self.negative
+            index = self.bin_index(-value)
+        else:
+            self.zeros += count
+            self.count += count
+            self.ordered = None
+            return
+        bins[index] = bins.get(index, 0) + count
+        self.count += count
+        self.ordered = None
+        if len(self.positive) + len(self.negative) > self.max_bins:
+            self.collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("sketches with different relative accuracies cannot be merged")
+        for index, count in other.positive.items():
+            self.positive[index] = self.positive.get(index, 0) + count
+        for index, count in other.negative.items():
+            self.negative[index] = self.negative.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.ordered = None
+        if len(self.positive) + len(self.negative) > self.max_bins:
+            self.collapse()
+
+    def collapse(self) -> None:
+        """
+        merge the bins of the smallest magnitudes (of the sign with the most bins) until there are max_bins bins
+        """
+        while len(self.positive) + len(self.negative) > self.max_bins:
+            if len(self.positive) >= len(self.negative):
+                bins = self.positive
+            else:
+                bins = self.negative
+            lowest, second = sorted(bins)[:2]
+            bins[second] += bins.pop(lowest)
+
+    def ordered_bins(self) -> tuple:
+        """
+        the representative value of every bin, from lowest to highest, with the number of values below each
+        """
+        if self.ordered is None:
+            values = []
+            counts = []
+            for index in sorted(self.negative, reverse=True):
+                values.append(-self.bin_value(index))
+                counts.append(self.negative[index])
+            if self.zeros > 0:
+                values.append(0)
+                counts.append(self.zeros)
+            for index in sorted(self.positive):
+                values.append(self.bin_value(index))
+                counts.append(self.positive[index])
+            below = [0]
+            for c in counts:
+                below.append(below[-1] + c)
+            self.ordered = (values, counts, below)
+        return self.ordered
+
+    def bin_of(self, value: float) -> float:
+        """
+        the representative value of the bin the value would be counted in
+        """
+        if value > MIN_MAGNITUDE:
+            return self.bin_value(self.bin_index(value))
+        elif value < -MIN_MAGNITUDE:
+            return -self.bin_value(self.bin_index(-value))
+        return 0
+
+    def percentile(self, value: float) -> float:
+        values, counts, below = self.ordered_bins()
+        v = self.bin_of(value)
+        i = bisect.bisect_left(values, v)
+        if (i < len(values)) and (values[i] == v):
+            return percentile_rank(below[i], counts[i], self.count)
+        return percentile_rank(below[i], 0, self.count)
+
+    def quantile(self, q: float) -> float:
+        values, counts, below = self.ordered_bins()
+        rank = math.floor(q * (self.count - 1))
+        return values[bisect.bisect_right(below, rank) - 1]
+
+
+def sketch_of(distribution: ExactDistribution, relative_accuracy: float = RELATIVE_ACCURACY,
+              max_bins: int = MAX_BINS) -> QuantileSketch:
+    sketch = QuantileSketch(relative_accuracy, max_bins)
+    for value in distribution.values:
+        sketch.add(value)
+    return sketch
+
+
+class CohortPercentiles:
+    """
+    the distribution of every metric in every year across a cohort of researchers.
+
+    if exact is None, each distribution is kept exactly until it holds more than exact_limit values and then as a
+    sketch; exact=True keeps every value however many there are, and exact=False sketches from the start
+    """
+    def __init__(self, exact: Optional[bool] = None, exact_limit: int = EXACT_LIMIT,
+                 relative_accuracy: float = RELATIVE_ACCURACY, max_bins: int = MAX_BINS):
+        self.exact = exact
+        self.exact_limit = exact_limit
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.distributions = {}  # (metric name, year) -> ExactDistribution or QuantileSketch
+        self.n_researchers = 0
+
+    def new_distribution(self):
+        if self.exact is False:
+            return QuantileSketch(self.relative_accuracy, self.max_bins)
+        return ExactDistribution()
+
+    def limit_size(self, key: tuple) -> None:
+        distribution = self.distributions[key]
+        if (self.exact is None) and isinstance(distribution, ExactDistribution) and \
+                (distribution.count > self.exact_limit):
+            self.distributions[key] = sketch_of(distribution, self.relative_accuracy, self.max_bins)
+
+    def add(self, name: str, year: int, value: float) -> None:
+        key = (name, year)
+        distribution = self.distributions.get(key)
+        if distribution is None:
+            distribution = self.new_distribution()
+            self.distributions[key] = distribution
+        distribution.add(value)
+        self.limit_size(key)
+
+    def add_researcher(self, stream) -> None:
+        """
+        add every (metric name, year, value) of a researcher's metric stream
+        """
+        for name, year, value in stream:
+            self.add(name, year, value)
+        self.n_researchers += 1
+
+    def merge(self, other: "CohortPercentiles") -> None:
+        """
+        add the distributions of another part of the cohort (e.g., from a worker process). the other part is left
+        unchanged, and is not changed by later additions to this one
+        """
+        for key, distribution in other.distributions.items():
+            mine = self.distributions.get(key)
+            if mine is None:
+                if isinstance(distribution, QuantileSketch) or (self.exact is not False):
+                    self.distributions[key] = copy.deepcopy(distribution)
+                else:
+                    self.distributions[key] = sketch_of(distribution, self.relative_accuracy, self.max_bins)
+            elif isinstance(mine, QuantileSketch):
+                if isinstance(distribution, QuantileSketch):
+                    mine.merge(distribution)
+                else:
+                    for value in distribution.values:
+                        mine.add(value)
+            elif isinstance(distribution, QuantileSketch):
+                self.distributions[key] = sketch_of(mine, self.relative_accuracy, self.max_bins)
+                self.distributions[key].merge(distribution)
+            else:
+                mine.merge(distribution)
+            self.limit_size(key)
+        self.n_researchers += other.n_researchers
+
+    def percentile(self, name: str, year: int, value: float) -> Optional[float]:
+        distribution = self.distributions.get((name, year))
+        if distribution is None:
+            return None
+        return distribution.percentile(value)
+
+    def researcher_percentiles(self, stream):
+        """
+        yields (metric name, year, value, percentile) for every value of a researcher's metric stream
+        """
+        for name, year, value in stream:
+            yield name, year, value, self.percentile(name, year, value)
+
+
+# --- metric streams ---
+def metric_stream(metric_sets: list, inc_self: bool = True, inc_coauth: bool = True,
+                  metric_names: Optional[list] = None):
+    """
+    yields (metric name, year, value) for every scalar metric at the last date of each year. values which cannot
+    be calculated for the data, or are not numbers (e.g., "n/a"), are left out
+    """
+    last_of_year = {}
+    for metric_set in metric_sets:
+        last_of_year[metric_set.year()] = metric_set
+    for year, metric_set in last_of_year.items():
+        if metric_names is None:
+            names = metric_set.metric_names
+        else:
+            names = metric_names
+        for name in names:
+            metric = metric_set.metrics[name]
+            if (metric.metric_type not in SCALAR_TYPES) or (metric.is_self and not inc_self) or \
+                    (metric.is_coauthor and not inc_coauth):
+                continue
+            try:
+                value = metric.value
+            except (ArithmeticError, ValueError, IndexError):
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                yield name, year, value
+
+
+def read_cohort_file(filename: str) -> list:
+    """
+    returns the (citation file, self-citation file, coauthor-citation file) of every researcher in a cohort file;
+    the names of missing files are empty. names are relative to the directory of the cohort file
+    """
+    base_dir = os.path.dirname(filename)
+    cohort = []
+    with open(filename, "r", encoding="utf-8") as infile:
+        for line in infile:
+            names = [n.strip() for n in line.rstrip("\n").split("\t")]
+            if names[0] == "":
+                continue
+            names = [os.path.join(base_dir, n) if n != "" else "" for n in (names + ["", ""])[:3]]
+            cohort.append(tuple(names))
+    return cohort
+
+
+def researcher_stream(files: tuple, metric_names: Optional[list] = None) -> list:
+    """
+    read a researcher's data files, calculate their metrics, and return their metric stream
+    """
+    citation_file, self_file, coauthor_file = files
+    date_list, article_list = ImpactFactorCalculator.read_data_file(citation_file)
+    inc_self = self_file != ""
+    inc_coauth = coauthor_file != ""
+    if inc_self:
+        ImpactFactorCalculator.read_self_citation_files(article_list, self_file, coauthor_file)
+    metric_sets = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, inc_self, inc_coauth)
+    return list(metric_stream(metric_sets, inc_self, inc_coauth, metric_names))
+
+
+def aggregate_researchers(cohort: list, stream_name: str, exact: Optional[bool] = None,
+                          metric_names: Optional[list] = None, first_index: int = 0) -> CohortPercentiles:
+    """
+    the distributions of part of a cohort. the metric stream of each researcher is written to the file stream_name
+    (numbering the researchers from first_index), so only the distributions are held in memory
+    """
+    percentiles = CohortPercentiles(exact)
+    with open(stream_name, "w", encoding="utf-8") as outfile:
+        for index, files in enumerate(cohort, first_index):
+            stream = researcher_stream(files, metric_names)
+            percentiles.add_researcher(stream)
+            write_stream(outfile, index, files[0], stream)
+    return percentiles
+
+
+def write_stream(outfile, index: int, label: str, stream) -> None:
+    for name, year, value in stream:
+        outfile.write(f"{index}\t{label}\t{name}\t{year}\t{value!r}\n")
+
+
+def read_streams(infile):
+    """
+    yields (researcher label, metric stream) for every researcher written with write_stream(). researchers are told
+    apart by their index in the cohort, so two with the same label are never joined
+    """
+    index = None
+    label = None
+    stream = []
+    for line in infile:
+        researcher, researcher_label, name, year, value = line.rstrip("\n").split("\t")
+        if (researcher != index) and (index is not None):
+            yield label, stream
+            stream = []
+        index = researcher
+        label = researcher_label
+        if value.lstrip("-").isdigit():
+            stream.append((name, int(year), int(value)))
+        else:
+            stream.append((name, int(year), float(value)))
+    if index is not None:
+        yield label, stream
+
+
+def cohort_percentiles(cohort: list, out_name: str, exact: Optional[bool] = None, processes: int = 1,
+                       metric_names: Optional[list] = None) -> CohortPercentiles:
+    """
+    calculate the metrics of every researcher of a cohort and write each researcher's percentile for every metric
+    and year to a tab-delimited file.
+
+    the first pass collects the distributions (split among worker processes, if more than one) and writes every
+    researcher's metric stream to a temporary file (one for each worker), which the second pass reads back to find
+    the percentiles
+    """
+    with tempfile.TemporaryDirectory() as stream_dir:
+        if processes > 1:
+            size = max(1, math.ceil(len(cohort) / processes))
+            starts = range(0, len(cohort), size)
+        else:
+            size = len(cohort)
+            starts = [0]
+        jobs = [(cohort[i:i + size], os.path.join(stream_dir, f"streams{i}.txt"), exact, metric_names, i)
+                for i in starts]
+        if len(jobs) > 1:
+            with multiprocessing.Pool(processes) as pool:
+                parts = pool.starmap(aggregate_researchers, jobs)
+            percentiles = CohortPercentiles(exact)
+            for part in parts:
+                percentiles.merge(part)
+        else:
+            percentiles = aggregate_researchers(*jobs[0])
+
+        with open(out_name, "w", encoding="utf-8") as outfile:
+            outfile.write("Researcher\tMetric\tYear\tValue\tPercentile\n")
+            for _, stream_name, _, _, _ in jobs:
+                with open(stream_name, "r", encoding="utf-8") as stream_file:
+                    for label, stream in read_streams(stream_file):
+                        for name, year, value, percentile in percentiles.researcher_percentiles(stream):
+                            outfile.write(f"{label}\t{name}\t{year}\t{value}\t{percentile:.1f}\n")
+    return percentiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="percentiles of every metric for each researcher in a cohort")
+    parser.add_argument("cohort_file", help="file listing the data files of each researcher")
+    parser.add_argument("--output", default="cohort_percentiles.txt", help="name of the output file")
+    parser.add_argument("--exact", action="store_true", help="keep every value, rather than sketching large cohorts")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache the results of the metric kernels, and report their hit rates (in this process)")
+    args = parser.parse_args()
+    if args.memoize:
+        Impact_Funcs.enable_memoization()
+    cohort = read_cohort_file(args.cohort_file)
+    cohort_percentiles(cohort, args.output, True if args.exact else None, args.processes)
+    print(f"Percentiles of {len(cohort)} researchers written to {args.output}")
+    if args.memoize:
+        print(Impact_Funcs.memoization_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 # metric definitions for impact factor calculator
 
 import Impact_Funcs
+import copy
 import datetime
+import json
 import math
-from typing import Union
+import time
+from typing import Optional, Tuple, Union
 
 # --- Internal Constants ---
 INT = 0
@@ -22,6 +25,18 @@ LINE_CHART_COMBINE = 4
 TWO_LINE_CHART = 5
 FSTR = "1.4f"  # constant formatting string
 
+# expected growth of the time to calculate a metric with the number of publications, given the values of any other
+# metrics it uses but including the building of any shared structure of the metric set it uses (sorted citations,
+# year index, author efforts); n log n counts as linear
+CONSTANT_TIME = "O(1)"
+LINEAR_TIME = "O(n)"
+QUADRATIC_TIME = "O(n^2)"
+EXPONENTIAL_TIME = "O(2^n)"
+COMPLEXITY_DEGREE = {CONSTANT_TIME: 0,
+                     LINEAR_TIME: 1,
+                     QUADRATIC_TIME: 2,
+                     EXPONENTIAL_TIME: None}
+
 PROPERTY_TYPES = ("Metric Type",
                   "Metric Property",
                   "Considerations and Adjustments",
@@ -66,7 +81,9 @@ class Metric:
         self.synonyms = []
         self.references = []
         self.calculate = None
+        self.complexity = LINEAR_TIME
         self.__value = None
+        self.reused_from = None  # the same metric in an identical earlier snapshot whose value can be reused
         self.parent_set = None
         self.graph_type = None
         self.description_graphs = []
@@ -92,8 +109,28 @@ class Metric:
 
     @property
     def value(self):
+        if metric_profiler is not None:
+            return self.profiled_value()
         if self.__value is None:
-            self.__value = self.calculate(self.parent_set)
+            if self.reused_from is not None:
+                self.__value = self.reused_from.value
+            else:
+                self.__value = self.calculate(self.parent_set)
+        return self.__value
+
+    def profiled_value(self):
+        """
+        the value of the metric, with its calculation (or the use of an already known value) recorded by the
+        active profiler
+        """
+        date = self.parent_set.date
+        size = len(self.parent_set.citations)
+        if self.__value is not None:
+            metric_profiler.record_hit(self.name, "metric", date, size)
+        elif self.reused_from is not None:
+            self.__value = metric_profiler.call(self.name, "reused", date, size, lambda: self.reused_from.value)
+        else:
+            self.__value = metric_profiler.call(self.name, "metric", date, size, self.calculate, self.parent_set)
         return self.__value
 
     def __str__(self):
@@ -148,21 +185,61 @@ class MetricSet:
         self.first_pub_year = None
         self.publications = []
         self.parent_list = None
+        self.efforts = {}  # author effort of each pub under each credit measure, built on first use
+        self.total_collaborators = None  # filled from an incrementally maintained coauthor index, if available
+        self.partnership_ability = None
+        self.year_index = None  # pubs and citations bucketed by publication year, built on first use
+        self.citation_increments = None  # yearly citations of every pub of the researcher, shared by all snapshots
+        self.publication_ids = None  # position of each pub within the full list of the researcher's pubs
+        self.decomposition = None  # successive h-cores of the citations, built on first use
         # add all defined metrics
-        tmp_list = load_all_metrics()
+        tmp_list = [copy.copy(m) for m in defined_metrics()]
         self.metrics = {m.name: m for m in tmp_list}
         for m in self.metrics:
             self.metrics[m].parent_set = self  # cross-point this set as parent of each child metric object
         self.metric_names = [m.name for m in tmp_list]
 
-    def calculate_ranks(self) -> None:
+    def calculate_ranks(self, rank_maintainer: Optional[Impact_Funcs.RankMaintainer] = None) -> None:
         """
         given a list of citation totals for each pub, fill in various other lists of ranks and counts and
         flags used to calculate metrics
+
+        if a rank maintainer is provided (and publication_ids is set), the order from the previous snapshot is
+        repaired rather than sorting from scratch
         """
         n = len(self.citations)
         self.is_core = [False for _ in range(n)]
-        self.rank_order, self.cumulative_citations = Impact_Funcs.calculate_ranks(self.citations)
+        if (rank_maintainer is not None) and (self.publication_ids is not None):
+            self.rank_order, self.cumulative_citations = rank_maintainer.calculate_ranks(self.citations,
+                                                                                         self.publication_ids)
+        else:
+            self.rank_order, self.cumulative_citations = Impact_Funcs.calculate_ranks(self.citations)
+
+    def is_unchanged_from(self, other) -> bool:
+        """
+        True if the other set has exactly the same active publications and citation counts as this one
+        """
+        return ((self.publication_ids is not None) and (self.publication_ids == other.publication_ids) and
+                (self.citations == other.citations) and (self.self_citations == other.self_citations) and
+                (self.coauthor_citations == other.coauthor_citations))
+
+    def reuse_unchanged(self, previous) -> None:
+        """
+        for a snapshot whose publications and citations are identical to the previous snapshot, take the values of
+        every metric which does not depend on the date from the previous set rather than recalculating them.
+        only the date-dependent metrics (ages, rates, time-series) will be calculated anew
+        """
+        previous.metrics["h-index"].value  # make sure the core has been identified
+        self.is_core = previous.is_core
+        self.efforts = previous.efforts
+        self.year_index = previous.year_index
+        self.decomposition = previous.decomposition
+        self.total_collaborators = previous.total_collaborators
+        self.partnership_ability = previous.partnership_ability
+        date_dependent = date_dependent_metrics()
+        for m in self.metric_names:
+            if m not in date_dependent:
+                self.metrics[m].reused_from = previous.metrics[m]
 
     def academic_age(self) -> int:
         """
@@ -173,11 +250,12 @@ class MetricSet:
         else:
             return self.date.year - self.first_pub_year + 1
 
-    # def sorted_citations(self) -> list:
-    #     """
-    #     returns the citation counts sorted from highest to lowest (rather than by pub order)
-    #     """
-    #     return sorted(self.citations, reverse=True)
+    def sorted_citations(self) -> list:
+        """
+        returns the citation counts sorted from highest to lowest (rather than by pub order). the list is shared,
+        so should not be modified
+        """
+        return self.h_decomposition().sorted_citations
 
     def self_coauthor_citations(self) -> list:
         """
@@ -197,12 +275,51 @@ class MetricSet:
         """
         return [p.author_rank for p in self.publications]
 
+    def author_efforts(self, measure: str) -> list:
+        """
+        returns a list with the estimated effort of the author for each pub under the given credit measure, in the
+        same order as citations. the list is built once per measure and shared by every coauthorship-adjusted metric
+        """
+        efforts = self.efforts.get(measure)
+        if efforts is None:
+            efforts = Impact_Funcs.author_efforts(measure, self.author_counts(), self.author_position())
+            self.efforts[measure] = efforts
+        return efforts
+
     def publication_years(self) -> list:
         """
         returns a list containing the publication year of each publication, in the same order as citations
         """
         return [p.year for p in self.publications]
 
+    def yearly_citations(self) -> list:
+        """
+        returns the citations received in each year through this snapshot for each pub, in the same order as
+        citations. uses views of the shared increments if they are available, otherwise computes them from the
+        cumulative counts
+        """
+        metric_pos = self.parent_list.index(self)
+        if self.citation_increments is not None:
+            return self.citation_increments.prefixes(self.publication_ids, metric_pos+1)
+        return Impact_Funcs.citations_per_pub_per_year([p.citations[:metric_pos+1] for p in self.publications])
+
+    def h_decomposition(self) -> Impact_Funcs.HDecomposition:
+        """
+        returns the sorted citations decomposed into successive h-cores, shared by the multidimensional h-index and
+        the metrics built from it
+        """
+        if self.decomposition is None:
+            self.decomposition = Impact_Funcs.HDecomposition(self.citations)
+        return self.decomposition
+
+    def publication_year_index(self) -> Impact_Funcs.YearIndex:
+        """
+        returns the publications and their citations bucketed by publication year, shared by the age-based metrics
+        """
+        if self.year_index is None:
+            self.year_index = Impact_Funcs.YearIndex(self.publication_years(), self.citations)
+        return self.year_index
+
     def coauthors(self) -> list:
         """
         returns a list containing the coauthor string for each publication, in the same order as citations
@@ -238,6 +355,279 @@ class DescriptionGraph:
         self.data = None
 
 
+# --- Optional Profiling of Metrics ---
+metric_profiler = None  # the active MetricProfiler (or MemoryProfiler), if profiling has been started
+
+
+class MetricTiming:
+    """
+    the calls of a single metric (or html generator) for a single date
+    """
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0  # requests for a value which had already been calculated
+        self.time = 0  # total wall time in seconds, including other metrics calculated along the way
+        self.self_time = 0  # wall time excluding other metrics calculated along the way
+        self.size = 0  # number of publications
+
+
+class MetricProfiler:
+    """
+    records the wall time, call count, cache hits, and input size of every metric calculation, html generator,
+    and per-date setup, by date. the calls are also kept as a timeline which can be written in the Chrome trace
+    event format (viewable in chrome://tracing or Perfetto)
+    """
+    def __init__(self):
+        self.timings = {}  # (name, kind, date) -> MetricTiming
+        self.events = []
+        self.open_calls = []  # time spent in nested calls of each call in progress
+        self.origin = time.perf_counter()
+
+    def timing(self, name: str, kind: str, date) -> MetricTiming:
+        key = (name, kind, date)
+        if key not in self.timings:
+            self.timings[key] = MetricTiming()
+        return self.timings[key]
+
+    def call(self, name: str, kind: str, date, size: int, func, *args):
+        """
+        call func(*args) and record it
+        """
+        self.open_calls.append(0)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.open_calls.pop()
+            if len(self.open_calls) > 0:
+                self.open_calls[-1] += elapsed
+            timing = self.timing(name, kind, date)
+            timing.calls += 1
+            timing.time += elapsed
+            timing.self_time += elapsed - nested
+            timing.size = size
+            self.events.append({"name": name, "cat": kind, "ph": "X", "pid": 1, "tid": 1,
+                                "ts": (start - self.origin) * 1000000, "dur": elapsed * 1000000,
+                                "args": {"date": str(date), "publications": size}})
+
+    def record_hit(self, name: str, kind: str, date, size: int) -> None:
+        timing = self.timing(name, kind, date)
+        timing.cache_hits += 1
+        timing.size = size
+
+    def totals(self) -> list:
+        """
+        returns the timings of every metric/generator combined over all dates, as a list of
+        (name, kind, combined MetricTiming, number of dates)
+        """
+        combined = {}
+        dates = {}
+        for (name, kind, date), timing in self.timings.items():
+            key = (name, kind)
+            if key not in combined:
+                combined[key] = MetricTiming()
+                dates[key] = 0
+            total = combined[key]
+            total.calls += timing.calls
+            total.cache_hits += timing.cache_hits
+            total.time += timing.time
+            total.self_time += timing.self_time
+            total.size = max(total.size, timing.size)
+            dates[key] += 1
+        return [(key[0], key[1], combined[key], dates[key]) for key in combined]
+
+    def report(self, per_date: bool = False, sort_by: str = "self_time") -> str:
+        """
+        a table of the timings, slowest first, either combined over all dates or separately for each date
+        """
+        if per_date:
+            rows = [(f"{name} [{kind}] {date}", timing, 1) for (name, kind, date), timing in self.timings.items()]
+        else:
+            rows = [(f"{name} [{kind}]", timing, n) for name, kind, timing, n in self.totals()]
+        rows.sort(key=lambda x: getattr(x[1], sort_by), reverse=True)
+        lines = [f"{'':<60}{'calls':>8}{'hits':>8}{'dates':>7}{'pubs':>8}{'time (s)':>12}{'self (s)':>12}"]
+        for label, timing, n in rows:
+            lines.append(f"{label[:59]:<60}{timing.calls:>8}{timing.cache_hits:>8}{n:>7}{timing.size:>8}"
+                         f"{timing.time:>12.6f}{timing.self_time:>12.6f}")
+        return "\n".join(lines)
+
+    def write_trace(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as outfile:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, outfile)
+
+
+class MetricMemory:
+    """
+    the memory allocated by the calls of a single metric (or html generator, or pipeline stage) for a single date
+    """
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.peak = 0  # most bytes allocated at any moment during a call, above what was allocated at its start
+        self.retained = 0  # bytes allocated by the calls and still allocated after them (e.g., cached values)
+        self.self_retained = 0  # retained bytes excluding other metrics calculated along the way
+        self.size = 0  # number of publications
+
+
+class MemoryProfiler:
+    """
+    records the memory allocated (traced with tracemalloc) by every metric calculation, html generator, and
+    per-date setup, by date. calls can be nested: the peak of a call includes the peaks of the calls made within it.
+    larger stages of a run (e.g., parsing the input) can be recorded with call() in the same way
+
+    tracing slows everything down considerably, so a MemoryProfiler is used in place of the (timing) MetricProfiler
+    rather than alongside it
+    """
+    def __init__(self):
+        import tracemalloc  # only needed when profiling memory
+        self.tracemalloc = tracemalloc
+        self.usage = {}  # (name, kind, date) -> MetricMemory
+        # [bytes retained by nested calls, highest traced total so far, overhead at its start] of each call in progress
+        self.open_calls = []
+        self.overhead = 0  # bytes allocated for the profiler's own records, which are left out of every measurement
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        # taking a measurement, and recording a call, allocate a little memory themselves (the integers holding the
+        # measurements, etc.), which would otherwise be charged to every call. both are measured once, on calls of a
+        # function which allocates nothing (once the first calls have settled), and subtracted from then on. what
+        # remains is accurate to within some tens of bytes per call
+        self.measure_bias = 0
+        self.call_bias = 0
+        bias = 0
+        for _ in range(3):
+            overhead = self.overhead
+            self.record_hit("", "", None, 0)
+            bias = self.overhead - overhead
+        self.measure_bias = bias
+        for i in range(3):
+            self.call("", "", i, 0, int)
+        self.call_bias = self.usage[("", "", 2)].retained
+        self.usage = {}
+        self.overhead = 0
+
+    def traced(self) -> int:
+        return self.tracemalloc.get_traced_memory()[0]
+
+    def memory(self, name: str, kind: str, date) -> MetricMemory:
+        key = (name, kind, date)
+        if key not in self.usage:
+            self.usage[key] = MetricMemory()
+        return self.usage[key]
+
+    def call(self, name: str, kind: str, date, size: int, func, *args):
+        """
+        call func(*args) and record it
+        """
+        start, peak = self.tracemalloc.get_traced_memory()
+        if len(self.open_calls) > 0:  # the traced peak is about to be reset, so keep it for the enclosing call
+            self.open_calls[-1][1] = max(self.open_calls[-1][1], peak)
+        self.tracemalloc.reset_peak()
+        self.open_calls.append([0, start, self.overhead])
+        try:
+            return func(*args)
+        finally:
+            end, peak = self.tracemalloc.get_traced_memory()
+            nested, highest, overhead = self.open_calls.pop()
+            retained = end - start - (self.overhead - overhead) - self.call_bias
+            if len(self.open_calls) > 0:
+                self.open_calls[-1][0] += retained
+            before = self.traced()
+            usage = self.memory(name, kind, date)
+            usage.calls += 1
+            usage.peak = max(usage.peak, max(highest, peak) - start)
+            usage.retained += retained
+            usage.self_retained += retained - nested
+            usage.size = size
+            self.overhead += self.traced() - before - self.measure_bias
+
+    def record_hit(self, name: str, kind: str, date, size: int) -> None:
+        before = self.traced()
+        usage = self.memory(name, kind, date)
+        usage.cache_hits += 1
+        usage.size = size
+        self.overhead += self.traced() - before - self.measure_bias
+
+    def stop(self) -> None:
+        if self.started_tracing and self.tracemalloc.is_tracing():
+            self.tracemalloc.stop()
+
+    def totals(self) -> list:
+        """
+        returns the memory of every metric/generator combined over all dates, as a list of
+        (name, kind, combined MetricMemory, number of dates)
+        """
+        combined = {}
+        dates = {}
+        for (name, kind, date), usage in self.usage.items():
+            key = (name, kind)
+            if key not in combined:
+                combined[key] = MetricMemory()
+                dates[key] = 0
+            total = combined[key]
+            total.calls += usage.calls
+            total.cache_hits += usage.cache_hits
+            total.peak = max(total.peak, usage.peak)
+            total.retained += usage.retained
+            total.self_retained += usage.self_retained
+            total.size = max(total.size, usage.size)
+            dates[key] += 1
+        return [(key[0], key[1], combined[key], dates[key]) for key in combined]
+
+    def report(self, per_date: bool = False, sort_by: str = "self_retained") -> str:
+        """
+        a table of the memory used, largest first, either combined over all dates or separately for each date
+        """
+        if per_date:
+            rows = [(f"{name} [{kind}] {date}", usage, 1) for (name, kind, date), usage in self.usage.items()]
+        else:
+            rows = [(f"{name} [{kind}]", usage, n) for name, kind, usage, n in self.totals()]
+        rows.sort(key=lambda x: getattr(x[1], sort_by), reverse=True)
+        lines = [f"{'':<52}{'calls':>8}{'hits':>8}{'dates':>7}{'pubs':>8}{'peak (KiB)':>12}{'kept (KiB)':>12}"
+                 f"{'self (KiB)':>12}"]
+        for label, usage, n in rows:
+            lines.append(f"{label[:51]:<52}{usage.calls:>8}{usage.cache_hits:>8}{n:>7}{usage.size:>8}"
+                         f"{usage.peak / 1024:>12.1f}{usage.retained / 1024:>12.1f}{usage.self_retained / 1024:>12.1f}")
+        return "\n".join(lines)
+
+
+def start_profiling(memory: bool = False) -> Union[MetricProfiler, MemoryProfiler]:
+    """
+    begin recording every metric calculation (and html generator call) in a new profiler, of the time taken or
+    (if memory is True) of the memory allocated
+    """
+    global metric_profiler
+    if memory:
+        metric_profiler = MemoryProfiler()
+    else:
+        metric_profiler = MetricProfiler()
+    return metric_profiler
+
+
+def stop_profiling() -> Union[MetricProfiler, MemoryProfiler]:
+    """
+    stop recording and return the profiler with everything recorded since profiling was started
+    """
+    global metric_profiler
+    profiler = metric_profiler
+    metric_profiler = None
+    if isinstance(profiler, MemoryProfiler):
+        profiler.stop()
+    return profiler
+
+
+def write_html(metric: Metric, kind: str, generator, metric_set: MetricSet):
+    """
+    call one of the html generators of a metric (its worked example or the data for a description graph),
+    recording the call if profiling
+    """
+    if metric_profiler is None:
+        return generator(metric_set)
+    return metric_profiler.call(metric.name, kind, metric_set.date, len(metric_set.citations), generator,
+                                metric_set)
+
+
 # --- Definitions and Calculations for Individual Metrics---
 """
 the calculation functions in this section are designed to extract the key data from the MetricSet(s) and
@@ -266,6 +656,7 @@ def metric_total_pubs() -> Metric:
     m.synonyms = ["<em>P</em>"]
     m.graph_type = LINE_CHART
     m.calculate = calculate_total_pubs
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Publications"] = True
     return m
@@ -355,6 +746,7 @@ def metric_mean_cites() -> Metric:
                   "<em>JPC</em>"]
     m.symbol = "<em>C/P</em>"
     m.calculate = calculate_mean_cites
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -410,6 +802,7 @@ def metric_pubs_per_year() -> Metric:
                   "<em>P<sup>TS</sup></em>"]
     m.graph_type = LINE_CHART
     m.calculate = calculate_pubs_per_year
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["Time"] = True
     m.properties["All Publications"] = True
@@ -441,6 +834,7 @@ def metric_cites_per_year() -> Metric:
                   "<em>C<sup>TS</sup></em>"]
     m.graph_type = LINE_CHART
     m.calculate = calculate_cites_per_year
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["Time"] = True
     m.properties["All Citations"] = True
@@ -664,6 +1058,7 @@ def metric_hirsch_min_const() -> Metric:
                     "<em>Proceedings of the National Academy of Sciences USA</em> 102(46):16569&ndash;16572."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_hirsch_min_const
+    m.complexity = CONSTANT_TIME
     m.properties["All Citations"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Property"] = True
@@ -1069,6 +1464,7 @@ def metric_mu_index() -> Metric:
                     "The generalized <em>h-</em>index. <em>Journal of Informetrics</em> 4:118&ndash;123."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_mu_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Core Metric"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -1317,6 +1713,7 @@ def metric_woeginger_w_index() -> Metric:
                     "Social Sciences</em> 56(2):224&ndash;242."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_woeginger_w_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Core Metric"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -1490,6 +1887,7 @@ def metric_hg_index() -> Metric:
                     "<em>g-</em>indices. <em>Scientometrics</em> 82:391&ndash;400."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_hg_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["Core Citations"] = True
@@ -1524,6 +1922,7 @@ def metric_a_index() -> Metric:
                     "1(4):23&ndash;25."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_a_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -1556,6 +1955,7 @@ def metric_r_index() -> Metric:
                     "Complementing the <em>h-</em>index. <em>Chinese Science Bulletin</em> 52(6):855&ndash;863."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_r_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -1587,6 +1987,7 @@ def metric_indifference() -> Metric:
     m.references = ["Egghe, L., and R. Rousseau (1996) Average and global impact of a set of journals. "
                     "<em>Scientometrics</em> 36:97&ndash;107."]
     m.calculate = calculate_indifference
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -1953,7 +2354,7 @@ def metric_todeschini_j_index() -> Metric:
 # Wohlin w-index (Wohlin 2009)
 def calculate_wohlin_w_index(metric_set: MetricSet) -> float:
     citations = metric_set.citations
-    return Impact_Funcs.calculate_wohlin_w(citations)
+    return Impact_Funcs.calculate_wohlin_w(citations, metric_set.sorted_citations())
 
 
 def write_wohlin_j_index_example(metric_set: MetricSet) -> str:
@@ -2057,6 +2458,7 @@ def metric_wohlin_w_index() -> Metric:
                     "81(2):521&ndash;533."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_wohlin_w_index
+    m.complexity = LINEAR_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -2069,7 +2471,7 @@ def calculate_hj_indices(metric_set: MetricSet) -> list:
     # total_pubs = metric_set.metrics["total pubs"].value
     h = metric_set.metrics["h-index"].value
     # sorted_citations = metric_set.sorted_citations()
-    return Impact_Funcs.calculate_hj_indices(h, citations)
+    return Impact_Funcs.calculate_hj_indices(h, citations, metric_set.h_decomposition())
 
 
 def metric_hj_indices() -> Metric:
@@ -2133,6 +2535,7 @@ def metric_v_index() -> Metric:
     m.graph_type = LINE_CHART
     m.symbol = "<em>v</em>"
     m.calculate = calculate_v_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["All Publications"] = True
     return m
@@ -2161,6 +2564,7 @@ def metric_normalized_h_index() -> Metric:
                     "for disclosing latent facts in citation networks. <em>Scientometrics</em> 72(2):253&ndash;280."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_normalized_h_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["All Publications"] = True
     return m
@@ -2407,6 +2811,7 @@ def metric_pi_rate() -> Metric:
     m.symbol = "<em>π-</em>rate"
     m.graph_type = LINE_CHART
     m.calculate = calculate_pi_rate
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -2436,6 +2841,7 @@ def metric_q2_index() -> Metric:
                     "impact of papers in the Hirsch core. <em>Journal of Informetrics</em> 4:23&ndash;28."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_q2_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["Core Citations"] = True
@@ -2518,6 +2924,7 @@ def metric_e_index() -> Metric:
                     "citations. <em>PLoS ONE</em> 4(5):e5429."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_e_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -2632,6 +3039,7 @@ def metric_h2_upper_index() -> Metric:
                     "4:407&ndash;414."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_h2_upper_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -2716,6 +3124,7 @@ def metric_h2_center_index() -> Metric:
                     "4:407&ndash;414."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_h2_center_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -2801,6 +3210,7 @@ def metric_h2_tail_index() -> Metric:
                     "4:407&ndash;414."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_h2_tail_index
+    m.complexity = CONSTANT_TIME
     m.properties["Tail Citations"] = True
     m.properties["Tail Publications"] = True
     return m
@@ -2831,6 +3241,7 @@ def metric_k_index() -> Metric:
                     "tail-core ratio for rank distributions. <em>Scientometrics</em> 84(2):431&ndash;439."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_k_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Citations"] = True
     m.properties["Tail Citations"] = True
@@ -2866,6 +3277,7 @@ def metric_prathap_p_index() -> Metric:
                     "<em>Scientometrics</em> 84:153&ndash;165."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_prathap_p_index
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -2891,6 +3303,7 @@ def metric_ph_ratio() -> Metric:
                     "proportion of citations in the upper core and the lower tail.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_ph_ratio
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["All Citations"] = True
@@ -2933,7 +3346,7 @@ def metric_p_index_frac() -> Metric:
 # multidimensional h-index (Garcia-Perez 2009)
 def calculate_multidimensional_h_index(metric_set: MetricSet) -> list:
     citations = metric_set.citations
-    return Impact_Funcs.calculate_multidimensional_h_index(citations)
+    return Impact_Funcs.calculate_multidimensional_h_index(citations, metric_set.h_decomposition())
 
 
 def write_multidim_h_index_desc_data(metric_set: MetricSet) -> list:
@@ -3081,7 +3494,7 @@ def metric_multdim_h_index() -> Metric:
 def calculate_two_sided_h_index(metric_set: MetricSet) -> list:
     citations = metric_set.citations
     multidim_h = metric_set.metrics["multidim h-index"].value
-    return Impact_Funcs.calculate_two_sided_h(citations, multidim_h)
+    return Impact_Funcs.calculate_two_sided_h(citations, multidim_h, decomposition=metric_set.h_decomposition())
 
 
 def write_two_sided_h_index_desc_data(metric_set: MetricSet) -> list:
@@ -3409,6 +3822,7 @@ def metric_em_index() -> Metric:
                     "of scientists. <em>Scientometrics</em> 112(1):659&ndash;677."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_em_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Alternative Metric"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -3527,6 +3941,7 @@ def metric_emp_index() -> Metric:
                     "of scientists. <em>Scientometrics</em> 112(1):659&ndash;677."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_emp_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -3635,6 +4050,7 @@ def metric_iterative_weighted_em_index() -> Metric:
                     "EM′-index for scientific assessment of scholars. <em>Scientometrics</em> 126:5551&ndash;5568."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_iterative_weighted_em_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Alternative Metric"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -3758,6 +4174,7 @@ def metric_iterative_weighted_emp_index() -> Metric:
                     "EM′-index for scientific assessment of scholars. <em>Scientometrics</em> 126:5551&ndash;5568."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_iterative_weighted_emp_index
+    m.complexity = QUADRATIC_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -3811,6 +4228,7 @@ def metric_total_self_cite_rate() -> Metric:
                     "number of citations to all of the author\'s publications or</p>" + equation
     m.graph_type = LINE_CHART
     m.calculate = calculate_total_self_cite_rate
+    m.complexity = CONSTANT_TIME
     m.properties["Basic Statistic"] = True
     m.properties["Self-Citation"] = True
     m.properties["All Citations"] = True
@@ -3911,6 +4329,7 @@ def metric_b_index_mean_self() -> Metric:
                     "the <em>b-</em>index. <em>Online Information Review</em> 33(6):1129&ndash;1136."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_b_index_mean_self
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["Self-Citation"] = True
     m.properties["Core Citations"] = True
@@ -3964,6 +4383,7 @@ def metric_total_coauthor_cite_rate() -> Metric:
                     equation
     m.graph_type = LINE_CHART
     m.calculate = calculate_total_coauthor_cite_rate
+    m.complexity = CONSTANT_TIME
     return m
 
 
@@ -4055,6 +4475,7 @@ def metric_b_index_mean_coauthor() -> Metric:
                     "the <em>b-</em>index. <em>Online Information Review</em> 33(6):1129&ndash;1136."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_b_index_mean_coauthor
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["Self-Citation"] = True
     return m
@@ -4088,6 +4509,7 @@ def metric_b_index_10_percent() -> Metric:
                     "the <em>b-</em>index. <em>Online Information Review</em> 33(6):1129&ndash;1136."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_b_index_10_percent
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["Self-Citation"] = True
     m.properties["Core Citations"] = True
@@ -4259,7 +4681,8 @@ def calculate_pure_h_index_prop(metric_set: MetricSet) -> float:
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
     h = metric_set.metrics["h-index"].value
-    return Impact_Funcs.calculate_pure_h_index_prop(is_core, n_authors, author_pos, h)
+    efforts = metric_set.author_efforts("proportional")
+    return Impact_Funcs.calculate_pure_h_index_prop(is_core, n_authors, author_pos, h, efforts)
 
 
 def write_pure_h_index_prop_example(metric_set: MetricSet) -> str:
@@ -4358,7 +4781,8 @@ def calculate_pure_h_index_geom(metric_set: MetricSet) -> float:
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
     h = metric_set.metrics["h-index"].value
-    return Impact_Funcs.calculate_pure_h_index_geom(is_core, n_authors, author_pos, h)
+    efforts = metric_set.author_efforts("geometric")
+    return Impact_Funcs.calculate_pure_h_index_geom(is_core, n_authors, author_pos, h, efforts)
 
 
 def write_pure_h_index_geom_example(metric_set: MetricSet) -> str:
@@ -4545,7 +4969,8 @@ def calculate_adapt_pure_h_index_prop(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_adapt_pure_h_index_prop(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("proportional")
+    return Impact_Funcs.calculate_adapt_pure_h_index_prop(citations, n_authors, author_pos, efforts)
 
 
 def write_adapt_pure_h_index_prop_example(metric_set: MetricSet) -> str:
@@ -4656,7 +5081,8 @@ def calculate_adapt_pure_h_index_geom(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_adapt_pure_h_index_geom(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("geometric")
+    return Impact_Funcs.calculate_adapt_pure_h_index_geom(citations, n_authors, author_pos, efforts)
 
 
 def write_adapt_pure_h_index_geom_example(metric_set: MetricSet) -> str:
@@ -4767,7 +5193,8 @@ def calculate_p_index_harm(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_harmonic_p_index(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("harmonic")
+    return Impact_Funcs.calculate_harmonic_p_index(citations, n_authors, author_pos, efforts)
 
 
 def metric_p_index_harm() -> Metric:
@@ -4805,7 +5232,8 @@ def calculate_profit_p_index(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_profit_p_index(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("harmonic_aziz")
+    return Impact_Funcs.calculate_profit_p_index(citations, n_authors, author_pos, efforts)
 
 
 def metric_profit_p_index() -> Metric:
@@ -4845,7 +5273,8 @@ def calculate_profit_adj_h_index(metric_set: MetricSet) -> int:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_profit_adj_h_index(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("harmonic_aziz")
+    return Impact_Funcs.calculate_profit_adj_h_index(citations, n_authors, author_pos, efforts)
 
 
 def write_profit_adj_h_index_example(metric_set: MetricSet) -> str:
@@ -4963,6 +5392,7 @@ def metric_profit_h_index() -> Metric:
                     "profit from co-authors. <em>PLoS ONE</em> 8(4):e59814."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_profit_h_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["Coauthorship"] = True
@@ -5331,7 +5761,8 @@ def calculate_pos_weight_h_index(metric_set: MetricSet) -> int:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_position_weighted_h_index(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("proportional")
+    return Impact_Funcs.calculate_position_weighted_h_index(citations, n_authors, author_pos, efforts)
 
 
 def write_pos_weight_h_index_example(metric_set: MetricSet) -> str:
@@ -5429,7 +5860,8 @@ def calculate_prop_weight_cite_agg(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_prop_weight_cite_agg(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("proportional")
+    return Impact_Funcs.calculate_prop_weight_cite_agg(citations, n_authors, author_pos, efforts)
 
 
 def metric_prop_weight_cite_agg() -> Metric:
@@ -5462,7 +5894,8 @@ def calculate_prop_weight_cite_h_cut(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     n_authors = metric_set.author_counts()
     author_pos = metric_set.author_position()
-    return Impact_Funcs.calculate_prop_weight_cite_h_cut(citations, n_authors, author_pos)
+    efforts = metric_set.author_efforts("proportional")
+    return Impact_Funcs.calculate_prop_weight_cite_h_cut(citations, n_authors, author_pos, efforts)
 
 
 def write_prop_weight_cite_h_cut_example(metric_set: MetricSet) -> str:
@@ -5740,6 +6173,7 @@ def metric_h_rate() -> Metric:
                      "<em>h-</em>index.</p>\n"
     m.graph_type = LINE_CHART
     m.calculate = calculate_h_rate
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Time"] = True
     m.properties["Core Citations"] = True
@@ -5820,6 +6254,7 @@ def metric_ls_h_rate() -> Metric:
                     "<em>Scientometrics</em> 73(1):19-28."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_ls_h_rate
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Time"] = True
     m.properties["Core Citations"] = True
@@ -5850,6 +6285,7 @@ def metric_time_scaled_h_index() -> Metric:
                     "of Informetrics</em> 7:176&ndash;182."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_time_scaled_h_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["All Publications"] = True
     m.properties["Time"] = True
@@ -5884,6 +6320,7 @@ def metric_alpha_index() -> Metric:
                     "91:1053&ndash;1058."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_alpha_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Time"] = True
     m.properties["All Publications"] = True
@@ -5957,6 +6394,7 @@ def metric_dynamic_h_type_index() -> Metric:
                     "59(11):1853&ndash;1855."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_dynamic_h_type_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["Time"] = True
@@ -5968,7 +6406,8 @@ def calculate_hpd_index(metric_set: MetricSet) -> int:
     citations = metric_set.citations
     pub_years = metric_set.publication_years()
     year = metric_set.year()
-    return Impact_Funcs.calculate_hpd_index(citations, pub_years, year)
+    return Impact_Funcs.calculate_hpd_index(citations, pub_years, year,
+                                            metric_set.publication_year_index())
 
 
 def write_hpd_index_example(metric_set: MetricSet) -> str:
@@ -6046,7 +6485,8 @@ def calculate_contemporary_h_index(metric_set: MetricSet) -> int:
     citations = metric_set.citations
     pub_years = metric_set.publication_years()
     year = metric_set.year()
-    return Impact_Funcs.calculate_contemporary_h_index(citations, pub_years, year)
+    return Impact_Funcs.calculate_contemporary_h_index(citations, pub_years, year,
+                                                       metric_set.publication_year_index())
 
 
 def write_contemporary_h_index_example(metric_set: MetricSet) -> str:
@@ -6127,10 +6567,7 @@ def metric_contemporary_h_index() -> Metric:
 
 # trend h-index
 def calculate_trend_h_index(metric_set: MetricSet) -> int:
-    metric_list = metric_set.parent_list
-    metric_pos = metric_list.index(metric_set)
-    pub_data = [p.citations[:metric_pos+1] for p in metric_set.publications]
-    return Impact_Funcs.calculate_trend_h_index(pub_data)
+    return Impact_Funcs.calculate_trend_h_index_yearly(metric_set.yearly_citations())
 
 
 def write_trend_h_index_example(metric_set: MetricSet) -> str:
@@ -6282,6 +6719,7 @@ def metric_impact_vitality() -> Metric:
                     "citations one year ago.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_impact_vitality
+    m.complexity = CONSTANT_TIME
     m.properties["Time"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6294,7 +6732,8 @@ def calculate_specific_impact_s_index(metric_set: MetricSet) -> float:
     total_cites = metric_set.metrics["total cites"].value
     pub_years = metric_set.publication_years()
     year = metric_set.year()
-    return Impact_Funcs.calculate_specific_impact_s_index(pub_years, year, total_cites)
+    return Impact_Funcs.calculate_specific_impact_s_index(pub_years, year, total_cites,
+                                                          metric_set.publication_year_index())
 
 
 def metric_specific_impact_s_index() -> Metric:
@@ -6385,6 +6824,7 @@ def metric_annual_h_index() -> Metric:
                     "99:811&ndash;821."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_annual_h_index
+    m.complexity = CONSTANT_TIME
     m.properties["Coauthorship"] = True
     m.properties["Time"] = True
     m.properties["Core Metric"] = True
@@ -6513,6 +6953,7 @@ def metric_cdr_index() -> Metric:
                     "Informetrics</em> 7(1):72&ndash;83."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_cdr_index
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6540,6 +6981,7 @@ def metric_circ_cite_area_radius() -> Metric:
                     "<em>Scientometrics</em> 93:987&ndash;1004."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_circ_cite_area_radius
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6568,6 +7010,7 @@ def metric_citation_acceleration() -> Metric:
                     "<em>Scientometrics</em> 93:987&ndash;1004."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_citation_acceleration
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6595,6 +7038,7 @@ def metric_redner_index() -> Metric:
                     "Mechanics: Theory and Experiment</em> 2010(3):L03005."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_redner_index
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     return m
@@ -6649,6 +7093,7 @@ def metric_s_index_h_mixed() -> Metric:
                     "<em>Journal of Library and Information Studies</em> 8:1&ndash;9."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_s_index_h_mixed
+    m.complexity = CONSTANT_TIME
     m.properties["Compound Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6681,6 +7126,7 @@ def metric_t_index_h_mixed() -> Metric:
                     "<em>Journal of Library and Information Studies</em> 8:1&ndash;9."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_t_index_h_mixed
+    m.complexity = CONSTANT_TIME
     m.properties["Compound Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6745,6 +7191,7 @@ def metric_cq_index() -> Metric:
                     "to knowledge. <em>Social Studies of Science</em> 8:349&ndash;354."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_cq_index
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -6773,6 +7220,7 @@ def metric_cq04_index() -> Metric:
     m.symbol = "CQ<sup>0.4</sup>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_cq04_index
+    m.complexity = CONSTANT_TIME
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
     m.properties["Alternative Metric"] = True
@@ -6784,7 +7232,8 @@ def calculate_th_index(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     years = metric_set.publication_years()
     total_cites = metric_set.metrics["total cites"].value
-    return Impact_Funcs.calculate_th_index(citations, years, total_cites)
+    return Impact_Funcs.calculate_th_index(citations, years, total_cites,
+                                           metric_set.publication_year_index())
 
 
 def write_th_index_example(metric_set: MetricSet) -> str:
@@ -6884,6 +7333,7 @@ def metric_mean_at_index() -> Metric:
                     "<em>ArXiv:physics</em>:0508113v1."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_mean_at_index
+    m.complexity = CONSTANT_TIME
     m.properties["Time"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -6935,6 +7385,7 @@ def metric_dci_index2() -> Metric:
                     "67:1424&ndash;1439."]
     m.graph_type = MULTILINE_CHART_LEFT
     m.calculate = calculate_dci_index2
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -6976,6 +7427,7 @@ def metric_ddci_index2() -> Metric:
                     "67:1424&ndash;1439."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_ddci_index2
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -7028,6 +7480,7 @@ def metric_dci_index10() -> Metric:
                     "67:1424&ndash;1439."]
     m.graph_type = MULTILINE_CHART_LEFT
     m.calculate = calculate_dci_index10
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -7069,6 +7522,7 @@ def metric_ddci_index10() -> Metric:
                     "67:1424&ndash;1439."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_ddci_index10
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -7081,7 +7535,7 @@ def metric_ddci_index10() -> Metric:
 def calculate_history_h_index(metric_set: MetricSet) -> int:
     h = metric_set.metrics["h-index"].value
     citations = metric_set.citations
-    return Impact_Funcs.calculate_history_h_index(citations, h)
+    return Impact_Funcs.calculate_history_h_index(citations, h, metric_set.sorted_citations())
 
 
 def write_history_h_index_desc_data(metric_set: MetricSet) -> list:
@@ -7227,6 +7681,7 @@ def metric_history_h_index() -> Metric:
                     "<em>Scientometrics</em> 80(3):809&ndash;818."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_history_h_index
+    m.complexity = LINEAR_TIME
     m.properties["Core Metric"] = True
     m.properties["Core Publications"] = True
     m.properties["Core Citations"] = True
@@ -7260,6 +7715,7 @@ def metric_quality_quotient() -> Metric:
                     "<em>Scientometrics</em> 80(3):809&ndash;818."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_quality_quotient
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Compound Metric"] = True
     m.properties["Core Publications"] = True
@@ -7307,6 +7763,7 @@ def metric_scientist_level() -> Metric:
                     "Engineering Science and Technology Review</em> 2(1):68&ndash;70."]
     m.graph_type = LINE_CHART_COMBINE
     m.calculate = calculate_scientist_level
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -7337,6 +7794,7 @@ def metric_scientist_level_nonint() -> Metric:
                     "Tools for Studying and Evaluating Research.</em> Weinheim, Germany: Wiley."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_scientist_level_nonint
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -7469,7 +7927,8 @@ def metric_q_index() -> Metric:
 # career years h-index by publications (Mahbuba and Rousseau 2013)
 def calculate_career_years_h_index_pub(metric_set: MetricSet) -> int:
     pub_years = metric_set.publication_years()
-    return Impact_Funcs.calculate_career_years_h_index_pub(pub_years)
+    return Impact_Funcs.calculate_career_years_h_index_pub(pub_years,
+                                                           metric_set.publication_year_index())
 
 
 def write_career_years_h_index_pub_example(metric_set: MetricSet) -> str:
@@ -7545,7 +8004,8 @@ def metric_career_years_h_index_pub() -> Metric:
 def calculate_career_years_h_index_cite(metric_set: MetricSet) -> int:
     pub_years = metric_set.publication_years()
     cites = metric_set.citations
-    return Impact_Funcs.calculate_career_years_h_index_cite(pub_years, cites)
+    return Impact_Funcs.calculate_career_years_h_index_cite(pub_years, cites,
+                                                            metric_set.publication_year_index())
 
 
 def write_career_years_h_index_cite_example(metric_set: MetricSet) -> str:
@@ -7626,7 +8086,8 @@ def metric_career_years_h_index_cite() -> Metric:
 def calculate_career_years_h_index_avgcite(metric_set: MetricSet) -> float:
     pub_years = metric_set.publication_years()
     cites = metric_set.citations
-    return Impact_Funcs.calculate_career_years_h_index_avgcite(pub_years, cites)
+    return Impact_Funcs.calculate_career_years_h_index_avgcite(pub_years, cites,
+                                                               metric_set.publication_year_index())
 
 
 def write_career_years_h_index_avgcite_example(metric_set: MetricSet) -> str:
@@ -7723,7 +8184,8 @@ def calculate_career_years_h_index_diffspeed(metric_set: MetricSet) -> float:
     pub_years = metric_set.publication_years()
     cites = metric_set.citations
     cur_year = metric_set.year()
-    return Impact_Funcs.calculate_career_years_h_index_diffspeed(pub_years, cites, cur_year)
+    return Impact_Funcs.calculate_career_years_h_index_diffspeed(pub_years, cites, cur_year,
+                                                                 metric_set.publication_year_index())
 
 
 def write_career_years_h_index_diffspeed_example(metric_set: MetricSet) -> str:
@@ -7950,7 +8412,7 @@ def metric_collaborative_coefficient() -> Metric:
 
 # i10 index (Google Scholar)
 def calculate_i10_index(metric_set: MetricSet) -> int:
-    return Impact_Funcs.calculate_i10_index(metric_set.citations)
+    return Impact_Funcs.calculate_i10_index(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_i10_index() -> Metric:
@@ -7964,6 +8426,7 @@ def metric_i10_index() -> Metric:
                     "have received at least 10 citations.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_i10_index
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -7972,7 +8435,7 @@ def metric_i10_index() -> Metric:
 
 # i100 index (Teixeira da Silva, 2021)
 def calculate_i100_index(metric_set: MetricSet) -> int:
-    return Impact_Funcs.calculate_i100_index(metric_set.citations)
+    return Impact_Funcs.calculate_i100_index(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_i100_index() -> Metric:
@@ -7986,6 +8449,7 @@ def metric_i100_index() -> Metric:
                     "__i10__ and is simply the number of publications which have received at least 100 citations.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_i100_index
+    m.complexity = LINEAR_TIME
     m.references = ["Teixeira da Silva, J.A. (2021) The i100-index, i1000-index and i10,000-index: expansion and "
                     "fortification of the Google Scholar h-index for finer-scale citation descriptions and researcher "
                     "classification. <em>Scientometrics</em> 126:3667-3672."]
@@ -7997,7 +8461,7 @@ def metric_i100_index() -> Metric:
 
 # i1000 index (Teixeira da Silva, 2021)
 def calculate_i1000_index(metric_set: MetricSet) -> int:
-    return Impact_Funcs.calculate_i1000_index(metric_set.citations)
+    return Impact_Funcs.calculate_i1000_index(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_i1000_index() -> Metric:
@@ -8012,6 +8476,7 @@ def metric_i1000_index() -> Metric:
                     "citations.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_i1000_index
+    m.complexity = LINEAR_TIME
     m.references = ["Teixeira da Silva, J.A. (2021) The i100-index, i1000-index and i10,000-index: expansion and "
                     "fortification of the Google Scholar h-index for finer-scale citation descriptions and researcher "
                     "classification. <em>Scientometrics</em> 126:3667-3672."]
@@ -8023,7 +8488,7 @@ def metric_i1000_index() -> Metric:
 
 # p1 index (van Eck and Waltman 2008)
 def calculate_p1_index(metric_set: MetricSet) -> int:
-    return Impact_Funcs.calculate_p1_index(metric_set.citations)
+    return Impact_Funcs.calculate_p1_index(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_p1_index() -> Metric:
@@ -8038,6 +8503,7 @@ def metric_p1_index() -> Metric:
                     "simply the number of publications which have received at least one citation.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_p1_index
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -8047,7 +8513,7 @@ def metric_p1_index() -> Metric:
 
 # PC%
 def calculate_cited_paper_percent(metric_set: MetricSet) -> float:
-    return Impact_Funcs.calculate_cited_paper_percent(metric_set.citations)
+    return Impact_Funcs.calculate_cited_paper_percent(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_cited_paper_percent() -> Metric:
@@ -8062,6 +8528,7 @@ def metric_cited_paper_percent() -> Metric:
                     "one citation.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_cited_paper_percent
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -8071,7 +8538,7 @@ def metric_cited_paper_percent() -> Metric:
 
 # uncitedness factor
 def calculate_uncitedness_factor(metric_set: MetricSet) -> int:
-    return Impact_Funcs.calculate_uncitedness_factor(metric_set.citations)
+    return Impact_Funcs.calculate_uncitedness_factor(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_uncitedness_factor() -> Metric:
@@ -8086,6 +8553,7 @@ def metric_uncitedness_factor() -> Metric:
                     "<p>where <em>P</em><sub>1</sub> is the number of publications with at least one citation.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_uncitedness_factor
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -8095,7 +8563,7 @@ def metric_uncitedness_factor() -> Metric:
 
 # UF%
 def calculate_uncited_paper_percent(metric_set: MetricSet) -> float:
-    return Impact_Funcs.calculate_uncited_paper_percent(metric_set.citations)
+    return Impact_Funcs.calculate_uncited_paper_percent(metric_set.citations, metric_set.sorted_citations())
 
 
 def metric_uncited_paper_percent() -> Metric:
@@ -8112,6 +8580,7 @@ def metric_uncited_paper_percent() -> Metric:
                     "publications with at least one citation.</p>"
     m.graph_type = LINE_CHART
     m.calculate = calculate_uncited_paper_percent
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -8519,6 +8988,7 @@ def metric_chi_index() -> Metric:
                     "simple geometric interpretation. <em>PLoS ONE</em> 13(7):e0200098."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_chi_index
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Citations"] = True
     m.properties["All Publications"] = True
@@ -8848,6 +9318,7 @@ def metric_o_index() -> Metric:
                     "11(11):882&ndash;883."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_o_index
+    m.complexity = CONSTANT_TIME
     m.properties["Compound Metric"] = True
     m.properties["Core Citations"] = True
     m.properties["Core Publications"] = True
@@ -8882,6 +9353,7 @@ def metric_discounted_h_index() -> Metric:
                     "Society for Information Science and Technology</em> 64(11):2332&ndash;2339."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_discounted_h_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["Self-Citation"] = True
     m.properties["Core Citations"] = True
@@ -9742,7 +10214,7 @@ def metric_year_based_emp_cites() -> Metric:
 
 
 # h'-index (Zhang 2013)
-def calculate_h_prime_index(metric_set: MetricSet) -> float:
+def calculate_h_prime_index(metric_set: MetricSet) -> Union[str, float]:
     total_cites = metric_set.metrics["total cites"].value
     core_cites = metric_set.metrics["h-core cites"].value
     h = metric_set.metrics["h-index"].value
@@ -9803,7 +10275,7 @@ def metric_h_prime_index() -> Metric:
     m.full_name = "h&prime;-index"
     m.html_name = "<em>h&prime;-</em>index"
     m.symbol = "<em>h&prime;</em>"
-    m.metric_type = FLOAT
+    m.metric_type = FLOAT_NA
     graph = DescriptionGraph()
     m.description_graphs.append(graph)
     graph.name = "h_prime_index_desc"
@@ -9820,6 +10292,7 @@ def metric_h_prime_index() -> Metric:
                     "the citation distribution. <em>PLoS ONE</em> 8(4):e59912."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_h_prime_index
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -9856,6 +10329,7 @@ def metric_hc() -> Metric:
                      f"greater than one, otherwise <em>h<sub>c</sub></em> = <em>h</em>.")
     m.graph_type = LINE_CHART
     m.calculate = calculate_hc
+    m.complexity = CONSTANT_TIME
     m.properties["Core Property"] = True
     m.properties["Core Publications"] = True
     m.properties["Core Citations"] = True
@@ -9944,6 +10418,7 @@ def metric_k_index_anania_caruso() -> Metric:
                     "<em>Scientometrics</em> 96:617&ndash;631."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_k_index_anania_caruso
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["Core Publications"] = True
     m.properties["Core Citations"] = True
@@ -9976,6 +10451,7 @@ def metric_w_index_anania_caruso() -> Metric:
                     "<em>Scientometrics</em> 96:617&ndash;631."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_w_index_anania_caruso
+    m.complexity = CONSTANT_TIME
     m.properties["Core Metric"] = True
     m.properties["All Publications"] = True
     m.properties["Core Citations"] = True
@@ -10263,6 +10739,7 @@ def metric_zynergy() -> Metric:
                     "Association for Information Science and Technology</em> 65(2):426&ndash;427."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_zynergy
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -10323,6 +10800,7 @@ def metric_rmp() -> Metric:
                     "impact. <em>Scientometrics</em> 127:2829&ndash;2845."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_rmp
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["All Publications"] = True
     m.properties["All Citations"] = True
@@ -10457,6 +10935,7 @@ def metric_3dsi_pr() -> Metric:
                     "impact. <em>Scientometrics</em> 127:2829&ndash;2845."]
     # m.graph_type = LINE_CHART
     m.calculate = calculate_3dsi_pr
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["Multidimensional Metric"] = True
     m.properties["All Publications"] = True
@@ -10466,6 +10945,8 @@ def metric_3dsi_pr() -> Metric:
 
 # total collaborators
 def calculate_total_collaborators(metric_set: MetricSet) -> int:
+    if metric_set.total_collaborators is not None:
+        return metric_set.total_collaborators
     return Impact_Funcs.calculate_total_collaborators(metric_set.coauthors())
 
 
@@ -10479,6 +10960,7 @@ def metric_total_collaborators() -> Metric:
                      "factor in the traditional sense.</p>")
     m.graph_type = LINE_CHART
     m.calculate = calculate_total_collaborators
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Publications"] = True
     m.properties["Coauthorship"] = True
@@ -10487,6 +10969,8 @@ def metric_total_collaborators() -> Metric:
 
 # partnership ability index (Schubert 2012)
 def calculate_partnership_ability(metric_set: MetricSet) -> int:
+    if metric_set.partnership_ability is not None:
+        return metric_set.partnership_ability
     return Impact_Funcs.calculate_partnership_ability(metric_set.coauthors())
     # return Impact_Funcs.calculate_partnership_ability(metric_set.publications)
 
@@ -10511,6 +10995,7 @@ def metric_partnership_ability() -> Metric:
 
     m.graph_type = LINE_CHART
     m.calculate = calculate_partnership_ability
+    m.complexity = LINEAR_TIME
     m.properties["Basic Statistic"] = True
     m.properties["All Publications"] = True
     m.properties["Coauthorship"] = True
@@ -10582,6 +11067,7 @@ def metric_platinum_h() -> Metric:
 
     m.graph_type = LINE_CHART
     m.calculate = calculate_platinum_h
+    m.complexity = CONSTANT_TIME
     m.properties["Compound Metric"] = True
     m.properties["Core Publications"] = True
     m.properties["Core Citations"] = True
@@ -10653,6 +11139,7 @@ def metric_stochastic_h() -> Metric:
                     "Informetrics</em> 6(1):80&ndash;87."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_stochastic_h
+    m.complexity = EXPONENTIAL_TIME
     m.properties["Core Metric"] = True
     m.properties["Core Publications"] = True
     m.properties["Core Citations"] = True
@@ -10664,7 +11151,7 @@ def calculate_multiple_h_index(metric_set: MetricSet) -> float:
     citations = metric_set.citations
     year = metric_set.year()
     pub_years = metric_set.publication_years()
-    return Impact_Funcs.calculate_multiple_h_index(citations, year, pub_years)
+    return Impact_Funcs.calculate_multiple_h_index(citations, year, pub_years, metric_set.h_decomposition())
 
 
 def metric_multiple_h_index() -> Metric:
@@ -10746,7 +11233,8 @@ def metric_hmaj_index() -> Metric:
 # fractional publication count
 def calculate_total_pubs_fractional(metric_set: MetricSet) -> float:
     return Impact_Funcs.calculate_total_pubs_coauthor_adj("fractional", metric_set.author_counts(),
-                                                          metric_set.author_position())
+                                                          metric_set.author_position(),
+                                                          metric_set.author_efforts("fractional"))
 
 
 def metric_total_pubs_fractional() -> Metric:
@@ -10774,7 +11262,8 @@ def metric_total_pubs_fractional() -> Metric:
 # proportional publication count
 def calculate_total_pubs_proportional(metric_set: MetricSet) -> float:
     return Impact_Funcs.calculate_total_pubs_coauthor_adj("proportional", metric_set.author_counts(),
-                                                          metric_set.author_position())
+                                                          metric_set.author_position(),
+                                                          metric_set.author_efforts("proportional"))
 
 
 def metric_total_pubs_proportional() -> Metric:
@@ -10804,7 +11293,8 @@ def metric_total_pubs_proportional() -> Metric:
 # geometric publication count
 def calculate_total_pubs_geometric(metric_set: MetricSet) -> float:
     return Impact_Funcs.calculate_total_pubs_coauthor_adj("geometric", metric_set.author_counts(),
-                                                          metric_set.author_position())
+                                                          metric_set.author_position(),
+                                                          metric_set.author_efforts("geometric"))
 
 
 def metric_total_pubs_geometric() -> Metric:
@@ -10834,7 +11324,8 @@ def metric_total_pubs_geometric() -> Metric:
 # harmonic publication count
 def calculate_total_pubs_harmonic(metric_set: MetricSet) -> float:
     return Impact_Funcs.calculate_total_pubs_coauthor_adj("harmonic", metric_set.author_counts(),
-                                                          metric_set.author_position())
+                                                          metric_set.author_position(),
+                                                          metric_set.author_efforts("harmonic"))
 
 
 def metric_total_pubs_harmonic() -> Metric:
@@ -10869,10 +11360,7 @@ def metric_total_pubs_harmonic() -> Metric:
 
 # l sequence (liu and yang 2014)
 def calculate_l_sequence(metric_set: MetricSet) -> int:
-    metric_list = metric_set.parent_list
-    metric_pos = metric_list.index(metric_set)
-    pub_data = [p.citations[:metric_pos+1] for p in metric_set.publications]
-    return Impact_Funcs.calculate_l_sequence(pub_data)
+    return Impact_Funcs.calculate_l_sequence_yearly(metric_set.yearly_citations())
 
 
 def metric_l_sequence() -> Metric:
@@ -10903,10 +11391,7 @@ def metric_l_sequence() -> Metric:
 
 # l∝ (liu and yang 2014)
 def calculate_l_prop(metric_set: MetricSet) -> int:
-    metric_list = metric_set.parent_list
-    metric_pos = metric_list.index(metric_set)
-    pub_data = [p.citations[:metric_pos+1] for p in metric_set.publications]
-    return Impact_Funcs.calculate_l_prop(pub_data)
+    return Impact_Funcs.calculate_l_prop_yearly(metric_set.yearly_citations())
 
 
 def metric_l_prop() -> Metric:
@@ -10954,6 +11439,7 @@ def metric_k_index_kaptay() -> Metric:
                     "evaluate better the scientific excellence of individuals. <em>Heliyon</em> 6(7):e04415."]
     m.graph_type = LINE_CHART
     m.calculate = calculate_k_index_kaptay
+    m.complexity = CONSTANT_TIME
     m.properties["Alternative Metric"] = True
     m.properties["Coauthorship"] = True
     m.properties["All Publications"] = True
@@ -10967,7 +11453,8 @@ def calculate_kz_index(metric_set: MetricSet) -> float:
     pub_years = metric_set.publication_years()
     year = metric_set.year()
     h = metric_set.metrics["h-index"].value
-    return Impact_Funcs.calculate_kz_index(citations, pub_years, year, h)
+    return Impact_Funcs.calculate_kz_index(citations, pub_years, year, h,
+                                           metric_set.publication_year_index())
 
 
 def metric_kz_index() -> Metric:
@@ -11039,9 +11526,86 @@ def metric_kz_index() -> Metric:
 #     return m
 
 
+# --- Date Dependence of Metrics ---
+DATE_ATTRIBUTES = {"year", "date", "academic_age", "parent_list", "yearly_citations"}
+date_dependent_metric_names = None
+
+
+def function_names_and_constants(func) -> Tuple[set, set]:
+    """
+    returns the global/attribute names and the string constants used by a function, including those of nested
+    functions, lambdas, and any helper functions of this module it calls
+    """
+    names = set()
+    constants = set()
+    stack = [func.__code__]
+    visited = set()
+    while len(stack) > 0:
+        code = stack.pop()
+        if code in visited:
+            continue
+        visited.add(code)
+        for n in code.co_names:
+            names.add(n)
+            helper = globals().get(n)
+            if callable(helper) and hasattr(helper, "__code__"):
+                stack.append(helper.__code__)
+        for c in code.co_consts:
+            if hasattr(c, "co_names"):
+                stack.append(c)
+            elif isinstance(c, str):
+                constants.add(c)
+    return names, constants
+
+
+def date_dependent_metrics() -> set:
+    """
+    returns the names of all metrics whose value may depend on the date of the snapshot as well as on its
+    publications and citations, found once by inspecting each calculation function
+
+    a metric is treated as date dependent if it is flagged as a Time metric, if its calculation touches the date,
+    year, academic age, or the list of other snapshots, or if it uses the value of another date dependent metric.
+    the test is conservative: e.g., any use of a publication's year also marks a metric as date dependent
+    """
+    global date_dependent_metric_names
+    if date_dependent_metric_names is None:
+        metric_list = defined_metrics()
+        all_names = {m.name for m in metric_list}
+        dependencies = {}
+        dependent = set()
+        for m in metric_list:
+            if m.calculate is None:
+                continue
+            names, constants = function_names_and_constants(m.calculate)
+            dependencies[m.name] = constants & all_names
+            if m.properties["Time"] or (len(names & DATE_ATTRIBUTES) > 0):
+                dependent.add(m.name)
+        changed = True
+        while changed:
+            changed = False
+            for m in dependencies:
+                if (m not in dependent) and (len(dependencies[m] & dependent) > 0):
+                    dependent.add(m)
+                    changed = True
+        date_dependent_metric_names = dependent
+    return date_dependent_metric_names
 
 
 # --- main initialization loop ---
+metric_definitions = None  # one instance of every metric, only built once and then copied into each MetricSet
+
+
+def defined_metrics() -> list:
+    """
+    returns a single shared instance of every metric. building a metric includes assembling its (long) description,
+    so new sets copy these rather than building every metric anew for every date
+    """
+    global metric_definitions
+    if metric_definitions is None:
+        metric_definitions = load_all_metrics()
+    return metric_definitions
+
+
 def load_all_metrics() -> list:
     """
     function to create a list containing an instance of every metric
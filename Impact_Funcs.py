@@ -5,9 +5,16 @@ This module is designed to provide the functions necessary to calculate the vari
 from generic data, without the reliance on the special class structure of the greater program
 """
 
+import array
+import copy
+import functools
+import hashlib
+import io
 import math
+import pickle
+import threading
+from collections import OrderedDict
 from typing import Tuple, Union, Optional
-import scipy
 import itertools
 
 
@@ -44,9 +51,20 @@ def calculate_median(values: list) -> Number:
 
 def calculate_ranks(citations: list) -> Tuple[list, list]:
     n = len(citations)
-    cumulative_citations = [0 for _ in range(n)]
     # sort by number of citations
-    tmp_index, rank_order = sort_and_rank(citations, n)
+    tmp_index, _ = sort_and_rank(citations, n)
+    return ranks_from_sorted_index(citations, tmp_index)
+
+
+def ranks_from_sorted_index(citations: list, tmp_index: list) -> Tuple[list, list]:
+    """
+    given the indices of the citations sorted from fewest to most, return the rank of each pub (1 is largest) and
+    the cumulative citations of the top i pubs
+    """
+    n = len(citations)
+    tmprank = rank(n, tmp_index)
+    rank_order = [n - tmprank[i] for i in range(n)]
+    cumulative_citations = [0 for _ in range(n)]
     for i in range(n):
         if i > 0:
             cumulative_citations[i] = cumulative_citations[i-1] + citations[tmp_index[n-i-1]]
@@ -55,6 +73,30 @@ def calculate_ranks(citations: list) -> Tuple[list, list]:
     return rank_order, cumulative_citations
 
 
+class RankMaintainer:
+    """
+    carries the citation order of publications from one snapshot into the next
+
+    consecutive snapshots usually differ only by a few new publications and small increases in citations, so the
+    previous order is almost correct. new publications are appended to it and the order is repaired with Python's
+    adaptive sort, which runs in near-linear time on nearly sorted input. ties are broken by publication id, which
+    gives exactly the same ranks as calculate_ranks() as long as the ids increase in the same order as the
+    publications are listed
+    """
+    def __init__(self):
+        self.order = []  # publication ids, sorted from fewest to most citations
+
+    def calculate_ranks(self, citations: list, pub_ids: list) -> Tuple[list, list]:
+        local = {pub_id: i for i, pub_id in enumerate(pub_ids)}
+        order = [pub_id for pub_id in self.order if pub_id in local]
+        if len(order) < len(pub_ids):
+            previous = set(order)
+            order.extend(pub_id for pub_id in pub_ids if pub_id not in previous)
+        order.sort(key=lambda pub_id: (citations[local[pub_id]], pub_id))
+        self.order = order
+        return ranks_from_sorted_index(citations, [local[pub_id] for pub_id in order])
+
+
 def publication_ages(year: int, pub_years: list) -> list:
     """
     returns a list containing the age of each publication
@@ -69,6 +111,36 @@ def citations_per_year(citations: list, pub_ages: list) -> list:
     return [citations[i]/pub_ages[i] for i in range(len(citations))]
 
 
+class YearIndex:
+    """
+    publications bucketed by publication year, with the number of publications and total citations of each year
+    from the first to the last year of publication (years without publications are included with zero counts)
+    """
+    def __init__(self, pub_years: list, citations: Optional[list] = None):
+        self.pub_years = pub_years
+        self.first_year = min(pub_years)
+        self.last_year = max(pub_years)
+        self.pubs = {y: [] for y in range(self.first_year, self.last_year + 1)}  # year -> indices of pubs
+        self.cite_totals = {y: 0 for y in self.pubs}
+        for i, y in enumerate(pub_years):
+            self.pubs[y].append(i)
+            if citations is not None:
+                self.cite_totals[y] += citations[i]
+        self.pub_counts = {y: len(self.pubs[y]) for y in self.pubs}
+        self.ages = {}  # snapshot year -> age of each publication
+
+    def publication_ages(self, year: int) -> list:
+        """
+        returns a list containing the age of each publication, computed once per year of each bucket
+        """
+        ages = self.ages.get(year)
+        if ages is None:
+            year_age = {y: year - y + 1 for y in self.pubs}
+            ages = [year_age[y] for y in self.pub_years]
+            self.ages[year] = ages
+        return ages
+
+
 def total_citations_each_year(total_cite_list: list) -> list:
     """
     returns a list containing the total citations received (across all pubs) each year
@@ -81,9 +153,14 @@ def total_citations_each_year(total_cite_list: list) -> list:
     return tcpy
 
 
-def author_effort(measure: str, n_authors: int, author_pos: int = 1) -> float:
+AUTHOR_EFFORT_MEASURES = ("fractional", "proportional", "geometric", "harmonic", "harmonic_aziz")
+_author_credit_table = {}  # (measure, n_authors) -> effort for each author position
+
+
+def position_effort(measure: str, n_authors: int, author_pos: int) -> float:
     """
-    returns the estimated effort of an author for a publication
+    returns the estimated effort of the author in the given position of a publication with n_authors. author_credit()
+    tabulates the same formulas for every position at once; this is only needed for positions outside the author list
     """
     if measure == "fractional":
         return 1 / n_authors
@@ -106,6 +183,58 @@ def author_effort(measure: str, n_authors: int, author_pos: int = 1) -> float:
         return 1
 
 
+def author_credit(measure: str, n_authors: int) -> list:
+    """
+    returns the estimated effort of every author position of a publication with n_authors, under the given
+    measure. results are cached, so each (measure, n_authors) combination is only computed once
+    """
+    key = (measure, n_authors)
+    credit = _author_credit_table.get(key)
+    if credit is None:
+        positions = range(1, n_authors + 1)
+        if measure == "fractional":
+            credit = [1 / n_authors for _ in positions]
+        elif measure == "proportional":
+            credit = [2*(n_authors + 1 - p) / (n_authors*(n_authors + 1)) for p in positions]
+        elif measure == "geometric":
+            d = 2**n_authors - 1
+            credit = [2**(n_authors - p) / d for p in positions]
+        elif measure == "harmonic":
+            d = sum(1/(i+1) for i in range(n_authors))
+            credit = [(1 / p)/d for p in positions]
+        elif measure == "harmonic_aziz":
+            # this is a more complicated form of the harmonic that includes an additional factor
+            if n_authors % 2 == 0:
+                d = 0
+            else:
+                d = 1 / (2*n_authors)
+            d = (n_authors**2)/2 + n_authors*(1 - d)
+            credit = [(1 + abs(n_authors + 1 - 2*p)) / d for p in positions]
+        else:
+            credit = [1 for _ in positions]
+        _author_credit_table[key] = credit
+    return credit
+
+
+def author_effort(measure: str, n_authors: int, author_pos: int = 1) -> float:
+    """
+    returns the estimated effort of an author for a publication
+    """
+    if measure not in AUTHOR_EFFORT_MEASURES:
+        return 1
+    if 1 <= author_pos <= n_authors:
+        return author_credit(measure, n_authors)[author_pos - 1]
+    # a position outside the author list (e.g., from inconsistent author data) is not in the table
+    return position_effort(measure, n_authors, author_pos)
+
+
+def author_efforts(measure: str, n_authors: list, author_pos: list) -> list:
+    """
+    returns the estimated effort of the author for every publication, in the same order as the input
+    """
+    return [author_effort(measure, a, author_pos[i]) for i, a in enumerate(n_authors)]
+
+
 def citations_per_pub_per_year(pub_list: list) -> list:
     def convert_none(x) -> int:
         if x is None:
@@ -123,6 +252,40 @@ def citations_per_pub_per_year(pub_list: list) -> list:
     return pub_cites
 
 
+class CitationIncrements:
+    """
+    yearly citation increments of every publication of a researcher, computed once from the cumulative counts and
+    stored row by row in a single contiguous array (None, for years before publication, is treated as 0)
+
+    the increments through any snapshot are a prefix of each row, so every snapshot can share the same data through
+    zero-copy views rather than re-slicing and re-differencing the cumulative counts
+    """
+    def __init__(self, pub_list: list):
+        if len(pub_list) > 0:
+            self.n_years = len(pub_list[0])
+        else:
+            self.n_years = 0
+        self.data = array.array("q")
+        for p in pub_list:
+            prev = 0
+            for c in p:
+                if c is None:
+                    c = 0
+                self.data.append(c - prev)
+                prev = c
+        self.view = memoryview(self.data)
+
+    def prefix(self, i: int, n_years: int) -> memoryview:
+        """
+        returns the increments of publication i for its first n_years
+        """
+        start = i * self.n_years
+        return self.view[start:start + n_years]
+
+    def prefixes(self, pub_ids: list, n_years: int) -> list:
+        return [self.prefix(i, n_years) for i in pub_ids]
+
+
 def get_rank_value(values: list) -> int:
     """
     basic function that takes an ordered list of values (high to low) and returns the largest index where the value
@@ -134,6 +297,139 @@ def get_rank_value(values: list) -> int:
     return len(values)
 
 
+def get_rank_value_range(values: list, start: int, end: int, offset: Number = 0) -> int:
+    """
+    get_rank_value() applied to values[start:end] with offset subtracted from each value, without copying the list
+    """
+    k = 0
+    while (start + k < end) and (values[start + k] - offset >= k + 1):
+        k += 1
+    return k
+
+
+def count_ranks(sorted_values: list, condition) -> int:
+    """
+    for a list sorted from high to low and a condition(value, rank) which holds for a leading run of ranks (1 to n)
+    and then fails for all the rest, return the length of that run, found by bisection
+    """
+    lo = 0
+    hi = len(sorted_values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if condition(sorted_values[mid], mid + 1):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def count_at_least(sorted_values: list, threshold: Number) -> int:
+    """
+    number of values in a list sorted from high to low which are greater than or equal to threshold
+    """
+    return count_ranks(sorted_values, lambda c, i: c >= threshold)
+
+
+def largest_rank_at_least(sorted_values: list, k: Number) -> int:
+    """
+    largest rank i for which the i-th value of a list sorted from high to low is at least k*i
+    """
+    return count_ranks(sorted_values, lambda c, i: c >= k*i)
+
+
+class HDecomposition:
+    """
+    decomposition of a set of citations into successive h-cores, found in a single pass over the sorted citations
+    with index arithmetic rather than by slicing and re-sorting
+
+    multidim_h holds the h-index of each successive core (the multidimensional h-index) and matching_h the h of the
+    core each publication (in rank order) belongs to, 0 for publications in no core
+    """
+    def __init__(self, citations: list):
+        self.sorted_citations = sorted(citations, reverse=True)
+        n = len(self.sorted_citations)
+        self.multidim_h = []
+        self.matching_h = [0 for _ in range(n)]
+        start = 0
+        while (start < n) and (self.sorted_citations[start] > 0):
+            h = get_rank_value_range(self.sorted_citations, start, n)
+            self.multidim_h.append(h)
+            for i in range(start, start + h):
+                self.matching_h[i] = h
+            start += h
+
+
+def two_sided_upper_steps(sorted_citations: list, h: int, n_steps: int) -> list:
+    """
+    the successive h-indices of the excess citations above the h-core, from the innermost step outward, found by
+    shrinking the end of the core and accumulating the amount subtracted rather than rebuilding the list
+    """
+    steps = []
+    end = h
+    offset = h
+    for _ in range(n_steps):
+        h = get_rank_value_range(sorted_citations, 0, end, offset)
+        steps.append(h)
+        end = h
+        offset += h
+    return steps
+
+
+scipy_stats = None  # scipy.stats, imported on first use (False if scipy is not installed)
+
+
+def load_scipy_stats():
+    """
+    import scipy.stats the first time it is needed rather than when this module is loaded, as importing scipy
+    takes far longer than everything else needed to start up
+    """
+    global scipy_stats
+    if scipy_stats is None:
+        try:
+            import scipy.stats
+            scipy_stats = scipy.stats
+        except ImportError:
+            scipy_stats = False
+    return scipy_stats
+
+
+numpy_module = None  # numpy, imported on first use (False if numpy is not installed)
+
+
+def load_numpy():
+    """
+    import numpy the first time it is needed (only the batched kernels of the resampling tools use it), for the
+    same reason as scipy
+    """
+    global numpy_module
+    if numpy_module is None:
+        try:
+            import numpy
+            numpy_module = numpy
+        except ImportError:
+            numpy_module = False
+    return numpy_module
+
+
+def poisson_cdf(k: int, rate: float) -> float:
+    """
+    probability of observing k or fewer events from a Poisson distribution with the given rate
+
+    uses scipy if it is available, otherwise sums the probability of each count directly
+    """
+    stats = load_scipy_stats()
+    if stats:
+        return float(stats.poisson.cdf(k, rate))
+    if k < 0:
+        return 0.0
+    term = math.exp(-rate)
+    total = term
+    for i in range(1, int(k) + 1):
+        term *= rate / i
+        total += term
+    return min(total, 1.0)
+
+
 # --- Metric Calculations ---
 
 # Total Publications
@@ -457,11 +753,14 @@ def calculate_fractional_p_index(citations: list, n_authors: list) -> float:
 
 
 # harmonic p-index (Prathap 2011)
-def calculate_harmonic_p_index(citations: list, n_authors: list, author_pos: list) -> float:
+def calculate_harmonic_p_index(citations: list, n_authors: list, author_pos: list,
+                               efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("harmonic", n_authors, author_pos)
     ph = 0
     nh = 0
     for i in range(len(citations)):
-        r = author_effort("harmonic", n_authors[i], author_pos[i])
+        r = efforts[i]
         ph += r
         nh += citations[i] * r
     return (nh**2 / ph)**(1/3)
@@ -486,20 +785,26 @@ def calculate_pure_h_index_frac(is_core: list, n_authors: list, h: int) -> float
 
 
 # proportional pure h-index (Wan et al 2007)
-def calculate_pure_h_index_prop(is_core: list, n_authors: list, author_pos: list, h: int) -> float:
+def calculate_pure_h_index_prop(is_core: list, n_authors: list, author_pos: list, h: int,
+                                efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("proportional", n_authors, author_pos)
     sump = 0
     for i in range(len(is_core)):
         if is_core[i]:
-            sump += 1 / author_effort("proportional", n_authors[i], author_pos[i])
+            sump += 1 / efforts[i]
     return h / math.sqrt(sump / h)
 
 
 # geometric pure h-index (Wan et al 2007)
-def calculate_pure_h_index_geom(is_core: list, n_authors: list, author_pos: list, h: int) -> float:
+def calculate_pure_h_index_geom(is_core: list, n_authors: list, author_pos: list, h: int,
+                                efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("geometric", n_authors, author_pos)
     sumg = 0
     for i in range(len(is_core)):
         if is_core[i]:
-            sumg += 1 / author_effort("geometric", n_authors[i], author_pos[i])
+            sumg += 1 / efforts[i]
     return h / math.sqrt(sumg / h)
 
 
@@ -566,8 +871,10 @@ def calculate_wu_wq(citations: list, w: int) -> int:
 
 
 # Wohlin w-index (Wohlin 2009)
-def calculate_wohlin_w(citations: list) -> float:
-    max_cites = max(citations)
+def calculate_wohlin_w(citations: list, sorted_citations: Optional[list] = None) -> float:
+    if sorted_citations is None:
+        sorted_citations = sorted(citations, reverse=True)
+    max_cites = sorted_citations[0]
     j = 5
     nc = 1
     while max_cites > j-1:
@@ -580,10 +887,7 @@ def calculate_wohlin_w(citations: list) -> float:
             wval.append(5)
         else:
             wval.append(2 * wval[i-1])
-        wclass.append(0)
-        for j in range(len(citations)):
-            if citations[j] >= wval[i]:
-                wclass[i] += 1
+        wclass.append(count_at_least(sorted_citations, wval[i]))
     wohlin_w_index = 0
     for i in range(nc):
         wohlin_w_index += math.log(wval[i]) * wclass[i]
@@ -591,8 +895,12 @@ def calculate_wohlin_w(citations: list) -> float:
 
 
 # contemporary h-index (Sidiropoulos et al 2007)
-def calculate_contemporary_h_index(citations: list, pub_years: list, year: int) -> int:
-    pub_ages = publication_ages(year, pub_years)
+def calculate_contemporary_h_index(citations: list, pub_years: list, year: int,
+                                   year_index: Optional[YearIndex] = None) -> int:
+    if year_index is None:
+        pub_ages = publication_ages(year, pub_years)
+    else:
+        pub_ages = year_index.publication_ages(year)
     cites_per_year = citations_per_year(citations, pub_ages)
     sc = [4*c for c in cites_per_year]
     sc.sort(reverse=True)
@@ -600,8 +908,11 @@ def calculate_contemporary_h_index(citations: list, pub_years: list, year: int)
 
 
 # hpd-index (Kosmulski 2009)
-def calculate_hpd_index(citations: list, pub_years: list, year: int) -> int:
-    pub_ages = publication_ages(year, pub_years)
+def calculate_hpd_index(citations: list, pub_years: list, year: int, year_index: Optional[YearIndex] = None) -> int:
+    if year_index is None:
+        pub_ages = publication_ages(year, pub_years)
+    else:
+        pub_ages = year_index.publication_ages(year)
     cites_per_year = citations_per_year(citations, pub_ages)
     sc = [10*c for c in cites_per_year]
     sc.sort(reverse=True)
@@ -609,10 +920,12 @@ def calculate_hpd_index(citations: list, pub_years: list, year: int) -> int:
 
 
 # specific impact s-index (De Visscher 2010)
-def calculate_specific_impact_s_index(pub_years: list, year: int, total_cites: int) -> float:
+def calculate_specific_impact_s_index(pub_years: list, year: int, total_cites: int,
+                                      year_index: Optional[YearIndex] = None) -> float:
+    if year_index is None:
+        year_index = YearIndex(pub_years)
     # uses a different measure of age of publication, allowing age to be zero
-    pub_ages = [year - y for y in pub_years]
-    specific_impact_s_index = sum(1 - math.exp(-0.1 * pub_ages[i]) for i in range(len(pub_years)))
+    specific_impact_s_index = sum(n * (1 - math.exp(-0.1 * (year - y))) for y, n in year_index.pub_counts.items())
     if specific_impact_s_index != 0:
         specific_impact_s_index = total_cites / (10 * specific_impact_s_index)
     return specific_impact_s_index
@@ -645,18 +958,15 @@ def calculate_gf_paper_index(cumulative_citations: list, rank_order: list, n_aut
 
 
 # multidimensional h-index (Garcia-Perez 2009)
-def calculate_multidimensional_h_index(citations: list) -> list:
-    multi_dim_h_index = []
-    sorted_citations = sorted(citations, reverse=True)
-    while (len(sorted_citations) > 0) and (max(sorted_citations) > 0):
-        h = get_rank_value(sorted_citations)
-        multi_dim_h_index.append(h)
-        sorted_citations = sorted_citations[h:]
-    return multi_dim_h_index
+def calculate_multidimensional_h_index(citations: list, decomposition: Optional[HDecomposition] = None) -> list:
+    if decomposition is None:
+        decomposition = HDecomposition(citations)
+    return [h for h in decomposition.multidim_h]
 
 
 # two-sided h-index (Garcia-Perez 2012)
-def calculate_two_sided_h(citations: list, multidim_h: list, mk: Optional[int] = None) -> list:
+def calculate_two_sided_h(citations: list, multidim_h: list, mk: Optional[int] = None,
+                          decomposition: Optional[HDecomposition] = None) -> list:
     # only need to calculate the upper part of the index the center and tail are identical to multidimensional h
     # mk is the number of steps to match on either side of h; the default is to auto-calculate for as many steps in
     # core as equal to length of steps in tail
@@ -664,17 +974,13 @@ def calculate_two_sided_h(citations: list, multidim_h: list, mk: Optional[int] =
         mk = len(multidim_h)
     else:
         mk += 1  # need to add 1 so number of steps works out correctly
-    two_sided_h = [i for i in multidim_h[:mk]]
-    sorted_citations = sorted(citations, reverse=True)
-    h = multidim_h[0]
-    sorted_citations = [c - h for c in sorted_citations[:h]]
-    cnt = 1
-    while cnt < mk:
-        h = get_rank_value(sorted_citations)
-        two_sided_h.insert(0, h)
-        sorted_citations = [c - h for c in sorted_citations[:h]]
-        cnt += 1
-    return two_sided_h
+    if decomposition is None:
+        sorted_citations = sorted(citations, reverse=True)
+    else:
+        sorted_citations = decomposition.sorted_citations
+    upper = two_sided_upper_steps(sorted_citations, multidim_h[0], max(mk - 1, 0))
+    upper.reverse()
+    return upper + [i for i in multidim_h[:mk]]
 
 
 # normalized hi-index/hf-index (Wohlin 2009)
@@ -699,20 +1005,29 @@ def calculate_gf_cite_index(citations: list, n_authors: list) -> int:
 
 
 # position-weighted h-index (Abbas 2011)
-def calculate_position_weighted_h_index(citations: list, n_authors: list, author_pos: list) -> int:
-    sc = [c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+def calculate_position_weighted_h_index(citations: list, n_authors: list, author_pos: list,
+                                        efforts: Optional[list] = None) -> int:
+    if efforts is None:
+        efforts = author_efforts("proportional", n_authors, author_pos)
+    sc = [c*efforts[i] for i, c in enumerate(citations)]
     sc.sort(reverse=True)
     return get_rank_value(sc)
 
 
 # proportional weighted citation aggregate (Abbas 2011)
-def calculate_prop_weight_cite_agg(citations: list, n_authors: list, author_pos: list) -> float:
-    return sum(c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations))
+def calculate_prop_weight_cite_agg(citations: list, n_authors: list, author_pos: list,
+                                   efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("proportional", n_authors, author_pos)
+    return sum(c*efforts[i] for i, c in enumerate(citations))
 
 
 # proportional weighted citation h-cut (Abbas 2011)
-def calculate_prop_weight_cite_h_cut(citations: list, n_authors: list, author_pos: list) -> float:
-    sc = [c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+def calculate_prop_weight_cite_h_cut(citations: list, n_authors: list, author_pos: list,
+                                     efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("proportional", n_authors, author_pos)
+    sc = [c*efforts[i] for i, c in enumerate(citations)]
     sc.sort(reverse=True)
     v = get_rank_value(sc)
     return sum(sc[:v])
@@ -780,26 +1095,38 @@ def calculate_adapt_pure_h_index_frac(citations: list, n_authors: list) -> float
 
 
 # adapted pure h-index w/proportional author credit (Chai et al 2008)
-def calculate_adapt_pure_h_index_prop(citations: list, n_authors: list, author_pos: list) -> float:
-    sc = [c / math.sqrt(1/author_effort("proportional", n_authors[i], author_pos[i])) for i, c in enumerate(citations)]
+def calculate_adapt_pure_h_index_prop(citations: list, n_authors: list, author_pos: list,
+                                      efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("proportional", n_authors, author_pos)
+    sc = [c / math.sqrt(1/efforts[i]) for i, c in enumerate(citations)]
     return calculate_adapt_pure_h_index(sc)
 
 
 # adapted pure h-index w/geometric author credit (Chai et al 2008)
-def calculate_adapt_pure_h_index_geom(citations: list, n_authors: list, author_pos: list) -> float:
-    sc = [c / math.sqrt(1/author_effort("geometric", n_authors[i], author_pos[i])) for i, c in enumerate(citations)]
+def calculate_adapt_pure_h_index_geom(citations: list, n_authors: list, author_pos: list,
+                                      efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("geometric", n_authors, author_pos)
+    sc = [c / math.sqrt(1/efforts[i]) for i, c in enumerate(citations)]
     return calculate_adapt_pure_h_index(sc)
 
 
 # profit p-index (Aziz and Rozing 2013)
-def calculate_profit_p_index(citations: list, n_authors: list, author_pos: list) -> float:
-    monograph_equiv = sum(author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i in range(len(citations)))
+def calculate_profit_p_index(citations: list, n_authors: list, author_pos: list,
+                             efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts("harmonic_aziz", n_authors, author_pos)
+    monograph_equiv = sum(efforts[i] for i in range(len(citations)))
     return 1 - monograph_equiv / len(citations)
 
 
 # profit adjusted h-index (Aziz and Rozing 2013)
-def calculate_profit_adj_h_index(citations: list, n_authors: list, author_pos: list) -> int:
-    sc = [c * author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+def calculate_profit_adj_h_index(citations: list, n_authors: list, author_pos: list,
+                                 efforts: Optional[list] = None) -> int:
+    if efforts is None:
+        efforts = author_efforts("harmonic_aziz", n_authors, author_pos)
+    sc = [c * efforts[i] for i, c in enumerate(citations)]
     # n = len(citations)
     # sc = [citations[i] * author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i in range(n)]
     sc.sort(reverse=True)
@@ -812,9 +1139,12 @@ def calculate_profit_h_index(profit_adj_h: int, h: int) -> float:
 
 
 # hj-indices (Dorta-Gonzalez and Dorta-Gonzalez 2010)
-def calculate_hj_indices(h: int, citations: list) -> list:
+def calculate_hj_indices(h: int, citations: list, decomposition: Optional[HDecomposition] = None) -> list:
     total_pubs = len(citations)
-    sorted_citations = sorted(citations, reverse=True)
+    if decomposition is None:
+        sorted_citations = sorted(citations, reverse=True)
+    else:
+        sorted_citations = decomposition.sorted_citations
     if total_pubs < 2*h - 1:
         j = total_pubs - h
     else:
@@ -1069,9 +1399,12 @@ def calculate_dynamic_h_type_index(rational_h_list: list, year_list: list, r: fl
 
 # trend h-index (Sidiropoulos et al 2007)
 def calculate_trend_h_index(pub_list: list) -> int:
-    pub_cites = citations_per_pub_per_year(pub_list)
-    ny = len(pub_list[0])
-    sc = [0 for _ in pub_list]
+    return calculate_trend_h_index_yearly(citations_per_pub_per_year(pub_list))
+
+
+def calculate_trend_h_index_yearly(pub_cites: list) -> int:
+    ny = len(pub_cites[0])
+    sc = [0 for _ in pub_cites]
     for i, p in enumerate(pub_cites):
         for y, c in enumerate(p):
             sc[i] += c * (1 / (ny - y))
@@ -1086,16 +1419,16 @@ def calculate_mean_at_index(total_cites: int, th: int) -> float:
 
 
 # characteristic times scale, th (Popov 2005)
-def calculate_th_index(citations: list, years: list, total_cites: int) -> int:
+def calculate_th_index(citations: list, years: list, total_cites: int, year_index: Optional[YearIndex] = None) -> int:
+    if year_index is None:
+        year_index = YearIndex(years, citations)
     target = total_cites / 2
     cite_sum = 0
-    maxy = max(years)
+    maxy = year_index.last_year
     cur_y = maxy + 1
     while cite_sum < target:
         cur_y -= 1
-        for i, y in enumerate(years):
-            if y == cur_y:
-                cite_sum += citations[i]
+        cite_sum += year_index.cite_totals.get(cur_y, 0)
     return maxy - cur_y + 1
 
 
@@ -1124,17 +1457,15 @@ def calculate_ddci_index(dci: list) -> float:
 
 
 # history h-index (Randic 2009)
-def calculate_history_h_index(citations: list, h: int) -> int:
-    tmp_cites = sorted(citations, reverse=True)
-    max_cites = max(tmp_cites)
+def calculate_history_h_index(citations: list, h: int, sorted_citations: Optional[list] = None) -> int:
+    if sorted_citations is None:
+        sorted_citations = sorted(citations, reverse=True)
+    max_cites = sorted_citations[0]
     hklist = [h]
     k = 0
     while max_cites > 2**k:
-        hk = 0
         k += 1
-        for i, c in enumerate(tmp_cites):
-            if c >= (i+1) * 2**k:
-                hk = i+1
+        hk = largest_rank_at_least(sorted_citations, 2**k)
         if hk != 0:
             hklist.append(hk)
     return sum(hklist)
@@ -1183,33 +1514,29 @@ def calculate_q_index(citations: list, self_citations: list, h: int) -> float:
 
 
 # career years h-index by publications (Mahbuba and Rousseau 2013)
-def calculate_career_years_h_index_pub(pub_years: list) -> int:
-    miny = min(pub_years)
-    maxy = max(pub_years)
-    year_cnts = [pub_years.count(y) for y in range(miny, maxy+1)]
+def calculate_career_years_h_index_pub(pub_years: list, year_index: Optional[YearIndex] = None) -> int:
+    if year_index is None:
+        year_index = YearIndex(pub_years)
+    year_cnts = list(year_index.pub_counts.values())
     year_cnts.sort(reverse=True)
     return get_rank_value(year_cnts)
 
 
 # career years h-index by citations (Mahbuba and Rousseau 2013)
-def calculate_career_years_h_index_cite(pub_years: list, cites: list) -> int:
-    miny = min(pub_years)
-    maxy = max(pub_years)
-    year_cnts = {y: 0 for y in range(miny, maxy+1)}
-    for i, c in enumerate(cites):
-        year_cnts[pub_years[i]] += c
-    data = sorted(year_cnts.values(), reverse=True)
+def calculate_career_years_h_index_cite(pub_years: list, cites: list, year_index: Optional[YearIndex] = None) -> int:
+    if year_index is None:
+        year_index = YearIndex(pub_years, cites)
+    data = sorted(year_index.cite_totals.values(), reverse=True)
     return get_rank_value(data)
 
 
 # career years h-index by avg citations/year (Mahbuba and Rousseau 2013)
-def calculate_career_years_h_index_avgcite(pub_years: list, cites: list) -> float:
-    miny = min(pub_years)
-    maxy = max(pub_years)
-    year_cnts = {y: 0 for y in range(miny, maxy+1)}
-    for i, c in enumerate(cites):
-        year_cnts[pub_years[i]] += c
-    year_pubs = {y: pub_years.count(y) for y in range(miny, maxy+1)}
+def calculate_career_years_h_index_avgcite(pub_years: list, cites: list,
+                                           year_index: Optional[YearIndex] = None) -> float:
+    if year_index is None:
+        year_index = YearIndex(pub_years, cites)
+    year_cnts = year_index.cite_totals
+    year_pubs = year_index.pub_counts
     data = []
     for y in year_cnts:
         if year_pubs[y] > 0:
@@ -1222,15 +1549,14 @@ def calculate_career_years_h_index_avgcite(pub_years: list, cites: list) -> floa
 
 
 # career years h-index by diffusion speed (Mahbuba and Rousseau 2013)
-def calculate_career_years_h_index_diffspeed(pub_years: list, cites: list, cur_year: int) -> float:
+def calculate_career_years_h_index_diffspeed(pub_years: list, cites: list, cur_year: int,
+                                             year_index: Optional[YearIndex] = None) -> float:
     # in the original paper they calculate ageas current year - pub year, rather than cy - py + 1. This would mean
     # articles in the present year would have an age of zero and an infinite diffusion
     #   this coded version adds the 1, so an article published this year has an age of 1 and lat year an age of 2
-    miny = min(pub_years)
-    maxy = max(pub_years)
-    cite_cnts = {y: 0 for y in range(miny, maxy+1)}
-    for i, c in enumerate(cites):
-        cite_cnts[pub_years[i]] += c
+    if year_index is None:
+        year_index = YearIndex(pub_years, cites)
+    cite_cnts = year_index.cite_totals
     data = [cite_cnts[y]/(cur_year - y + 1) for y in cite_cnts]
     data.sort(reverse=True)
     h = get_rank_value(data)
@@ -1255,7 +1581,9 @@ def calculate_collaborative_coefficient(author_cnts: list) -> float:
 
 
 # i10 index (Google Scholar)
-def calculate_i10_index(citations: list) -> int:
+def calculate_i10_index(citations: list, sorted_citations: Optional[list] = None) -> int:
+    if sorted_citations is not None:
+        return count_at_least(sorted_citations, 10)
     cnt = 0
     for c in citations:
         if c >= 10:
@@ -1264,7 +1592,9 @@ def calculate_i10_index(citations: list) -> int:
 
 
 # i100 index (Teixeira da Silva, 2021)
-def calculate_i100_index(citations: list) -> int:
+def calculate_i100_index(citations: list, sorted_citations: Optional[list] = None) -> int:
+    if sorted_citations is not None:
+        return count_at_least(sorted_citations, 100)
     cnt = 0
     for c in citations:
         if c >= 100:
@@ -1273,7 +1603,9 @@ def calculate_i100_index(citations: list) -> int:
 
 
 # i1000 index (Teixeira da Silva, 2021)
-def calculate_i1000_index(citations: list) -> int:
+def calculate_i1000_index(citations: list, sorted_citations: Optional[list] = None) -> int:
+    if sorted_citations is not None:
+        return count_at_least(sorted_citations, 1000)
     cnt = 0
     for c in citations:
         if c >= 1000:
@@ -1287,23 +1619,25 @@ def count_non_zero(x: list) -> int:
 
 
 # P1 index (van Eck and Waltman 2008)
-def calculate_p1_index(citations: list) -> int:
+def calculate_p1_index(citations: list, sorted_citations: Optional[list] = None) -> int:
+    if sorted_citations is not None:
+        return count_ranks(sorted_citations, lambda c, i: c > 0)
     return count_non_zero(citations)
 
 
 # cited paper percent
-def calculate_cited_paper_percent(citations: list) -> float:
-    return 100 * calculate_p1_index(citations) / len(citations)
+def calculate_cited_paper_percent(citations: list, sorted_citations: Optional[list] = None) -> float:
+    return 100 * calculate_p1_index(citations, sorted_citations) / len(citations)
 
 
 # uncitedness factor
-def calculate_uncitedness_factor(citations: list) -> int:
-    return len(citations) - calculate_p1_index(citations)
+def calculate_uncitedness_factor(citations: list, sorted_citations: Optional[list] = None) -> int:
+    return len(citations) - calculate_p1_index(citations, sorted_citations)
 
 
 # uncited paper percent
-def calculate_uncited_paper_percent(citations: list) -> float:
-    return 100 - calculate_cited_paper_percent(citations)
+def calculate_uncited_paper_percent(citations: list, sorted_citations: Optional[list] = None) -> float:
+    return 100 - calculate_cited_paper_percent(citations, sorted_citations)
 
 
 # # beauty coefficient (Ke et al 2015)
@@ -1476,7 +1810,9 @@ def calculate_year_based_emp_cites(total_cite_list: list) -> float:
 
 
 # h' index (Zhang 2012)
-def calculate_h_prime(h: int, e: float, total_cites, core_cites) -> float:
+def calculate_h_prime(h: int, e: float, total_cites, core_cites) -> Union[str, float]:
+    if total_cites == core_cites:  # no tail citations
+        return "n/a"
     t = math.sqrt(total_cites - core_cites)
     return e*h/t
 
@@ -1611,6 +1947,93 @@ def calculate_3dsi_pr(total_pubs: int, total_cites: int, csr: float) -> list:
     return [total_pubs, total_cites, pr]
 
 
+# --- Coauthor index ---
+def split_coauthors(coauthors: str) -> list:
+    """
+    returns the names in a semicolon-delimited coauthor string, or an empty list for a "." (no coauthors)
+    """
+    if coauthors == ".":
+        return []
+    return coauthors.split(";")
+
+
+class CoauthorIndex:
+    """
+    coauthor strings for a list of publications, parsed once into interned integer author ids and stored as a
+    CSR-style incidence structure: the ids of the coauthors of publication i are authors[starts[i]:starts[i+1]]
+    """
+    def __init__(self, coauthor_list: list):
+        self.names = []  # name of each author id
+        self.ids = {}  # author id of each name
+        self.starts = [0]
+        self.authors = []
+        for coauthors in coauthor_list:
+            for a in split_coauthors(coauthors):
+                author_id = self.ids.get(a)
+                if author_id is None:
+                    author_id = len(self.names)
+                    self.ids[a] = author_id
+                    self.names.append(a)
+                self.authors.append(author_id)
+            self.starts.append(len(self.authors))
+
+    def pub_authors(self, i: int) -> list:
+        return self.authors[self.starts[i]:self.starts[i+1]]
+
+
+class CollaborationCounter:
+    """
+    publication counts for every coauthor in a CoauthorIndex, maintained incrementally as publications become
+    active (or inactive), along with the number of distinct collaborators and the partnership ability index
+
+    n_at_least[k] holds the number of coauthors with at least k joint publications, so the partnership ability
+    index (the h-index of the coauthor counts) only needs to move one step per change in a single count
+    """
+    def __init__(self, index: CoauthorIndex):
+        self.index = index
+        self.counts = [0 for _ in range(len(index.names))]
+        self.n_at_least = [len(index.names), 0]
+        self.active = set()
+        self.total_collaborators = 0
+        self.partnership_ability = 0
+
+    def add(self, i: int) -> None:
+        self.active.add(i)
+        for a in self.index.pub_authors(i):
+            c = self.counts[a] + 1
+            self.counts[a] = c
+            if c == 1:
+                self.total_collaborators += 1
+            if c == len(self.n_at_least):
+                self.n_at_least.append(0)
+            self.n_at_least[c] += 1
+            p = self.partnership_ability + 1
+            if (p < len(self.n_at_least)) and (self.n_at_least[p] >= p):
+                self.partnership_ability = p
+
+    def remove(self, i: int) -> None:
+        self.active.discard(i)
+        for a in self.index.pub_authors(i):
+            c = self.counts[a]
+            self.counts[a] = c - 1
+            if c == 1:
+                self.total_collaborators -= 1
+            self.n_at_least[c] -= 1
+            p = self.partnership_ability
+            if (p > 0) and (self.n_at_least[p] < p):
+                self.partnership_ability = p - 1
+
+    def update(self, active: list) -> None:
+        """
+        make exactly the publications in active the active set, only touching publications which have changed
+        """
+        new_active = set(active)
+        for i in self.active - new_active:
+            self.remove(i)
+        for i in new_active - self.active:
+            self.add(i)
+
+
 # total collaborators
 def calculate_total_collaborators(coauthor_list: list) -> int:
     c = []
@@ -1693,7 +2116,7 @@ def calculate_stochastic_h(h: int, citations: list, year: int, pub_years: list)
         else:
             rate = c / age  # citations per year
         m = h - c
-        pub_q.append(scipy.stats.poisson.cdf(m, rate))
+        pub_q.append(poisson_cdf(m, rate))
     hs = h + 1
     for i in range(k+1):  # go from 0 to k
         all_indices = range(len(pub_q))
@@ -1712,22 +2135,16 @@ def calculate_stochastic_h(h: int, citations: list, year: int, pub_years: list)
 
 
 # multiple h-index (Yaminfirooz and Gholinia 2015)
-def calculate_multiple_h_index(citations: list, year: int, pub_years: list) -> float:
-    multi_dim_h_index = []
-    matching_h = []
+def calculate_multiple_h_index(citations: list, year: int, pub_years: list,
+                               decomposition: Optional[HDecomposition] = None) -> float:
+    if decomposition is None:
+        decomposition = HDecomposition(citations)
+    # the matching h of each rank only depends on the sorted citation values, so is unaffected by the order of ties
+    matching_h = decomposition.matching_h
     data = [[c, pub_years[i]] for i, c in enumerate(citations)]
     data.sort(reverse=True)
     sorted_citations = [d[0] for d in data]
     sorted_pubyears = [d[1] for d in data]
-    while (len(sorted_citations) > 0) and (max(sorted_citations) > 0):
-        h = get_rank_value(sorted_citations)
-        multi_dim_h_index.append(h)
-        for _ in range(h):
-            matching_h.append(h)
-        sorted_citations = sorted_citations[h:]
-    sorted_citations = [d[0] for d in data]  # pull original sorted citation data back out
-    while len(matching_h) < len(sorted_citations):
-        matching_h.append(0)
     pub_ages = publication_ages(year, sorted_pubyears)
     mh = 0
     for i, c in enumerate(sorted_citations):
@@ -1746,13 +2163,19 @@ def calculate_hmaj_index(citations: list, primary: list) -> int:
     return get_rank_value(tmp_cites)
 
 
-def calculate_total_pubs_coauthor_adj(measure: str, author_cnts: list, author_pos: list) -> float:
-    return sum(author_effort(measure, a, author_pos[i]) for i, a in enumerate(author_cnts))
+def calculate_total_pubs_coauthor_adj(measure: str, author_cnts: list, author_pos: list,
+                                      efforts: Optional[list] = None) -> float:
+    if efforts is None:
+        efforts = author_efforts(measure, author_cnts, author_pos)
+    return sum(efforts)
 
 
 # l-sequence (Liu and Yang 2014)
 def calculate_l_sequence(pub_list: list) -> int:
-    pub_cites = citations_per_pub_per_year(pub_list)
+    return calculate_l_sequence_yearly(citations_per_pub_per_year(pub_list))
+
+
+def calculate_l_sequence_yearly(pub_cites: list) -> int:
     """
     although technically a multidimensional sequence, values for previous years are fixed, so only need to 
     calculate for the citations for the latest year
@@ -1764,11 +2187,14 @@ def calculate_l_sequence(pub_list: list) -> int:
 
 # l-prop (Liu and Yang 2014)
 def calculate_l_prop(pub_list: list) -> int:
+    return calculate_l_prop_yearly(citations_per_pub_per_year(pub_list))
+
+
+def calculate_l_prop_yearly(pub_cites: list) -> int:
     """
     I should be able to get this by directly adding the L values from all years already calculated, but it is
     simpler to recalculate than to access the already calculated values
     """
-    pub_cites = citations_per_pub_per_year(pub_list)
     lp = 0
     for i in range(len(pub_cites[0])):
         cur_year_cites = [x[i] for x in pub_cites]
@@ -1783,8 +2209,11 @@ def calculate_k_index_kaptay(x: float) -> float:
 
 
 # kz-index (Sharma and Uddin 2026)
-def calculate_kz_index(citations, pub_years, year, h) -> float:
-    pub_ages = publication_ages(year, pub_years)
+def calculate_kz_index(citations, pub_years, year, h, year_index: Optional[YearIndex] = None) -> float:
+    if year_index is None:
+        pub_ages = publication_ages(year, pub_years)
+    else:
+        pub_ages = year_index.publication_ages(year)
     k = []
     for c in citations:
         if c == 0:
@@ -1794,6 +2223,277 @@ def calculate_kz_index(citations, pub_years, year, h) -> float:
     return sum(k[i]/pub_ages[i] for i in range(len(k)))
 
 
+# --- Optional Memoization of Kernels ---
+"""
+the calculation functions in this module are pure, so identical inputs (early-career snapshots, consecutive
+snapshots where nothing changed, researchers with identical sub-inputs) always give identical results. memoization
+is off by default; enable_memoization() replaces the named functions in this module with wrappers that cache their
+results in a size-bounded LRU cache keyed by a digest of the content of the arguments. callers which reach the
+functions through the module (e.g., Impact_Funcs.calculate_h_index) pick up the wrappers automatically.
+
+the cache and its statistics are per process: worker processes of a pool start with their own empty cache (or a
+forked copy of the parent's), and the wrappers pickle by name like the original functions
+"""
+MEMO_MAX_SIZE = 4096
+BASIC_TYPES = (int, float, str, bool, type(None))
+
+
+class MemoUnsupported(Exception):
+    pass
+
+
+class MemoPickler(pickle.Pickler):
+    """
+    pickles only basic values and (nested) lists, tuples, arrays and memoryviews; other objects (e.g., precomputed
+    index structures) cannot be keyed. arrays and memoryviews are pickled as tuples of their values
+    """
+    def reducer_override(self, obj):
+        if isinstance(obj, (array.array, memoryview)):
+            return tuple, (tuple(obj),)
+        if isinstance(obj, BASIC_TYPES + (list, tuple)) or (obj is tuple):
+            return NotImplemented
+        raise MemoUnsupported
+
+
+def memo_key(value) -> bytes:
+    """
+    a short key for the content of an argument: a 128-bit digest of its pickle, so the cache does not hold copies of
+    the inputs. a pickle records the type of every value in its position, since 1 and 1.0 are equal but may not give
+    identical results
+    """
+    data = io.BytesIO()
+    MemoPickler(data, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+    return hashlib.blake2b(data.getbuffer(), digest_size=16).digest()
+
+
+class KernelMemo:
+    """
+    size-bounded LRU cache of kernel results shared by all memoized kernels, with hit and miss counts per kernel
+    """
+    def __init__(self, max_size: int = MEMO_MAX_SIZE):
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.stats = {}  # kernel name -> [hits, misses, calls that could not be keyed]
+        self.lock = threading.Lock()
+
+    def call(self, func, args, kwargs):
+        name = func.__name__
+        stats = self.stats.setdefault(name, [0, 0, 0])
+        try:
+            key = (name, memo_key((args, tuple(sorted(kwargs.items())))))
+        except MemoUnsupported:
+            stats[2] += 1
+            return func(*args, **kwargs)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                stats[0] += 1
+                return copy.deepcopy(self.cache[key])
+        result = func(*args, **kwargs)
+        with self.lock:
+            stats[1] += 1
+            self.cache[key] = copy.deepcopy(result)
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+            self.stats = {}
+
+
+kernel_memo = None  # the active cache, or None when memoization is off
+memoized_kernels = {}  # name -> original function, for every kernel currently replaced by a wrapper
+
+
+def memoizable_kernels() -> list:
+    """
+    names of the functions which can be memoized: every metric calculation function in this module
+    """
+    return sorted(name for name, f in globals().items() if name.startswith("calculate_") and callable(f))
+
+
+def memoize(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if kernel_memo is None:
+            return func(*args, **kwargs)
+        return kernel_memo.call(func, args, kwargs)
+    return wrapper
+
+
+def enable_memoization(names: Optional[list] = None, max_size: int = MEMO_MAX_SIZE) -> None:
+    """
+    turn on memoization for the named kernels (default: all of them). may be called repeatedly to switch on
+    additional kernels; the cache size of the first call is kept until memoization is disabled
+    """
+    global kernel_memo
+    if kernel_memo is None:
+        kernel_memo = KernelMemo(max_size)
+    if names is None:
+        names = memoizable_kernels()
+    module = globals()
+    for name in names:
+        if name not in memoized_kernels:
+            memoized_kernels[name] = module[name]
+            module[name] = memoize(module[name])
+
+
+def disable_memoization(names: Optional[list] = None) -> None:
+    """
+    restore the original functions for the named kernels (default: all of them); the cache is discarded once no
+    kernel is memoized
+    """
+    global kernel_memo
+    if names is None:
+        names = list(memoized_kernels)
+    module = globals()
+    for name in names:
+        if name in memoized_kernels:
+            module[name] = memoized_kernels.pop(name)
+    if len(memoized_kernels) == 0:
+        kernel_memo = None
+
+
+def memoization_stats() -> dict:
+    """
+    returns the hits, misses, and unkeyable calls of each memoized kernel in this process
+    """
+    if kernel_memo is None:
+        return {}
+    return {name: {"hits": v[0], "misses": v[1], "unkeyed": v[2]} for name, v in kernel_memo.stats.items()}
+
+
+def memoization_report() -> str:
+    """
+    a table of the hits, misses, unkeyable calls, and hit rate of each memoized kernel in this process
+    """
+    stats = memoization_stats()
+    outlist = [f"{'kernel':<50}{'hits':>10}{'misses':>10}{'unkeyed':>10}{'hit rate':>10}"]
+    totals = {"hits": 0, "misses": 0, "unkeyed": 0}
+    for name in sorted(stats) + ["total"]:
+        if name == "total":
+            counts = totals
+        else:
+            counts = stats[name]
+            for k in totals:
+                totals[k] += counts[k]
+        calls = counts["hits"] + counts["misses"] + counts["unkeyed"]
+        rate = counts["hits"] / calls if calls > 0 else 0
+        outlist.append(f"{name:<50}{counts['hits']:>10}{counts['misses']:>10}{counts['unkeyed']:>10}{rate:>10.1%}")
+    return "\n".join(outlist)
+
+
+# --- Fast Backends ---
+"""
+several kernels have faster ways of being calculated than their reference form: optional precomputed structures
+(sorted citations, a YearIndex, an HDecomposition, author efforts) shared between metrics, and incremental engines
+(RankMaintainer, CollaborationCounter) which carry their state from one snapshot to the next. each of these is
+registered here as a backend of the kernel it replaces, so that every one can be checked against the reference
+kernel (see kernel_equivalence.py).
+
+a backend takes the same arguments as its kernel, always passed by keyword
+"""
+fast_backends = {}  # kernel name -> {backend name: function}
+
+
+def register_fast_backend(kernel_name: str, backend_name: str, func) -> None:
+    fast_backends.setdefault(kernel_name, {})[backend_name] = func
+
+
+def precomputed_backend(kernel, keyword: str, build):
+    """
+    a backend which builds one of the optional precomputed structures of a kernel from its other arguments, and
+    passes it to the kernel
+    """
+    def backend(**kwargs):
+        kwargs[keyword] = build(kwargs)
+        return kernel(**kwargs)
+    return backend
+
+
+def ranks_single_snapshot(citations: list) -> Tuple[list, list]:
+    return RankMaintainer().calculate_ranks(citations, list(range(len(citations))))
+
+
+def ranks_carried_forward(citations: list) -> Tuple[list, list]:
+    """
+    ranks from a RankMaintainer which has already ordered an earlier snapshot, with fewer publications and fewer
+    citations
+    """
+    maintainer = RankMaintainer()
+    earlier = [c // 2 for c in citations[:(len(citations) + 1) // 2]]
+    maintainer.calculate_ranks(earlier, list(range(len(earlier))))
+    return maintainer.calculate_ranks(citations, list(range(len(citations))))
+
+
+def counted_collaborations(coauthor_list: list) -> CollaborationCounter:
+    """
+    a CollaborationCounter for every publication, reached by adding them all, removing the later half, and adding
+    those back again
+    """
+    counter = CollaborationCounter(CoauthorIndex(coauthor_list))
+    n = len(coauthor_list)
+    counter.update(list(range(n)))
+    counter.update(list(range(n // 2)))
+    counter.update(list(range(n)))
+    return counter
+
+
+def register_default_backends() -> None:
+    def sorted_citations(kwargs):
+        return sorted(kwargs["citations"], reverse=True)
+
+    def year_index(kwargs):
+        return YearIndex(kwargs.get("pub_years", kwargs.get("years")), kwargs.get("citations", kwargs.get("cites")))
+
+    def decomposition(kwargs):
+        return HDecomposition(kwargs["citations"])
+
+    def efforts(measure):
+        def build(kwargs):
+            return author_efforts(kwargs.get("measure", measure), kwargs.get("n_authors", kwargs.get("author_cnts")),
+                                  kwargs["author_pos"])
+        return build
+
+    for kernel in (calculate_wohlin_w, calculate_history_h_index, calculate_i10_index, calculate_i100_index,
+                   calculate_i1000_index, calculate_p1_index, calculate_cited_paper_percent,
+                   calculate_uncitedness_factor, calculate_uncited_paper_percent):
+        register_fast_backend(kernel.__name__, "sorted citations",
+                              precomputed_backend(kernel, "sorted_citations", sorted_citations))
+    for kernel in (calculate_contemporary_h_index, calculate_hpd_index, calculate_specific_impact_s_index,
+                   calculate_th_index, calculate_career_years_h_index_pub, calculate_career_years_h_index_cite,
+                   calculate_career_years_h_index_avgcite, calculate_career_years_h_index_diffspeed,
+                   calculate_kz_index):
+        register_fast_backend(kernel.__name__, "year index", precomputed_backend(kernel, "year_index", year_index))
+    for kernel in (calculate_multidimensional_h_index, calculate_two_sided_h, calculate_hj_indices,
+                   calculate_multiple_h_index):
+        register_fast_backend(kernel.__name__, "h decomposition",
+                              precomputed_backend(kernel, "decomposition", decomposition))
+    for kernel, measure in ((calculate_harmonic_p_index, "harmonic"), (calculate_pure_h_index_prop, "proportional"),
+                            (calculate_pure_h_index_geom, "geometric"),
+                            (calculate_position_weighted_h_index, "proportional"),
+                            (calculate_prop_weight_cite_agg, "proportional"),
+                            (calculate_prop_weight_cite_h_cut, "proportional"),
+                            (calculate_adapt_pure_h_index_prop, "proportional"),
+                            (calculate_adapt_pure_h_index_geom, "geometric"),
+                            (calculate_profit_p_index, "harmonic_aziz"),
+                            (calculate_profit_adj_h_index, "harmonic_aziz"),
+                            (calculate_total_pubs_coauthor_adj, None)):
+        register_fast_backend(kernel.__name__, "author efforts", precomputed_backend(kernel, "efforts",
+                                                                                     efforts(measure)))
+    register_fast_backend("calculate_ranks", "rank maintainer", ranks_single_snapshot)
+    register_fast_backend("calculate_ranks", "rank maintainer, carried forward", ranks_carried_forward)
+    register_fast_backend("calculate_total_collaborators", "collaboration counter",
+                          lambda coauthor_list: counted_collaborations(coauthor_list).total_collaborators)
+    register_fast_backend("calculate_partnership_ability", "collaboration counter",
+                          lambda coauthor_list: counted_collaborations(coauthor_list).partnership_ability)
+
+
+register_default_backends()
+
+
 # only used for spot testing new functions
 if __name__ == "__main__":
     pass
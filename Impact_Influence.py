@@ -0,0 +1,303 @@
+# Leave-one-out influence
+"""
+This module finds which publications drive a researcher's metrics: for every publication active at a snapshot, each
+scalar metric is recalculated without it (a jackknife), and the change in the metric is reported as the influence
+of the publication.
+
+Metrics which only depend on the order statistics of the citation counts (total cites, h, g, h(2), hg, Tol's f and
+t, h-core cites, and the a, R, and e-indices) are not recalculated. removing the publication at position k of the
+sorted citations leaves every rank above k unchanged and shifts every rank below it up by one, so its effect on
+these metrics can be found from the sorted citations and their prefix sums:
+* h and h(2) can only drop by one, and only if the publication was in the core
+* g and Tol's indices are the length of a run of ranks which meet a condition; the ranks after k meet it when a
+  value precomputed for each rank is above a threshold set by the removed publication, so the end of the run is
+  found by a search of a table of range minima in logarithmic time
+* the h-core cites (and the a, R, and e-indices from them) follow from h and the prefix sums
+the rare removals where a floating point sum lands too close to a threshold to be sure of agreeing with the metric's
+own calculation are recalculated directly.
+
+every other metric is recalculated from a metric set without the publication (split among worker processes if
+requested), just as the bootstrap resamples are (see Impact_Bootstrap)
+
+    python Impact_Influence.py cites.txt [self.txt coauth.txt] --metrics h-index g-index "Tol t-index"
+    python Impact_Influence.py cites.txt --all-dates --processes 8
+"""
+
+import argparse
+import bisect
+import math
+from typing import Optional
+
+import Impact_Bootstrap
+import Impact_Funcs
+import ImpactFactorCalculator
+
+CLOSED_FORM_METRICS = ("total cites", "h-index", "g-index", "h(2)-index", "hg-index", "Tol f-index", "Tol t-index",
+                       "h-core cites", "a-index", "R-index", "e-index")
+TIE_TOLERANCE = 1e-7
+
+
+class InfluenceTable:
+    """
+    the value of every metric at a snapshot, and the change in each when each publication is removed (None if the
+    metric cannot be calculated with or without the publication)
+    """
+    def __init__(self, date, publications: list, citations: list):
+        self.date = date
+        self.publications = publications
+        self.citations = citations
+        self.values = {}
+        self.changes = {}
+
+
+class FirstBelow:
+    """
+    a sparse table of the minima of every power-of-two range of a list of values, to find the first position at or
+    after a start whose value is below a threshold in logarithmic time
+    """
+    def __init__(self, values: list):
+        self.levels = [list(values)]
+        width = 1
+        while 2 * width <= len(values):
+            previous = self.levels[-1]
+            self.levels.append([min(previous[i], previous[i + width]) for i in range(len(previous) - width)])
+            width *= 2
+
+    def find(self, start: int, threshold: float) -> int:
+        """
+        the first position at or after start with a value below the threshold, or the length of the list if none
+        """
+        position = start
+        for j in range(len(self.levels) - 1, -1, -1):
+            level = self.levels[j]
+            if (position < len(level)) and (level[position] >= threshold):
+                position += 1 << j
+        return min(position, len(self.levels[0]))
+
+
+class LeaveOneOut:
+    """
+    the sorted citations of a snapshot with their prefix sums and rank tables, from which the order-statistic
+    metrics without any one publication are found
+    """
+    def __init__(self, citations: list):
+        self.citations = sorted(citations, reverse=True)
+        self.ascending = self.citations[::-1]
+        n = len(self.citations)
+        self.cumulative = [0]
+        for c in self.citations:
+            self.cumulative.append(self.cumulative[-1] + c)
+        self.h = Impact_Funcs.get_rank_value(self.citations)
+        self.roots = [math.sqrt(c) for c in self.citations]
+        self.h2 = Impact_Funcs.get_rank_value(self.roots)
+        self.g = Impact_Funcs.calculate_g_index(self.cumulative[1:])
+        # after a removal, rank r (below the removed pub) holds the pub which had rank r + 1, and the g condition
+        # C(r) >= r^2 becomes cumulative[r + 1] - r^2 >= removed citations
+        self.g_table = FirstBelow([self.cumulative[r + 1] - r ** 2 for r in range(n)])
+        # Tol's indices, calculated as in Impact_Funcs from prefix sums of 1/c and log(c) (zero for uncited pubs)
+        self.inverses = [0 if c == 0 else 1 / c for c in self.citations]
+        self.logs = [0 if c == 0 else math.log(c) for c in self.citations]
+        harmonic = [0]
+        geometric = [0]
+        for i in range(n):
+            harmonic.append(harmonic[-1] + self.inverses[i])
+            geometric.append(geometric[-1] + self.logs[i])
+        self.f = self.tol_index(Impact_Funcs.calculate_tol_f_index, self.citations)
+        self.t = self.tol_index(Impact_Funcs.calculate_tol_t_index, self.citations)
+        # the harmonic mean of the top r is at least r while their sum of 1/c is at most 1, and the geometric mean
+        # while their sum of log(c) is at least r log(r)
+        self.f_table = FirstBelow([-harmonic[r + 1] for r in range(n)])
+        self.t_table = FirstBelow([geometric[r + 1] - (r * math.log(r) if r > 0 else 0) for r in range(n)])
+
+    @staticmethod
+    def tol_index(kernel, citations: list) -> Optional[int]:
+        try:
+            return kernel(citations)
+        except ZeroDivisionError:  # every publication is uncited
+            return None
+
+    def position(self, citations: int) -> int:
+        """
+        the position of a publication with the given citations within the sorted citations (the first of any tied
+        pubs, as removing any of them has the same effect)
+        """
+        return len(self.citations) - bisect.bisect_right(self.ascending, citations)
+
+    def without(self, citations: int) -> list:
+        """
+        the sorted citations without one publication with the given number of citations
+        """
+        k = self.position(citations)
+        return self.citations[:k] + self.citations[k + 1:]
+
+    @staticmethod
+    def rank_without(values: list, rank: int, k: int) -> int:
+        """
+        the rank value (see Impact_Funcs.get_rank_value) of sorted values without the value at position k
+        """
+        if (k >= rank) or ((rank < len(values)) and (values[rank] >= rank)):
+            return rank
+        return rank - 1
+
+    @staticmethod
+    def run_without(table: FirstBelow, run: int, k: int, threshold: float, tolerance: float = 0) -> Optional[int]:
+        """
+        the length of a leading run of ranks meeting a condition, without the pub at position k: ranks up to k are
+        unaffected, and each later rank r meets the condition when its table value is at least the threshold.
+        returns None if a table value is within the tolerance of the threshold
+        """
+        if run < k:
+            return run
+        end = table.find(k + 1, threshold + tolerance)
+        if (tolerance > 0) and (table.find(k + 1, threshold - tolerance) != end):
+            return None
+        return end - 1
+
+    def core_cites(self, h: int, k: int) -> int:
+        """
+        the sum of the citations of the top h pubs, without the pub at position k
+        """
+        if h <= k:
+            return self.cumulative[h]
+        return self.cumulative[h + 1] - self.citations[k]
+
+    def values_without(self, citations: int, names: list) -> dict:
+        """
+        the value of each of the named metrics without one publication with the given number of citations (None if
+        it cannot be calculated)
+        """
+        k = self.position(citations)
+        n = len(self.citations)
+        h = self.rank_without(self.citations, self.h, k)
+        g = self.run_without(self.g_table, self.g, k, self.citations[k])
+        core = self.core_cites(h, k)
+        values = {}
+        for name in names:
+            try:
+                if name == "total cites":
+                    values[name] = self.cumulative[n] - citations
+                elif name == "h-index":
+                    values[name] = h
+                elif name == "g-index":
+                    values[name] = g
+                elif name == "h(2)-index":
+                    values[name] = self.rank_without(self.roots, self.h2, k)
+                elif name == "hg-index":
+                    values[name] = Impact_Funcs.calculate_hg_index(h, g)
+                elif name == "h-core cites":
+                    values[name] = core
+                elif name == "a-index":
+                    values[name] = Impact_Funcs.calculate_a_index(core, h)
+                elif name == "R-index":
+                    values[name] = Impact_Funcs.calculate_r_index(core)
+                elif name == "e-index":
+                    values[name] = Impact_Funcs.calculate_e_index(core, h)
+                elif name == "Tol f-index":
+                    values[name] = self.tol_f_without(k)
+                elif name == "Tol t-index":
+                    values[name] = self.tol_t_without(k)
+            except (ArithmeticError, ValueError):
+                values[name] = None
+        return values
+
+    def tol_f_without(self, k: int) -> Optional[int]:
+        if len(self.citations) == 1:
+            return 0
+        if self.citations[1 if k == 0 else 0] == 0:
+            return None  # every remaining pub is uncited
+        f = self.run_without(self.f_table, self.f, k, -(1 + self.inverses[k]), TIE_TOLERANCE)
+        if f is None:
+            f = self.tol_index(Impact_Funcs.calculate_tol_f_index, self.without(self.citations[k]))
+        return f
+
+    def tol_t_without(self, k: int) -> int:
+        t = self.run_without(self.t_table, self.t, k, self.logs[k], TIE_TOLERANCE)
+        if t is None:
+            t = Impact_Funcs.calculate_tol_t_index(self.without(self.citations[k]))
+        return t
+
+
+def influence_tables(date_list: list, article_list: list, inc_self: bool, inc_coauth: bool,
+                     metric_names: Optional[list] = None, snapshots: Optional[list] = None, processes: int = 1,
+                     closed_form: bool = True) -> list:
+    """
+    the influence of every publication on the scalar metrics (all of them, unless names are given) at the given
+    snapshots (by default, the last one).
+
+    order-statistic metrics are updated from the sorted citations (if closed_form is True); the rest are
+    recalculated without each publication, split among worker processes if more than one
+    """
+    metric_sets = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, inc_self, inc_coauth)
+    if snapshots is None:
+        snapshots = [len(date_list) - 1]
+    pool = Impact_Bootstrap.start_workers(processes, date_list, article_list, inc_self, inc_coauth)
+    tables = []
+    try:
+        for snapshot in snapshots:
+            metric_set = metric_sets[snapshot]
+            names = Impact_Bootstrap.scalar_metric_names(metric_set, metric_names, inc_self, inc_coauth)
+            n_pubs = len(metric_set.citations)
+            if (n_pubs == 0) or (len(names) == 0):
+                continue
+            fast_names = [n for n in names if closed_form and (n in CLOSED_FORM_METRICS)]
+            slow_names = [n for n in names if n not in fast_names]
+            values = {name: [] for name in fast_names}
+            if len(fast_names) > 0:
+                leave_one_out = LeaveOneOut(metric_set.citations)
+                for c in metric_set.citations:
+                    for name, value in leave_one_out.values_without(c, fast_names).items():
+                        values[name].append(value)
+            if len(slow_names) > 0:
+                indices = [[j for j in range(n_pubs) if j != i] for i in range(n_pubs)]
+                values.update(Impact_Bootstrap.recalculated_values(pool, processes, snapshot, indices, slow_names))
+            table = InfluenceTable(metric_set.date, metric_set.publications, metric_set.citations)
+            for name in names:
+                value = Impact_Bootstrap.scalar_value(metric_set.metrics[name])
+                table.values[name] = value
+                table.changes[name] = [None if (v is None) or (value is None) else v - value for v in values[name]]
+            tables.append(table)
+    finally:
+        Impact_Bootstrap.stop_workers(pool)
+    return tables
+
+
+def write_tables(filename: str, tables: list) -> None:
+    with open(filename, "w", encoding="utf-8") as outfile:
+        for table in tables:
+            names = list(table.values)
+            outfile.write("Date\tPublication\tYear\tCitations\t" + "\t".join(names) + "\n")
+            date = ImpactFactorCalculator.date_to_string(table.date)
+            outfile.write(f"{date}\tall publications\t\t{sum(table.citations)}\t" +
+                          "\t".join("" if table.values[n] is None else str(table.values[n]) for n in names) + "\n")
+            for i, publication in enumerate(table.publications):
+                changes = ["" if table.changes[n][i] is None else str(table.changes[n][i]) for n in names]
+                outfile.write(f"{date}\t{publication.title}\t{publication.year}\t{table.citations[i]}\t" +
+                              "\t".join(changes) + "\n")
+            outfile.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="influence of each publication on a researcher's metrics")
+    parser.add_argument("citations", help="citation file")
+    parser.add_argument("self", nargs="?", default="", help="self-citation file")
+    parser.add_argument("coauthor", nargs="?", default="", help="coauthor-citation file")
+    parser.add_argument("--metrics", nargs="+", help="names of the metrics (default: every scalar metric)")
+    parser.add_argument("--all-dates", action="store_true", help="analyze every snapshot, not just the last")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--output", default="publication_influence.txt", help="name of the output file")
+    args = parser.parse_args()
+
+    date_list, article_list = ImpactFactorCalculator.read_data_file(args.citations)
+    inc_self = args.self != ""
+    inc_coauth = args.coauthor != ""
+    if inc_self:
+        ImpactFactorCalculator.read_self_citation_files(article_list, args.self, args.coauthor)
+    snapshots = list(range(len(date_list))) if args.all_dates else None
+    tables = influence_tables(date_list, article_list, inc_self, inc_coauth, args.metrics, snapshots,
+                              args.processes)
+    write_tables(args.output, tables)
+    print(f"Influence tables of {len(tables)} snapshots written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# Monte Carlo projection
+"""
+This module projects a researcher's metrics into the future. Where the stochastic h-index only looks one year ahead
+and only at h, here the future citations of every publication are simulated for a number of years, many times
+over, and the distribution of any scalar metric in each future year is collected from the simulated trajectories.
+
+Citation rates are fitted to the citations each publication received over its most recent years (RATE_WINDOW):
+those since the earliest snapshot within the window, over the time elapsed since that snapshot (or all of its
+citations over the time since the start of its publication year, if it is newer than that snapshot). exposure is
+measured in days rather than in snapshots, so partial years and gaps between snapshots do not skew the rates.
+a publication which received k citations over t years is given a gamma distributed rate with shape k + PRIOR_SHAPE
+and scale 1 / t (the posterior of a Poisson rate under a Jeffreys prior), so publications with little history get
+appropriately uncertain rates and uncited ones are not stuck at zero. each trajectory draws one rate for each
+publication and then a Poisson number of new citations in every future year. the projections assume no new
+publications, no change in the rates, and no further self or coauthor citations.
+
+Trajectories are simulated in chunks (with numpy when it is available), so memory use depends on the chunk size
+rather than the number of trajectories. each chunk has its own seed, so results are reproducible and do not depend
+on how the chunks are split among worker processes. the values of each metric in each year are collected in a
+mergeable distribution (see Impact_Cohort), which is kept exactly up to EXACT_LIMIT values and then converted into a
+quantile sketch of bounded size. the h-family is calculated for a whole chunk at once (see Impact_Bootstrap); every
+other metric is calculated from metric sets extended by each trajectory, which is far slower
+
+    python Impact_Projection.py cites.txt [self.txt coauth.txt] --years 5 --trajectories 10000
+    python Impact_Projection.py cites.txt --metrics h-index "Tol t-index" --trajectories 500 --processes 8
+"""
+
+import argparse
+import copy
+import datetime
+import math
+import multiprocessing
+import random
+from typing import Optional
+
+import Impact_Bootstrap
+import Impact_Cohort
+import Impact_Defs
+import Impact_Funcs
+import ImpactFactorCalculator
+import Synthetic_Citations
+
+N_TRAJECTORIES = 10000
+N_YEARS = 5
+CHUNK_SIZE = 1000
+EXACT_LIMIT = 100000  # values of a metric in a year kept exactly before they are sketched
+SEED = 1
+RATE_WINDOW = 3  # most recent years of each publication's history from which its citation rate is fitted
+DAYS_PER_YEAR = 365.25
+PRIOR_SHAPE = 0.5
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DEFAULT_METRICS = ("total cites", "h-index", "g-index", "i10")
+
+
+def years_after(date: datetime.date, years: int) -> datetime.date:
+    try:
+        return date.replace(year=date.year + years)
+    except ValueError:  # Feb 29
+        return date.replace(year=date.year + years, day=28)
+
+
+def rate_window_start(date_list: list, window: int) -> Optional[int]:
+    """
+    the index of the snapshot from which citation rates are fitted: the earliest one no more than window years
+    before the last, or the latest one before that if there is none (a gap longer than the window), or None if there
+    is only a single snapshot
+    """
+    if len(date_list) < 2:
+        return None
+    window_start = years_after(date_list[-1], -window)
+    for i, date in enumerate(date_list[:-1]):
+        if date >= window_start:
+            return i
+    return len(date_list) - 2
+
+
+class ProjectionModel:
+    """
+    the fitted citation rates of a researcher's publications and everything needed to simulate and evaluate their
+    trajectories
+    """
+    def __init__(self, date_list: list, article_list: list, inc_self: bool, inc_coauth: bool, n_years: int,
+                 seed: int, metric_names: list, batched: bool = True, window: int = RATE_WINDOW):
+        self.date_list = date_list
+        self.inc_self = inc_self
+        self.inc_coauth = inc_coauth
+        self.n_years = n_years
+        self.seed = seed
+        self.future_dates = [years_after(date_list[-1], t + 1) for t in range(n_years)]
+        self.publications = [a for a in article_list if a.citations[-1] is not None]
+        self.citations = [a.citations[-1] for a in self.publications]
+        self.shapes = []
+        self.scales = []
+        start = rate_window_start(date_list, window)
+        for article in self.publications:
+            published = datetime.date(article.year, 1, 1)
+            if (start is None) or (article.citations[start] is None) or (date_list[start] < published):
+                # no earlier snapshot, or the publication is newer than it: use the whole life of the publication
+                recent = article.citations[-1]
+                since = published
+            else:
+                recent = article.citations[-1] - article.citations[start]
+                since = date_list[start]
+            self.shapes.append(recent + PRIOR_SHAPE)
+            self.scales.append(DAYS_PER_YEAR / max(1, (date_list[-1] - since).days))
+        numpy_available = bool(Impact_Funcs.load_numpy())
+        self.fast_names = [n for n in metric_names if batched and numpy_available and
+                           (n in Impact_Bootstrap.BATCHED_METRICS)]
+        self.slow_names = [n for n in metric_names if n not in self.fast_names]
+        self.history = any(n in Impact_Defs.date_dependent_metrics() for n in self.slow_names)
+
+    def future_year(self, t: int) -> int:
+        return self.future_dates[t].year
+
+    def simulate(self, chunk: int, size: int):
+        """
+        yields the cumulative citations of every publication in each future year, for each trajectory of a chunk:
+        as a matrix (one row per trajectory) if numpy is available, otherwise as a list of rows
+        """
+        np = Impact_Funcs.load_numpy()
+        if np:
+            rng = np.random.default_rng([self.seed, chunk])
+            rates = rng.gamma(self.shapes, self.scales, size=(size, len(self.citations)))
+            counts = np.tile(np.asarray(self.citations, dtype=np.int64), (size, 1))
+            for _ in range(self.n_years):
+                counts = counts + rng.poisson(rates)
+                yield counts
+        else:
+            rng = random.Random(f"{self.seed}:{chunk}")
+            rates = [[rng.gammavariate(a, b) for a, b in zip(self.shapes, self.scales)] for _ in range(size)]
+            counts = [list(self.citations) for _ in range(size)]
+            for _ in range(self.n_years):
+                counts = [[c + Synthetic_Citations.poisson(rng, r) for c, r in zip(row, row_rates)]
+                          for row, row_rates in zip(counts, rates)]
+                yield counts
+
+    def trajectory_metric_sets(self, trajectory: list) -> list:
+        """
+        the metric sets of the future years of a single trajectory (the cumulative citations of every publication
+        in each year), built from the publications extended by the trajectory
+        """
+        articles = []
+        for i, article in enumerate(self.publications):
+            projected = copy.copy(article)
+            projected.citations = article.citations + [year_counts[i] for year_counts in trajectory]
+            if len(article.self_cites) > 0:
+                projected.self_cites = article.self_cites + [article.self_cites[-1]] * self.n_years
+            if len(article.coauthor_cites) > 0:
+                projected.coauthor_cites = article.coauthor_cites + [article.coauthor_cites[-1]] * self.n_years
+            articles.append(projected)
+        dates = self.date_list + self.future_dates
+        if self.history:
+            return ImpactFactorCalculator.calculate_all_metrics(dates, articles, self.inc_self,
+                                                                self.inc_coauth)[-self.n_years:]
+        return [ImpactFactorCalculator.calculate_metrics(len(self.date_list) + t, dates, articles, self.inc_self,
+                                                         self.inc_coauth) for t in range(self.n_years)]
+
+    def simulate_chunk(self, chunk: int, size: int) -> Impact_Cohort.CohortPercentiles:
+        """
+        the distribution of every metric in every future year over the trajectories of a chunk
+        """
+        distributions = Impact_Cohort.CohortPercentiles(exact_limit=EXACT_LIMIT)
+        np = Impact_Funcs.load_numpy()
+        trajectories = [[] for _ in range(size)]
+        for t, counts in enumerate(self.simulate(chunk, size)):
+            year = self.future_year(t)
+            if len(self.fast_names) > 0:
+                for name, values in Impact_Bootstrap.matrix_values(np, counts, self.fast_names).items():
+                    for value in values:
+                        if value is not None:
+                            distributions.add(name, year, value)
+            if len(self.slow_names) > 0:
+                rows = counts.tolist() if np else counts
+                for trajectory, row in zip(trajectories, rows):
+                    trajectory.append(row)
+        if len(self.slow_names) > 0:
+            for trajectory in trajectories:
+                for t, metric_set in enumerate(self.trajectory_metric_sets(trajectory)):
+                    metric_set.metrics["h-index"].value  # make sure the core has been identified
+                    for name in self.slow_names:
+                        value = Impact_Bootstrap.scalar_value(metric_set.metrics[name])
+                        if value is not None:
+                            distributions.add(name, self.future_year(t), value)
+        distributions.n_researchers = size
+        return distributions
+
+
+worker_model = None  # the projection model, set in every worker process
+
+
+def set_worker_model(model: ProjectionModel) -> None:
+    global worker_model
+    worker_model = model
+
+
+def simulate_chunk(chunk: int, size: int) -> Impact_Cohort.CohortPercentiles:
+    return worker_model.simulate_chunk(chunk, size)
+
+
+def project_metrics(date_list: list, article_list: list, inc_self: bool, inc_coauth: bool,
+                    metric_names: Optional[list] = None, n_years: int = N_YEARS,
+                    n_trajectories: int = N_TRAJECTORIES, seed: int = SEED, chunk_size: int = CHUNK_SIZE,
+                    processes: int = 1, batched: bool = True) -> Impact_Cohort.CohortPercentiles:
+    """
+    simulate the researcher's citations for n_years and return the distribution of each scalar metric (by default,
+    total cites, h, g, and i10) in each future year, keyed by (metric name, year)
+    """
+    metric_set = ImpactFactorCalculator.calculate_metrics(len(date_list) - 1, date_list, article_list, inc_self,
+                                                          inc_coauth)
+    names = Impact_Bootstrap.scalar_metric_names(metric_set, list(DEFAULT_METRICS) if metric_names is None else
+                                                 metric_names, inc_self, inc_coauth)
+    model = ProjectionModel(date_list, article_list, inc_self, inc_coauth, n_years, seed, names, batched)
+    chunks = [(i, min(chunk_size, n_trajectories - i * chunk_size))
+              for i in range(math.ceil(n_trajectories / chunk_size))]
+    distributions = Impact_Cohort.CohortPercentiles(exact_limit=EXACT_LIMIT)
+    if len(model.citations) == 0:
+        return distributions
+    if processes > 1:
+        with multiprocessing.Pool(processes, initializer=set_worker_model, initargs=(model,)) as pool:
+            for part in pool.starmap(simulate_chunk, chunks):
+                distributions.merge(part)
+    else:
+        for chunk, size in chunks:
+            distributions.merge(model.simulate_chunk(chunk, size))
+    return distributions
+
+
+def projection_quantiles(distributions: Impact_Cohort.CohortPercentiles, quantiles: tuple = QUANTILES) -> list:
+    """
+    (metric name, year, number of trajectories with a value, quantiles) of every projected distribution. quantiles
+    of integer metrics are rounded, as the sketch of a large distribution only finds them approximately
+    """
+    integer_metrics = {m.name for m in Impact_Defs.defined_metrics() if m.metric_type == Impact_Defs.INT}
+    order = {}
+    for name, _ in distributions.distributions:
+        order.setdefault(name, len(order))
+    results = []
+    for (name, year), distribution in sorted(distributions.distributions.items(),
+                                             key=lambda item: (order[item[0][0]], item[0][1])):
+        values = [distribution.quantile(q) for q in quantiles]
+        if name in integer_metrics:
+            values = [round(v) for v in values]
+        results.append((name, year, distribution.count, values))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="project a researcher's metrics into the future")
+    parser.add_argument("citations", help="citation file")
+    parser.add_argument("self", nargs="?", default="", help="self-citation file")
+    parser.add_argument("coauthor", nargs="?", default="", help="coauthor-citation file")
+    parser.add_argument("--metrics", nargs="+", help="names of the metrics (default: total cites, h, g, i10)")
+    parser.add_argument("--years", type=int, default=N_YEARS, help="number of years to project")
+    parser.add_argument("--trajectories", type=int, default=N_TRAJECTORIES, help="number of simulated futures")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="trajectories simulated together")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--output", default="metric_projection.txt", help="name of the output file")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache the results of the metric kernels, and report their hit rates (in this process)")
+    args = parser.parse_args()
+    if args.memoize:
+        Impact_Funcs.enable_memoization()
+
+    date_list, article_list = ImpactFactorCalculator.read_data_file(args.citations)
+    inc_self = args.self != ""
+    inc_coauth = args.coauthor != ""
+    if inc_self:
+        ImpactFactorCalculator.read_self_citation_files(article_list, args.self, args.coauthor)
+    distributions = project_metrics(date_list, article_list, inc_self, inc_coauth, args.metrics, args.years,
+                                    args.trajectories, args.seed, args.chunk, args.processes)
+    with open(args.output, "w", encoding="utf-8") as outfile:
+        outfile.write("Metric\tYear\tTrajectories\t" + "\t".join(f"{q:.0%}" for q in QUANTILES) + "\n")
+        for name, year, count, values in projection_quantiles(distributions):
+            outfile.write(f"{name}\t{year}\t{count}\t" + "\t".join(f"{v:.6g}" for v in values) + "\n")
+    print(f"Projections of {args.trajectories} trajectories over {args.years} years written to {args.output}")
+    if args.memoize:
+        print(Impact_Funcs.memoization_report())
+
+
+if __name__ == "__main__":
+    main()
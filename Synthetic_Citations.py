@@ -0,0 +1,225 @@
+# Synthetic citation data
+"""
+This module generates citation histories for imaginary researchers, for benchmarking and testing the calculator
+on data sets of any size.
+
+The histories are meant to look like real ones rather than uniform noise:
+* publications appear at an increasing rate over a career
+* each publication has a heavy-tailed (log-normal) citation rate, so a few papers receive most of the citations
+* citations to a paper rise for a few years after publication and then slowly decay
+* author counts and author positions vary, and coauthors are drawn from a pool of collaborators which favors
+  those the researcher has already worked with
+* a fraction of the citations of each paper are self-citations and coauthor-citations
+
+The data can be written as the three tab-delimited files (citations, self-citations, coauthor-citations) read by
+read_data_file() and read_self_citation_files() in ImpactFactorCalculator.
+"""
+
+import datetime
+import math
+import random
+from typing import Optional
+
+HEADER = "Year\t# Authors\tOrder\tPrimary\tCoauthors\tArticle"
+FIRST_YEAR = 1990
+MAX_CAREER_YEARS = 40  # very large publication counts are produced by a higher rate, not a longer career
+FIRST_SNAPSHOT_YEAR = 3  # citations are first recorded at the end of this year of the career
+DAYS_PER_YEAR = 365.25
+SURNAME_PARTS = ("Ad", "Bar", "Car", "Den", "El", "Fos", "Gar", "Hol", "Ish", "Jan", "Kim", "Lor", "Mor", "Nak",
+                 "Ol", "Pet", "Quin", "Ros", "Sok", "Tan", "Ul", "Van", "Wal", "Yam", "Zel")
+SURNAME_ENDS = ("ams", "berg", "ez", "ford", "i", "ko", "lin", "man", "ova", "sen", "son", "ton", "wicz", "yama")
+INITIALS = "ABCDEFGHJKLMNPRSTW"
+
+
+class SyntheticResearcher:
+    """
+    the publication list and citation history of a single imaginary researcher. each citation list contains the
+    cumulative count at every date, or None if the publication did not yet exist on that date
+    """
+    def __init__(self):
+        self.dates = []
+        self.pub_years = []
+        self.n_authors = []
+        self.author_pos = []
+        self.primary = []
+        self.coauthors = []
+        self.titles = []
+        self.citations = []
+        self.self_citations = []
+        self.coauthor_citations = []
+
+
+def poisson(rng: random.Random, rate: float) -> int:
+    """
+    random draw from a Poisson distribution (normal approximation for large rates)
+    """
+    if rate <= 0:
+        return 0
+    if rate > 30:
+        return max(0, round(rng.gauss(rate, math.sqrt(rate))))
+    limit = math.exp(-rate)
+    k = 0
+    p = rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def binomial(rng: random.Random, n: int, p: float) -> int:
+    """
+    random draw from a binomial distribution (normal approximation for large n)
+    """
+    if (n <= 0) or (p <= 0):
+        return 0
+    if n > 50:
+        return min(n, max(0, round(rng.gauss(n * p, math.sqrt(n * p * (1 - p))))))
+    return sum(1 for _ in range(n) if rng.random() < p)
+
+
+def cumulative_aging(age: float, peak: float) -> float:
+    """
+    integral of the aging curve (age / peak) * exp(1 - age / peak), which peaks at 1 when age equals peak, from
+    publication until the given age
+    """
+    if age <= 0:
+        return 0
+    x = age / peak
+    return peak * math.e * (1 - (1 + x) * math.exp(-x))
+
+
+def random_name(rng: random.Random) -> str:
+    return rng.choice(SURNAME_PARTS) + rng.choice(SURNAME_ENDS) + ", " + rng.choice(INITIALS) + "."
+
+
+def choose_coauthors(rng: random.Random, n: int, history: list) -> list:
+    """
+    pick n distinct coauthors, mostly from previous collaborators, otherwise someone new. history holds every
+    earlier coauthorship, so picking from it favors collaborators in proportion to how often they have coauthored
+    """
+    chosen = []
+    for _ in range(n):
+        name = None
+        if (len(history) > 0) and (rng.random() < 0.7):
+            name = rng.choice(history)
+        while (name is None) or (name in chosen):
+            name = random_name(rng)
+        chosen.append(name)
+    history.extend(chosen)
+    return chosen
+
+
+def generate_researcher(n_pubs: int, n_snapshots: int, seed: Optional[int] = None,
+                        first_year: int = FIRST_YEAR) -> SyntheticResearcher:
+    """
+    create a researcher with n_pubs publications whose citations are recorded at n_snapshots dates.
+
+    the dates are evenly spaced from the end of the third year of the career until its end (yearly, on Dec 31, if
+    there are no more snapshots than years)
+    """
+    rng = random.Random(seed)
+    researcher = SyntheticResearcher()
+    n_pubs = max(1, n_pubs)
+    n_snapshots = max(1, n_snapshots)
+
+    # career length: a few publications per year, but never longer than a realistic career. the record of citations
+    # starts a few years in (as it usually does), with at least one day between snapshots
+    career = min(MAX_CAREER_YEARS, round(n_pubs / rng.uniform(2, 6)))
+    career = max(career, FIRST_SNAPSHOT_YEAR + math.ceil(n_snapshots / 365))
+    start = datetime.date(first_year, 1, 1)
+    if n_snapshots <= career - FIRST_SNAPSHOT_YEAR + 1:
+        researcher.dates = [datetime.date(first_year + career - n_snapshots + k, 12, 31) for k in range(n_snapshots)]
+        snapshot_times = [(d - start).days / DAYS_PER_YEAR for d in researcher.dates]
+    else:
+        step = (career - FIRST_SNAPSHOT_YEAR) / (n_snapshots - 1)
+        snapshot_times = [FIRST_SNAPSHOT_YEAR + step * k for k in range(n_snapshots)]
+        researcher.dates = [start + datetime.timedelta(days=round(t * DAYS_PER_YEAR) - 1) for t in snapshot_times]
+
+    # the rate of publication grows over the career; the first paper starts it and all appear by the last date
+    span = snapshot_times[-1]
+    pub_times = sorted([0.0] + [span * rng.random() ** (1 / 1.5) for _ in range(n_pubs - 1)])
+    self_fraction = rng.uniform(0.05, 0.25)
+    coauthor_fraction = rng.uniform(0, 0.15)
+    history = []
+    for i, t in enumerate(pub_times):
+        year = first_year + math.floor(t)
+        researcher.pub_years.append(year)
+        n_authors = 1
+        while (n_authors < 100) and (rng.random() < 0.6):
+            n_authors += 1
+        position = rng.randint(1, n_authors)
+        researcher.n_authors.append(n_authors)
+        researcher.author_pos.append(position)
+        researcher.primary.append((position == 1) or (position == n_authors))
+        researcher.coauthors.append(choose_coauthors(rng, n_authors - 1, history))
+        researcher.titles.append(f"Pub{i + 1}_{year}")
+
+        # heavy-tailed citation rate (citations per year at the peak of attention) and aging curve
+        rate = rng.lognormvariate(math.log(2), 1.2)
+        peak = rng.uniform(1.5, 4)
+        cites = []
+        self_cites = []
+        coauthor_cites = []
+        total = total_self = total_coauthor = 0
+        previous = 0
+        for s in snapshot_times:
+            if s < t:
+                cites.append(None)
+                self_cites.append(None)
+                coauthor_cites.append(None)
+            else:
+                expected = rate * cumulative_aging(s - t, peak)
+                new = poisson(rng, expected - previous)
+                previous = expected
+                new_self = binomial(rng, new, self_fraction)
+                total += new
+                total_self += new_self
+                total_coauthor += binomial(rng, new - new_self, coauthor_fraction)
+                cites.append(total)
+                self_cites.append(total_self)
+                coauthor_cites.append(total_coauthor)
+        researcher.citations.append(cites)
+        researcher.self_citations.append(self_cites)
+        researcher.coauthor_citations.append(coauthor_cites)
+
+    # many metrics cannot be calculated with an h-index of zero, so make sure something is cited by the first date
+    if max(c[0] for c in researcher.citations if c[0] is not None) == 0:
+        researcher.citations[0] = [c + 1 for c in researcher.citations[0]]
+    return researcher
+
+
+def generate_cohort(n_researchers: int, n_pubs: int, n_snapshots: int, seed: Optional[int] = None) -> list:
+    """
+    create a group of researchers whose publication counts vary (log-normally) around n_pubs
+    """
+    rng = random.Random(seed)
+    cohort = []
+    for _ in range(n_researchers):
+        size = max(1, round(n_pubs * rng.lognormvariate(0, 0.5)))
+        cohort.append(generate_researcher(size, n_snapshots, rng.randrange(2**32)))
+    return cohort
+
+
+def write_researcher(researcher: SyntheticResearcher, citation_file: str, self_file: str,
+                     coauthor_file: str) -> None:
+    """
+    write the citation, self-citation, and coauthor-citation counts of the researcher in the format expected by
+    read_data_file() and read_self_citation_files()
+    """
+    header = HEADER + "".join(f"\t{d.month}/{d.day}/{d.year}" for d in researcher.dates) + "\n"
+    for filename, counts in ((citation_file, researcher.citations), (self_file, researcher.self_citations),
+                             (coauthor_file, researcher.coauthor_citations)):
+        with open(filename, "w", encoding="utf-8") as outfile:
+            outfile.write(header)
+            for i, year in enumerate(researcher.pub_years):
+                if researcher.primary[i]:
+                    primary = "Y"
+                else:
+                    primary = "N"
+                if len(researcher.coauthors[i]) > 0:
+                    coauthors = ";".join(researcher.coauthors[i])
+                else:
+                    coauthors = "."
+                values = ["n/a" if c is None else str(c) for c in counts[i]]
+                outfile.write(f"{year}\t{researcher.n_authors[i]}\t{researcher.author_pos[i]}\t{primary}\t"
+                              f"{coauthors}\t{researcher.titles[i]}\t" + "\t".join(values) + "\n")
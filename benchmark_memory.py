@@ -0,0 +1,233 @@
+# Memory benchmark
+"""
+Measures the memory used by full runs of the calculator (with tracemalloc), for a cohort of synthetic researchers
+(see Synthetic_Citations) or for the data files of a real one.
+
+Each researcher's run is divided into stages: parsing the input files, building the metric set of every snapshot,
+evaluating the metrics, and creating the html output. The peak and retained (still allocated at the end of the
+stage) bytes of each stage are reported, along with the bytes still allocated once the researcher's results have
+been released (which should be close to zero, apart from things built once and kept for every later researcher,
+such as the metric definitions). The memory allocated by each metric is recorded separately, so the definitions
+responsible for most of it can be found:
+
+    python benchmark_memory.py                                    cohort of synthetic researchers
+    python benchmark_memory.py --files cites.txt self.txt coauth.txt   a researcher's own data files
+    python benchmark_memory.py --metrics 20                       also list the 20 metrics which retain the most
+
+Results are saved to a json file; if a previous result file exists, any stage whose peak or retained memory has
+grown noticeably is reported as a regression (and the program exits with a non-zero status).
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import Impact_Defs
+import Impact_Funcs
+import Impact_HTML
+import Synthetic_Citations
+import benchmark_metrics
+
+RESULTS_FILE = "memory_usage.json"
+STAGE = "stage"
+STAGES = ("parse", "snapshot build", "metric evaluation", "html")
+N_RESEARCHERS = 3
+N_PUBS = 30
+N_SNAPSHOTS = 30
+SEED = 1
+TOLERANCE = 0.25  # memory use is a regression if it is more than 25% higher than the saved result...
+MIN_DIFFERENCE = 65536  # ...and at least this many bytes higher
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    old_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old_path)
+
+
+def write_html_output(metric_sets: list) -> int:
+    """
+    create both html outputs in a temporary directory; returns 1 if they could not be created for the data
+    (as happens for some very small records), otherwise 0
+    """
+    with tempfile.TemporaryDirectory() as work_dir, working_directory(work_dir):
+        os.mkdir("webout")
+        try:
+            Impact_HTML.create_single_html_output(metric_sets, True, True)
+            Impact_HTML.create_set_html_output(metric_sets, True, True)
+        except (ArithmeticError, ValueError, IndexError):
+            return 1
+    return 0
+
+
+def load_lazy_imports() -> None:
+    """
+    make sure anything loaded on first use (e.g., scipy) is loaded before tracing starts, so that it is not
+    charged to whichever metric of whichever researcher happens to need it first
+    """
+    Impact_Funcs.poisson_cdf(1, 1)
+
+
+def profile_researcher(profiler: Impact_Defs.MemoryProfiler, label: str, names: tuple, n_pubs: int,
+                       do_html: bool = True) -> dict:
+    """
+    run every stage for a single researcher, recording the memory of each, and return the peak and retained bytes
+    of every stage and of the whole run, and the bytes left allocated after the results are released
+    """
+    def run():
+        date_list, article_list = profiler.call("parse", STAGE, label, n_pubs, benchmark_metrics.read_researcher,
+                                                *names)
+        metric_sets = profiler.call("snapshot build", STAGE, label, n_pubs,
+                                    benchmark_metrics.ImpactFactorCalculator.calculate_all_metrics, date_list,
+                                    article_list, True, True)
+        failed = profiler.call("metric evaluation", STAGE, label, n_pubs, benchmark_metrics.format_all_values,
+                               metric_sets)
+        if do_html:
+            failed += profiler.call("html", STAGE, label, n_pubs, write_html_output, metric_sets)
+        return metric_sets, failed
+
+    gc.collect()
+    start = tracemalloc.get_traced_memory()[0]
+    overhead = profiler.overhead
+    results, failed = profiler.call("researcher", STAGE, label, n_pubs, run)
+    del results
+    gc.collect()
+    released = tracemalloc.get_traced_memory()[0] - start - (profiler.overhead - overhead)
+
+    result = {"publications": n_pubs, "failed_values": failed, "stages": {}}
+    for stage in STAGES + ("researcher",):
+        if (stage, STAGE, label) in profiler.usage:
+            usage = profiler.usage[(stage, STAGE, label)]
+            result["stages"][stage] = {"peak": usage.peak, "retained": usage.retained}
+    result["left_after_release"] = released
+    return result
+
+
+def metric_memory(profiler: Impact_Defs.MemoryProfiler) -> dict:
+    """
+    peak and retained bytes of every metric (and html generator), combined over all researchers and dates
+    """
+    results = {}
+    for name, kind, usage, _ in profiler.totals():
+        if kind != STAGE:
+            results[f"{name} [{kind}]"] = {"peak": usage.peak, "retained": usage.retained,
+                                           "self_retained": usage.self_retained}
+    return results
+
+
+def profile_cohort(n_researchers: int = N_RESEARCHERS, n_pubs: int = N_PUBS, n_snapshots: int = N_SNAPSHOTS,
+                   seed: int = SEED, do_html: bool = True) -> dict:
+    cohort = Synthetic_Citations.generate_cohort(n_researchers, n_pubs, n_snapshots, seed)
+    results = {"researchers": {}}
+    load_lazy_imports()
+    with tempfile.TemporaryDirectory() as work_dir:
+        profiler = Impact_Defs.start_profiling(memory=True)
+        try:
+            for i, researcher in enumerate(cohort):
+                label = f"researcher{i + 1}"
+                names = benchmark_metrics.researcher_files(researcher, work_dir, label)
+                results["researchers"][label] = profile_researcher(profiler, label, names,
+                                                                   len(researcher.pub_years), do_html)
+        finally:
+            Impact_Defs.stop_profiling()
+    results["metrics"] = metric_memory(profiler)
+    results["profiler"] = profiler
+    return results
+
+
+def profile_files(names: tuple, do_html: bool = True) -> dict:
+    label = os.path.basename(names[0])
+    n_pubs = len(benchmark_metrics.read_researcher(*names)[1])
+    load_lazy_imports()
+    profiler = Impact_Defs.start_profiling(memory=True)
+    try:
+        results = {"researchers": {label: profile_researcher(profiler, label, names, n_pubs, do_html)}}
+    finally:
+        Impact_Defs.stop_profiling()
+    results["metrics"] = metric_memory(profiler)
+    results["profiler"] = profiler
+    return results
+
+
+def find_regressions(results: dict, previous: dict, tolerance: float = TOLERANCE,
+                     min_difference: int = MIN_DIFFERENCE) -> list:
+    """
+    returns (researcher, stage, measure, old bytes, new bytes) for every stage whose peak or retained memory is now
+    noticeably higher than in the previous results
+    """
+    regressions = []
+    for label, result in results["researchers"].items():
+        old_result = previous.get("researchers", {}).get(label)
+        if (old_result is None) or (old_result["publications"] != result["publications"]):
+            continue
+        for stage, usage in result["stages"].items():
+            old_usage = old_result["stages"].get(stage)
+            if old_usage is None:
+                continue
+            for measure in ("peak", "retained"):
+                new_value = usage[measure]
+                old_value = old_usage[measure]
+                if (new_value - old_value >= min_difference) and (new_value > old_value * (1 + tolerance)):
+                    regressions.append((label, stage, measure, old_value, new_value))
+    return regressions
+
+
+def kib(n: int) -> str:
+    return f"{n / 1024:.1f} KiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="measure the memory used by full runs of the calculator")
+    parser.add_argument("results_file", nargs="?", default=RESULTS_FILE, help="json results file")
+    parser.add_argument("--files", nargs=3, metavar=("CITATIONS", "SELF", "COAUTHOR"),
+                        help="profile the data files of a researcher instead of synthetic researchers")
+    parser.add_argument("--researchers", type=int, default=N_RESEARCHERS, help="number of synthetic researchers")
+    parser.add_argument("--pubs", type=int, default=N_PUBS, help="typical number of publications")
+    parser.add_argument("--snapshots", type=int, default=N_SNAPSHOTS, help="number of citation snapshots")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed for the synthetic data")
+    parser.add_argument("--no-html", action="store_true", help="skip the html stage")
+    parser.add_argument("--metrics", type=int, default=0, help="number of metrics to list, largest first")
+    args = parser.parse_args()
+
+    if args.files is not None:
+        results = profile_files(tuple(args.files), not args.no_html)
+    else:
+        results = profile_cohort(args.researchers, args.pubs, args.snapshots, args.seed, not args.no_html)
+    profiler = results.pop("profiler")
+
+    for label, result in results["researchers"].items():
+        print(f"{label} ({result['publications']} publications)")
+        for stage, usage in result["stages"].items():
+            print(f"    {stage:<20}peak {kib(usage['peak']):>14}    retained {kib(usage['retained']):>14}")
+        print(f"    {'after release':<20}{'':>19}    retained {kib(result['left_after_release']):>14}")
+    if args.metrics > 0:
+        print()
+        print("\n".join(profiler.report().split("\n")[:args.metrics + 1]))
+
+    previous = None
+    if os.path.exists(args.results_file):
+        with open(args.results_file, "r") as infile:
+            previous = json.load(infile)
+    regressions = []
+    if previous is not None:
+        regressions = find_regressions(results, previous)
+        for label, stage, measure, old_value, new_value in regressions:
+            print(f"Regression: {label} {stage} {measure} memory {kib(old_value)} -> {kib(new_value)}")
+    if len(regressions) == 0:
+        with open(args.results_file, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
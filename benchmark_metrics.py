@@ -0,0 +1,330 @@
+# Metric and pipeline benchmarks
+"""
+Times every metric's calculation and the full calculation pipeline on synthetic researchers (see
+Synthetic_Citations), sweeping the number of publications, the number of citation snapshots (dates), and the
+number of researchers in a cohort.
+
+Results are written as json, labeled with the current commit, so that runs on different commits can be compared:
+
+    python benchmark_metrics.py                       quick sweep
+    python benchmark_metrics.py --full                publications 10 to 100000, snapshots 1 to 500, cohorts to 100
+    python benchmark_metrics.py --compare old.json    also report what has become slower since an earlier run
+
+Some metrics (and so the pipeline) grow very quickly with the number of publications. Any single calculation
+which takes longer than a time limit is abandoned and that metric (or pipeline sweep) is skipped at larger sizes.
+The limit relies on SIGALRM and is not enforced on platforms without it (e.g., Windows).
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import Impact_Funcs
+import ImpactFactorCalculator
+import Synthetic_Citations
+
+PUBLICATION_SIZES = (10, 100, 1000, 10000, 100000)
+SNAPSHOT_SIZES = (1, 10, 100, 500)
+COHORT_SIZES = (1, 10, 100)
+QUICK_PUBLICATION_SIZES = (10, 100, 1000)
+QUICK_SNAPSHOT_SIZES = (1, 10, 50)
+QUICK_COHORT_SIZES = (1, 5)
+BASE_PUBS = 100  # size of the dimensions not being swept
+BASE_SNAPSHOTS = 10
+BASE_COHORT = 1
+METRIC_TIME_LIMIT = 10  # seconds
+PIPELINE_TIME_LIMIT = 600
+QUICK_PIPELINE_TIME_LIMIT = 60
+REPEAT_TIME = 0.05  # quick calculations are repeated for up to this long (or MAX_REPEATS times)...
+MAX_REPEATS = 100  # ...keeping the fastest, to reduce timer noise
+SLOWDOWN_THRESHOLD = 1.2  # something is slower if it takes at least 20% longer...
+MIN_SLOWDOWN = 0.0001  # ...and at least this many seconds longer
+SEED = 1
+
+
+class BenchmarkTimeout(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float):
+    """
+    raise BenchmarkTimeout in the enclosed block if it runs longer than the given number of seconds
+    """
+    if (not hasattr(signal, "setitimer")) or (threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def timeout(signum, frame):
+        raise BenchmarkTimeout()
+
+    old_handler = signal.signal(signal.SIGALRM, timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old_handler)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def researcher_files(researcher: Synthetic_Citations.SyntheticResearcher, work_dir: str, label: str) -> tuple:
+    """
+    write the data of a synthetic researcher to files in the working directory and return their names
+    """
+    names = tuple(os.path.join(work_dir, label + suffix) for suffix in ("_cites.txt", "_self.txt", "_coauth.txt"))
+    Synthetic_Citations.write_researcher(researcher, *names)
+    return names
+
+
+def read_researcher(citation_file: str, self_file: str, coauthor_file: str) -> tuple:
+    date_list, article_list = ImpactFactorCalculator.read_data_file(citation_file)
+    ImpactFactorCalculator.read_self_citation_files(article_list, self_file, coauthor_file)
+    return date_list, article_list
+
+
+def synthetic_researcher_data(n_pubs: int, n_snapshots: int, seed: int) -> tuple:
+    """
+    the dates and articles of a synthetic researcher, written to temporary files and read back as any researcher's
+    data is
+    """
+    researcher = Synthetic_Citations.generate_researcher(n_pubs, n_snapshots, seed=seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        return read_researcher(*researcher_files(researcher, work_dir, "researcher"))
+
+
+def error_description(error: Exception) -> str:
+    if isinstance(error, BenchmarkTimeout):
+        return "timeout"
+    return f"{type(error).__name__}: {error}"
+
+
+def time_calculation(metric, metric_set, setup=None) -> float:
+    """
+    the fastest of repeated calculations of a metric, calling setup (if given, and untimed) before each one
+    """
+    best = None
+    total = 0
+    repeats = 0
+    while (repeats < MAX_REPEATS) and (total < REPEAT_TIME):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        metric.calculate(metric_set)
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+        total += elapsed
+        repeats += 1
+    return best
+
+
+def benchmark_metric_functions(pub_sizes: tuple, n_snapshots: int = BASE_SNAPSHOTS, seed: int = SEED,
+                               limit: float = METRIC_TIME_LIMIT) -> dict:
+    """
+    time the calculation of every metric for the last date of a researcher, for each number of publications.
+
+    every value is calculated once first, so any other metrics a metric relies on are already known and each time
+    is the cost of that metric's own calculation
+    """
+    results = {}
+    too_slow = set()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n in pub_sizes:
+            researcher = Synthetic_Citations.generate_researcher(n, n_snapshots, seed)
+            date_list, article_list = read_researcher(*researcher_files(researcher, work_dir, "researcher"))
+            metric_set = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, True, True)[-1]
+            times = {}
+            for name in metric_set.metric_names:
+                if name in too_slow:
+                    times[name] = {"skipped": "too slow at a smaller size"}
+                    continue
+                try:
+                    with time_limit(limit):
+                        _ = metric_set.metrics[name].value
+                except Exception as error:
+                    times[name] = {"error": error_description(error)}
+                    if isinstance(error, BenchmarkTimeout):
+                        too_slow.add(name)
+            for name in metric_set.metric_names:
+                if name in times:
+                    continue
+                times[name] = {"time": time_calculation(metric_set.metrics[name], metric_set)}
+            results[str(n)] = times
+            print(f"metrics: {n} publications done")
+    return results
+
+
+def format_all_values(metric_sets: list) -> int:
+    """
+    calculate and format the value of every metric for every date, as write_output() does, but carry on past any
+    metric which cannot be calculated for the data (e.g., a division by zero for a very small record). returns the
+    number of values which failed
+    """
+    failed = 0
+    for metric_set in metric_sets:
+        for name in metric_set.metric_names:
+            try:
+                str(metric_set.metrics[name])
+            except (ArithmeticError, ValueError, IndexError):
+                failed += 1
+    return failed
+
+
+def time_pipeline(n_researchers: int, n_pubs: int, n_snapshots: int, seed: int = SEED) -> tuple:
+    """
+    time reading, calculating, and formatting the results for every researcher of a synthetic cohort. writing
+    the input files is not included. returns the time and the number of values which could not be calculated
+    """
+    cohort = Synthetic_Citations.generate_cohort(n_researchers, n_pubs, n_snapshots, seed)
+    total = 0
+    failed = 0
+    with tempfile.TemporaryDirectory() as work_dir:
+        for i, researcher in enumerate(cohort):
+            names = researcher_files(researcher, work_dir, f"researcher{i}")
+            start = time.perf_counter()
+            date_list, article_list = read_researcher(*names)
+            metric_sets = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, True, True)
+            failed += format_all_values(metric_sets)
+            total += time.perf_counter() - start
+    return total, failed
+
+
+def benchmark_pipeline(pub_sizes: tuple, snapshot_sizes: tuple, cohort_sizes: tuple, seed: int = SEED,
+                       limit: float = PIPELINE_TIME_LIMIT) -> dict:
+    """
+    time the full pipeline while sweeping each of the publication, snapshot, and cohort sizes in turn (with the
+    other two held at their base values)
+    """
+    sweeps = {"publications": [(BASE_COHORT, n, BASE_SNAPSHOTS) for n in pub_sizes],
+              "snapshots": [(BASE_COHORT, BASE_PUBS, n) for n in snapshot_sizes],
+              "cohort": [(n, BASE_PUBS, BASE_SNAPSHOTS) for n in cohort_sizes]}
+    results = {}
+    for sweep in sweeps:
+        results[sweep] = []
+        too_slow = False
+        for n_researchers, n_pubs, n_snapshots in sweeps[sweep]:
+            case = {"researchers": n_researchers, "publications": n_pubs, "snapshots": n_snapshots}
+            if too_slow:
+                case["skipped"] = "too slow at a smaller size"
+            else:
+                try:
+                    with time_limit(limit):
+                        case["time"], case["failed_values"] = time_pipeline(n_researchers, n_pubs, n_snapshots,
+                                                                            seed)
+                except Exception as error:
+                    case["error"] = error_description(error)
+                    too_slow = isinstance(error, BenchmarkTimeout)
+            results[sweep].append(case)
+        print(f"pipeline: {sweep} sweep done")
+    return results
+
+
+def timed_values(results: dict) -> dict:
+    """
+    flatten a set of results into a dictionary of every successful time, keyed by a readable label
+    """
+    values = {}
+    for size, times in results.get("metrics", {}).items():
+        for name, result in times.items():
+            if "time" in result:
+                values[f"{name} ({size} publications)"] = result["time"]
+    for sweep, cases in results.get("pipeline", {}).items():
+        for case in cases:
+            if "time" in case:
+                label = f"pipeline: {case['researchers']} researchers, {case['publications']} publications, " \
+                        f"{case['snapshots']} snapshots"
+                values[label] = case["time"]
+    return values
+
+
+def compare_results(old_results: dict, new_results: dict, threshold: float = SLOWDOWN_THRESHOLD,
+                    min_difference: float = MIN_SLOWDOWN) -> list:
+    """
+    returns (label, old time, new time) for everything which is now slower than before by more than both the
+    threshold ratio and the minimum difference, from the greatest slowdown to the least
+    """
+    old_values = timed_values(old_results)
+    new_values = timed_values(new_results)
+    slower = []
+    for label in new_values:
+        if (label in old_values) and (old_values[label] > 0):
+            if (new_values[label] / old_values[label] > threshold) and \
+                    (new_values[label] - old_values[label] >= min_difference):
+                slower.append((label, old_values[label], new_values[label]))
+    slower.sort(key=lambda x: x[2] / x[1], reverse=True)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark metric calculations on synthetic researchers")
+    parser.add_argument("--full", action="store_true", help="sweep the full range of sizes")
+    parser.add_argument("--output", help="name of the json results file")
+    parser.add_argument("--compare", help="earlier json results file to compare against")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed for the synthetic data")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache the results of the metric kernels, and report their hit rates (in this process)")
+    args = parser.parse_args()
+    if args.memoize:
+        Impact_Funcs.enable_memoization()
+
+    if args.full:
+        pub_sizes, snapshot_sizes, cohort_sizes = PUBLICATION_SIZES, SNAPSHOT_SIZES, COHORT_SIZES
+        pipeline_limit = PIPELINE_TIME_LIMIT
+    else:
+        pub_sizes, snapshot_sizes, cohort_sizes = QUICK_PUBLICATION_SIZES, QUICK_SNAPSHOT_SIZES, QUICK_COHORT_SIZES
+        pipeline_limit = QUICK_PIPELINE_TIME_LIMIT
+    commit = git_commit()
+    results = {"commit": commit,
+               "date": datetime.datetime.now().isoformat(timespec="seconds"),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "seed": args.seed,
+               "metrics": benchmark_metric_functions(pub_sizes, seed=args.seed),
+               "pipeline": benchmark_pipeline(pub_sizes, snapshot_sizes, cohort_sizes, seed=args.seed,
+                                           limit=pipeline_limit)}
+    if args.memoize:
+        results["memoization"] = Impact_Funcs.memoization_stats()
+        print(Impact_Funcs.memoization_report())
+
+    out_name = args.output
+    if out_name is None:
+        out_name = f"benchmark_{commit if commit is not None else 'results'}.json"
+    with open(out_name, "w") as outfile:
+        json.dump(results, outfile, indent=2)
+    print("Results written to " + out_name)
+
+    if args.compare is not None:
+        with open(args.compare, "r") as infile:
+            old_results = json.load(infile)
+        slower = compare_results(old_results, results)
+        if len(slower) == 0:
+            print(f"Nothing is slower than in {args.compare}")
+        for label, old_time, new_time in slower:
+            print(f"{label}: {old_time:.6f} s -> {new_time:.6f} s ({new_time / old_time:.1f}x)")
+        if len(slower) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Startup time benchmark
+"""
+Measures how long it takes to import each module of the impact factor calculator, using the interpreter's own
+import profiler (python -X importtime), so that increases in cold-start time can be caught.
+
+Each module is imported in a fresh interpreter several times and the fastest run is kept. Results are saved to a
+json file; if a previous result file exists, any module whose import has become noticeably slower is reported
+as a regression (and the program exits with a non-zero status).
+
+Heavy optional dependencies (e.g., scipy) should only be imported when first needed, so any of those which are
+loaded just by importing a module are also reported.
+"""
+
+import json
+import os
+import py_compile
+import subprocess
+import sys
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULES = ("Impact_Funcs", "Impact_Defs", "ImpactFactorCalculator", "Impact_HTML")
+HEAVY_MODULES = ("scipy", "numpy")
+REPEATS = 5
+RESULTS_FILE = "startup_times.json"
+TOLERANCE = 0.25  # an import is a regression if it is more than 25% slower than the saved result...
+MIN_DIFFERENCE = 5000  # ...and at least this many microseconds slower
+
+
+def parse_importtime(output: str) -> dict:
+    """
+    convert the -X importtime report into a dictionary of the cumulative import time (in microseconds) of every
+    module which was imported
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            cumulative = int(fields[1])
+        except ValueError:  # the header line
+            continue
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+def time_import(module: str, repeats: int = REPEATS) -> Optional[dict]:
+    """
+    import the module in new interpreters and return the times of its fastest import, or None if it failed
+    """
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                                capture_output=True, text=True, cwd=BASE_DIR)
+        if result.returncode != 0:
+            return None
+        times = parse_importtime(result.stderr)
+        if (best is None) or (times.get(module, 0) < best.get(module, 0)):
+            best = times
+    return best
+
+
+def measure_startup(modules: tuple = MODULES, repeats: int = REPEATS) -> dict:
+    """
+    returns the import time of each module and the heavy dependencies it pulls in
+    """
+    # make sure the cached bytecode is up to date, so that compiling the source is not part of the times
+    for module in modules:
+        py_compile.compile(os.path.join(BASE_DIR, module + ".py"))
+    results = {}
+    for module in modules:
+        times = time_import(module, repeats)
+        if times is None:
+            print(f"{module}: import failed")
+            continue
+        heavy = sorted(h for h in HEAVY_MODULES if h in times)
+        results[module] = {"import_time": times.get(module, 0),
+                           "heavy_imports": heavy}
+    return results
+
+
+def find_regressions(results: dict, previous: dict, tolerance: float = TOLERANCE,
+                     min_difference: int = MIN_DIFFERENCE) -> list:
+    """
+    returns the modules whose import is now noticeably slower than in the previous results
+    """
+    regressions = []
+    for module in results:
+        if module in previous:
+            new_time = results[module]["import_time"]
+            old_time = previous[module]["import_time"]
+            if (new_time - old_time >= min_difference) and (new_time > old_time * (1 + tolerance)):
+                regressions.append(module)
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1:
+        results_file = sys.argv[1]
+    else:
+        results_file = RESULTS_FILE
+    previous = None
+    if os.path.exists(results_file):
+        with open(results_file, "r") as infile:
+            previous = json.load(infile)
+
+    results = measure_startup()
+    for module in results:
+        line = f"{module:<24}{results[module]['import_time'] / 1000:>10.1f} ms"
+        if previous is not None and module in previous:
+            line += f"  (previously {previous[module]['import_time'] / 1000:.1f} ms)"
+        if len(results[module]["heavy_imports"]) > 0:
+            line += "  imports " + ", ".join(results[module]["heavy_imports"])
+        print(line)
+
+    regressions = []
+    if previous is not None:
+        regressions = find_regressions(results, previous)
+        for module in regressions:
+            print(f"Regression: importing {module} is slower than before")
+    if len(regressions) == 0:
+        with open(results_file, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
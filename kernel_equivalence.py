@@ -0,0 +1,811 @@
+# Equivalence of fast kernel backends
+"""
+Checks every kernel with fast backends registered in Impact_Funcs (Impact_Funcs.fast_backends), both as called
+without its optional precomputed structures and through each of its backends, against the reference form of the
+kernel, on random and adversarial publication records:
+* random records of varied size, with uniform, heavy-tailed, heavily tied, and mostly uncited citation counts
+* fixed adversarial records: single papers, all zeros, all ties, ties on the h boundary, huge outliers, one year,
+  one author
+
+The reference kernels are the original scan and slice formulas, copied below as they were before the shared
+structures (YearIndex, HDecomposition, author credit tables, rank counting) were introduced, so that a mistake in
+one of those structures cannot be hidden by a reference which uses it too.
+
+A backend passes if it gives the same result as the reference kernel (floats within a tolerance), or raises the
+same type of exception. A failing record is shrunk (dropping publications, lowering citation counts, and removing
+coauthors and years) to a minimal counterexample which still fails, so the cause is easy to see:
+
+    python kernel_equivalence.py                   check every backend on the default number of random records
+    python kernel_equivalence.py --cases 10000     check on more random records
+"""
+
+import argparse
+import copy
+import inspect
+import math
+import random
+import sys
+from typing import Optional, Tuple, Union
+
+import Impact_Funcs
+
+RANDOM_CASES = 300
+SEED = 1
+REL_TOLERANCE = 1e-9
+ABS_TOLERANCE = 1e-9
+MAX_SHRINK_STEPS = 1000
+FIRST_YEAR = 1990
+KERNEL_ITSELF = "no precomputed structures"
+COAUTHOR_POOL = ("Ames, A.", "Bell, B.", "Cruz, C.", "Diaz, D.", "Endo, E.", "Fox, F.", "Gray, G.", "Hale, H.")
+
+
+class Publication:
+    def __init__(self, cites: int, year: int, n_authors: int = 1, author_pos: int = 1, coauthors: str = "."):
+        self.cites = cites
+        self.year = year
+        self.n_authors = n_authors
+        self.author_pos = author_pos
+        self.coauthors = coauthors
+
+    def __repr__(self):
+        return f"Publication({self.cites}, {self.year}, {self.n_authors}, {self.author_pos}, {self.coauthors!r})"
+
+
+class PublicationRecord:
+    """
+    the publications of a single researcher at one date, from which the arguments of any kernel are derived
+    """
+    def __init__(self, pubs: list, year: Optional[int] = None, measure: str = "fractional", mk: Optional[int] = None):
+        self.pubs = pubs
+        if year is None:
+            year = max(p.year for p in pubs)
+        self.year = year
+        self.measure = measure
+        self.mk = mk
+
+    def __repr__(self):
+        return f"PublicationRecord({self.pubs}, year={self.year}, measure={self.measure!r}, mk={self.mk})"
+
+    def arguments(self) -> dict:
+        """
+        every kernel argument which can be derived from the record, by the parameter names the kernels use
+        """
+        citations = [p.cites for p in self.pubs]
+        pub_years = [p.year for p in self.pubs]
+        n_authors = [p.n_authors for p in self.pubs]
+        rank_order, cumulative_citations = calculate_ranks(citations)
+        h, is_core = calculate_h_index(citations, rank_order)
+        return {"citations": citations, "cites": citations,
+                "pub_years": pub_years, "years": pub_years,
+                "n_authors": n_authors, "author_cnts": n_authors,
+                "author_pos": [p.author_pos for p in self.pubs],
+                "primary": [(p.author_pos == 1) or (p.author_pos == p.n_authors) for p in self.pubs],
+                "coauthor_list": [p.coauthors for p in self.pubs],
+                "year": self.year, "cur_year": self.year,
+                "total_cites": sum(citations), "total_pubs": len(citations),
+                "rank_order": rank_order, "cumulative_citations": cumulative_citations,
+                "h": h, "is_core": is_core,
+                "multidim_h": calculate_multidimensional_h_index(citations),
+                "measure": self.measure, "mk": self.mk}
+
+
+class Counterexample:
+    def __init__(self, kernel: str, backend: str, record: PublicationRecord, expected, actual):
+        self.kernel = kernel
+        self.backend = backend
+        self.record = record
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self):
+        return f"{self.kernel} ({self.backend}): reference gives {self.expected!r}, backend gives {self.actual!r} " \
+               f"for {self.record!r}"
+
+
+# --- reference kernels ---
+# the kernels (and the helpers they call) as first written, without any shared precomputed structure
+Number = Union[int, float]
+
+
+def rank(n: int, indx: list) -> list:
+    irank = [0 for _ in range(n)]
+    for j in range(n):
+        irank[indx[j]] = j
+    return irank
+
+
+def sort_and_rank(sort_list: list, n: int) -> Tuple[list, list]:
+    tmpindex = sorted(range(n), key=lambda k: sort_list[k])
+    tmprank = rank(n, tmpindex)
+    # reverse so #1 is largest
+    # NOTE: the ranks in rank_order go from 1 to n, rather than 0 to n-1
+    rank_order = [n - tmprank[i] for i in range(n)]
+    return tmpindex, rank_order
+
+
+def calculate_ranks(citations: list) -> Tuple[list, list]:
+    n = len(citations)
+    cumulative_citations = [0 for _ in range(n)]
+    # sort by number of citations
+    tmp_index, rank_order = sort_and_rank(citations, n)
+    for i in range(n):
+        if i > 0:
+            cumulative_citations[i] = cumulative_citations[i-1] + citations[tmp_index[n-i-1]]
+        else:
+            cumulative_citations[i] = citations[tmp_index[n-i-1]]
+    return rank_order, cumulative_citations
+
+
+def publication_ages(year: int, pub_years: list) -> list:
+    """
+    returns a list containing the age of each publication
+    """
+    return [year - p + 1 for p in pub_years]
+
+
+def citations_per_year(citations: list, pub_ages: list) -> list:
+    """
+    returns a list containing the citations per year for each publication
+    """
+    return [citations[i]/pub_ages[i] for i in range(len(citations))]
+
+
+def author_effort(measure: str, n_authors: int, author_pos: int = 1) -> float:
+    """
+    returns the estimated effort of an author for a publication
+    """
+    if measure == "fractional":
+        return 1 / n_authors
+    elif measure == "proportional":
+        return 2*(n_authors + 1 - author_pos) / (n_authors*(n_authors + 1))
+    elif measure == "geometric":
+        return 2**(n_authors - author_pos) / (2**n_authors - 1)
+    elif measure == "harmonic":
+        n = 1 / author_pos
+        d = sum(1/(i+1) for i in range(n_authors))
+        return n/d
+    elif measure == "harmonic_aziz":
+        # this is a more complicated form of the harmonic that includes an additional factor
+        if n_authors % 2 == 0:
+            d = 0
+        else:
+            d = 1 / (2*n_authors)
+        return (1 + abs(n_authors + 1 - 2*author_pos)) / ((n_authors**2)/2 + n_authors*(1 - d))
+    else:
+        return 1
+
+
+def get_rank_value(values: list) -> int:
+    """
+    basic function that takes an ordered list of values (high to low) and returns the largest index where the value
+    is greater than or equal to the rank, essentially the basic h-index concept
+    """
+    for i, value in enumerate(values):
+        if value < i + 1:
+            return i
+    return len(values)
+
+
+def calculate_h_index(citations: list, rank_order: list) -> Tuple[int, list]:
+    """
+    This function calculates both the h-index and returns a boolean list of
+    whether a particular publication is part of the core
+    """
+    h = 0
+    is_core = [False for _ in rank_order]
+    for i in range(len(citations)):
+        if rank_order[i] <= citations[i]:
+            h += 1
+            is_core[i] = True
+    return h, is_core
+
+
+def calculate_real_h_index(citations: list, h: int) -> Number:
+    if h == len(citations):
+        return h
+    elif h == 0:
+        return h
+
+    sorted_cites = sorted(citations, reverse=True)
+    cite_h = sorted_cites[h-1]  # need to offset because counting from zero
+    cite_hp1 = sorted_cites[h]
+    return ((h + 1) * cite_h - h * cite_hp1) / (1 - cite_hp1 + cite_h)
+
+
+def calculate_harmonic_p_index(citations: list, n_authors: list, author_pos: list) -> float:
+    ph = 0
+    nh = 0
+    for i in range(len(citations)):
+        r = author_effort("harmonic", n_authors[i], author_pos[i])
+        ph += r
+        nh += citations[i] * r
+    return (nh**2 / ph)**(1/3)
+
+
+def calculate_pure_h_index_prop(is_core: list, n_authors: list, author_pos: list, h: int) -> float:
+    sump = 0
+    for i in range(len(is_core)):
+        if is_core[i]:
+            sump += 1 / author_effort("proportional", n_authors[i], author_pos[i])
+    return h / math.sqrt(sump / h)
+
+
+def calculate_pure_h_index_geom(is_core: list, n_authors: list, author_pos: list, h: int) -> float:
+    sumg = 0
+    for i in range(len(is_core)):
+        if is_core[i]:
+            sumg += 1 / author_effort("geometric", n_authors[i], author_pos[i])
+    return h / math.sqrt(sumg / h)
+
+
+def calculate_wohlin_w(citations: list) -> float:
+    max_cites = max(citations)
+    j = 5
+    nc = 1
+    while max_cites > j-1:
+        j *= 2
+        nc += 1
+    wval = []
+    wclass = []
+    for i in range(nc):
+        if i + 1 == 1:
+            wval.append(5)
+        else:
+            wval.append(2 * wval[i-1])
+        wclass.append(0)
+        for j in range(len(citations)):
+            if citations[j] >= wval[i]:
+                wclass[i] += 1
+    wohlin_w_index = 0
+    for i in range(nc):
+        wohlin_w_index += math.log(wval[i]) * wclass[i]
+    return wohlin_w_index
+
+
+def calculate_contemporary_h_index(citations: list, pub_years: list, year: int) -> int:
+    pub_ages = publication_ages(year, pub_years)
+    cites_per_year = citations_per_year(citations, pub_ages)
+    sc = [4*c for c in cites_per_year]
+    sc.sort(reverse=True)
+    return get_rank_value(sc)
+
+
+def calculate_hpd_index(citations: list, pub_years: list, year: int) -> int:
+    pub_ages = publication_ages(year, pub_years)
+    cites_per_year = citations_per_year(citations, pub_ages)
+    sc = [10*c for c in cites_per_year]
+    sc.sort(reverse=True)
+    return get_rank_value(sc)
+
+
+def calculate_specific_impact_s_index(pub_years: list, year: int, total_cites: int) -> float:
+    # uses a different measure of age of publication, allowing age to be zero
+    pub_ages = [year - y for y in pub_years]
+    specific_impact_s_index = sum(1 - math.exp(-0.1 * pub_ages[i]) for i in range(len(pub_years)))
+    if specific_impact_s_index != 0:
+        specific_impact_s_index = total_cites / (10 * specific_impact_s_index)
+    return specific_impact_s_index
+
+
+def calculate_multidimensional_h_index(citations: list) -> list:
+    multi_dim_h_index = []
+    sorted_citations = sorted(citations, reverse=True)
+    while (len(sorted_citations) > 0) and (max(sorted_citations) > 0):
+        h = get_rank_value(sorted_citations)
+        multi_dim_h_index.append(h)
+        sorted_citations = sorted_citations[h:]
+    return multi_dim_h_index
+
+
+def calculate_two_sided_h(citations: list, multidim_h: list, mk: Optional[int] = None) -> list:
+    # only need to calculate the upper part of the index the center and tail are identical to multidimensional h
+    # mk is the number of steps to match on either side of h; the default is to auto-calculate for as many steps in
+    # core as equal to length of steps in tail
+    if mk is None:
+        mk = len(multidim_h)
+    else:
+        mk += 1  # need to add 1 so number of steps works out correctly
+    two_sided_h = [i for i in multidim_h[:mk]]
+    sorted_citations = sorted(citations, reverse=True)
+    h = multidim_h[0]
+    sorted_citations = [c - h for c in sorted_citations[:h]]
+    cnt = 1
+    while cnt < mk:
+        h = get_rank_value(sorted_citations)
+        two_sided_h.insert(0, h)
+        sorted_citations = [c - h for c in sorted_citations[:h]]
+        cnt += 1
+    return two_sided_h
+
+
+def calculate_position_weighted_h_index(citations: list, n_authors: list, author_pos: list) -> int:
+    sc = [c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+    sc.sort(reverse=True)
+    return get_rank_value(sc)
+
+
+def calculate_prop_weight_cite_agg(citations: list, n_authors: list, author_pos: list) -> float:
+    return sum(c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations))
+
+
+def calculate_prop_weight_cite_h_cut(citations: list, n_authors: list, author_pos: list) -> float:
+    sc = [c*author_effort("proportional", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+    sc.sort(reverse=True)
+    v = get_rank_value(sc)
+    return sum(sc[:v])
+
+
+def calculate_adapt_pure_h_index(sc: list) -> float:
+    """
+    this is used to calculate the adapted pure h-index once the weighted citations (sc) are determined
+    """
+    sc.sort(reverse=True)
+    j = get_rank_value(sc)
+    return calculate_real_h_index(sc, j)
+
+
+def calculate_adapt_pure_h_index_prop(citations: list, n_authors: list, author_pos: list) -> float:
+    sc = [c / math.sqrt(1/author_effort("proportional", n_authors[i], author_pos[i])) for i, c in enumerate(citations)]
+    return calculate_adapt_pure_h_index(sc)
+
+
+def calculate_adapt_pure_h_index_geom(citations: list, n_authors: list, author_pos: list) -> float:
+    sc = [c / math.sqrt(1/author_effort("geometric", n_authors[i], author_pos[i])) for i, c in enumerate(citations)]
+    return calculate_adapt_pure_h_index(sc)
+
+
+def calculate_profit_p_index(citations: list, n_authors: list, author_pos: list) -> float:
+    monograph_equiv = sum(author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i in range(len(citations)))
+    return 1 - monograph_equiv / len(citations)
+
+
+def calculate_profit_adj_h_index(citations: list, n_authors: list, author_pos: list) -> int:
+    sc = [c * author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i, c in enumerate(citations)]
+    # n = len(citations)
+    # sc = [citations[i] * author_effort("harmonic_aziz", n_authors[i], author_pos[i]) for i in range(n)]
+    sc.sort(reverse=True)
+    return get_rank_value(sc)
+
+
+def calculate_hj_indices(h: int, citations: list) -> list:
+    total_pubs = len(citations)
+    sorted_citations = sorted(citations, reverse=True)
+    if total_pubs < 2*h - 1:
+        j = total_pubs - h
+    else:
+        j = h - 1
+    hj_index = [h**2]
+    for i in range(1, j+1):
+        hj_index.append(hj_index[i-1] + (h-i)*(sorted_citations[h-i-1] - sorted_citations[h-i])
+                        + sorted_citations[h+i-1])
+    return hj_index
+
+
+def calculate_th_index(citations: list, years: list, total_cites: int) -> int:
+    target = total_cites / 2
+    cite_sum = 0
+    maxy = max(years)
+    cur_y = maxy + 1
+    while cite_sum < target:
+        cur_y -= 1
+        for i, y in enumerate(years):
+            if y == cur_y:
+                cite_sum += citations[i]
+    return maxy - cur_y + 1
+
+
+def calculate_history_h_index(citations: list, h: int) -> int:
+    tmp_cites = sorted(citations, reverse=True)
+    max_cites = max(tmp_cites)
+    hklist = [h]
+    k = 0
+    while max_cites > 2**k:
+        hk = 0
+        k += 1
+        for i, c in enumerate(tmp_cites):
+            if c >= (i+1) * 2**k:
+                hk = i+1
+        if hk != 0:
+            hklist.append(hk)
+    return sum(hklist)
+
+
+def calculate_career_years_h_index_pub(pub_years: list) -> int:
+    miny = min(pub_years)
+    maxy = max(pub_years)
+    year_cnts = [pub_years.count(y) for y in range(miny, maxy+1)]
+    year_cnts.sort(reverse=True)
+    return get_rank_value(year_cnts)
+
+
+def calculate_career_years_h_index_cite(pub_years: list, cites: list) -> int:
+    miny = min(pub_years)
+    maxy = max(pub_years)
+    year_cnts = {y: 0 for y in range(miny, maxy+1)}
+    for i, c in enumerate(cites):
+        year_cnts[pub_years[i]] += c
+    data = sorted(year_cnts.values(), reverse=True)
+    return get_rank_value(data)
+
+
+def calculate_career_years_h_index_avgcite(pub_years: list, cites: list) -> float:
+    miny = min(pub_years)
+    maxy = max(pub_years)
+    year_cnts = {y: 0 for y in range(miny, maxy+1)}
+    for i, c in enumerate(cites):
+        year_cnts[pub_years[i]] += c
+    year_pubs = {y: pub_years.count(y) for y in range(miny, maxy+1)}
+    data = []
+    for y in year_cnts:
+        if year_pubs[y] > 0:
+            data.append(year_cnts[y]/year_pubs[y])
+        else:
+            data.append(0)
+    data.sort(reverse=True)
+    h = get_rank_value(data)
+    return calculate_real_h_index(data, h)
+
+
+def calculate_career_years_h_index_diffspeed(pub_years: list, cites: list, cur_year: int) -> float:
+    # in the original paper they calculate ageas current year - pub year, rather than cy - py + 1. This would mean
+    # articles in the present year would have an age of zero and an infinite diffusion
+    #   this coded version adds the 1, so an article published this year has an age of 1 and lat year an age of 2
+    miny = min(pub_years)
+    maxy = max(pub_years)
+    cite_cnts = {y: 0 for y in range(miny, maxy+1)}
+    for i, c in enumerate(cites):
+        cite_cnts[pub_years[i]] += c
+    data = [cite_cnts[y]/(cur_year - y + 1) for y in cite_cnts]
+    data.sort(reverse=True)
+    h = get_rank_value(data)
+    return calculate_real_h_index(data, h)
+
+
+def calculate_i10_index(citations: list) -> int:
+    cnt = 0
+    for c in citations:
+        if c >= 10:
+            cnt += 1
+    return cnt
+
+
+def calculate_i100_index(citations: list) -> int:
+    cnt = 0
+    for c in citations:
+        if c >= 100:
+            cnt += 1
+    return cnt
+
+
+def calculate_i1000_index(citations: list) -> int:
+    cnt = 0
+    for c in citations:
+        if c >= 1000:
+            cnt += 1
+    return cnt
+
+
+def count_non_zero(x: list) -> int:
+    # support function to count the number of non-zero items in a list of numbers
+    return len(x) - x.count(0)
+
+
+def calculate_p1_index(citations: list) -> int:
+    return count_non_zero(citations)
+
+
+def calculate_cited_paper_percent(citations: list) -> float:
+    return 100 * calculate_p1_index(citations) / len(citations)
+
+
+def calculate_uncitedness_factor(citations: list) -> int:
+    return len(citations) - calculate_p1_index(citations)
+
+
+def calculate_uncited_paper_percent(citations: list) -> float:
+    return 100 - calculate_cited_paper_percent(citations)
+
+
+def calculate_total_collaborators(coauthor_list: list) -> int:
+    c = []
+    for coauthors in coauthor_list:
+        if coauthors != ".":
+            if ";" in coauthors:
+                c.extend(coauthors.split(";"))
+            else:
+                c.append(coauthors)
+    return len(set(c))
+
+
+def calculate_partnership_ability(coauthor_list: list):
+    # create counts of publications per coauthor
+    coauthor_cnts = {}
+    for coauthors in coauthor_list:
+        if coauthors != ".":
+            if ";" in coauthors:
+                coa_list = coauthors.split(";")
+            else:
+                coa_list = [coauthors]
+            for a in coa_list:
+                if a in coauthor_cnts:
+                    coauthor_cnts[a] += 1
+                else:
+                    coauthor_cnts[a] = 1
+    cnts = sorted(coauthor_cnts.values(), reverse=True)
+    return get_rank_value(cnts)
+
+
+def calculate_multiple_h_index(citations: list, year: int, pub_years: list) -> float:
+    multi_dim_h_index = []
+    matching_h = []
+    data = [[c, pub_years[i]] for i, c in enumerate(citations)]
+    data.sort(reverse=True)
+    sorted_citations = [d[0] for d in data]
+    sorted_pubyears = [d[1] for d in data]
+    while (len(sorted_citations) > 0) and (max(sorted_citations) > 0):
+        h = get_rank_value(sorted_citations)
+        multi_dim_h_index.append(h)
+        for _ in range(h):
+            matching_h.append(h)
+        sorted_citations = sorted_citations[h:]
+    sorted_citations = [d[0] for d in data]  # pull original sorted citation data back out
+    while len(matching_h) < len(sorted_citations):
+        matching_h.append(0)
+    pub_ages = publication_ages(year, sorted_pubyears)
+    mh = 0
+    for i, c in enumerate(sorted_citations):
+        mh += (matching_h[i] * c**2) / pub_ages[i]
+    return math.sqrt(mh)
+
+
+def calculate_total_pubs_coauthor_adj(measure: str, author_cnts: list, author_pos: list) -> float:
+    return sum(author_effort(measure, a, author_pos[i]) for i, a in enumerate(author_cnts))
+
+
+def calculate_kz_index(citations, pub_years, year, h) -> float:
+    pub_ages = publication_ages(year, pub_years)
+    k = []
+    for c in citations:
+        if c == 0:
+            k.append(0)
+        else:
+            k.append(math.log(c)/math.log(h+1))
+    return sum(k[i]/pub_ages[i] for i in range(len(k)))
+
+
+reference_kernels = {name: func for name, func in globals().items() if name.startswith("calculate_")}
+
+
+# --- record generation ---
+def random_citations(rng: random.Random, n: int) -> list:
+    shape = rng.choice(("uniform", "heavy", "ties", "zeros"))
+    if shape == "uniform":
+        return [rng.randint(0, 20) for _ in range(n)]
+    elif shape == "heavy":
+        return [int(rng.paretovariate(0.8)) - 1 for _ in range(n)]
+    elif shape == "ties":
+        values = [rng.randint(0, 10) for _ in range(rng.randint(1, 3))]
+        return [rng.choice(values) for _ in range(n)]
+    else:
+        return [0 if rng.random() < 0.8 else rng.randint(1, 5) for _ in range(n)]
+
+
+def random_record(rng: random.Random) -> PublicationRecord:
+    n = rng.choice((1, 2, 3, 5, 8, 13, 30, 60))
+    citations = random_citations(rng, n)
+    span = rng.choice((0, 1, 5, 20))
+    pubs = []
+    for c in citations:
+        n_authors = 1
+        while (n_authors < 12) and (rng.random() < 0.5):
+            n_authors += 1
+        coauthors = rng.sample(COAUTHOR_POOL, min(n_authors - 1, len(COAUTHOR_POOL)))
+        pubs.append(Publication(c, FIRST_YEAR + rng.randint(0, span), n_authors, rng.randint(1, n_authors),
+                                ";".join(coauthors) if len(coauthors) > 0 else "."))
+    pubs.sort(key=lambda p: p.year)
+    return PublicationRecord(pubs, max(p.year for p in pubs) + rng.randint(0, 3),
+                             rng.choice(Impact_Funcs.AUTHOR_EFFORT_MEASURES), rng.choice((None, 0, 1, 2, 5)))
+
+
+def record_from_citations(citations: list, same_year: bool = False, n_authors: int = 3) -> PublicationRecord:
+    pubs = []
+    for i, c in enumerate(citations):
+        coauthors = ";".join(COAUTHOR_POOL[(i + k) % len(COAUTHOR_POOL)] for k in range(n_authors - 1))
+        pubs.append(Publication(c, FIRST_YEAR + (0 if same_year else i // 2), n_authors, 1 + i % n_authors,
+                                coauthors if n_authors > 1 else "."))
+    return PublicationRecord(pubs)
+
+
+def adversarial_records() -> list:
+    records = [record_from_citations(c) for c in ([0], [1], [7], [10**9], [0, 0, 0, 0, 0], [4, 4, 4, 4, 4, 4, 4],
+                                                  [3, 3, 3, 3], [5, 5, 5, 5, 5], [2, 2, 1, 1, 0, 0],
+                                                  [10**9, 1, 1, 0], [10**12, 10**12, 0], list(range(20, 0, -1)),
+                                                  list(range(20)), [1] * 25, [0] * 10 + [1])]
+    records.append(record_from_citations([9, 4, 4, 1, 0], same_year=True))
+    records.append(record_from_citations([9, 4, 4, 1, 0], n_authors=1))
+    records.append(record_from_citations([6, 6, 2, 2, 2], n_authors=8))
+    return records
+
+
+# --- comparison ---
+def equivalent(a, b, rel_tol: float = REL_TOLERANCE, abs_tol: float = ABS_TOLERANCE) -> bool:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+        return math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return (len(a) == len(b)) and all(equivalent(x, y, rel_tol, abs_tol) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return (a.keys() == b.keys()) and all(equivalent(a[k], b[k], rel_tol, abs_tol) for k in a)
+    return a == b
+
+
+class RaisedError:
+    """
+    the outcome of a call which raised an exception; two are the same if the exceptions are of the same type
+    """
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def __eq__(self, other):
+        return isinstance(other, RaisedError) and (type(self.error) is type(other.error))
+
+    def __repr__(self):
+        return f"{type(self.error).__name__}({self.error})"
+
+
+def outcome(func, kwargs: dict):
+    """
+    the result of calling func, or the exception it raised. the arguments are copied so a function which modifies
+    its input cannot affect the next call
+    """
+    try:
+        return func(**copy.deepcopy(kwargs))
+    except Exception as error:
+        return RaisedError(error)
+
+
+def kernel_arguments(kernel, arguments: dict) -> Optional[dict]:
+    """
+    the arguments of the kernel, by name, or None if the kernel needs something the record cannot provide
+    """
+    kwargs = {}
+    for name, parameter in inspect.signature(kernel).parameters.items():
+        if name in arguments:
+            kwargs[name] = arguments[name]
+        elif parameter.default is inspect.Parameter.empty:
+            return None
+    return kwargs
+
+
+def backend_fails(kernel_name: str, backend, record: PublicationRecord) -> Optional[tuple]:
+    """
+    returns (reference outcome, backend outcome) if the backend disagrees with the reference kernel on the record.
+    the backend is given the arguments of the current kernel, which may include optional structures the reference
+    does not have
+    """
+    arguments = record.arguments()
+    reference_kwargs = kernel_arguments(reference_kernels[kernel_name], arguments)
+    kwargs = kernel_arguments(getattr(Impact_Funcs, kernel_name), arguments)
+    if (reference_kwargs is None) or (kwargs is None):
+        return None
+    expected = outcome(reference_kernels[kernel_name], reference_kwargs)
+    actual = outcome(backend, kwargs)
+    if isinstance(expected, RaisedError) or isinstance(actual, RaisedError):
+        if expected == actual:
+            return None
+    elif equivalent(expected, actual):
+        return None
+    return expected, actual
+
+
+# --- shrinking ---
+def smaller_records(record: PublicationRecord):
+    """
+    every record one step simpler than the given one, the most drastic simplifications first
+    """
+    pubs = record.pubs
+    if len(pubs) > 1:
+        half = len(pubs) // 2
+        yield PublicationRecord(pubs[:half], record.year, record.measure, record.mk)
+        yield PublicationRecord(pubs[half:], record.year, record.measure, record.mk)
+        for i in range(len(pubs)):
+            yield PublicationRecord(pubs[:i] + pubs[i+1:], record.year, record.measure, record.mk)
+    for i, p in enumerate(pubs):
+        for c in sorted({0, p.cites // 2, p.cites - 1}):
+            if 0 <= c < p.cites:
+                yield record_with(record, i, Publication(c, p.year, p.n_authors, p.author_pos, p.coauthors))
+        if p.n_authors > 1:
+            yield record_with(record, i, Publication(p.cites, p.year, 1, 1, "."))
+        if p.author_pos > 1:
+            yield record_with(record, i, Publication(p.cites, p.year, p.n_authors, 1, p.coauthors))
+        if p.coauthors != ".":
+            yield record_with(record, i, Publication(p.cites, p.year, p.n_authors, p.author_pos, "."))
+        first_year = min(q.year for q in pubs)
+        if p.year > first_year:
+            yield record_with(record, i, Publication(p.cites, first_year, p.n_authors, p.author_pos, p.coauthors))
+    last_year = max(p.year for p in pubs)
+    if record.year > last_year:
+        yield PublicationRecord(pubs, last_year, record.measure, record.mk)
+
+
+def record_with(record: PublicationRecord, i: int, pub: Publication) -> PublicationRecord:
+    return PublicationRecord(record.pubs[:i] + [pub] + record.pubs[i+1:], record.year, record.measure, record.mk)
+
+
+def shrink(record: PublicationRecord, fails, max_steps: int = MAX_SHRINK_STEPS) -> PublicationRecord:
+    """
+    repeatedly replace the record by the first simpler record which still fails, until none does
+    """
+    for _ in range(max_steps):
+        for smaller in smaller_records(record):
+            if fails(smaller):
+                record = smaller
+                break
+        else:
+            break
+    return record
+
+
+# --- checking ---
+def check_backend(kernel_name: str, backend_name: str, backend, records: list) -> Optional[Counterexample]:
+    """
+    returns a minimal counterexample if the backend disagrees with its reference kernel on any of the records
+    """
+    for record in records:
+        if backend_fails(kernel_name, backend, record) is not None:
+            minimal = shrink(record, lambda r: backend_fails(kernel_name, backend, r) is not None)
+            expected, actual = backend_fails(kernel_name, backend, minimal)
+            return Counterexample(kernel_name, backend_name, minimal, expected, actual)
+    return None
+
+
+def generate_records(n_random: int = RANDOM_CASES, seed: int = SEED) -> list:
+    rng = random.Random(seed)
+    return adversarial_records() + [random_record(rng) for _ in range(n_random)]
+
+
+def all_backends() -> dict:
+    """
+    the registered backends of every kernel, together with the kernel itself
+    """
+    backends = {}
+    for kernel_name, registered in Impact_Funcs.fast_backends.items():
+        backends[kernel_name] = {KERNEL_ITSELF: getattr(Impact_Funcs, kernel_name)}
+        backends[kernel_name].update(registered)
+    return backends
+
+
+def check_all_backends(n_random: int = RANDOM_CASES, seed: int = SEED, backends: Optional[dict] = None) -> list:
+    """
+    check every registered backend, and every kernel with backends as called without them (or only the backends
+    given, as kernel name -> {backend name: function}), and return the counterexamples found, at most one per backend
+    """
+    if backends is None:
+        backends = all_backends()
+    records = generate_records(n_random, seed)
+    counterexamples = []
+    for kernel_name in sorted(backends):
+        for backend_name, backend in backends[kernel_name].items():
+            counterexample = check_backend(kernel_name, backend_name, backend, records)
+            if counterexample is not None:
+                counterexamples.append(counterexample)
+    return counterexamples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check fast kernel backends against the reference kernels")
+    parser.add_argument("--cases", type=int, default=RANDOM_CASES, help="number of random records")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    args = parser.parse_args()
+    n_backends = sum(len(b) for b in all_backends().values())
+    counterexamples = check_all_backends(args.cases, args.seed)
+    for counterexample in counterexamples:
+        print(counterexample)
+    print(f"{n_backends - len(counterexamples)} of {n_backends} backends match their reference kernels")
+    if len(counterexamples) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
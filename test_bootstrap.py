@@ -0,0 +1,38 @@
+"""
+Bootstrap confidence intervals: batched kernels against recalculated metric sets, and reproducibility
+"""
+
+import Impact_Bootstrap
+import benchmark_metrics
+
+
+def interval_tuples(intervals: list) -> list:
+    return [(i.name, i.date, i.value, i.low, i.high, i.n_resamples) for i in intervals]
+
+
+def test_batched_matches_recalculation():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(30, 5, 4)
+    names = list(Impact_Bootstrap.BATCHED_METRICS)
+    snapshots = [2, len(date_list) - 1]
+    batched = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, True, True, names, snapshots,
+                                                   n_resamples=200)
+    recalculated = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, True, True, names, snapshots,
+                                                        n_resamples=200, batched=False)
+    assert interval_tuples(batched) == interval_tuples(recalculated)
+    assert len(batched) == 2 * len(names)
+    for interval in batched:
+        assert interval.low <= interval.high
+
+
+def test_reproducible_intervals():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(30, 5, 5)
+    names = ["h-index", "Tol f-index", "m-index", "total self cites"]
+    first = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, True, True, names, n_resamples=30, seed=7)
+    second = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, True, True, names, n_resamples=30, seed=7,
+                                                  processes=2)
+    assert interval_tuples(first) == interval_tuples(second)
+    assert [i.name for i in first] == names
+    other = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, True, True, names, n_resamples=30, seed=8)
+    assert interval_tuples(first) != interval_tuples(other)
+    without_self = Impact_Bootstrap.bootstrap_intervals(date_list, article_list, False, False, names, n_resamples=5)
+    assert "total self cites" not in [i.name for i in without_self]
@@ -0,0 +1,147 @@
+"""
+Percentiles of researchers within a cohort: exact distributions, quantile sketches, and merging
+"""
+
+import os
+import random
+import tempfile
+
+import Impact_Cohort
+import Synthetic_Citations
+
+
+def test_exact_percentile():
+    distribution = Impact_Cohort.ExactDistribution()
+    for value in (1, 2, 2, 3, 10):
+        distribution.add(value)
+    assert distribution.percentile(0) == 0
+    assert distribution.percentile(1) == 10
+    assert distribution.percentile(2) == 40
+    assert distribution.percentile(5) == 80
+    assert distribution.percentile(11) == 100
+    assert distribution.quantile(0.5) == 2
+
+
+def test_sketch_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(2, 1.5) for _ in range(20000)] + [0] * 500 + [-rng.expovariate(1) for _ in range(500)]
+    exact = Impact_Cohort.ExactDistribution()
+    sketch = Impact_Cohort.QuantileSketch()
+    for v in values:
+        exact.add(v)
+        sketch.add(v)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert abs(sketch.quantile(q) - exact.quantile(q)) <= 0.02 * abs(exact.quantile(q))
+    for v in values[:500]:
+        assert abs(sketch.percentile(v) - exact.percentile(v)) < 1
+
+
+def test_sketch_bounded_size():
+    sketch = Impact_Cohort.QuantileSketch(max_bins=100)
+    for i in range(1, 100000):
+        sketch.add(1.001 ** i)
+    assert len(sketch.positive) <= 100
+    assert sketch.count == 99999
+    # only the smallest values are affected by collapsing the bins
+    assert abs(sketch.quantile(0.99) - 1.001 ** 99000) <= 0.02 * 1.001 ** 99000
+
+
+def test_merge():
+    rng = random.Random(2)
+    parts = [Impact_Cohort.CohortPercentiles(exact_limit=50) for _ in range(3)]
+    whole = Impact_Cohort.CohortPercentiles(exact_limit=50)
+    for i in range(90):
+        stream = [("h-index", 2020, rng.randint(0, 40)), ("g-index", 2020, rng.randint(0, 80))]
+        parts[i % 3].add_researcher(stream)
+        whole.add_researcher(stream)
+    merged = Impact_Cohort.CohortPercentiles(exact_limit=50)
+    for part in parts:
+        merged.merge(part)
+    assert merged.n_researchers == 90
+    # the whole has become a sketch, as has the merge of the (exact) parts; both must match
+    assert isinstance(merged.distributions[("h-index", 2020)], Impact_Cohort.QuantileSketch)
+    for value in range(0, 80, 3):
+        for name in ("h-index", "g-index"):
+            assert merged.percentile(name, 2020, value) == whole.percentile(name, 2020, value)
+
+
+def test_merge_leaves_part_unchanged():
+    part = Impact_Cohort.CohortPercentiles()
+    for value in (1, 2, 3):
+        part.add_researcher([("h-index", 2020, value)])
+    merged = [Impact_Cohort.CohortPercentiles() for _ in range(2)]
+    for target in merged:
+        target.merge(part)
+    merged[0].add_researcher([("h-index", 2020, 10)])
+    merged[0].merge(merged[1])
+    # mid-rank percentiles of 3 among (1, 2, 3), and among (1, 2, 3, 10, 1, 2, 3)
+    assert part.percentile("h-index", 2020, 3) == merged[1].percentile("h-index", 2020, 3) == 100 * 2.5 / 3
+    assert merged[0].percentile("h-index", 2020, 3) == 100 * 5 / 7
+
+
+def test_cohort_percentiles():
+    cohort = Synthetic_Citations.generate_cohort(4, 10, 3, 5)
+    names = ["total pubs", "total cites", "h-index", "g-index"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        files = []
+        for i, researcher in enumerate(cohort):
+            files.append(tuple(os.path.join(work_dir, f"r{i}{suffix}") for suffix in ("_c.txt", "_s.txt", "_a.txt")))
+            Synthetic_Citations.write_researcher(researcher, *files[-1])
+        out_name = os.path.join(work_dir, "percentiles.txt")
+        Impact_Cohort.cohort_percentiles(files, out_name, metric_names=names)
+        with open(out_name, "r", encoding="utf-8") as infile:
+            lines = [line.rstrip("\n").split("\t") for line in infile][1:]
+    years = {int(y) for _, _, y, _, _ in lines}
+    assert {name for _, name, _, _, _ in lines} == set(names)
+    for year in years:
+        for name in names:
+            rows = [row for row in lines if (row[1] == name) and (int(row[2]) == year)]
+            percentiles = [float(row[4]) for row in rows]
+            # the mean of the (mid-rank) percentiles of the researchers in a group is always 50
+            assert abs(sum(percentiles) / len(percentiles) - 50) < 0.1
+            # higher values have higher percentiles
+            ordered = sorted(rows, key=lambda row: float(row[3]))
+            assert [float(row[4]) for row in ordered] == sorted(percentiles)
+
+
+def test_cohort_researchers_with_the_same_file_name():
+    # citation files with the same name in different directories, and the same researcher listed twice in a row, are
+    # separate researchers in the output
+    cohort = Synthetic_Citations.generate_cohort(2, 10, 3, 7)
+    names = ["total cites", "h-index"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        files = []
+        for directory, researcher in zip(("a", "b"), cohort):
+            os.mkdir(os.path.join(work_dir, directory))
+            files.append(tuple(os.path.join(work_dir, directory, f"r{suffix}") for suffix in ("_c.txt", "_s.txt",
+                                                                                             "_a.txt")))
+            Synthetic_Citations.write_researcher(researcher, *files[-1])
+        files.append(files[-1])
+        out_name = os.path.join(work_dir, "percentiles.txt")
+        Impact_Cohort.cohort_percentiles(files, out_name, metric_names=names)
+        with open(out_name, "r", encoding="utf-8") as infile:
+            lines = [line.rstrip("\n").split("\t") for line in infile][1:]
+    assert {row[0] for row in lines} == {files[0][0], files[1][0]}
+    for year in {int(row[2]) for row in lines}:
+        for name in names:
+            rows = [row for row in lines if (row[1] == name) and (int(row[2]) == year)]
+            assert [row[0] for row in rows].count(files[1][0]) == 2 * [row[0] for row in rows].count(files[0][0])
+
+
+def test_parallel_cohort_percentiles():
+    # worker processes, each spilling its researchers' streams to its own file, give the same output as one process
+    cohort = Synthetic_Citations.generate_cohort(5, 10, 3, 11)
+    names = ["total pubs", "total cites", "h-index", "g-index"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        files = []
+        for i, researcher in enumerate(cohort):
+            files.append(tuple(os.path.join(work_dir, f"r{i}{suffix}") for suffix in ("_c.txt", "_s.txt", "_a.txt")))
+            Synthetic_Citations.write_researcher(researcher, *files[-1])
+        output = []
+        for processes in (1, 2, 3):
+            out_name = os.path.join(work_dir, f"percentiles{processes}.txt")
+            Impact_Cohort.cohort_percentiles(files, out_name, processes=processes, metric_names=names)
+            with open(out_name, "r", encoding="utf-8") as infile:
+                output.append(infile.read())
+    assert len(output[0].splitlines()) > len(cohort)
+    assert output[0] == output[1] == output[2]
@@ -0,0 +1,127 @@
+"""
+Performance tests: the time to calculate each metric is measured on synthetic researchers of doubling size, and
+the growth exponent fitted to those times must not exceed the complexity declared with the metric's definition
+(Metric.complexity). The values of any other metrics a metric uses are known beforehand, but the structures a
+metric set builds on first use and shares between metrics (sorted citations and h-cores, the year index, author
+efforts, collaboration counts) are dropped before every timed calculation, so the cost of building them is counted
+rather than hidden by whichever metric happened to build them first. Every calculation must also stay within a time
+budget.
+
+Metrics with exponential complexity are only held to the time budget, on small researchers.
+
+the timing tests are slow and sensitive to the load of the machine, so they only run when the environment variable
+IMPACT_TIMING_TESTS is set (e.g., IMPACT_TIMING_TESTS=1 python -m pytest test_complexity.py); the declarations
+themselves are always checked
+"""
+
+import functools
+import math
+import os
+
+import pytest
+
+import Impact_Defs
+import Impact_Funcs
+import ImpactFactorCalculator
+import benchmark_metrics
+
+SIZES = (125, 250, 500, 1000, 2000)
+EXPONENTIAL_SIZES = (20, 40, 80)
+N_SNAPSHOTS = 5
+SEED = 7
+TOLERANCE = 0.5  # allowed excess of the fitted exponent over the declared degree, as timings are noisy
+TIME_BUDGET = 1  # seconds, for a single calculation
+timing_test = pytest.mark.skipif(os.environ.get("IMPACT_TIMING_TESTS", "") == "",
+                                 reason="timing tests only run when IMPACT_TIMING_TESTS is set")
+
+
+def growth_exponent(sizes: tuple, times: list) -> float:
+    """
+    slope of the least-squares line through log(time) vs. log(size)
+    """
+    log_sizes = [math.log(n) for n in sizes]
+    log_times = [math.log(t) for t in times]
+    mean_size = sum(log_sizes) / len(log_sizes)
+    mean_time = sum(log_times) / len(log_times)
+    numerator = sum((x - mean_size) * (y - mean_time) for x, y in zip(log_sizes, log_times))
+    denominator = sum((x - mean_size) ** 2 for x in log_sizes)
+    return numerator / denominator
+
+
+def last_metric_set(n_pubs: int) -> Impact_Defs.MetricSet:
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(n_pubs, N_SNAPSHOTS, SEED)
+    return ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, True, True)[-1]
+
+
+def clear_structures(metric_set: Impact_Defs.MetricSet) -> None:
+    metric_set.decomposition = None
+    metric_set.year_index = None
+    metric_set.efforts = {}
+    metric_set.total_collaborators = None
+    metric_set.partnership_ability = None
+
+
+@functools.lru_cache()
+def metric_times(sizes: tuple, exponential: bool) -> dict:
+    """
+    time of the calculation of every metric (of exponential complexity or not), at each size. a metric which
+    cannot be calculated for the data is left out; one which runs past the time budget is recorded as None
+    """
+    Impact_Funcs.poisson_cdf(1, 1)  # make sure any lazy import is not part of the first time
+    times = {}
+    for n in sizes:
+        metric_set = last_metric_set(n)
+        for name in metric_set.metric_names:
+            metric = metric_set.metrics[name]
+            if (metric.complexity == Impact_Defs.EXPONENTIAL_TIME) != exponential:
+                continue
+            try:
+                with benchmark_metrics.time_limit(TIME_BUDGET):
+                    _ = metric.value
+            except benchmark_metrics.BenchmarkTimeout:
+                times.setdefault(name, []).append(None)
+                continue
+            except (ArithmeticError, ValueError, IndexError):
+                continue
+            times.setdefault(name, []).append(benchmark_metrics.time_calculation(
+                metric, metric_set, functools.partial(clear_structures, metric_set)))
+    return times
+
+
+def test_growth_exponent():
+    sizes = (10, 20, 40, 80)
+    assert round(growth_exponent(sizes, [3 for _ in sizes]), 4) == 0
+    assert round(growth_exponent(sizes, [n * 2 for n in sizes]), 4) == 1
+    assert round(growth_exponent(sizes, [n ** 2 / 100 for n in sizes]), 4) == 2
+
+
+def test_declared_complexity():
+    metrics = Impact_Defs.defined_metrics()
+    assert all(m.complexity in Impact_Defs.COMPLEXITY_DEGREE for m in metrics)
+    for complexity in Impact_Defs.COMPLEXITY_DEGREE:
+        assert any(m.complexity == complexity for m in metrics)
+
+
+@timing_test
+def test_metric_complexity():
+    metrics = {m.name: m for m in Impact_Defs.defined_metrics()}
+    failures = []
+    for name, times in metric_times(SIZES, False).items():
+        if None in times:
+            failures.append(f"{name}: more than {TIME_BUDGET} s at {SIZES[times.index(None)]} publications")
+        elif len(times) == len(SIZES):
+            exponent = growth_exponent(SIZES, times)
+            degree = Impact_Defs.COMPLEXITY_DEGREE[metrics[name].complexity]
+            if exponent > degree + TOLERANCE:
+                failures.append(f"{name}: grows as n^{exponent:.2f}, declared {metrics[name].complexity}")
+    assert failures == []
+
+
+@timing_test
+def test_exponential_metric_budget():
+    failures = []
+    for name, times in metric_times(EXPONENTIAL_SIZES, True).items():
+        if None in times:
+            failures.append(f"{name}: more than {TIME_BUDGET} s at {EXPONENTIAL_SIZES[times.index(None)]} "
+                            "publications")
+    assert failures == []
@@ -0,0 +1,187 @@
+"""
+Offline parts of the Google Scholar fetcher, driven by saved pages (the view_citation page saved in
+Fetch_Google_Scholar.TEST and the trimmed pages in "sample data/scholar pages")
+"""
+
+import os
+import random
+import tempfile
+
+import tqdm
+
+import Fetch_Google_Scholar
+
+PAGE_DIR = os.path.join("sample data", "scholar pages")
+PROFILE_PAGE = os.path.join(PAGE_DIR, "profile listing.html")
+SOURCE_PAGE = os.path.join(PAGE_DIR, "view-source citation.html")
+CAPTCHA_PAGE = os.path.join(PAGE_DIR, "captcha.html")
+# the histogram of the saved page in Fetch_Google_Scholar.TEST
+TEST_HISTOGRAM = {2002: 3, 2003: 4, 2004: 7, 2005: 14, 2006: 21, 2007: 24, 2008: 23, 2009: 19, 2010: 27, 2011: 46,
+                  2012: 87, 2013: 93, 2014: 78, 2015: 93, 2016: 92, 2017: 68, 2018: 70, 2019: 56, 2020: 42, 2021: 34,
+                  2022: 15, 2023: 21, 2024: 16}
+SOURCE_HISTOGRAM = {1998: 1, 1999: 1, 2000: 4, 2005: 123, 2012: 0, 2023: 2}
+# no progress bar monitor thread, which would outlive the test and be forked by later tests using multiprocessing
+tqdm.tqdm.monitor_interval = 0
+
+
+def read_page(filename: str) -> str:
+    with open(filename, "r", encoding="ISO-8859-1") as infile:
+        return infile.read()
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 11))
+    assert Fetch_Google_Scholar.percentile(values, 50) == 5
+    assert Fetch_Google_Scholar.percentile(values, 90) == 9
+    assert Fetch_Google_Scholar.percentile(values, 95) == 10
+    assert Fetch_Google_Scholar.percentile(values, 100) == 10
+    assert Fetch_Google_Scholar.percentile(values, 10) == 1
+    assert Fetch_Google_Scholar.percentile(values, 0) == 1
+    assert Fetch_Google_Scholar.percentile([1, 2, 3, 4, 5, 6], 50) == 3
+    assert Fetch_Google_Scholar.percentile([1, 2, 3, 4, 5, 6], 51) == 4
+    assert Fetch_Google_Scholar.percentile([7], 99) == 7
+    assert Fetch_Google_Scholar.percentile([], 50) == 0
+
+
+def test_classify_page():
+    citation_marker = Fetch_Google_Scholar.CITATION_PAGE_MARKER
+    profile_marker = Fetch_Google_Scholar.PROFILE_PAGE_MARKER
+    assert Fetch_Google_Scholar.classify_page(200, Fetch_Google_Scholar.TEST, citation_marker) == "ok"
+    assert Fetch_Google_Scholar.classify_page(200, read_page(SOURCE_PAGE), citation_marker) == "ok"
+    assert Fetch_Google_Scholar.classify_page(200, read_page(PROFILE_PAGE), profile_marker) == "ok"
+    # a profile listing is not a citation page, and vice versa
+    assert Fetch_Google_Scholar.classify_page(200, read_page(PROFILE_PAGE), citation_marker) == "malformed"
+    assert Fetch_Google_Scholar.classify_page(200, Fetch_Google_Scholar.TEST, profile_marker) == "malformed"
+    assert Fetch_Google_Scholar.classify_page(200, read_page(CAPTCHA_PAGE), citation_marker) == "blocked"
+    for status in (302, 429, 503):
+        assert Fetch_Google_Scholar.classify_page(status, Fetch_Google_Scholar.TEST, citation_marker) == "blocked"
+    assert Fetch_Google_Scholar.classify_page(404, Fetch_Google_Scholar.TEST, citation_marker) == "malformed"
+    assert Fetch_Google_Scholar.classify_page(200, " \n", citation_marker) == "empty"
+    # a page cut off before the histogram (and before the marker)
+    assert Fetch_Google_Scholar.classify_page(200, Fetch_Google_Scholar.TEST[:20000], citation_marker) == "malformed"
+
+
+def test_extract_profile_totals():
+    totals = Fetch_Google_Scholar.extract_profile_totals(read_page(PROFILE_PAGE))
+    # the uncited publication has an empty count; codes may contain dashes
+    assert totals == {"ypzvKOdbExQC": 1930, "8k81kl-MbHgC": 57, "UeHWp8X0CEIC": 0}
+    assert Fetch_Google_Scholar.extract_profile_totals(Fetch_Google_Scholar.TEST) == {}
+
+
+def test_histogram_scanner_pages():
+    scanner = Fetch_Google_Scholar.scan_citation_histogram([Fetch_Google_Scholar.TEST.encode("ISO-8859-1")])
+    assert scanner.counts == TEST_HISTOGRAM
+    assert scanner.classification() == "ok"
+    scanner = Fetch_Google_Scholar.scan_citation_histogram(Fetch_Google_Scholar.read_file_chunks(SOURCE_PAGE))
+    assert scanner.counts == SOURCE_HISTOGRAM
+    assert scanner.classification() == "ok"
+    scanner = Fetch_Google_Scholar.scan_citation_histogram(Fetch_Google_Scholar.read_file_chunks(CAPTCHA_PAGE))
+    assert scanner.counts == {}
+    assert scanner.classification() == "blocked"
+    assert Fetch_Google_Scholar.scan_citation_histogram([]).classification() == "empty"
+    scanner = Fetch_Google_Scholar.scan_citation_histogram([Fetch_Google_Scholar.TEST[:20000].encode("ISO-8859-1")])
+    assert scanner.classification() == "malformed"
+
+
+def test_histogram_scanner_chunk_boundaries():
+    # the same histogram must be found wherever the chunks split an anchor, a year, or a count
+    with open(SOURCE_PAGE, "rb") as infile:
+        source = infile.read()
+    for size in list(range(1, 40)) + [97, 256, 1000, 2047, 2048, 2049, 4096]:
+        assert Fetch_Google_Scholar.scan_citation_histogram(chunked(source, size)).counts == SOURCE_HISTOGRAM
+    test_page = Fetch_Google_Scholar.TEST.encode("ISO-8859-1")
+    for size in (500, 777, 1024, 4096, Fetch_Google_Scholar.SCAN_CHUNK_SIZE):
+        scanner = Fetch_Google_Scholar.scan_citation_histogram(chunked(test_page, size))
+        assert scanner.counts == TEST_HISTOGRAM
+        assert scanner.classification() == "ok"
+    # split into two chunks at every position around the counts of the bars
+    position = test_page.find(b'gsc_oci_g_al">')
+    while position != -1:
+        for split in range(position, position + 20):
+            scanner = Fetch_Google_Scholar.scan_citation_histogram([test_page[:split], test_page[split:]])
+            assert scanner.counts == TEST_HISTOGRAM
+        position = test_page.find(b'gsc_oci_g_al">', position + 1)
+
+
+def test_histogram_scanner_stops_early():
+    # the rest of the page is not read once the histogram has ended
+    test_page = Fetch_Google_Scholar.TEST.encode("ISO-8859-1")
+    chunks = chunked(test_page, 1024)
+    consumed = []
+
+    def reader():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    scanner = Fetch_Google_Scholar.scan_citation_histogram(reader())
+    assert scanner.counts == TEST_HISTOGRAM
+    assert len(consumed) < len(chunks)
+    assert sum(len(c) for c in consumed) > test_page.rfind(b"gsc_oci_g_al")
+
+
+def test_backoff_delay():
+    random.seed(1)
+    for attempt in range(1, 12):
+        cap = min(Fetch_Google_Scholar.BACKOFF_MAX, Fetch_Google_Scholar.BACKOFF_BASE * 2**attempt)
+        delays = [Fetch_Google_Scholar.backoff_delay(attempt) for _ in range(500)]
+        assert all(0 <= d <= cap for d in delays)
+        # full jitter: spread over the whole range up to the cap
+        assert min(delays) < 0.05 * cap
+        assert max(delays) > 0.95 * cap
+    assert max(Fetch_Google_Scholar.backoff_delay(30) for _ in range(100)) <= Fetch_Google_Scholar.BACKOFF_MAX
+
+
+def publication(label: str, code: str, year: int = 2010) -> Fetch_Google_Scholar.Publication:
+    pub = Fetch_Google_Scholar.Publication()
+    pub.label = label
+    pub.code = code
+    pub.year = str(year)
+    return pub
+
+
+def test_fetch_changed_counts():
+    pubs = [publication("unchanged", "A"), publication("changed", "B"), publication("flaky", "C"),
+            publication("failing", "D"), publication("new failing", "E"), publication("new", "F")]
+    pub_data = {p.label: p for p in pubs}
+    pub_list = [p.label for p in pubs]
+    totals = {"A": 10, "B": 25, "C": 8, "D": 40, "E": 3, "F": 1}
+    cached_totals = {"A": 10, "B": 20, "C": 5, "D": 30}
+    cached_counts = {code: {2020: total} for code, total in cached_totals.items()}
+    # the number of times each publication fails before it is fetched
+    failures = {"B": 0, "C": 1, "D": Fetch_Google_Scholar.MAX_REQUEUES + 1, "E": Fetch_Google_Scholar.MAX_REQUEUES + 1,
+                "F": 0}
+    calls = []
+
+    def fetch(pub):
+        calls.append(pub.code)
+        if calls.count(pub.code) <= failures[pub.code]:
+            raise Fetch_Google_Scholar.FetchError(pub.code, "blocked")
+        return {2020: totals[pub.code]}
+
+    trace = Fetch_Google_Scholar.FetchTrace()
+    counts = Fetch_Google_Scholar.fetch_changed_counts(pub_data, pub_list, totals, cached_totals, cached_counts, fetch,
+                                                       trace)
+    # unchanged totals are taken from the cache; failed publications go to the back of the queue
+    assert calls == ["B", "C", "D", "E", "F", "C", "D", "E", "D", "E"]
+    assert counts == {"unchanged": {2020: 10}, "changed": {2020: 25}, "flaky": {2020: 8}, "failing": {2020: 30},
+                      "new": {2020: 1}}
+    # publications which failed keep their cached totals (or none), so they are fetched again on the next run
+    assert totals == {"A": 10, "B": 25, "C": 8, "D": 30, "F": 1}
+
+
+def test_cached_totals_and_counts():
+    with tempfile.TemporaryDirectory() as work_dir:
+        totals_file = os.path.join(work_dir, "totals.txt")
+        assert Fetch_Google_Scholar.read_cached_totals(totals_file) == {}
+        Fetch_Google_Scholar.write_cached_totals(totals_file, {"ypzvKOdbExQC": 1930, "8k81kl-MbHgC": 0})
+        assert Fetch_Google_Scholar.read_cached_totals(totals_file) == {"ypzvKOdbExQC": 1930, "8k81kl-MbHgC": 0}
+    counts = Fetch_Google_Scholar.read_cached_counts("google_scholar_citation_data.txt")
+    start = Fetch_Google_Scholar.START_YEAR
+    assert counts["UeHWp8X0CEIC"][start + 2] == 10
+    assert counts["8k81kl-MbHgC"][start + 1] == 1
+    assert set(counts["UeHWp8X0CEIC"]) == set(range(start, Fetch_Google_Scholar.CURRENT_YEAR + 1))
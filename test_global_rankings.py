@@ -0,0 +1,89 @@
+"""
+Placement of researchers within global ranking releases: cached columns, percentiles, and indicators
+"""
+
+import csv
+import os
+import random
+import tempfile
+
+import Global_Rankings
+import Impact_Cohort
+import benchmark_metrics
+
+COLUMNS = ["authfull", "inst_name", "cntry", "np6019", "firstyr", "lastyr", "nc9619", "h19", "hm19", "ncs", "ncsf",
+           "ncsfl", "c", "nc9619 (ns)", "h19 (ns)", "hm19 (ns)", "ncs (ns)", "ncsf (ns)", "ncsfl (ns)", "c (ns)"]
+
+
+def write_release(filename: str, n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    values = {}
+    with open(filename, "w", newline="") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(COLUMNS)
+        for i in range(n):
+            row = [f"Author {i}", "Somewhere", "usa", rng.randint(1, 300), 1980, 2019]
+            row += [rng.randint(0, 5000) for _ in range(6)] + [round(rng.uniform(0, 6), 3)]
+            row += [rng.randint(0, 4000) for _ in range(6)] + [""]  # a missing value is left out of its column
+            for column, value in zip(COLUMNS, row):
+                values.setdefault(Global_Rankings.indicator_name(column), []).append(value)
+            writer.writerow(row)
+    return values
+
+
+def test_indicator_names():
+    assert Global_Rankings.indicator_name("nc9619") == "nc"
+    assert Global_Rankings.indicator_name("h19 (ns)") == "h (ns)"
+    assert Global_Rankings.indicator_name("ncsfl") == "ncsfl"
+    assert Global_Rankings.indicator_name("c (ns)") == "c (ns)"
+    assert Global_Rankings.indicator_name("np6019") is None
+    assert Global_Rankings.indicator_name("cntry") is None
+    maxlog = Global_Rankings.read_maxlog(os.path.join("Global Rankings", "v02 2020-10 release",
+                                                      "Table-S10-maxlog-2019-career.csv"))
+    assert set(maxlog) == {name + suffix for name in Global_Rankings.INDICATORS for suffix in ("", " (ns)")}
+
+
+def test_release_percentiles():
+    with tempfile.TemporaryDirectory() as work_dir:
+        release_name = os.path.join(work_dir, "release.csv")
+        values = write_release(release_name, 2000)
+        ranking = Global_Rankings.ReleaseRanking(release_name)
+        assert os.path.exists(release_name + Global_Rankings.CACHE_SUFFIX)
+        assert len(ranking.columns["c (ns)"]) == 0
+        assert ranking.percentile("c (ns)", 1) is None
+        for name in ("nc", "h (ns)", "c"):
+            column = values[name]
+            assert len(ranking.columns[name]) == len(column)
+            for value in column[:50] + [-1, 10 ** 6]:
+                below = sum(1 for v in column if v < value)
+                equal = sum(1 for v in column if v == value)
+                assert ranking.percentile(name, value) == Impact_Cohort.percentile_rank(below, equal, len(column))
+        assert ranking.percentile("ncs (ns)", 100) is not None
+        assert ranking.percentile("missing", 100) is None
+        ranking.close()
+
+        # the cache is used while the release is unchanged, and rebuilt once it changes
+        cache_time = os.stat(release_name + Global_Rankings.CACHE_SUFFIX).st_mtime_ns
+        Global_Rankings.ReleaseRanking(release_name).close()
+        assert os.stat(release_name + Global_Rankings.CACHE_SUFFIX).st_mtime_ns == cache_time
+        write_release(release_name, 10, seed=2)
+        ranking = Global_Rankings.ReleaseRanking(release_name)
+        assert len(ranking.columns["nc"]) == 10
+        ranking.close()
+
+
+def test_researcher_indicators():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(25, 6, 3)
+    metric_set = benchmark_metrics.ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, True,
+                                                                                True)[-1]
+    maxlog = Global_Rankings.read_maxlog(os.path.join("Global Rankings", "v02 2020-10 release",
+                                                      "Table-S10-maxlog-2019-career.csv"))
+    indicators = Global_Rankings.researcher_indicators(metric_set, True, maxlog)
+    assert indicators["nc"] == metric_set.metrics["total cites"].value
+    assert indicators["h"] == metric_set.metrics["h-index"].value
+    # the database counts citations from coauthors as self-citations too
+    assert indicators["nc"] - indicators["nc (ns)"] == metric_set.metrics["total coauthor cites"].value
+    assert metric_set.metrics["total coauthor cites"].value > metric_set.metrics["total self cites"].value
+    assert indicators["ncs"] <= indicators["ncsf"] <= indicators["ncsfl"] <= indicators["nc"]
+    assert indicators["h (ns)"] <= indicators["h"]
+    assert 0 <= indicators["c (ns)"] <= indicators["c"] <= 6
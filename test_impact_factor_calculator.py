@@ -0,0 +1,69 @@
+"""
+Reading the output of Fetch_Google_Scholar directly into the calculator
+"""
+
+import datetime
+import os
+import tempfile
+
+import Fetch_Google_Scholar
+import ImpactFactorCalculator
+
+GOOGLE_SCHOLAR_FILE = "google_scholar_citation_data.txt"
+
+
+def test_cumulative_citation_counts():
+    assert ImpactFactorCalculator.cumulative_citation_counts(["n/a", "n/a", "3", "0", "2"]) == [None, None, 3, 3, 5]
+    assert ImpactFactorCalculator.cumulative_citation_counts(["0", "1", "1"]) == [0, 1, 2]
+    assert ImpactFactorCalculator.cumulative_citation_counts([]) == []
+
+
+def test_read_google_scholar_file():
+    rows = ["2000\t2\t1\tFirst2000\tcodeA\t0\t0\t4\t1\t2\n",
+            "2001\t1\t1\tSecond2001\tcode-B\tn/a\t0\t0\t3\t1\n",
+            "\n",
+            "2003\t3\t2\tThird2003\tcodeC\tn/a\tn/a\tn/a\t0\t5\n"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        filename = os.path.join(work_dir, "scholar.txt")
+        with open(filename, "w", encoding="UTF-8") as outfile:
+            outfile.writelines(rows)
+        date_list, article_list = ImpactFactorCalculator.read_google_scholar_file(filename, 2000,
+                                                                                  datetime.date(2004, 5, 17))
+        # by default, the last year is dated with the modification date of the file
+        modified = datetime.datetime(2004, 3, 2, 12).timestamp()
+        os.utime(filename, (modified, modified))
+        last_date = ImpactFactorCalculator.read_google_scholar_file(filename, 2000)[0][-1]
+    # the first two years, without any citations, are dropped; the last year is dated by the fetch
+    assert date_list == [datetime.date(2002, 12, 31), datetime.date(2003, 12, 31), datetime.date(2004, 5, 17)]
+    assert last_date == datetime.date(2004, 3, 2)
+    assert [a.title for a in article_list] == ["First2000", "Second2001", "Third2003"]
+    assert [a.year for a in article_list] == [2000, 2001, 2003]
+    assert [(a.authors, a.author_rank) for a in article_list] == [(2, 1), (1, 1), (3, 2)]
+    assert [a.citations for a in article_list] == [[4, 5, 7], [0, 3, 4], [None, 0, 5]]
+
+
+def test_google_scholar_file_metrics():
+    fetch_date = datetime.date(Fetch_Google_Scholar.CURRENT_YEAR, 6, 30)
+    date_list, article_list = ImpactFactorCalculator.read_google_scholar_file(GOOGLE_SCHOLAR_FILE,
+                                                                              fetch_date=fetch_date)
+    with open(GOOGLE_SCHOLAR_FILE, "r", encoding="UTF-8") as infile:
+        rows = [line.strip().split("\t") for line in infile if line.strip() != ""]
+    assert len(article_list) == len(rows)
+    n_years = len(rows[0]) - 5
+    assert date_list[-1] == fetch_date
+    assert len(date_list) == n_years
+    assert date_list[0] == datetime.date(Fetch_Google_Scholar.START_YEAR, 12, 31)
+    yearly_metrics_list = ImpactFactorCalculator.calculate_all_metrics(date_list, article_list, False, False)
+    assert len(yearly_metrics_list) == len(date_list)
+    last = yearly_metrics_list[-1].metrics
+    assert last["total cites"].value == sum(int(n) for row in rows for n in row[5:] if n != "n/a")
+    assert last["total pubs"].value == len(rows)
+    assert last["h-index"].value > 0
+    # every metric can be written, in the order of the output file
+    for metric_list in yearly_metrics_list:
+        for metric in metric_list.metrics.values():
+            str(metric)
+    # the single citation of the first year is in the h-core, which leaves h' undefined rather than failing
+    first = yearly_metrics_list[0].metrics
+    assert first["total cites"].value == first["h-core cites"].value == 1
+    assert str(first["h_prime-index"]) == "n/a"
@@ -1,3 +1,5 @@
+import array
+
 import Impact_Funcs
 
 # common data for conducting many of the tests
@@ -65,6 +67,16 @@ def test_calculate_ranks():
     assert Impact_Funcs.calculate_ranks(TEST_CITATION_DATA) == (rank_order, cumulative_cnt)
 
 
+def test_rank_maintainer():
+    rank_maintainer = Impact_Funcs.RankMaintainer()
+    # each snapshot adds publications and citations; ties must be broken exactly as in calculate_ranks()
+    for n in range(1, len(TEST_CITATION_DATA) + 1):
+        citations = [c + n for c in TEST_CITATION_DATA[:n]]
+        assert rank_maintainer.calculate_ranks(citations, list(range(n))) == Impact_Funcs.calculate_ranks(citations)
+    assert rank_maintainer.calculate_ranks(TEST_CITATION_DATA, list(range(len(TEST_CITATION_DATA)))) == \
+        Impact_Funcs.calculate_ranks(TEST_CITATION_DATA)
+
+
 def test_publication_ages():
     year = 2018
     answer = [22, 22, 22, 22, 21, 20, 19, 19, 18, 18, 18, 22, 19, 18, 19, 19]
@@ -93,6 +105,35 @@ def test_author_effort():
     assert round(Impact_Funcs.author_effort("harmonic", 5, 3), 4) == 0.1460
     assert round(Impact_Funcs.author_effort("harmonic_aziz", 5, 1), 4) == 0.2941
     assert round(Impact_Funcs.author_effort("harmonic_aziz", 5, 3), 4) == 0.0588
+    # positions outside the author list follow the same formulas rather than failing or taking another position
+    assert Impact_Funcs.author_effort("proportional", 3, 4) == 0
+    assert Impact_Funcs.author_effort("geometric", 2, 0) == 4 / 3
+    assert round(Impact_Funcs.author_effort("harmonic", 2, 4), 4) == 0.1667
+    assert Impact_Funcs.author_efforts("geometric", [2, 2], [1, 3]) == [2 / 3, 1 / 6]
+
+
+def test_author_credit_large_row():
+    # a large consortium paper: the row is built once, with the same values as the per-position formulas
+    n_authors = 4000
+    for measure in Impact_Funcs.AUTHOR_EFFORT_MEASURES:
+        credit = Impact_Funcs.author_credit(measure, n_authors)
+        assert len(credit) == n_authors
+        for p in (1, 2, 17, 1999, 2000, 2001, n_authors):
+            assert credit[p - 1] == Impact_Funcs.position_effort(measure, n_authors, p)
+        assert round(sum(credit), 8) == 1
+
+
+def test_author_credit():
+    for measure in Impact_Funcs.AUTHOR_EFFORT_MEASURES:
+        for n in range(1, 8):
+            assert round(sum(Impact_Funcs.author_credit(measure, n)), 10) == 1
+    assert Impact_Funcs.author_credit("harmonic", 5) is Impact_Funcs.author_credit("harmonic", 5)
+    efforts = Impact_Funcs.author_efforts("proportional", TEST_AUTHOR_CNT, TEST_AUTHOR_ORDER)
+    assert efforts == [Impact_Funcs.author_effort("proportional", a, TEST_AUTHOR_ORDER[i])
+                       for i, a in enumerate(TEST_AUTHOR_CNT)]
+    assert round(Impact_Funcs.calculate_harmonic_p_index(TEST_CITATION_DATA, TEST_AUTHOR_CNT, TEST_AUTHOR_ORDER,
+                                                         Impact_Funcs.author_efforts("harmonic", TEST_AUTHOR_CNT,
+                                                                                     TEST_AUTHOR_ORDER)), 4) == 7.8709
 
 
 def test_citations_per_pub_per_year():
@@ -120,6 +161,16 @@ def test_citations_per_pub_per_year():
             assert col == answer[r][c]
 
 
+def test_citation_increments():
+    increments = Impact_Funcs.CitationIncrements(TEST_YEARLY_PUBCITE_DATA)
+    n_pubs = len(TEST_YEARLY_PUBCITE_DATA)
+    for ny in range(1, increments.n_years + 1):
+        prefixes = increments.prefixes(list(range(n_pubs)), ny)
+        answer = Impact_Funcs.citations_per_pub_per_year([p[:ny] for p in TEST_YEARLY_PUBCITE_DATA])
+        assert [list(p) for p in prefixes] == answer
+    assert Impact_Funcs.calculate_l_prop_yearly(increments.prefixes(list(range(n_pubs)), increments.n_years)) == 14
+
+
 def test_calculate_total_pubs():
     assert Impact_Funcs.calculate_total_pubs(TEST_CITATION_DATA) == 16
 
@@ -562,6 +613,17 @@ def test_calculate_two_sided_h():
     assert Impact_Funcs.calculate_two_sided_h(citations, mdh, 4) == [8, 8, 10, 12, 15, 6, 2, 1, 1]
 
 
+def test_h_decomposition():
+    citations = [386, 282, 172, 113, 87, 83, 80, 69, 40, 38, 30, 28, 27, 24, 17, 14, 11, 11, 10, 7, 7, 4, 2, 1, 1,
+                 1, 0, 0]
+    decomposition = Impact_Funcs.HDecomposition(citations)
+    assert decomposition.multidim_h == [15, 6, 2, 1, 1, 1]
+    assert decomposition.matching_h == [15]*15 + [6]*6 + [2]*2 + [1, 1, 1, 0, 0]
+    assert Impact_Funcs.two_sided_upper_steps(decomposition.sorted_citations, 15, 4) == [12, 10, 8, 8]
+    assert Impact_Funcs.calculate_two_sided_h(citations, decomposition.multidim_h, 4,
+                                              decomposition) == [8, 8, 10, 12, 15, 6, 2, 1, 1]
+
+
 def test_calculate_normal_hi_index():
     assert Impact_Funcs.calculate_normal_hi_index(TEST_CITATION_DATA, TEST_AUTHOR_CNT) == 4
 
@@ -915,6 +977,16 @@ def test_calculate_th_index():
     assert Impact_Funcs.calculate_th_index(TEST_CITATION_DATA, TEST_YEAR_DATA, total_cites) == 5
 
 
+def test_year_index():
+    year_index = Impact_Funcs.YearIndex(TEST_YEAR_DATA, TEST_CITATION_DATA)
+    assert year_index.pub_counts == {1997: 5, 1998: 1, 1999: 1, 2000: 5, 2001: 4}
+    assert year_index.cite_totals == {1997: 77, 1998: 11, 1999: 2, 2000: 40, 2001: 3}
+    assert year_index.pubs[1998] == [4]
+    assert year_index.publication_ages(2001) == Impact_Funcs.publication_ages(2001, TEST_YEAR_DATA)
+    total_cites = Impact_Funcs.calculate_total_cites(TEST_CITATION_DATA)
+    assert Impact_Funcs.calculate_th_index(TEST_CITATION_DATA, TEST_YEAR_DATA, total_cites, year_index) == 5
+
+
 def test_calculate_dci_index():
     cumulative_citations_per_year = [0, 3, 13, 17, 26, 32, 41, 48, 53, 71, 83, 107]
     answer = [0, 0.903089987, 4.057738755, 5.391072088, 8.596936772, 10.91805362, 14.79414264, 18.29414264,
@@ -1033,6 +1105,16 @@ def test_calculate_collaborative_coefficient():
     assert round(Impact_Funcs.calculate_collaborative_coefficient(TEST_AUTHOR_CNT), 4) == 0.4531
 
 
+def test_count_at_least():
+    sorted_citations = sorted(TEST_CITATION_DATA, reverse=True)
+    for t in range(50):
+        assert Impact_Funcs.count_at_least(sorted_citations, t) == len([c for c in TEST_CITATION_DATA if c >= t])
+    assert Impact_Funcs.largest_rank_at_least(sorted_citations, 1) == 6  # the h-index
+    assert Impact_Funcs.largest_rank_at_least(sorted_citations, 8) == 2
+    assert Impact_Funcs.calculate_i10_index(TEST_CITATION_DATA, sorted_citations) == 4
+    assert Impact_Funcs.calculate_p1_index(TEST_CITATION_DATA, sorted_citations) == 13
+
+
 def test_calculate_i10_index():
     assert Impact_Funcs.calculate_i10_index(TEST_CITATION_DATA) == 4
 
@@ -1233,6 +1315,8 @@ def test_calculate_h_prime():
     total_cites = Impact_Funcs.calculate_total_cites(TEST_CITATION_DATA)
     e = Impact_Funcs.calculate_e_index(core_cites, h)
     assert round(Impact_Funcs.calculate_h_prime(h, e, total_cites, core_cites), 3) == 15.969
+    # every citation in the core: no tail
+    assert Impact_Funcs.calculate_h_prime(1, 0, 1, 1) == "n/a"
 
 
 def test_calculate_hc():
@@ -1353,6 +1437,22 @@ def test_calculate_partnership_ability():
     assert Impact_Funcs.calculate_partnership_ability(TEST_COAUTHORS) == 3
 
 
+def test_collaboration_counter():
+    index = Impact_Funcs.CoauthorIndex(TEST_COAUTHORS)
+    assert len(index.names) == 7
+    assert [index.names[a] for a in index.pub_authors(0)] == Impact_Funcs.split_coauthors(TEST_COAUTHORS[0])
+    counter = Impact_Funcs.CollaborationCounter(index)
+    for n in range(len(TEST_COAUTHORS) + 1):  # publications becoming active one at a time
+        counter.update(list(range(n)))
+        assert counter.total_collaborators == Impact_Funcs.calculate_total_collaborators(TEST_COAUTHORS[:n])
+        assert counter.partnership_ability == Impact_Funcs.calculate_partnership_ability(TEST_COAUTHORS[:n])
+    counter.update([1, 3])
+    assert counter.total_collaborators == Impact_Funcs.calculate_total_collaborators([TEST_COAUTHORS[1],
+                                                                                      TEST_COAUTHORS[3]])
+    assert counter.partnership_ability == Impact_Funcs.calculate_partnership_ability([TEST_COAUTHORS[1],
+                                                                                      TEST_COAUTHORS[3]])
+
+
 def test_calculate_stratified_h():
     """
     working out answer from test data
@@ -1392,6 +1492,20 @@ def test_calculate_stochastic_h():
     assert round(hs, 3) == answer
 
 
+def test_poisson_cdf():
+    assert Impact_Funcs.poisson_cdf(-1, 2) == 0
+    assert Impact_Funcs.poisson_cdf(3, 0) == 1
+    assert round(Impact_Funcs.poisson_cdf(2, 1.5), 4) == 0.8088
+    # the direct sum used when scipy is not installed must give the same result
+    stats = Impact_Funcs.scipy_stats
+    Impact_Funcs.scipy_stats = False
+    try:
+        assert round(Impact_Funcs.poisson_cdf(2, 1.5), 4) == 0.8088
+        assert round(Impact_Funcs.poisson_cdf(10, 4.2), 4) == 0.9959
+    finally:
+        Impact_Funcs.scipy_stats = stats
+
+
 def test_calculate_multiple_h_index():
     # data and answer from original publication, Yaminfirooz and Gholinia 2015
     answer = 42.45
@@ -1456,3 +1570,47 @@ def test_calculate_kz_index():
     r2answer = 2.753
     assert round(Impact_Funcs.calculate_kz_index(r2cites, r2years, r2year, r2h), 3) == r2answer
 
+
+
+def test_memoization():
+    Impact_Funcs.enable_memoization(["calculate_h_index", "calculate_total_cites"])
+    try:
+        rank_order, _ = Impact_Funcs.calculate_ranks(TEST_CITATION_DATA)
+        first = Impact_Funcs.calculate_h_index(TEST_CITATION_DATA, rank_order)
+        first[1][0] = None  # modifying a result must not change the cached copy
+        h, is_core = Impact_Funcs.calculate_h_index(TEST_CITATION_DATA, rank_order)
+        assert h == 6
+        assert is_core[0] is True
+        assert Impact_Funcs.calculate_total_cites([1, 2]) == 3
+        assert isinstance(Impact_Funcs.calculate_total_cites([1.0, 2.0]), float)  # equal values, different types
+        assert isinstance(Impact_Funcs.calculate_total_cites([1, 2.0]), float)
+        assert isinstance(Impact_Funcs.calculate_total_cites([1.0, 2]), float)
+        stats = Impact_Funcs.memoization_stats()
+        assert stats["calculate_h_index"] == {"hits": 1, "misses": 1, "unkeyed": 0}
+        assert stats["calculate_total_cites"]["misses"] == 4
+        assert "calculate_ranks" not in stats
+        report = Impact_Funcs.memoization_report().splitlines()
+        assert report[1].split() == ["calculate_h_index", "1", "1", "0", "50.0%"]
+        assert report[-1].split() == ["total", "1", "5", "0", "16.7%"]
+    finally:
+        Impact_Funcs.disable_memoization()
+    assert Impact_Funcs.memoization_stats() == {}
+    assert not hasattr(Impact_Funcs.calculate_h_index, "__wrapped__")
+
+
+def test_memo_key():
+    # the type of each value is part of the key, in its position
+    assert Impact_Funcs.memo_key([1, 2.0]) != Impact_Funcs.memo_key([1.0, 2])
+    assert Impact_Funcs.memo_key([1, True]) != Impact_Funcs.memo_key([1, 1])
+    assert Impact_Funcs.memo_key([[1, 2], [3]]) != Impact_Funcs.memo_key([[1], [2, 3]])
+    # arrays and memoryviews are keyed by their values, whatever their item size
+    integers = array.array("i", [1, 2])
+    assert Impact_Funcs.memo_key(integers) == Impact_Funcs.memo_key(memoryview(array.array("l", [1, 2])))
+    # the key is a short digest, not a copy of the data
+    assert len(Impact_Funcs.memo_key(list(range(10000)))) == 16
+    for value in (Impact_Funcs.YearIndex([2000, 2001]), [1, Impact_Funcs.YearIndex([2000])]):
+        try:
+            Impact_Funcs.memo_key(value)
+            assert False
+        except Impact_Funcs.MemoUnsupported:
+            pass
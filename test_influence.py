@@ -0,0 +1,52 @@
+"""
+Leave-one-out influence: closed-form updates against recalculated metric sets
+"""
+
+import random
+
+import Impact_Funcs
+import Impact_Influence
+import benchmark_metrics
+
+
+def test_first_below():
+    rng = random.Random(1)
+    values = [rng.randint(-20, 20) for _ in range(100)]
+    table = Impact_Influence.FirstBelow(values)
+    for start in range(0, 101, 7):
+        for threshold in (-25, -10, 0, 5, 21):
+            expected = next((i for i in range(start, 100) if values[i] < threshold), 100)
+            assert table.find(start, threshold) == expected
+
+
+def test_closed_form_matches_kernels():
+    rng = random.Random(2)
+    names = list(Impact_Influence.CLOSED_FORM_METRICS)
+    for _ in range(300):
+        citations = [rng.choice([0, 1, 2, 3, 4, 6, 9, 16, 27, rng.randint(0, 300)]) for _ in range(rng.randint(2, 20))]
+        leave_one_out = Impact_Influence.LeaveOneOut(citations)
+        for i, c in enumerate(citations):
+            remaining = citations[:i] + citations[i + 1:]
+            values = leave_one_out.values_without(c, names)
+            assert values["h-index"] == Impact_Funcs.get_rank_value(sorted(remaining, reverse=True))
+            assert values["h(2)-index"] == Impact_Funcs.calculate_h2_index(remaining)
+            assert values["Tol t-index"] == Impact_Funcs.calculate_tol_t_index(remaining)
+            if max(remaining) > 0:
+                assert values["Tol f-index"] == Impact_Funcs.calculate_tol_f_index(remaining)
+            else:
+                assert values["Tol f-index"] is None
+
+
+def test_influence_matches_recalculation():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(30, 5, 6)
+    names = list(Impact_Influence.CLOSED_FORM_METRICS) + ["m-index"]
+    snapshots = [1, len(date_list) - 1]
+    closed = Impact_Influence.influence_tables(date_list, article_list, True, True, names, snapshots)
+    recalculated = Impact_Influence.influence_tables(date_list, article_list, True, True, names, snapshots,
+                                                     processes=2, closed_form=False)
+    assert len(closed) == 2
+    for a, b in zip(closed, recalculated):
+        assert a.values == b.values
+        assert a.changes == b.changes
+        assert len(a.changes["h-index"]) == len(a.citations)
+        assert all(change <= 0 for change in a.changes["h-index"])
@@ -0,0 +1,63 @@
+"""
+Every fast backend of a kernel must match the reference kernel, on random and adversarial records
+"""
+
+import math
+
+import Impact_Funcs
+import kernel_equivalence
+
+
+def test_fast_backends_match_reference():
+    counterexamples = kernel_equivalence.check_all_backends(n_random=100)
+    assert [str(c) for c in counterexamples] == []
+
+
+def test_every_backend_is_checked():
+    # every registered kernel must have a reference and be given its arguments by the records, or it would never be
+    # compared
+    arguments = kernel_equivalence.adversarial_records()[0].arguments()
+    for kernel_name in Impact_Funcs.fast_backends:
+        kernel = getattr(Impact_Funcs, kernel_name)
+        assert kernel_equivalence.kernel_arguments(kernel, arguments) is not None
+        reference = kernel_equivalence.reference_kernels[kernel_name]
+        assert kernel_equivalence.kernel_arguments(reference, arguments) is not None
+
+
+def test_references_are_independent():
+    # the references must not call anything in Impact_Funcs, or a mistake there would be repeated in the reference
+    for reference in kernel_equivalence.reference_kernels.values():
+        assert "Impact_Funcs" not in reference.__code__.co_names
+
+
+def test_broken_shared_structure_is_caught():
+    class MiscountedYearIndex(Impact_Funcs.YearIndex):
+        def __init__(self, pub_years, citations=None):
+            super().__init__(pub_years, citations)
+            self.cite_totals[self.last_year] += 1
+
+    def backend(pub_years, cites):
+        return Impact_Funcs.calculate_career_years_h_index_cite(pub_years, cites,
+                                                                MiscountedYearIndex(pub_years, cites))
+
+    broken = {"calculate_career_years_h_index_cite": {"miscounted": backend}}
+    assert len(kernel_equivalence.check_all_backends(n_random=20, backends=broken)) == 1
+
+
+def test_equivalent():
+    assert kernel_equivalence.equivalent(1, 1.0)
+    assert kernel_equivalence.equivalent([0.1 + 0.2, (2, 3)], [0.3, [2, 3]])
+    assert kernel_equivalence.equivalent(math.nan, math.nan)
+    assert not kernel_equivalence.equivalent(1, 1.001)
+    assert not kernel_equivalence.equivalent([1, 2], [1, 2, 3])
+    assert not kernel_equivalence.equivalent("a", 1)
+
+
+def test_shrink_to_minimal_counterexample():
+    # an i10-index which only counts more than 10 citations fails first for a single paper with exactly 10
+    broken = {"calculate_i10_index": {"strict": lambda citations: sum(1 for c in citations if c > 10)}}
+    counterexamples = kernel_equivalence.check_all_backends(n_random=20, backends=broken)
+    assert len(counterexamples) == 1
+    record = counterexamples[0].record
+    assert [p.cites for p in record.pubs] == [10]
+    assert (counterexamples[0].expected, counterexamples[0].actual) == (1, 0)
@@ -0,0 +1,45 @@
+"""
+Memory profiling: the memory attributed to each call by the MemoryProfiler, and the memory used by a full run
+"""
+
+import Impact_Defs
+import benchmark_memory
+
+SLACK = 200  # bytes per call the profiler's measurements may be off by
+
+
+def test_memory_profiler_attribution():
+    kept = []
+    profiler = Impact_Defs.start_profiling(memory=True)
+    try:
+        profiler.call("nothing", "test", None, 0, int)
+        profiler.call("temporary", "test", None, 0, lambda: len(bytearray(100000)))
+        profiler.call("kept", "test", None, 0, lambda: kept.append(bytearray(100000)))
+        profiler.call("outer", "test", None, 0,
+                      lambda: [profiler.call("inner", "test", None, 0, lambda: kept.append(bytearray(10000)))
+                               for _ in range(3)])
+    finally:
+        Impact_Defs.stop_profiling()
+    usage = {name: u for (name, _, _), u in profiler.usage.items()}
+    assert abs(usage["nothing"].retained) < SLACK
+    assert abs(usage["temporary"].retained) < SLACK
+    assert abs(usage["temporary"].peak - 100000) < 1000
+    assert abs(usage["kept"].retained - 100000) < 1000
+    assert usage["inner"].calls == 3
+    assert abs(usage["inner"].retained - 30000) < 1000
+    assert abs(usage["outer"].retained - 30000) < 1000
+    assert abs(usage["outer"].self_retained) < 4 * SLACK
+    assert 30000 <= usage["outer"].peak < 33000  # its peak also includes the records of the inner calls
+
+
+def test_researcher_memory():
+    results = benchmark_memory.profile_cohort(2, 10, 5, do_html=False)
+    for result in results["researchers"].values():
+        stages = result["stages"]
+        assert set(stages) == {"parse", "snapshot build", "metric evaluation", "researcher"}
+        total = sum(stages[s]["retained"] for s in stages if s != "researcher")
+        assert abs(stages["researcher"]["retained"] - total) < 1000
+        assert stages["researcher"]["peak"] >= max(stages[s]["peak"] for s in stages)
+    # nothing but things built once should remain after the first researcher's results are released
+    assert results["researchers"]["researcher2"]["left_after_release"] < 10000
+    assert len(results["metrics"]) > 100
@@ -0,0 +1,60 @@
+"""
+Monte Carlo projection of metrics: reproducibility, chunking, and the batched kernels against metric sets
+"""
+
+import datetime
+
+import ImpactFactorCalculator
+import Impact_Projection
+import benchmark_metrics
+
+
+def test_projection_reproducible():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(25, 8, 7)
+    first = Impact_Projection.project_metrics(date_list, article_list, True, True, n_years=3, n_trajectories=500,
+                                              chunk_size=100)
+    second = Impact_Projection.project_metrics(date_list, article_list, True, True, n_years=3, n_trajectories=500,
+                                               chunk_size=100, processes=2)
+    assert Impact_Projection.projection_quantiles(first) == Impact_Projection.projection_quantiles(second)
+    quantiles = Impact_Projection.projection_quantiles(first)
+    assert len(quantiles) == 3 * len(Impact_Projection.DEFAULT_METRICS)
+    total_cites = sum(a.citations[-1] for a in article_list)
+    last_year = date_list[-1].year
+    for name, year, count, values in quantiles:
+        assert count == 500
+        assert values == sorted(values)
+        assert last_year < year <= last_year + 3
+        if name == "total cites":
+            assert values[0] >= total_cites
+
+
+def test_batched_matches_metric_sets():
+    date_list, article_list = benchmark_metrics.synthetic_researcher_data(25, 8, 8)
+    names = ["total cites", "h-index", "g-index", "i10", "a-index"]
+    batched = Impact_Projection.project_metrics(date_list, article_list, True, False, names, n_years=2,
+                                                n_trajectories=20, chunk_size=8)
+    recalculated = Impact_Projection.project_metrics(date_list, article_list, True, False, names, n_years=2,
+                                                     n_trajectories=20, chunk_size=8, batched=False)
+    for key, distribution in batched.distributions.items():
+        assert distribution.sorted_values() == recalculated.distributions[key].sorted_values()
+
+
+def steady_article(year: int, dates: list, rate: float):
+    # a publication cited at a steady rate from the start of its publication year
+    article = ImpactFactorCalculator.Article()
+    article.year = year
+    published = datetime.date(year, 1, 1)
+    article.citations = [None if d < published else round(rate * (d - published).days / 365.25) for d in dates]
+    return article
+
+
+def test_rates_fitted_over_elapsed_time():
+    year_ends = [datetime.date(y, 12, 31) for y in range(2014, 2021)]
+    for dates in (year_ends, year_ends + [datetime.date(2021, 1, 31)], year_ends + [datetime.date(2021, 6, 30)],
+                  year_ends[::3] + [datetime.date(2021, 6, 30)], [datetime.date(2021, 6, 30)]):
+        articles = [steady_article(2010, dates, 120), steady_article(2019, dates, 60),
+                    steady_article(2020, dates, 30)]
+        model = Impact_Projection.ProjectionModel(dates, articles, False, False, 1, 1, ["total cites"])
+        for article, rate in zip(articles, (120, 60, 30)):
+            i = model.publications.index(article)
+            assert abs(model.shapes[i] * model.scales[i] - rate) < 0.05 * rate + 2